@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IndustryOR 性能回归测试
+
+对每个实例的求解脚本重复运行N次 (每次在临时目录中的副本里以独立进程运行，
+不会改写仓库中的 result.txt / .lp / .sol 文件)，借助 solve_telemetry 收集每次运行的
+建模耗时、求解耗时和目标值，统计中位数与分位数，并与已提交的基线文件比较：
+
+- 求解耗时或建模耗时的中位数超过基线P90的 (1 + threshold) 倍，且比基线中位数多出 min_abs_time 以上，
+  判为性能回退 (以P90为参照可吸收基线本身的运行波动)
+- 目标值与基线的相对偏差超过 objective_tol，或求解状态变化，判为结果漂移
+- 本次或基线的最终求解状态不是最优 (如超出许可规模、超时、不可行)，判为失败；
+  --update-baseline 不记录这样的结果，需在能求解该实例的环境中生成基线
+
+用法:
+    python benchmark_suite.py                      # 与基线比较，存在回退时返回码为1
+    python benchmark_suite.py --runs 5 id34 id36   # 只测指定实例
+    python benchmark_suite.py --update-baseline    # 重新生成基线
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+TELEMETRY_SCRIPT = os.path.join(ROOT, "solve_telemetry.py")
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmark_baseline.json")
+# COPT.OPTIMAL (遥测记录中的 status 为COPT状态码)
+OPTIMAL = 1
+
+# 实例编号 -> 求解脚本
+INSTANCES = {
+    "id01": "solve_problem.py",
+    "id03": "solve_production_planning.py",
+    "id04": "solve_bomber.py",
+    "id05": "solve_bomber.py",
+    "id06": "production_planning.py",
+    "id07": "solve_bomber.py",
+    "id08": "solve_problem.py",
+    "id09": "production_planning.py",
+    "id10": "solve_bomber.py",
+    "id100": "solve_bottleneck.py",
+    "id12": "production_planning.py",
+    "id13": "solve_problem.py",
+    "id14": "meal_planning.py",
+    "id15": "solve_corrected.py",
+    "id16": "solve_problem.py",
+    "id19": "solve_problem.py",
+    "id20": "solve.py",
+    "id21": "solve_copt.py",
+    "id26": "workforce_scheduling.py",
+    "id27": "production_planning.py",
+    "id31": "production_planning.py",
+    "id34": "production_planning.py",
+    "id36": "vrphtw_solver.py",
+    "id47": "farm_optimization.py",
+    "id55": "course_selection_copt.py",
+    "id60": "tsp_mtz.py",
+    "id81": "parking_load_balance.py",
+    "id83": "workforce_scheduling.py",
+    "id85": "product_mix.py",
+    "id86": "product_mix.py",
+    "id99": "solve_reliability.py",
+}
+
+
+def percentile(values, pct):
+    """最近秩法分位数"""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = max(1, int(round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def run_once(instance, timeout):
+    """
+    在临时目录中运行一次实例脚本
+
+    Returns:
+        {build_time, solve_time, wall_time, objective, status, solves}，没有求解记录时返回 {error: 信息}；
+        有求解记录但脚本异常退出时附带 warning 字段
+    """
+    script = INSTANCES[instance]
+    with tempfile.TemporaryDirectory(prefix="industryor_bench_") as workdir:
+        instance_dir = os.path.join(workdir, instance)
+        shutil.copytree(os.path.join(ROOT, instance), instance_dir)
+        log_file = os.path.join(workdir, "telemetry.jsonl")
+
+        start = time.perf_counter()
+        try:
+            completed = subprocess.run(
+                [sys.executable, TELEMETRY_SCRIPT, "--log", log_file, os.path.join(instance_dir, script)],
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=timeout, text=True,
+            )
+        except subprocess.TimeoutExpired:
+            return {"error": f"运行超过 {timeout} 秒"}
+        wall_time = time.perf_counter() - start
+
+        records = []
+        if os.path.exists(log_file):
+            with open(log_file, encoding="utf-8") as f:
+                records = [json.loads(line) for line in f if line.strip()]
+        message = (completed.stderr.strip().splitlines()[-1:] or ["没有求解记录"])[0]
+        if not records:
+            return {"error": message}
+
+    final = records[-1]
+    result = {
+        "build_time": sum(r["build_time"] or 0.0 for r in records),
+        "solve_time": sum(r["solve_wall_time"] or 0.0 for r in records),
+        "wall_time": wall_time,
+        "objective": final["objective"],
+        "status": final["status"],
+        "solves": len(records),
+    }
+    # 部分脚本求解后把结果写到作者机器上的绝对路径，此时求解记录仍然有效，只记警告
+    if completed.returncode != 0:
+        result["warning"] = message
+    return result
+
+
+def measure(instance, runs, timeout):
+    """运行实例N次并汇总统计量"""
+    results = []
+    for _ in range(runs):
+        result = run_once(instance, timeout)
+        if "error" in result:
+            return result
+        results.append(result)
+
+    summary = {
+        "runs": runs,
+        "solves": results[-1]["solves"],
+        "status": results[-1]["status"],
+        "objective": results[-1]["objective"],
+    }
+    if "warning" in results[-1]:
+        summary["warning"] = results[-1]["warning"]
+    for key in ("build_time", "solve_time", "wall_time"):
+        values = [r[key] for r in results]
+        summary[key] = {
+            "median": round(statistics.median(values), 6),
+            "p10": round(percentile(values, 10), 6),
+            "p90": round(percentile(values, 90), 6),
+        }
+    return summary
+
+
+def check_solved(result):
+    """
+    单次测量结果本身的问题 (运行失败或未求得最优解)
+
+    Returns:
+        问题描述，没有问题时返回None
+    """
+    if "error" in result:
+        return f"运行失败: {result['error']}"
+    if result["status"] != OPTIMAL:
+        return f"未求得最优解 (状态 {result['status']})"
+    return None
+
+
+def compare(current, baseline, threshold, min_abs_time, objective_tol):
+    """
+    比较单个实例的测量结果与基线
+
+    Returns:
+        问题描述列表，空列表表示通过
+    """
+    problem = check_solved(current)
+    if problem is not None:
+        return [problem]
+    problem = check_solved(baseline)
+    if problem is not None:
+        return [f"基线无效 ({problem})，需在能求解该实例的环境中重新生成"]
+    problems = []
+    if current["status"] != baseline["status"]:
+        problems.append(f"状态 {baseline['status']} -> {current['status']}")
+
+    base_obj, cur_obj = baseline["objective"], current["objective"]
+    if (base_obj is None) != (cur_obj is None):
+        problems.append(f"目标值 {base_obj} -> {cur_obj}")
+    elif base_obj is not None and abs(cur_obj - base_obj) > objective_tol * max(1.0, abs(base_obj)):
+        problems.append(f"目标值漂移 {base_obj} -> {cur_obj}")
+
+    for key, label in (("solve_time", "求解"), ("build_time", "建模")):
+        base_time = baseline[key]["median"]
+        cur_time = current[key]["median"]
+        limit = baseline[key]["p90"] * (1 + threshold)
+        if cur_time > limit and cur_time - base_time > min_abs_time:
+            problems.append(f"{label}耗时回退 {base_time:.4f}s -> {cur_time:.4f}s "
+                            f"(+{(cur_time / base_time - 1) * 100 if base_time > 0 else float('inf'):.0f}%)")
+    return problems
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path, instances, runs):
+    # 警告是运行环境相关的信息 (如脚本写入作者机器上的绝对路径失败)，不写入基线
+    instances = {name: {key: value for key, value in entry.items() if key != "warning"}
+                 for name, entry in instances.items()}
+    baseline = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "host": socket.gethostname(),
+        "python_version": platform.python_version(),
+        "runs": runs,
+        "instances": instances,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IndustryOR 性能回归测试")
+    parser.add_argument("instances", nargs="*", help="要测试的实例编号，默认全部")
+    parser.add_argument("--runs", type=int, default=3, help="每个实例的运行次数")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="基线文件路径")
+    parser.add_argument("--update-baseline", action="store_true", help="用本次测量结果更新基线")
+    parser.add_argument("--threshold", type=float, default=0.25, help="耗时回退的相对阈值")
+    parser.add_argument("--min-abs-time", type=float, default=0.05, help="耗时回退的最小绝对增量 (秒)")
+    parser.add_argument("--objective-tol", type=float, default=1e-6, help="目标值相对容差")
+    parser.add_argument("--timeout", type=float, default=600.0, help="单次运行超时 (秒)")
+    args = parser.parse_args()
+
+    selected = args.instances or list(INSTANCES)
+    unknown = [name for name in selected if name not in INSTANCES]
+    if unknown:
+        print(f"错误: 未知实例 {unknown}")
+        sys.exit(2)
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None and not args.update_baseline:
+        print(f"错误: 基线文件 '{args.baseline}' 不存在，请先使用 --update-baseline 生成")
+        sys.exit(2)
+
+    measured = {}
+    failures = {}
+    print(f"{'实例':<6} {'建模中位数(s)':>14} {'求解中位数(s)':>14} {'求解P90(s)':>11} {'目标值':>16}  结果")
+    print("-" * 80)
+    for instance in selected:
+        current = measure(instance, args.runs, args.timeout)
+        measured[instance] = current
+
+        problem = check_solved(current)
+        if args.update_baseline:
+            verdict = "已记录" if problem is None else f"未记录: {problem}"
+        elif instance not in baseline["instances"]:
+            if problem is not None:
+                failures[instance] = [problem]
+            verdict = "无基线" if problem is None else "失败"
+        else:
+            problems = compare(current, baseline["instances"][instance],
+                               args.threshold, args.min_abs_time, args.objective_tol)
+            if problems:
+                failures[instance] = problems
+            verdict = "通过" if not problems else "失败"
+
+        if "error" in current:
+            print(f"{instance:<6} {'-':>14} {'-':>14} {'-':>11} {'-':>16}  {verdict} ({current['error']})")
+        else:
+            objective = f"{current['objective']:.4f}" if current["objective"] is not None else "-"
+            note = f" (退出异常: {current['warning']})" if "warning" in current else ""
+            print(f"{instance:<6} {current['build_time']['median']:>14.4f} "
+                  f"{current['solve_time']['median']:>14.4f} {current['solve_time']['p90']:>11.4f} "
+                  f"{objective:>16}  {verdict}{note}")
+
+    if args.update_baseline:
+        instances = dict(baseline["instances"]) if baseline else {}
+        for instance, current in measured.items():
+            if check_solved(current) is None:
+                instances[instance] = current
+            else:
+                instances.pop(instance, None)
+        save_baseline(args.baseline, instances, args.runs)
+        print(f"\n基线已写入 {args.baseline}")
+        skipped = [instance for instance, current in measured.items() if check_solved(current) is not None]
+        if skipped:
+            print(f"未求得最优解、未写入基线的实例: {', '.join(skipped)}")
+            sys.exit(1)
+        return
+
+    if failures:
+        print("\n回退详情:")
+        for instance, problems in failures.items():
+            for problem in problems:
+                print(f"  {instance}: {problem}")
+        sys.exit(1)
+    print("\n全部实例通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IndustryOR 建模热点分析
+
+求解器日志只包含求解阶段，看不到Python端构造约束的开销 (如 id36 中 time_flow 的三重循环、
+id01 中嵌套的 quicksum)。本模块按"约束族"统计建模耗时，并输出耗时最多的前N个约束族。
+
+约束族的划分:
+- 显式计时段: 在脚本中用 `with span("time_flow"):` 包住一组约束，段内的全部调用计入该段
+- 自动划分: 不修改脚本时，挂钩 addConstr / addConstrs / addVar / addVars 等方法，
+  同一调用位置 (文件:行号) 的所有调用视为一个约束族，名称取首个约束名去掉末尾数字下标的部分
+
+每次调用的耗时 = 距上一次挂钩调用 (或 createModel、上一次求解结束) 的间隔，
+其中包含在Python中构造表达式的时间 (表达式在调用前求值) 和COPT添加约束的时间，两者分别统计。
+
+启用方式 (默认关闭，未启用时 span() 不做任何事):
+    python build_profiler.py [--top 20] id36/vrphtw_solver.py    # 不修改脚本
+    INDUSTRYOR_PROFILE=1 python script.py                        # 脚本中 import build_profiler 并使用 span()
+"""
+
+import argparse
+import atexit
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager
+
+import coptpy as cp
+
+from solve_telemetry import script_environment
+
+# 被挂钩的建模方法
+HOOKED_METHODS = ("addConstr", "addConstrs", "addVar", "addVars", "addSOS",
+                  "addGenConstrIndicator", "addQConstr", "setObjective")
+
+_TRAILING_INDEX = re.compile(r"(?:[_(\[,]?-?\d+[)\]]?)+$")
+
+
+class FamilyStats:
+    """单个约束族的统计量"""
+
+    __slots__ = ("name", "calls", "expr_time", "call_time")
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.expr_time = 0.0
+        self.call_time = 0.0
+
+    @property
+    def total_time(self):
+        return self.expr_time + self.call_time
+
+
+class BuildProfiler:
+    """收集建模耗时的全局状态"""
+
+    def __init__(self):
+        self.enabled = bool(os.environ.get("INDUSTRYOR_PROFILE"))
+        self.families = {}
+        self.site_names = {}
+        self.span_stack = []
+        self.last_mark = time.perf_counter()
+        self.solve_calls = 0
+        self.solve_time = 0.0
+        self.originals = {}
+        self.create_model = None
+        self.reported = False
+
+    def reset(self):
+        self.families.clear()
+        self.site_names.clear()
+        self.span_stack.clear()
+        self.last_mark = time.perf_counter()
+        self.solve_calls = 0
+        self.solve_time = 0.0
+
+    def family(self, name):
+        stats = self.families.get(name)
+        if stats is None:
+            stats = self.families[name] = FamilyStats(name)
+        return stats
+
+    def record(self, key, call_start, call_end):
+        stats = self.family(key)
+        stats.calls += 1
+        stats.expr_time += max(call_start - self.last_mark, 0.0)
+        stats.call_time += call_end - call_start
+        self.last_mark = call_end
+
+
+_profiler = BuildProfiler()
+
+
+def enabled():
+    """是否启用了建模耗时统计"""
+    return _profiler.enabled
+
+
+def family_name(method, args, kwargs):
+    """根据调用参数推断约束族名称: 约束名或变量名前缀去掉末尾的数字下标"""
+    if method in ("addVar", "addVars"):
+        name = kwargs.get("nameprefix") or kwargs.get("name") or ""
+        return f"var:{name}" if name else "var"
+    if method == "setObjective":
+        return "objective"
+    name = kwargs.get("name") or kwargs.get("nameprefix") or ""
+    if not name and len(args) > 1 and isinstance(args[-1], str):
+        name = args[-1]
+    return _TRAILING_INDEX.sub("", name).rstrip("_") or method
+
+
+@contextmanager
+def span(name):
+    """
+    显式计时段: 段内的建模调用全部计入名为 name 的约束族，未启用时不做任何事
+
+    示例:
+        with span("time_flow"):
+            for i in customers:
+                ...
+                model.addConstr(...)
+    """
+    if not _profiler.enabled:
+        yield
+        return
+    _profiler.span_stack.append(name)
+    start = time.perf_counter()
+    # 计时段开始前的间隔不属于本段
+    _profiler.last_mark = start
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        _profiler.span_stack.pop()
+        # 段内最后一次调用之后的时间 (如循环收尾) 也计入本段
+        stats = _profiler.family(name)
+        stats.expr_time += max(end - _profiler.last_mark, 0.0)
+        _profiler.last_mark = end
+
+
+def _wrap(method_name, original):
+    def wrapper(self, *args, **kwargs):
+        if not _profiler.enabled:
+            return original(self, *args, **kwargs)
+        call_start = time.perf_counter()
+        try:
+            return original(self, *args, **kwargs)
+        finally:
+            call_end = time.perf_counter()
+            if _profiler.span_stack:
+                key = _profiler.span_stack[-1]
+            else:
+                frame = sys._getframe(1)
+                site = (frame.f_code.co_filename, frame.f_lineno)
+                label = _profiler.site_names.get(site)
+                if label is None:
+                    label = (f"{family_name(method_name, args, kwargs)} "
+                             f"({os.path.basename(site[0])}:{site[1]})")
+                    _profiler.site_names[site] = label
+                key = label
+            _profiler.record(key, call_start, call_end)
+
+    wrapper.__name__ = method_name
+    return wrapper
+
+
+def _wrap_solve(original):
+    def solve(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original(self, *args, **kwargs)
+        finally:
+            end = time.perf_counter()
+            _profiler.solve_calls += 1
+            _profiler.solve_time += end - start
+            _profiler.last_mark = end
+
+    return solve
+
+
+def _wrap_create_model(original):
+    def create_model(self, *args, **kwargs):
+        try:
+            return original(self, *args, **kwargs)
+        finally:
+            # 环境创建和许可检查不计入建模耗时
+            _profiler.last_mark = time.perf_counter()
+
+    return create_model
+
+
+def install():
+    """挂钩COPT建模方法并启用统计"""
+    _profiler.enabled = True
+    if _profiler.originals:
+        return
+    for method_name in HOOKED_METHODS:
+        original = getattr(cp.Model, method_name, None)
+        if original is None:
+            continue
+        _profiler.originals[method_name] = original
+        setattr(cp.Model, method_name, _wrap(method_name, original))
+    _profiler.originals["solve"] = cp.Model.solve
+    cp.Model.solve = _wrap_solve(cp.Model.solve)
+    _profiler.create_model = cp.Envr.createModel
+    cp.Envr.createModel = _wrap_create_model(cp.Envr.createModel)
+    _profiler.reset()
+
+
+def uninstall():
+    """撤销 install() 的挂钩"""
+    for method_name, original in _profiler.originals.items():
+        setattr(cp.Model, method_name, original)
+    _profiler.originals.clear()
+    if _profiler.create_model is not None:
+        cp.Envr.createModel = _profiler.create_model
+        _profiler.create_model = None
+
+
+def report(top=20, file=None):
+    """
+    打印耗时最多的前 top 个约束族
+
+    Returns:
+        按总耗时降序排列的 FamilyStats 列表
+    """
+    file = file or sys.stdout
+    _profiler.reported = True
+    families = sorted(_profiler.families.values(), key=lambda s: s.total_time, reverse=True)
+    build_total = sum(s.total_time for s in families)
+    if not families:
+        print("没有记录到建模调用", file=file)
+        return families
+
+    print("\n" + "=" * 96, file=file)
+    print("建模耗时热点", file=file)
+    print("=" * 96, file=file)
+    print(f"{'约束族':<48} {'调用次数':>8} {'表达式(ms)':>11} {'添加(ms)':>10} {'合计(ms)':>10} {'占比':>7}",
+          file=file)
+    print("-" * 96, file=file)
+    for stats in families[:top]:
+        share = stats.total_time / build_total if build_total > 0 else 0.0
+        print(f"{stats.name[:48]:<48} {stats.calls:>8} {stats.expr_time * 1000:>11.2f} "
+              f"{stats.call_time * 1000:>10.2f} {stats.total_time * 1000:>10.2f} {share:>7.1%}", file=file)
+    if len(families) > top:
+        rest = sum(s.total_time for s in families[top:])
+        print(f"{f'其余 {len(families) - top} 个约束族':<48} {'':>8} {'':>11} {'':>10} {rest * 1000:>10.2f} "
+              f"{rest / build_total if build_total > 0 else 0.0:>7.1%}", file=file)
+    print("-" * 96, file=file)
+    print(f"建模合计: {build_total * 1000:.2f} ms, 求解 {_profiler.solve_calls} 次合计: "
+          f"{_profiler.solve_time * 1000:.2f} ms", file=file)
+    return families
+
+
+def run_script(script, script_args=(), top=20):
+    """在脚本所在目录下运行脚本，统计其建模耗时并打印报告"""
+    install()
+    try:
+        with script_environment(script, script_args) as run:
+            run.run()
+    finally:
+        uninstall()
+        report(top)
+
+
+@atexit.register
+def _report_at_exit():
+    # 通过环境变量启用且脚本直接运行时，在进程退出前打印报告
+    if _profiler.enabled and _profiler.families and not _profiler.reported:
+        report(int(os.environ.get("INDUSTRYOR_PROFILE_TOP", "20")))
+
+
+if os.environ.get("INDUSTRYOR_PROFILE"):
+    install()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="统计IndustryOR脚本中各约束族的建模耗时")
+    parser.add_argument("--top", type=int, default=20, help="报告中显示的约束族数量")
+    parser.add_argument("script", help="要运行的脚本，如 id36/vrphtw_solver.py")
+    parser.add_argument("script_args", nargs=argparse.REMAINDER, help="传给脚本的参数")
+    args = parser.parse_args()
+    run_script(args.script, args.script_args, args.top)
+
+
+if __name__ == "__main__":
+    main()
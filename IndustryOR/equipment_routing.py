@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+两阶段设备路径生产规划的实例生成器与规模基准测试
+
+id27 (带设备固定成本的MILP) 和 id31 (带单位工时加工成本的LP) 使用相同的数据布局：
+产品集合、A/B两阶段设备、可行路径 routes = {(产品, A设备, B设备)}、单位加工时间等。
+原脚本对每台设备都扫描一遍完整的路径列表来构造工时约束，构建时间为 O(设备数 × 路径数)。
+
+本模块提供：
+- generate_instance: 按同样的数据布局生成上百种产品、上百台设备的随机实例
+- index_routes: 一次遍历建立 设备 -> 路径列表 的索引，约束构建降为 O(路径数)
+- build_fixed_charge_model / build_processing_cost_model: 分别对应 id27 / id31 的模型
+- 命令行基准测试: 对比扫描与索引两种构建方式的耗时，以及随规模增长的求解时间
+
+用法:
+    python equipment_routing.py [--sizes 10x4 50x10 100x20 200x40] [--model fixed|processing]
+"""
+
+import argparse
+import csv
+import os
+import random
+import time
+from collections import defaultdict
+
+import coptpy as cp
+from coptpy import COPT
+
+
+def generate_instance(num_products, num_machines_a, num_machines_b,
+                      max_machines_per_stage=8, seed=0):
+    """
+    生成与 id27 / id31 相同数据布局的随机实例
+
+    Args:
+        num_products: 产品数
+        num_machines_a: A阶段设备数
+        num_machines_b: B阶段设备数
+        max_machines_per_stage: 每种产品在每个阶段最多可用的设备数
+        seed: 随机种子
+
+    Returns:
+        数据字典，键与原脚本中的变量名一致
+    """
+    rng = random.Random(seed)
+    products = [f"P{k}" for k in range(1, num_products + 1)]
+    equipment_A = [f"A{k}" for k in range(1, num_machines_a + 1)]
+    equipment_B = [f"B{k}" for k in range(1, num_machines_b + 1)]
+
+    routes = []
+    processing_time = {}
+    sell_price = {}
+    material_cost = {}
+    for p in products:
+        allowed_a = rng.sample(equipment_A, rng.randint(1, min(max_machines_per_stage, num_machines_a)))
+        allowed_b = rng.sample(equipment_B, rng.randint(1, min(max_machines_per_stage, num_machines_b)))
+        for m in allowed_a + allowed_b:
+            processing_time[p, m] = rng.randint(3, 15)
+        for a in allowed_a:
+            for b in allowed_b:
+                routes.append((p, a, b))
+        material_cost[p] = round(rng.uniform(0.2, 0.6), 2)
+        sell_price[p] = round(material_cost[p] + rng.uniform(0.8, 2.5), 2)
+
+    all_equipment = equipment_A + equipment_B
+    machine_hours = {m: rng.randrange(4000, 12001, 1000) for m in all_equipment}
+    fixed_cost = {m: rng.randint(200, 800) for m in all_equipment}
+    processing_cost = {m: round(rng.uniform(0.02, 0.12), 2) for m in all_equipment}
+
+    return {
+        "products": products,
+        "equipment_A": equipment_A,
+        "equipment_B": equipment_B,
+        "routes": routes,
+        "sell_price": sell_price,
+        "material_cost": material_cost,
+        "machine_hours": machine_hours,
+        "fixed_cost": fixed_cost,
+        "processing_cost": processing_cost,
+        "processing_time": processing_time,
+    }
+
+
+def index_routes(routes):
+    """
+    一次遍历建立 设备 -> 经过该设备的路径列表 的索引
+
+    Returns:
+        defaultdict(list)，键为A或B设备
+    """
+    routes_by_machine = defaultdict(list)
+    for route in routes:
+        _, a, b = route
+        routes_by_machine[a].append(route)
+        routes_by_machine[b].append(route)
+    return routes_by_machine
+
+
+def _machine_routes(data, routes_by_machine, m, stage):
+    """返回经过设备m的路径；无索引时按原脚本方式扫描完整路径列表"""
+    if routes_by_machine is not None:
+        return routes_by_machine.get(m, [])
+    position = 1 if stage == "A" else 2
+    return [route for route in data["routes"] if route[position] == m]
+
+
+def build_fixed_charge_model(model, data, routes_by_machine=None):
+    """
+    构建 id27 的带设备固定成本MILP模型
+
+    Args:
+        model: COPT模型对象
+        data: 实例数据
+        routes_by_machine: index_routes 的结果；为None时按原脚本方式扫描路径列表
+
+    Returns:
+        (x, y)
+    """
+    routes = data["routes"]
+    processing_time = data["processing_time"]
+    machine_hours = data["machine_hours"]
+    all_equipment = data["equipment_A"] + data["equipment_B"]
+
+    # x[p,a,b]: 通过路径(p,a,b)生产的产品p的数量 (件)
+    x = model.addVars(routes, lb=0.0, nameprefix="x")
+
+    # y[m]: 设备m是否被启用的二元变量
+    y = model.addVars(all_equipment, vtype=COPT.BINARY, nameprefix="y")
+
+    # 大M: 设备在有效时长内能生产的最大产品数量
+    min_time = {}
+    for (p, m), t in processing_time.items():
+        if m not in min_time or t < min_time[m]:
+            min_time[m] = t
+
+    for stage, machines in (("A", data["equipment_A"]), ("B", data["equipment_B"])):
+        for m in machines:
+            machine_routes = _machine_routes(data, routes_by_machine, m, stage)
+            if not machine_routes:
+                continue
+            # 设备工时约束
+            workload = cp.quicksum(processing_time[route[0], m] * x[route] for route in machine_routes)
+            model.addConstr(workload <= machine_hours[m], name=f"capacity_{stage}_{m}")
+            # 设备启用逻辑约束
+            production = cp.quicksum(x[route] for route in machine_routes)
+            big_M = machine_hours[m] / min_time[m]
+            model.addConstr(production <= big_M * y[m], name=f"activation_{stage}_{m}")
+
+    # 目标函数：最大化 总边际利润 - 设备固定成本
+    total_margin = cp.quicksum(
+        (data["sell_price"][p] - data["material_cost"][p]) * x[p, a, b]
+        for p, a, b in routes
+    )
+    total_fixed_cost = cp.quicksum(data["fixed_cost"][m] * y[m] for m in all_equipment)
+    model.setObjective(total_margin - total_fixed_cost, sense=COPT.MAXIMIZE)
+    return x, y
+
+
+def build_processing_cost_model(model, data, routes_by_machine=None):
+    """
+    构建 id31 的单位工时加工成本LP模型
+
+    Args:
+        model: COPT模型对象
+        data: 实例数据
+        routes_by_machine: index_routes 的结果；为None时按原脚本方式扫描路径列表
+
+    Returns:
+        x
+    """
+    routes = data["routes"]
+    processing_time = data["processing_time"]
+    processing_cost = data["processing_cost"]
+    machine_hours = data["machine_hours"]
+
+    # 单位路径利润 = 销售价格 - 原料成本 - A阶段加工成本 - B阶段加工成本
+    route_profit = {
+        (p, a, b): data["sell_price"][p] - data["material_cost"][p]
+        - processing_time[p, a] * processing_cost[a]
+        - processing_time[p, b] * processing_cost[b]
+        for p, a, b in routes
+    }
+
+    x = model.addVars(routes, lb=0.0, nameprefix="x")
+    model.setObjective(cp.quicksum(route_profit[r] * x[r] for r in routes), sense=COPT.MAXIMIZE)
+
+    for stage, machines in (("A", data["equipment_A"]), ("B", data["equipment_B"])):
+        for m in machines:
+            machine_routes = _machine_routes(data, routes_by_machine, m, stage)
+            if not machine_routes:
+                continue
+            workload = cp.quicksum(processing_time[route[0], m] * x[route] for route in machine_routes)
+            model.addConstr(workload <= machine_hours[m], name=f"capacity_{stage}_{m}")
+    return x
+
+
+def run_benchmark(sizes, model_kind="fixed", time_limit=60.0, seed=0):
+    """
+    规模基准测试
+
+    Args:
+        sizes: [(产品数, 每阶段设备数), ...]
+        model_kind: "fixed" 对应id27模型，"processing" 对应id31模型
+        time_limit: 每次求解的时间限制 (秒)
+        seed: 随机种子
+
+    Returns:
+        结果行列表
+    """
+    builder = build_fixed_charge_model if model_kind == "fixed" else build_processing_cost_model
+    rows = []
+    env = cp.Envr()
+    try:
+        for num_products, num_machines in sizes:
+            data = generate_instance(num_products, num_machines, num_machines, seed=seed)
+
+            # 扫描方式构建 (原脚本做法)，只计时不求解
+            model = env.createModel("routing_scan")
+            start = time.perf_counter()
+            builder(model, data, None)
+            scan_time = time.perf_counter() - start
+
+            # 索引方式构建并求解
+            model = env.createModel("routing_indexed")
+            model.setParam(COPT.Param.Logging, 0)
+            model.setParam(COPT.Param.TimeLimit, time_limit)
+            start = time.perf_counter()
+            routes_by_machine = index_routes(data["routes"])
+            builder(model, data, routes_by_machine)
+            indexed_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            try:
+                model.solve()
+            except cp.CoptError as e:
+                print(f"COPT Error ({num_products}x{num_machines}): {e.retcode} - {e.message}")
+                continue
+            solve_time = time.perf_counter() - start
+
+            has_solution = model.getAttr(COPT.Attr.HasMipSol) or model.getAttr(COPT.Attr.HasLpSol)
+            rows.append({
+                "products": num_products,
+                "machines_per_stage": num_machines,
+                "routes": len(data["routes"]),
+                "rows": model.getAttr(COPT.Attr.Rows),
+                "cols": model.getAttr(COPT.Attr.Cols),
+                "scan_build_time": round(scan_time, 4),
+                "indexed_build_time": round(indexed_time, 4),
+                "solve_time": round(solve_time, 4),
+                "status": model.status,
+                "objective": round(model.objval, 4) if has_solution else "",
+            })
+    finally:
+        env.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="两阶段设备路径模型规模基准测试")
+    parser.add_argument("--sizes", nargs="+", default=["10x4", "50x10", "100x20", "200x40", "400x80"],
+                        help="实例规模，格式: 产品数x每阶段设备数")
+    parser.add_argument("--model", choices=["fixed", "processing"], default="fixed",
+                        help="fixed: id27固定成本MILP; processing: id31加工成本LP")
+    parser.add_argument("--time-limit", type=float, default=60.0, help="每次求解的时间限制 (秒)")
+    parser.add_argument("--output", default=os.path.join("output", "equipment_routing_benchmark.csv"),
+                        help="结果CSV路径")
+    args = parser.parse_args()
+
+    sizes = [tuple(int(v) for v in size.split("x")) for size in args.sizes]
+    rows = run_benchmark(sizes, args.model, args.time_limit)
+
+    print(f"{'产品数':>6} {'设备数':>6} {'路径数':>8} {'扫描构建(s)':>12} {'索引构建(s)':>12} "
+          f"{'求解(s)':>9} {'目标值':>14}")
+    for row in rows:
+        objective = f"{row['objective']:>14.2f}" if row["objective"] != "" else f"{'-':>14}"
+        print(f"{row['products']:>6} {row['machines_per_stage']:>6} {row['routes']:>8} "
+              f"{row['scan_build_time']:>12.4f} {row['indexed_build_time']:>12.4f} "
+              f"{row['solve_time']:>9.4f} {objective}")
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"\n基准测试结果已保存到 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
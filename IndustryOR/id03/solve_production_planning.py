@@ -7,6 +7,14 @@ import coptpy as cp
 from coptpy import COPT
 import json
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solution_snapshot import save_env_snapshot, snapshot_dir  # noqa: E402
+
+# 批量运行时设置环境变量 INDUSTRYOR_SNAPSHOT=快照目录，解追加到二进制快照，不再写JSON和文本结果文件
+SNAPSHOT_DIR = snapshot_dir()
+
 
 def solve_production_planning():
     """
@@ -160,6 +168,7 @@ def solve_production_planning():
         # 7. 求解模型
         print("\n开始求解模型...")
         model.solve()
+        save_env_snapshot(model)
         
         # 8. 分析求解结果
         results = {}
@@ -320,6 +329,10 @@ def main():
     # 求解问题
     results = solve_production_planning()
     
+    if SNAPSHOT_DIR:
+        print(f"\n解已追加到快照: {SNAPSHOT_DIR}")
+        return
+    
     # 确保output目录存在
     os.makedirs('output', exist_ok=True)
     
@@ -15,12 +15,49 @@
   6. 变量类型：x1, x2, x3 为非负整数
 """
 
+import argparse
+import os
+import sys
+
 import coptpy as cp
 from coptpy import COPT
 
-def solve_farm_optimization():
-    """求解农场动物饲养优化问题"""
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from problem_data import load_arguments, result_path  # noqa: E402
+
+# 动物种类 (牛、羊、鸡)
+ITEMS = ["牛", "羊", "鸡"]
+# 利润系数（售价-成本）
+PROFITS = [400, 120, 3]
+# 资源约束: 粪便处理量、动物总数
+RESOURCES = ["manure", "animals"]
+RESOURCE_LABELS = {"manure": "粪便产量", "animals": "动物总数"}
+WEIGHTS = [
+    [10, 5, 3],  # 牛、羊、鸡的每日粪便产量
+    [1, 1, 1],   # 每只动物占用的名额
+]
+CAPACITIES = [800, 100]
+# 饲养数量上下界: 最小牛数10、最小羊数20、最大鸡数50
+LOWER = [10, 20, 0]
+UPPER = [None, None, 50]
+
+
+def solve_farm_optimization(items=None, profits=None, resources=None, weights=None, capacities=None,
+                            lower=None, upper=None, data_path=None):
+    """
+    求解农场动物饲养优化问题
+
+    Args:
+        items: 动物种类列表，默认为题目数据
+        profits: 各种类的单位利润
+        resources: 资源约束名称列表
+        weights: weights[r][i] 为种类i对资源r的单位占用
+        capacities: 各资源的上限
+        lower / upper: 各种类饲养数量的下界/上界，None表示无界
+        data_path: --data 给出的数据文件，结果写入 result_<数据文件名>.txt (见 problem_data.result_path)
+    """
     
+    result_file = result_path(data_path)
     try:
         # 1. 创建COPT求解环境
         env = cp.Envr()
@@ -29,48 +66,35 @@ def solve_farm_optimization():
         model = env.createModel("farm_optimization")
         
         # 3. 定义问题数据
-        # 利润系数（售价-成本）
-        profits = [400, 120, 3]  # 牛、羊、鸡的单位利润
-        
-        # 粪便产量系数
-        manure = [10, 5, 3]  # 牛、羊、鸡的每日粪便产量
-        
-        # 约束参数
-        max_manure = 800      # 最大粪便处理量
-        max_animals = 100     # 最大动物总数
-        min_cows = 10         # 最小牛数
-        min_sheep = 20        # 最小羊数
-        max_chickens = 50     # 最大鸡数
+        if items is None:
+            items, profits, resources, weights, capacities = ITEMS, PROFITS, RESOURCES, WEIGHTS, CAPACITIES
+            lower, upper = LOWER, UPPER
+        n = len(items)
+        lower = lower or [0] * n
+        upper = upper or [None] * n
         
         # 4. 添加决策变量
-        # x[0] = 牛的数量, x[1] = 羊的数量, x[2] = 鸡的数量
-        x = model.addVars(3, vtype=COPT.INTEGER, lb=0, nameprefix="x")
+        # x[i] = 第i种动物的饲养数量
+        x = model.addVars(n, vtype=COPT.INTEGER, lb=0, nameprefix="x")
         
         # 5. 添加约束条件
-        # 约束1: 粪便处理能力约束
-        model.addConstr(
-            cp.quicksum(manure[i] * x[i] for i in range(3)) <= max_manure,
-            name="manure_constraint"
-        )
+        # 资源约束: 粪便处理能力、动物总数等
+        for r, resource in enumerate(resources):
+            model.addConstr(
+                cp.quicksum(weights[r][i] * x[i] for i in range(n)) <= capacities[r],
+                name=f"{resource}_constraint"
+            )
         
-        # 约束2: 动物总数约束
-        model.addConstr(
-            cp.quicksum(x[i] for i in range(3)) <= max_animals,
-            name="total_animals_constraint"
-        )
-        
-        # 约束3: 最小牛数约束
-        model.addConstr(x[0] >= min_cows, name="min_cows_constraint")
-        
-        # 约束4: 最小羊数约束
-        model.addConstr(x[1] >= min_sheep, name="min_sheep_constraint")
-        
-        # 约束5: 最大鸡数约束
-        model.addConstr(x[2] <= max_chickens, name="max_chickens_constraint")
+        # 数量上下界约束: 最小牛数、最小羊数、最大鸡数等
+        for i in range(n):
+            if lower[i] > 0:
+                model.addConstr(x[i] >= lower[i], name=f"min_{i}_constraint")
+            if upper[i] is not None:
+                model.addConstr(x[i] <= upper[i], name=f"max_{i}_constraint")
         
         # 6. 设置目标函数 - 最大化总利润
         model.setObjective(
-            cp.quicksum(profits[i] * x[i] for i in range(3)),
+            cp.quicksum(profits[i] * x[i] for i in range(n)),
             sense=COPT.MAXIMIZE
         )
         
@@ -83,36 +107,34 @@ def solve_farm_optimization():
             print("\n=== 求解成功：找到最优解 ===")
             
             # 获取最优解
-            optimal_cows = int(round(x[0].x))
-            optimal_sheep = int(round(x[1].x))
-            optimal_chickens = int(round(x[2].x))
+            quantities = [int(round(x[i].x)) for i in range(n)]
             optimal_profit = model.objval
             
             print(f"\n最优饲养方案：")
-            print(f"  牛的数量: {optimal_cows}")
-            print(f"  羊的数量: {optimal_sheep}")
-            print(f"  鸡的数量: {optimal_chickens}")
+            for name, qty in zip(items, quantities):
+                print(f"  {name}的数量: {qty}")
             print(f"  最大总利润: ${optimal_profit:,.2f}")
             
             # 验证约束条件
             print(f"\n约束条件验证：")
-            total_manure = manure[0]*optimal_cows + manure[1]*optimal_sheep + manure[2]*optimal_chickens
-            total_animals = optimal_cows + optimal_sheep + optimal_chickens
-            
-            print(f"  粪便产量: {total_manure} / {max_manure} (约束: <= {max_manure})")
-            print(f"  动物总数: {total_animals} / {max_animals} (约束: <= {max_animals})")
-            print(f"  牛数量: {optimal_cows} (约束: >= {min_cows})")
-            print(f"  羊数量: {optimal_sheep} (约束: >= {min_sheep})")
-            print(f"  鸡数量: {optimal_chickens} (约束: <= {max_chickens})")
+            usage = [sum(weights[r][i] * quantities[i] for i in range(n)) for r in range(len(resources))]
+            for r, resource in enumerate(resources):
+                label = RESOURCE_LABELS.get(resource, resource)
+                print(f"  {label}: {usage[r]:g} / {capacities[r]:g} (约束: <= {capacities[r]:g})")
+            bound_lines = []
+            for i, name in enumerate(items):
+                if lower[i] > 0:
+                    bound_lines.append(f"{name}数量: {quantities[i]} >= {lower[i]:g}")
+                if upper[i] is not None:
+                    bound_lines.append(f"{name}数量: {quantities[i]} <= {upper[i]:g}")
+            for line in bound_lines:
+                print(f"  {line}")
             
             # 计算利润构成
             print(f"\n利润构成：")
-            cow_profit = profits[0] * optimal_cows
-            sheep_profit = profits[1] * optimal_sheep
-            chicken_profit = profits[2] * optimal_chickens
-            print(f"  牛的利润: ${cow_profit:,.2f} ({optimal_cows} × ${profits[0]})")
-            print(f"  羊的利润: ${sheep_profit:,.2f} ({optimal_sheep} × ${profits[1]})")
-            print(f"  鸡的利润: ${chicken_profit:,.2f} ({optimal_chickens} × ${profits[2]})")
+            item_profits = [profits[i] * quantities[i] for i in range(n)]
+            for i, name in enumerate(items):
+                print(f"  {name}的利润: ${item_profits[i]:,.2f} ({quantities[i]} × ${profits[i]})")
             print(f"  总利润: ${optimal_profit:,.2f}")
             
             # MIP求解统计信息
@@ -122,28 +144,27 @@ def solve_farm_optimization():
             print(f"  搜索节点数: {model.getAttr(COPT.Attr.NodeCnt)}")
             
             # 将结果写入文件
-            with open("result.txt", "w", encoding="utf-8") as f:
+            with open(result_file, "w", encoding="utf-8") as f:
                 f.write("=== 农场动物饲养优化问题求解结果 ===\n\n")
                 f.write(f"最优饲养方案：\n")
-                f.write(f"  牛的数量: {optimal_cows}\n")
-                f.write(f"  羊的数量: {optimal_sheep}\n")
-                f.write(f"  鸡的数量: {optimal_chickens}\n")
+                for name, qty in zip(items, quantities):
+                    f.write(f"  {name}的数量: {qty}\n")
                 f.write(f"  最大总利润: ${optimal_profit:,.2f}\n\n")
                 
                 f.write(f"约束条件验证：\n")
-                f.write(f"  粪便产量: {total_manure} / {max_manure} (满足约束)\n")
-                f.write(f"  动物总数: {total_animals} / {max_animals} (满足约束)\n")
-                f.write(f"  牛数量: {optimal_cows} >= {min_cows} (满足约束)\n")
-                f.write(f"  羊数量: {optimal_sheep} >= {min_sheep} (满足约束)\n")
-                f.write(f"  鸡数量: {optimal_chickens} <= {max_chickens} (满足约束)\n\n")
+                for r, resource in enumerate(resources):
+                    label = RESOURCE_LABELS.get(resource, resource)
+                    f.write(f"  {label}: {usage[r]:g} / {capacities[r]:g} (满足约束)\n")
+                for line in bound_lines:
+                    f.write(f"  {line} (满足约束)\n")
+                f.write("\n")
                 
                 f.write(f"利润构成：\n")
-                f.write(f"  牛的利润: ${cow_profit:,.2f}\n")
-                f.write(f"  羊的利润: ${sheep_profit:,.2f}\n")
-                f.write(f"  鸡的利润: ${chicken_profit:,.2f}\n")
+                for i, name in enumerate(items):
+                    f.write(f"  {name}的利润: ${item_profits[i]:,.2f}\n")
                 f.write(f"  总利润: ${optimal_profit:,.2f}\n")
             
-            print(f"\n结果已保存到 result.txt 文件")
+            print(f"\n结果已保存到 {result_file} 文件")
             return optimal_profit
             
         else:
@@ -160,7 +181,7 @@ def solve_farm_optimization():
             status_desc = status_map.get(model.status, "未知状态")
             print(f"状态描述: {status_desc}")
             
-            with open("result.txt", "w", encoding="utf-8") as f:
+            with open(result_file, "w", encoding="utf-8") as f:
                 f.write("=== 农场动物饲养优化问题求解结果 ===\n\n")
                 f.write(f"求解失败！\n")
                 f.write(f"模型状态: {model.status}\n")
@@ -170,14 +191,14 @@ def solve_farm_optimization():
             
     except cp.CoptError as e:
         print(f"COPT错误: {e.retcode} - {e.message}")
-        with open("result.txt", "w", encoding="utf-8") as f:
+        with open(result_file, "w", encoding="utf-8") as f:
             f.write("=== 农场动物饲养优化问题求解结果 ===\n\n")
             f.write(f"COPT错误: {e.retcode} - {e.message}\n")
         return None
         
     except Exception as e:
         print(f"程序执行错误: {e}")
-        with open("result.txt", "w", encoding="utf-8") as f:
+        with open(result_file, "w", encoding="utf-8") as f:
             f.write("=== 农场动物饲养优化问题求解结果 ===\n\n")
             f.write(f"程序执行错误: {e}\n")
         return None
@@ -191,7 +212,14 @@ if __name__ == "__main__":
     print("农场动物饲养优化问题求解器")
     print("=" * 50)
     
-    result = solve_farm_optimization()
+    parser = argparse.ArgumentParser(description="农场动物饲养优化问题")
+    parser.add_argument("--data", default=None, help="knapsack 数据文件 (.json / .npz / CSV目录)，默认使用题目数据")
+    args = parser.parse_args()
+    
+    if args.data:
+        result = solve_farm_optimization(*load_arguments(args.data, "knapsack"), data_path=args.data)
+    else:
+        result = solve_farm_optimization()
     
     if result is not None:
         print(f"\n求解完成！最优目标函数值: ${result:,.2f}")
@@ -1,6 +1,15 @@
 import coptpy as cp
 from coptpy import COPT
 import numpy as np
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solution_snapshot import save_env_snapshot, snapshot_dir  # noqa: E402
+
+# 批量运行时设置环境变量 INDUSTRYOR_SNAPSHOT=快照目录，解追加到二进制快照，不再写文本结果文件
+SNAPSHOT_DIR = snapshot_dir()
+
 
 try:
     # 1. 数据定义
@@ -109,6 +118,8 @@ try:
     # 6. 求解模型
     print("开始求解生产规划问题...")
     model.solve()
+    # 批量运行 (设置了 INDUSTRYOR_SNAPSHOT) 时无论求解状态如何都追加到快照
+    save_env_snapshot(model)
     
     # 7. 分析和输出结果
     if model.status == COPT.OPTIMAL:
@@ -156,47 +167,51 @@ try:
             used_hours = sum(production_hours[i] * P[i, t].x for i in products)
             print(f"季度{t}: {used_hours:.2f} / {max_hours} 小时 (使用率: {used_hours/max_hours*100:.1f}%)")
         
-        # 8. 保存结果到文件
-        with open("/Users/jiale.cheng/Documents/mcp/test/output/detailed_results.txt", "w", encoding="utf-8") as f:
-            f.write("生产规划问题求解结果\n")
-            f.write("="*60 + "\n")
-            f.write(f"最小总成本: {model.objval:.2f} 元\n")
-            f.write(f"库存成本: {total_inv_cost_value:.2f} 元\n")
-            f.write(f"延期交付罚金: {total_back_cost_value:.2f} 元\n\n")
+        if SNAPSHOT_DIR:
+            # 批量运行: 解已追加到二进制快照，不写文本结果文件
+            print(f"\n解已追加到快照: {SNAPSHOT_DIR}")
+        else:
+            # 8. 保存结果到文件
+            with open("/Users/jiale.cheng/Documents/mcp/test/output/detailed_results.txt", "w", encoding="utf-8") as f:
+                f.write("生产规划问题求解结果\n")
+                f.write("="*60 + "\n")
+                f.write(f"最小总成本: {model.objval:.2f} 元\n")
+                f.write(f"库存成本: {total_inv_cost_value:.2f} 元\n")
+                f.write(f"延期交付罚金: {total_back_cost_value:.2f} 元\n\n")
             
-            f.write("生产计划 (P_{it})\n")
-            f.write("-"*60 + "\n")
-            f.write("季度\\产品    产品I      产品II     产品III\n")
-            f.write("-"*60 + "\n")
-            for t in periods:
-                f.write(f"季度{t}      {P[1,t].x:8.2f}   {P[2,t].x:8.2f}   {P[3,t].x:8.2f}\n")
+                f.write("生产计划 (P_{it})\n")
+                f.write("-"*60 + "\n")
+                f.write("季度\\产品    产品I      产品II     产品III\n")
+                f.write("-"*60 + "\n")
+                for t in periods:
+                    f.write(f"季度{t}      {P[1,t].x:8.2f}   {P[2,t].x:8.2f}   {P[3,t].x:8.2f}\n")
             
-            f.write("\n期末库存 (I_{it})\n")
-            f.write("-"*60 + "\n")
-            f.write("季度\\产品    产品I      产品II     产品III\n")
-            f.write("-"*60 + "\n")
-            for t in periods:
-                f.write(f"季度{t}      {I[1,t].x:8.2f}   {I[2,t].x:8.2f}   {I[3,t].x:8.2f}\n")
+                f.write("\n期末库存 (I_{it})\n")
+                f.write("-"*60 + "\n")
+                f.write("季度\\产品    产品I      产品II     产品III\n")
+                f.write("-"*60 + "\n")
+                for t in periods:
+                    f.write(f"季度{t}      {I[1,t].x:8.2f}   {I[2,t].x:8.2f}   {I[3,t].x:8.2f}\n")
             
-            f.write("\n期末积压订单 (B_{it})\n")
-            f.write("-"*60 + "\n")
-            f.write("季度\\产品    产品I      产品II     产品III\n")
-            f.write("-"*60 + "\n")
-            for t in periods:
-                f.write(f"季度{t}      {B[1,t].x:8.2f}   {B[2,t].x:8.2f}   {B[3,t].x:8.2f}\n")
+                f.write("\n期末积压订单 (B_{it})\n")
+                f.write("-"*60 + "\n")
+                f.write("季度\\产品    产品I      产品II     产品III\n")
+                f.write("-"*60 + "\n")
+                for t in periods:
+                    f.write(f"季度{t}      {B[1,t].x:8.2f}   {B[2,t].x:8.2f}   {B[3,t].x:8.2f}\n")
             
-            f.write("\n每季度工时使用情况\n")
-            f.write("-"*60 + "\n")
-            for t in periods:
-                used_hours = sum(production_hours[i] * P[i, t].x for i in products)
-                f.write(f"季度{t}: {used_hours:.2f} / {max_hours} 小时 (使用率: {used_hours/max_hours*100:.1f}%)\n")
+                f.write("\n每季度工时使用情况\n")
+                f.write("-"*60 + "\n")
+                for t in periods:
+                    used_hours = sum(production_hours[i] * P[i, t].x for i in products)
+                    f.write(f"季度{t}: {used_hours:.2f} / {max_hours} 小时 (使用率: {used_hours/max_hours*100:.1f}%)\n")
         
-        # 保存目标函数值到result.txt
-        with open("/Users/jiale.cheng/Documents/mcp/test/result.txt", "w", encoding="utf-8") as f:
-            f.write(f"最优目标函数值: {model.objval:.2f}")
+            # 保存目标函数值到result.txt
+            with open("/Users/jiale.cheng/Documents/mcp/test/result.txt", "w", encoding="utf-8") as f:
+                f.write(f"最优目标函数值: {model.objval:.2f}")
         
-        print(f"\n详细结果已保存到: /Users/jiale.cheng/Documents/mcp/test/output/detailed_results.txt")
-        print(f"目标函数值已保存到: /Users/jiale.cheng/Documents/mcp/test/result.txt")
+            print(f"\n详细结果已保存到: /Users/jiale.cheng/Documents/mcp/test/output/detailed_results.txt")
+            print(f"目标函数值已保存到: /Users/jiale.cheng/Documents/mcp/test/result.txt")
         
     else:
         print(f"\n求解失败！模型状态码: {model.status}")
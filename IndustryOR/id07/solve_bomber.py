@@ -8,79 +8,87 @@
 - 5个港口(热那亚、威尼斯、安科纳、那不勒斯、巴里)
 - 每辆卡车最多运输2个集装箱
 - 运输成本：30欧元/公里 × 距离 × 卡车数量
+
+truck_flow.py 用运输单纯形法构造可行解，作为初始解 (上界) 热启动本模型，最优性由COPT证明。
 """
 
 import coptpy as cp
 from coptpy import COPT
 
+# 问题数据
+# 仓库名称
+WAREHOUSES = ["维罗纳", "佩鲁贾", "罗马", "佩斯卡拉", "塔兰托", "拉默齐亚"]
+# 港口名称
+PORTS = ["热那亚", "威尼斯", "安科纳", "那不勒斯", "巴里"]
+
+# 供应量 (各仓库的空集装箱数量)
+SUPPLY = {
+    "维罗纳": 10,
+    "佩鲁贾": 12,
+    "罗马": 20,
+    "佩斯卡拉": 24,
+    "塔兰托": 18,
+    "拉默齐亚": 40
+}
+
+# 需求量 (各港口的集装箱需求)
+DEMAND = {
+    "热那亚": 20,
+    "威尼斯": 15,
+    "安科纳": 25,
+    "那不勒斯": 33,
+    "巴里": 21
+}
+
+# 距离矩阵 (公里)
+DISTANCE = {
+    ("维罗纳", "热那亚"): 290,
+    ("维罗纳", "威尼斯"): 115,
+    ("维罗纳", "安科纳"): 355,
+    ("维罗纳", "那不勒斯"): 715,
+    ("维罗纳", "巴里"): 810,
+    ("佩鲁贾", "热那亚"): 380,
+    ("佩鲁贾", "威尼斯"): 340,
+    ("佩鲁贾", "安科纳"): 165,
+    ("佩鲁贾", "那不勒斯"): 380,
+    ("佩鲁贾", "巴里"): 610,
+    ("罗马", "热那亚"): 505,
+    ("罗马", "威尼斯"): 530,
+    ("罗马", "安科纳"): 285,
+    ("罗马", "那不勒斯"): 220,
+    ("罗马", "巴里"): 450,
+    ("佩斯卡拉", "热那亚"): 655,
+    ("佩斯卡拉", "威尼斯"): 450,
+    ("佩斯卡拉", "安科纳"): 155,
+    ("佩斯卡拉", "那不勒斯"): 240,
+    ("佩斯卡拉", "巴里"): 315,
+    ("塔兰托", "热那亚"): 1010,
+    ("塔兰托", "威尼斯"): 840,
+    ("塔兰托", "安科纳"): 550,
+    ("塔兰托", "那不勒斯"): 305,
+    ("塔兰托", "巴里"): 95,
+    ("拉默齐亚", "热那亚"): 1072,
+    ("拉默齐亚", "威尼斯"): 1097,
+    ("拉默齐亚", "安科纳"): 747,
+    ("拉默齐亚", "那不勒斯"): 372,
+    ("拉默齐亚", "巴里"): 333
+}
+
+# 参数
+COST_PER_KM = 30  # 每公里30欧元
+TRUCK_CAPACITY = 2  # 每辆卡车最多装载2个集装箱
+
+
 def solve_transportation_problem():
     try:
         # 1. 创建COPT求解环境
         env = cp.Envr()
         model = env.createModel("italian_container_transportation")
 
-        # 2. 定义问题数据
-        # 仓库名称
-        warehouses = ["维罗纳", "佩鲁贾", "罗马", "佩斯卡拉", "塔兰托", "拉默齐亚"]
-        # 港口名称
-        ports = ["热那亚", "威尼斯", "安科纳", "那不勒斯", "巴里"]
-        
-        # 供应量 (各仓库的空集装箱数量)
-        supply = {
-            "维罗纳": 10,
-            "佩鲁贾": 12,
-            "罗马": 20,
-            "佩斯卡拉": 24,
-            "塔兰托": 18,
-            "拉默齐亚": 40
-        }
-        
-        # 需求量 (各港口的集装箱需求)
-        demand = {
-            "热那亚": 20,
-            "威尼斯": 15,
-            "安科纳": 25,
-            "那不勒斯": 33,
-            "巴里": 21
-        }
-        
-        # 距离矩阵 (公里)
-        distance = {
-            ("维罗纳", "热那亚"): 290,
-            ("维罗纳", "威尼斯"): 115,
-            ("维罗纳", "安科纳"): 355,
-            ("维罗纳", "那不勒斯"): 715,
-            ("维罗纳", "巴里"): 810,
-            ("佩鲁贾", "热那亚"): 380,
-            ("佩鲁贾", "威尼斯"): 340,
-            ("佩鲁贾", "安科纳"): 165,
-            ("佩鲁贾", "那不勒斯"): 380,
-            ("佩鲁贾", "巴里"): 610,
-            ("罗马", "热那亚"): 505,
-            ("罗马", "威尼斯"): 530,
-            ("罗马", "安科纳"): 285,
-            ("罗马", "那不勒斯"): 220,
-            ("罗马", "巴里"): 450,
-            ("佩斯卡拉", "热那亚"): 655,
-            ("佩斯卡拉", "威尼斯"): 450,
-            ("佩斯卡拉", "安科纳"): 155,
-            ("佩斯卡拉", "那不勒斯"): 240,
-            ("佩斯卡拉", "巴里"): 315,
-            ("塔兰托", "热那亚"): 1010,
-            ("塔兰托", "威尼斯"): 840,
-            ("塔兰托", "安科纳"): 550,
-            ("塔兰托", "那不勒斯"): 305,
-            ("塔兰托", "巴里"): 95,
-            ("拉默齐亚", "热那亚"): 1072,
-            ("拉默齐亚", "威尼斯"): 1097,
-            ("拉默齐亚", "安科纳"): 747,
-            ("拉默齐亚", "那不勒斯"): 372,
-            ("拉默齐亚", "巴里"): 333
-        }
-        
-        # 参数
-        cost_per_km = 30  # 每公里30欧元
-        truck_capacity = 2  # 每辆卡车最多装载2个集装箱
+        # 2. 问题数据
+        warehouses, ports = WAREHOUSES, PORTS
+        supply, demand, distance = SUPPLY, DEMAND, DISTANCE
+        cost_per_km, truck_capacity = COST_PER_KM, TRUCK_CAPACITY
         
         # 3. 创建所有可能的路线
         routes = [(w, p) for w in warehouses for p in ports]
@@ -122,11 +130,21 @@ def solve_transportation_problem():
         )
         model.setObjective(total_cost, sense=COPT.MINIMIZE)
         
-        # 7. 求解模型
+        # 7. 用 truck_flow 的倍化图可行解热启动 (truck_flow 依赖本模块的数据，在此延迟导入)
+        from truck_flow import heuristic_solution, problem_instance
+        start = heuristic_solution(*problem_instance())
+        if start is not None:
+            # routes 按 仓库×港口 行优先排列，与方案矩阵展平后的顺序一致
+            model.setMipStart([x[r] for r in routes] + [t[r] for r in routes],
+                              start["containers"].ravel().tolist() + start["trucks"].ravel().tolist())
+            model.loadMipStart()
+            print(f"初始解 (上界): {start['objective']:,.2f} 欧元，奇偶松弛下界: {start['lower_bound']:,.2f} 欧元")
+
+        # 8. 求解模型
         print("正在求解模型...")
         model.solve()
         
-        # 8. 分析求解结果
+        # 9. 分析求解结果
         if model.status == COPT.OPTIMAL:
             print("\n" + "="*60)
             print("           意大利集装箱运输优化求解结果")
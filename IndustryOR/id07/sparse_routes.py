@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+集装箱调运问题的稀疏候选路线生成 (k近邻候选图 + 检验数定价)
+
+solve_bomber.py 为全部 仓库×港口 路线建立集装箱变量 x 和卡车变量 t，全国规模的实例变量数随
+仓库数与港口数的乘积增长，而最优方案只用到每个仓库附近的少数港口。本模块:
+
+1. 候选图: 每个仓库取费用最低的 k 个港口，每个港口取费用最低的 k 个仓库
+2. 定价循环: 求解候选路线上的LP松弛，用对偶值计算未加入路线的检验数
+       rc_wp = c_wp / 2 - u_w - v_p
+   (u_w、v_p 为供应、需求约束的对偶值，卡车约束 x <= 2t 的对偶取 -c_wp/2)，
+   把检验数为负的路线加入模型后重新求解，直到没有负检验数，此时候选图上的LP即为完整LP
+3. 整数求解与最优性证明: 候选路线改为整数变量求解得到 Z*。对任一未加入的路线，
+   使用它的整数解满足 x_wp >= 1、t_wp >= 1，由LP对偶可得其目标值不低于
+       LP* + c_wp - (u_w + v_p) - max(0, u_w + v_p)
+   全部未加入路线的这一下界都不低于 Z* 时，Z* 也是完整模型的最优值；
+   路线下界另取 truck_flow.route_lower_bounds 的奇偶松弛界 (比LP松弛紧得多)，两者取大；
+   仍不满足的路线按下界从小到大分批加入模型重新求解，直到证明成立
+4. 稠密回退: 定价或证明需要的路线 (已加入的 + 本轮待加入的) 超过全部路线的 dense_fraction
+   (默认一半) 时，候选图已不能明显缩小模型，逐批加入只会多解若干次受限模型，此时一次加入全部路线，
+   按稠密模型求解 (证明阶段以当前整数解作为初始解)。例如 15×15 随机实例 (种子3) 的路线下界
+   无法排除 106 条未加入路线，直接回退为稠密模型
+
+候选图上LP不可行时 (某些港口的近邻仓库供应不足)，需求约束上带罚系数的缺货变量保证LP可行，
+定价会逐步加入通往缺货港口的路线，而不是一次加入全部路线。
+
+用法:
+    python sparse_routes.py                          # 原题数据 (k=2)，与稠密模型对照
+    python sparse_routes.py --random 40 60 --k 4     # 随机实例 (仓库数 港口数)
+    python sparse_routes.py --random 20 30 --dense   # 同时求解稠密模型进行校验
+"""
+
+import argparse
+import time
+
+import coptpy as cp
+import numpy as np
+from coptpy import COPT
+
+from solve_bomber import TRUCK_CAPACITY
+from truck_flow import problem_instance, random_instance, route_lower_bounds, solve_truck_copt
+
+
+def candidate_routes(cost, k):
+    """每个仓库费用最低的 k 个港口与每个港口费用最低的 k 个仓库的并集"""
+    m, n = cost.shape
+    routes = set()
+    for w, ports in enumerate(np.argsort(cost, axis=1, kind="stable")[:, :k]):
+        routes.update((w, int(p)) for p in ports)
+    for p, warehouses in enumerate(np.argsort(cost, axis=0, kind="stable")[:k].T):
+        routes.update((int(w), p) for w in warehouses)
+    return routes
+
+
+class SparseTransportModel:
+    """
+    只包含部分路线的集装箱调运模型，可以增量加入路线
+
+    供应、需求约束先建立，每加入一条路线就新增 x、t 两列和一行卡车约束。
+    """
+
+    def __init__(self, env, supply, demand, cost):
+        self.supply = np.asarray(supply)
+        self.demand = np.asarray(demand)
+        self.cost = np.asarray(cost, dtype=float)
+        self.model = env.createModel("sparse_container_transportation")
+        self.model.setParam(COPT.Param.Logging, 0)
+        self.model.setObjSense(COPT.MINIMIZE)
+        m, n = self.cost.shape
+        self.supply_constrs = [
+            self.model.addConstr(cp.LinExpr() <= int(self.supply[w]), name=f"supply_{w}") for w in range(m)
+        ]
+        self.demand_constrs = [
+            self.model.addConstr(cp.LinExpr() == int(self.demand[p]), name=f"demand_{p}") for p in range(n)
+        ]
+        self.x = {}
+        self.t = {}
+        self.vtype = COPT.CONTINUOUS
+        # 缺货变量保证候选图上的LP总是可行，罚系数大于任何路线的单箱费用时，缺货非零的需求约束对偶值很大，
+        # 定价会优先加入通往该港口的路线
+        penalty = float(self.cost.max()) * (m + n)
+        self.shortage = [
+            self.model.addVar(lb=0, obj=penalty, name=f"shortage_{p}",
+                              column=cp.Column([self.demand_constrs[p]], [1.0]))
+            for p in range(n)
+        ]
+
+    def add_routes(self, routes):
+        """加入路线 (已存在的路线忽略)，返回实际加入的条数"""
+        added = 0
+        for w, p in routes:
+            if (w, p) in self.x:
+                continue
+            column = cp.Column()
+            column.addTerm(self.supply_constrs[w], 1.0)
+            column.addTerm(self.demand_constrs[p], 1.0)
+            x = self.model.addVar(lb=0, obj=0.0, vtype=self.vtype, name=f"containers_{w}_{p}", column=column)
+            t = self.model.addVar(lb=0, obj=float(self.cost[w, p]), vtype=self.vtype, name=f"trucks_{w}_{p}")
+            self.model.addConstr(x <= TRUCK_CAPACITY * t, name=f"truck_capacity_{w}_{p}")
+            self.x[w, p] = x
+            self.t[w, p] = t
+            added += 1
+        return added
+
+    def densify(self):
+        """加入全部未加入的路线 (退化为稠密模型)，整数阶段以当前整数解作为初始解"""
+        start = None
+        if self.vtype == COPT.INTEGER:
+            start = {key: (var.x, self.t[key].x) for key, var in self.x.items()}
+        self.add_routes([(int(w), int(p)) for w, p in np.argwhere(self.missing_mask())])
+        if start is not None:
+            keys = list(self.x)
+            values = [start.get(key, (0.0, 0.0)) for key in keys]
+            self.model.setMipStart([self.x[key] for key in keys] + [self.t[key] for key in keys],
+                                   [x for x, _ in values] + [t for _, t in values])
+            self.model.loadMipStart()
+
+    def set_integer(self):
+        """把全部路线变量改为整数变量 (之后加入的路线也为整数变量)，并禁止缺货"""
+        self.vtype = COPT.INTEGER
+        for var in self.shortage:
+            var.ub = 0.0
+        for w, p in self.x:
+            self.x[w, p].vtype = COPT.INTEGER
+            self.t[w, p].vtype = COPT.INTEGER
+
+    def duals(self):
+        """供应、需求约束的对偶值"""
+        u = np.array([c.pi for c in self.supply_constrs])
+        v = np.array([c.pi for c in self.demand_constrs])
+        return u, v
+
+    def total_shortage(self):
+        return sum(var.x for var in self.shortage)
+
+    def missing_mask(self):
+        mask = np.ones(self.cost.shape, dtype=bool)
+        for w, p in self.x:
+            mask[w, p] = False
+        return mask
+
+    def solution(self):
+        containers = np.zeros(self.cost.shape, dtype=np.int64)
+        trucks = np.zeros(self.cost.shape, dtype=np.int64)
+        for (w, p), var in self.x.items():
+            containers[w, p] = round(var.x)
+            trucks[w, p] = round(self.t[w, p].x)
+        return containers, trucks
+
+
+def solve_sparse(supply, demand, cost, k=3, batch=None, max_rounds=100, dense_fraction=0.5, verbose=True):
+    """
+    用候选路线 + 定价循环求解集装箱调运问题，并证明结果对完整模型最优
+
+    Args:
+        supply / demand: 各仓库供应量、各港口需求量
+        cost: 每辆卡车的运输费用矩阵 (仓库 × 港口)
+        k: 候选图中每个仓库 (港口) 保留的近邻数
+        batch: 定价、证明每轮最多加入的路线数，默认为 仓库数 + 港口数
+        max_rounds: 定价与证明循环的最大轮数
+        dense_fraction: 需要的路线超过全部路线的该比例时回退为稠密模型 (见模块说明)
+
+    Returns:
+        {"objective", "lp_bound", "proven", "routes", "initial_routes", "dense_routes", "dense_fallback",
+         "pricing_rounds", "proof_rounds", "containers", "trucks", "time"}，模型不可行时返回None
+    """
+    start = time.perf_counter()
+    cost = np.asarray(cost, dtype=float)
+    m, n = cost.shape
+    batch = batch or (m + n)
+    tol = 1e-6 * max(1.0, float(cost.max()))
+    route_limit = dense_fraction * m * n
+
+    env = cp.Envr()
+    try:
+        sparse = SparseTransportModel(env, supply, demand, cost)
+        sparse.add_routes(sorted(candidate_routes(cost, k)))
+        initial = len(sparse.x)
+
+        # 1. LP定价循环
+        pricing_rounds = 0
+        dense_fallback = False
+        while True:
+            sparse.model.solve()
+            if sparse.model.status != COPT.OPTIMAL:
+                return None
+            u, v = sparse.duals()
+            reduced = cost / 2 - u[:, None] - v[None, :]
+            reduced[~sparse.missing_mask()] = np.inf
+            negative = np.argwhere(reduced < -tol)
+            if verbose:
+                print(f"  定价第 {pricing_rounds + 1} 轮: LP = {sparse.model.objval:,.2f}，"
+                      f"路线 {len(sparse.x)}，负检验数路线 {len(negative)}")
+            if len(negative) == 0 or pricing_rounds >= max_rounds:
+                break
+            order = np.argsort(reduced[negative[:, 0], negative[:, 1]], kind="stable")[:batch]
+            if len(sparse.x) + len(order) > route_limit:
+                # 稠密回退: 重新求解完整LP后不再有负检验数
+                sparse.densify()
+                dense_fallback = True
+            else:
+                sparse.add_routes((int(w), int(p)) for w, p in negative[order])
+            pricing_rounds += 1
+        if sparse.total_shortage() > 1e-6 and len(negative) == 0:
+            # 没有负检验数时仍有缺货: 完整模型不可行
+            return None
+        lp_bound = sparse.model.objval
+        lp_complete = len(negative) == 0
+
+        # 2. 整数求解，用LP对偶界与 truck_flow 的奇偶松弛界排除未加入的路线
+        total = u[:, None] + v[None, :]
+        route_bound = lp_bound + cost - total - np.maximum(total, 0.0)
+        relaxation = route_lower_bounds(supply, demand, cost)
+        if relaxation is not None:
+            route_bound = np.maximum(route_bound, relaxation[1])
+        sparse.set_integer()
+        sparse.model.setParam(COPT.Param.RelGap, 0.0)
+        proof_rounds = 0
+        while True:
+            sparse.model.solve()
+            if sparse.model.status != COPT.OPTIMAL:
+                return None
+            objective = sparse.model.objval
+            bound = np.where(sparse.missing_mask(), route_bound, np.inf)
+            unresolved = np.argwhere(bound < objective - tol)
+            if verbose:
+                print(f"  证明第 {proof_rounds + 1} 轮: 整数解 = {objective:,.2f}，"
+                      f"无法排除的未加入路线 {len(unresolved)}")
+            if len(unresolved) == 0 or proof_rounds >= max_rounds:
+                break
+            # 受限模型的整数解可能明显高于完整模型的最优值，按下界从小到大分批加入，避免一次加入大量路线
+            if len(sparse.x) + len(unresolved) > route_limit:
+                # 稠密回退: 路线下界太弱，逐批加入最终也接近稠密模型
+                sparse.densify()
+                dense_fallback = True
+            else:
+                order = np.argsort(bound[unresolved[:, 0], unresolved[:, 1]], kind="stable")[:batch]
+                sparse.add_routes((int(w), int(p)) for w, p in unresolved[order])
+            proof_rounds += 1
+
+        containers, trucks = sparse.solution()
+        return {
+            "objective": objective,
+            "lp_bound": lp_bound,
+            "proven": lp_complete and len(unresolved) == 0,
+            "routes": len(sparse.x),
+            "initial_routes": initial,
+            "dense_routes": m * n,
+            "dense_fallback": dense_fallback,
+            "pricing_rounds": pricing_rounds,
+            "proof_rounds": proof_rounds,
+            "containers": containers,
+            "trucks": trucks,
+            "time": time.perf_counter() - start,
+        }
+    finally:
+        env.close()
+
+
+def report(supply, demand, cost, k, dense):
+    result = solve_sparse(supply, demand, cost, k)
+    if result is None:
+        print("模型无可行解")
+        return None
+    print(f"最小总运输成本: {result['objective']:,.2f} 欧元 (LP下界 {result['lp_bound']:,.2f})")
+    print(f"{'已证明对完整模型最优' if result['proven'] else '未能在轮数限制内完成证明'}，"
+          f"定价 {result['pricing_rounds']} 轮，证明 {result['proof_rounds']} 轮，耗时 {result['time']:.3f} s")
+    share = result["routes"] / result["dense_routes"]
+    if result["dense_fallback"]:
+        print("需要的路线过多，已回退为稠密模型求解")
+    print(f"路线数: 候选图 {result['initial_routes']} → 最终 {result['routes']} / 稠密 {result['dense_routes']} "
+          f"({share:.1%})，变量数 {2 * result['routes']} / {2 * result['dense_routes']}")
+    if dense:
+        start = time.perf_counter()
+        objective = solve_truck_copt(supply, demand, cost)
+        elapsed = time.perf_counter() - start
+        if objective is None:
+            print("稠密模型未求得最优解")
+        else:
+            match = abs(objective - result["objective"]) < 1e-6 * max(1.0, abs(objective))
+            print(f"稠密模型最优值: {objective:,.2f} 欧元 (耗时 {elapsed:.3f} s) {'✓ 一致' if match else '✗ 不一致'}")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="集装箱调运问题的稀疏候选路线求解")
+    parser.add_argument("--random", type=int, nargs=2, metavar=("仓库数", "港口数"), default=None,
+                        help="求解随机实例而不是原题数据")
+    parser.add_argument("--seed", type=int, default=2024, help="随机实例的种子")
+    parser.add_argument("--k", type=int, default=None, help="候选图近邻数 (原题默认2，随机实例默认4)")
+    parser.add_argument("--dense", action="store_true", help="同时求解稠密模型进行校验 (原题数据默认校验)")
+    args = parser.parse_args()
+
+    try:
+        if args.random is None:
+            print("=== 稀疏候选路线求解意大利集装箱调运问题 ===")
+            report(*problem_instance(), k=args.k or 2, dense=True)
+        else:
+            m, n = args.random
+            print(f"=== 随机实例: {m} 个仓库 × {n} 个港口 (种子 {args.seed}) ===")
+            report(*random_instance(m, n, args.seed), k=args.k or 4, dense=args.dense)
+    except cp.CoptError as e:
+        print(f"COPT Error: {e.retcode} - {e.message}")
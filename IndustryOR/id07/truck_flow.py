@@ -0,0 +1,586 @@
+#!/usr/bin/env python3
+"""
+集装箱调运问题的运输单纯形法热启动 (倍化图可行解 + 奇偶松弛下界)
+
+solve_bomber.py 中的整数规划
+    min  sum c_wp * t_wp
+    s.t. sum_p x_wp <= s_w,  sum_w x_wp = d_p,  x_wp <= 2 t_wp,  x, t 为非负整数
+等价于 min sum c_wp * ceil(x_wp / 2): 偶数流量的路线全部是整车，奇数流量的路线恰有一辆单箱车。
+卡车取整的奇偶性使它不是单纯的网络流问题，本模块只为COPT求解的整数规划提供初始解 (上界) 和下界，
+最优值一律由COPT证明 (solve_bomber.py 与 solve_truck_copt)。
+
+下界松弛 (容器单位的运输问题): 路线按半车计费 c_wp / 2；需求为奇数的港口新增一列"单箱需求"
+(需求1)，原港口列的需求减1；供应为奇数的仓库同样拆出一行"单箱供应" (供应1，可经松弛列闲置)。
+涉及单箱行或单箱列的格按整车计费 c_wp。任意整数可行解在每个奇数港口、每个满载的奇数仓库
+都至少有一条奇数流量的路线，从中拆出一箱作为单箱车，其余流量按半车计费，费用不增加，
+因此松弛最优值是原问题的下界。sparse_routes.py 用它的位势排除未加入的路线 (route_lower_bounds)。
+
+倍化图上界: 固定各奇数港口单箱车的来源仓库，剩余需求全部为偶数，以卡车为单位
+(供应 floor((s_w - 单箱数)/2)，需求 (d_p - 单箱)/2，单位费用 c_wp) 再解一次运输问题，
+卡车单位的数据为整数，基本最优解天然为整数，加上单箱车即为可行解。
+再按卡车运输问题的位势调整单箱车来源 (见 _paired_solution)。该可行解不保证最优，
+例如 15×15 随机实例 (种子3) 上为 982,080 欧元，COPT 证明的最优值为 977,640 欧元，
+因此只作为 setMipStart 的初始解。
+
+运输问题用 numpy 向量化的运输单纯形法 (MODI) 求解: 最小元素法构造初始基，生成树上计算位势，
+按行分块计算检验数并选取最负者入基，退出基后只更新被切下子树的位势。
+供应超过需求时增加费用为0的松弛列。
+
+用法:
+    python truck_flow.py                        # 原题数据: 初始解、下界与COPT最优值
+    python truck_flow.py --random 15 15 --seed 3
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from solve_bomber import COST_PER_KM, DEMAND, DISTANCE, PORTS, SUPPLY, TRUCK_CAPACITY, WAREHOUSES
+
+
+def _initial_basis(supply, demand, cost, upper):
+    """
+    最小元素法构造初始基本可行解，再用流量为0的格补足生成树
+
+    最后一行/列为人工行列: 受容量限制无法分配的供应和需求经人工格 (大M费用) 平衡。
+
+    Returns:
+        (基变量 {(i, j): 流量}, 处于上界的非基格集合)
+    """
+    m, n = cost.shape
+    order = np.argsort(cost, axis=None, kind="stable")
+    rows, cols = np.divmod(order, n)
+    rows, cols = rows.tolist(), cols.tolist()
+    a = supply.copy()
+    b = demand.copy()
+
+    # 并查集，节点 0..m-1 为行，m..m+n-1 为列
+    parent = list(range(m + n))
+
+    def find(k):
+        while parent[k] != k:
+            parent[k] = parent[parent[k]]
+            k = parent[k]
+        return k
+
+    basis = {}
+    at_upper = set()
+    remaining = int(b[:-1].sum())
+    art_row, art_col = m - 1, n - 1
+    for i, j in zip(rows, cols):
+        if remaining == 0:
+            break
+        if i == art_row or j == art_col or a[i] == 0 or b[j] == 0:
+            continue
+        q = min(a[i], b[j])
+        cap = upper.get((i, j))
+        if cap is not None and cap < q:
+            if cap > 0:
+                at_upper.add((i, j))
+                a[i] -= cap
+                b[j] -= cap
+                remaining -= cap
+            continue
+        a[i] -= q
+        b[j] -= q
+        remaining -= q
+        basis[i, j] = int(q)
+        parent[find(i)] = find(m + j)
+
+    # 剩余的供应和需求经人工行列平衡
+    shortage = int(b[:-1].sum())
+    if shortage:
+        a[art_row] += shortage
+        b[art_col] += shortage
+    for j in np.flatnonzero(b[:-1]).tolist():
+        basis[art_row, j] = int(b[j])
+        parent[find(art_row)] = find(m + j)
+    for i in np.flatnonzero(a[:-1]).tolist():
+        basis[i, art_col] = int(a[i])
+        parent[find(i)] = find(m + art_col)
+
+    # 退化: 用流量为0的格把其余连通分量接到第0行所在的分量上
+    # (先接含列节点的分量，其余只含行节点的分量再接到任一列上)
+    groups = {}
+    for k in range(m + n):
+        groups.setdefault(find(k), []).append(k)
+    main = find(0)
+    others = sorted((g for root, g in groups.items() if root != main), key=lambda g: g[-1] < m)
+    for group in others:
+        col = next((k - m for k in group if k >= m and (0, k - m) not in at_upper), None)
+        if col is not None:
+            basis[0, col] = 0
+        else:
+            row = group[0]
+            basis[row, next(j for j in range(n) if (row, j) not in at_upper)] = 0
+    return basis, at_upper
+
+
+def transportation_simplex(supply, demand, cost, upper=None, block_cells=65536, max_iter=None):
+    """
+    带界运输单纯形法 (MODI) 求解
+        min sum c_ij x_ij,  sum_j x_ij <= s_i,  sum_i x_ij = d_j,  0 <= x_ij <= u_ij
+
+    Args:
+        supply: 各供应点供应量 (整数)
+        demand: 各需求点需求量 (整数)，总和不超过总供应量
+        cost: m×n 单位费用矩阵，费用为 inf 的格不允许有流量
+        upper: 可选的格容量 {(i, j): u_ij}，未列出的格不限容量
+        block_cells: 每次定价检查的格数 (按整行分块)
+        max_iter: 最大主元次数，None 表示不限
+
+    Returns:
+        {"objective", "flow": m×n 整数矩阵, "u": 行位势, "v": 列位势, "iterations"}，
+        位势满足 c_ij - u_i - v_j >= 0 (处于上界的格 <= 0) 且 u_i <= 0；问题不可行时返回None
+    """
+    supply = np.asarray(supply, dtype=np.int64)
+    demand = np.asarray(demand, dtype=np.int64)
+    cost = np.asarray(cost, dtype=np.float64)
+    upper = dict(upper or {})
+    m, n = cost.shape
+    surplus = int(supply.sum() - demand.sum())
+    if surplus < 0:
+        return None
+
+    # 扩展矩阵: 第n列为松弛列 (费用0)，最后一行/列为人工行列 (大M费用，仅在容量冲突时使用)
+    finite = np.isfinite(cost)
+    scale = float(np.abs(cost[finite]).max()) if finite.any() else 1.0
+    big = scale * (float(supply.sum()) + 1.0) + 1.0
+    m1, n2 = m + 1, n + 2
+    C = np.full((m1, n2), big)
+    C[:m, :n] = np.where(finite, cost, big)
+    C[:m, n] = 0.0
+    C[m, n] = 0.0
+    s = np.append(supply, 0)
+    b = np.concatenate([demand, [surplus, 0]])
+    N = m1 + n2
+
+    basis, at_upper = _initial_basis(s, b, C, upper)
+    adj = [[] for _ in range(N)]
+    for i, j in basis:
+        adj[i].append(m1 + j)
+        adj[m1 + j].append(i)
+    upper_mask = np.zeros((m1, n2), dtype=bool)
+    for i, j in at_upper:
+        upper_mask[i, j] = True
+
+    pot = np.zeros(N)
+    parent = [-1] * N
+    depth = [0] * N
+
+    def edge_cost(p, q):
+        return C[p, q - m1] if p < m1 else C[q, p - m1]
+
+    def hang(start, anchor):
+        """以 anchor 为父节点重新计算 start 所在子树的父指针、深度和位势"""
+        parent[start] = anchor
+        depth[start] = depth[anchor] + 1 if anchor >= 0 else 0
+        pot[start] = edge_cost(start, anchor) - pot[anchor] if anchor >= 0 else 0.0
+        stack = [start]
+        while stack:
+            p = stack.pop()
+            for q in adj[p]:
+                if q != parent[p]:
+                    parent[q] = p
+                    depth[q] = depth[p] + 1
+                    pot[q] = edge_cost(p, q) - pot[p]
+                    stack.append(q)
+
+    hang(m1 + n, -1)  # 以松弛列为根，位势 v_slack = 0
+
+    rows_per_block = max(1, block_cells // n2)
+    blocks = [(r, min(m1, r + rows_per_block)) for r in range(0, m1, rows_per_block)]
+    block = 0
+    clean = 0
+    iterations = 0
+    eps = 1e-9 * max(1.0, scale)
+    while clean < len(blocks):
+        if max_iter is not None and iterations >= max_iter:
+            break
+        # 定价: 下界格检验数 < 0 或上界格检验数 > 0 即可入基
+        r0, r1 = blocks[block]
+        reduced = C[r0:r1] - pot[r0:r1, None] - pot[None, m1:]
+        if at_upper:
+            reduced[upper_mask[r0:r1]] = 0.0
+        k = int(np.argmin(reduced))
+        violation = -reduced.flat[k]
+        i, j = r0 + k // n2, k % n2
+        direction = 1
+        for cell in at_upper:
+            r = C[cell] - pot[cell[0]] - pot[m1 + cell[1]]
+            if r > violation:
+                violation, (i, j), direction = r, cell, -1
+        if violation <= eps:
+            clean += 1
+            block = (block + 1) % len(blocks)
+            continue
+        clean = 0
+        iterations += 1
+
+        # 生成树上从行节点 i 到列节点 m1+j 的路径
+        x, y = i, m1 + j
+        left, right = [x], [y]
+        while depth[x] > depth[y]:
+            x = parent[x]
+            left.append(x)
+        while depth[y] > depth[x]:
+            y = parent[y]
+            right.append(y)
+        while x != y:
+            x = parent[x]
+            left.append(x)
+            y = parent[y]
+            right.append(y)
+        path = left + right[-2::-1]
+        keys = [(p, q - m1) if p < m1 else (q, p - m1) for p, q in zip(path, path[1:])]
+
+        # 入基格变化 direction*θ，路径上的边交替 -direction*θ、+direction*θ
+        theta = upper.get((i, j), math.inf)
+        leave = None
+        for t, key in enumerate(keys):
+            sign = -direction if t % 2 == 0 else direction
+            limit = basis[key] if sign < 0 else upper.get(key, math.inf) - basis[key]
+            if limit < theta:
+                theta, leave = limit, t
+        for t, key in enumerate(keys):
+            basis[key] += (-direction if t % 2 == 0 else direction) * theta
+
+        if leave is None:
+            # 入基格直接移到另一个界，基不变
+            if direction > 0:
+                at_upper.add((i, j))
+            else:
+                at_upper.discard((i, j))
+            upper_mask[i, j] = direction > 0
+            continue
+
+        if direction < 0:
+            at_upper.discard((i, j))
+            upper_mask[i, j] = False
+            basis[i, j] = upper[i, j] - theta
+        else:
+            basis[i, j] = theta
+        key = keys[leave]
+        if basis.pop(key) > 0:
+            at_upper.add(key)
+            upper_mask[key] = True
+        p, q = path[leave], path[leave + 1]
+        adj[p].remove(q)
+        adj[q].remove(p)
+        adj[i].append(m1 + j)
+        adj[m1 + j].append(i)
+        # 出基边的下端所在子树被切下，经入基格重新挂到树上
+        if leave < len(left) - 1:
+            hang(i, m1 + j)
+        else:
+            hang(m1 + j, i)
+
+    full = np.zeros((m1, n2), dtype=np.int64)
+    for (i, j), f in basis.items():
+        full[i, j] = f
+    for i, j in at_upper:
+        full[i, j] = upper[i, j]
+    if np.any(full[C >= big] > 0):
+        return None
+    flow = full[:m, :n]
+    return {
+        "objective": float((C[:m, :n] * flow).sum()),
+        "flow": flow,
+        "u": pot[:m].copy(),
+        "v": pot[m1:m1 + n].copy(),
+        "iterations": iterations,
+    }
+
+
+def truck_cost(flow, cost):
+    """按 ceil(x/2) 辆卡车计费的总成本"""
+    return float((cost * ((flow + 1) // 2)).sum())
+
+
+def _relaxation(supply, demand, cost):
+    """
+    求解下界松弛 (见模块说明)
+
+    Returns:
+        (运输问题结果, 松弛费用矩阵, 单箱行对应的仓库, 单箱列对应的港口)，总供应不足时返回None
+    """
+    m, n = cost.shape
+    odd_ports = np.flatnonzero(demand % 2)
+    odd_warehouses = np.flatnonzero(supply % 2)
+    k, l = len(odd_warehouses), len(odd_ports)
+    lp_cost = np.empty((m + k, n + l))
+    lp_cost[:m, :n] = cost / 2
+    lp_cost[:m, n:] = cost[:, odd_ports]
+    lp_cost[m:, :n] = cost[odd_warehouses]
+    lp_cost[m:, n:] = cost[np.ix_(odd_warehouses, odd_ports)]
+    result = transportation_simplex(
+        np.concatenate([supply - supply % 2, np.ones(k, dtype=np.int64)]),
+        np.concatenate([demand - demand % 2, np.ones(l, dtype=np.int64)]),
+        lp_cost,
+    )
+    if result is None:
+        return None
+    return result, lp_cost, odd_warehouses, odd_ports
+
+
+def route_lower_bounds(supply, demand, cost):
+    """
+    下界松弛的最优值，以及使用各路线 (x_wp >= 1) 的任意可行解的目标值下界
+
+    使用路线 (w, p) 的可行解映射到下界松弛后，该路线对应的格 (整车格、单箱行/列格) 中至少一个
+    有流量，由运输问题的位势得到 目标值 >= 松弛最优值 + 这些格检验数的最小值。
+
+    Returns:
+        (松弛最优值, 仓库×港口 下界矩阵)，总供应不足时返回None
+    """
+    supply = np.asarray(supply, dtype=np.int64)
+    demand = np.asarray(demand, dtype=np.int64)
+    cost = np.asarray(cost, dtype=np.float64)
+    m, n = cost.shape
+    solved = _relaxation(supply, demand, cost)
+    if solved is None:
+        return None
+    result, lp_cost, odd_warehouses, odd_ports = solved
+    reduced = lp_cost - result["u"][:, None] - result["v"][None, :]
+    route_min = reduced[:m, :n].copy()
+    np.minimum.at(route_min, (slice(None), odd_ports), reduced[:m, n:])
+    route_min[odd_warehouses] = np.minimum(route_min[odd_warehouses], reduced[m:, :n])
+    block = np.minimum(route_min[np.ix_(odd_warehouses, odd_ports)], reduced[m:, n:])
+    route_min[np.ix_(odd_warehouses, odd_ports)] = block
+    return result["objective"], result["objective"] + np.maximum(route_min, 0.0)
+
+
+def _paired_solution(supply, demand, cost, containers, rounds=20, deadline=None):
+    """
+    倍化图上界: 保留方案中各奇数港口的一辆单箱车，其余需求以卡车为单位重新求解运输问题
+
+    仓库扣除单箱车后剩余的集装箱为奇数时，多出的一箱装不满整车。用卡车运输问题的位势估计
+    改换单箱车来源的收益: 单箱车移到剩余为奇数的仓库不占用整车能力，移出剩余为奇数的仓库
+    可多派一辆整车。每轮按估计收益改换来源后重新求解，总成本不再下降或超过 deadline 时停止。
+
+    Returns:
+        集装箱方案矩阵，卡车单位的供应不足时返回None
+    """
+    odd_ports = np.flatnonzero(demand % 2)
+    source = np.empty(len(odd_ports), dtype=np.int64)
+    for k, p in enumerate(odd_ports):
+        odd_routes = np.flatnonzero(containers[:, p] % 2)
+        source[k] = odd_routes[np.argmin(cost[odd_routes, p])]
+    truck_demand = (demand - demand % 2) // 2
+
+    def evaluate(source):
+        singles = np.zeros(cost.shape, dtype=np.int64)
+        singles[source, odd_ports] = 1
+        result = transportation_simplex((supply - singles.sum(axis=1)) // 2, truck_demand, cost)
+        if result is None:
+            return None, None, None
+        solution = 2 * result["flow"] + singles
+        return truck_cost(solution, cost), solution, -result["u"]
+
+    best, solution, value = evaluate(source)
+    if best is None:
+        return None
+    for _ in range(rounds):
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        leftover = supply - np.bincount(source, minlength=len(supply))
+        candidate = source.copy()
+        gains = []
+        for k, p in enumerate(odd_ports):
+            w = candidate[k]
+            # 改换来源的估计费用变化: 单箱运费差 + 新仓库损失的整车能力 - 原仓库释放的整车能力
+            delta = cost[:, p] - cost[w, p] + value * (leftover % 2 == 0) - value[w] * (leftover[w] % 2)
+            delta[w] = 0.0
+            target = int(np.argmin(delta))
+            if delta[target] < -1e-9:
+                gains.append((delta[target], k, target))
+        if not gains:
+            break
+        gains.sort()
+        # 估计只在当前基附近有效，改换过多时逐次减半
+        count = len(gains)
+        improved = False
+        while count and (deadline is None or time.perf_counter() <= deadline):
+            candidate = source.copy()
+            leftover = supply - np.bincount(source, minlength=len(supply))
+            for _, k, target in gains[:count]:
+                w = candidate[k]
+                if leftover[target] % 2 == 0 and leftover[target] < 2:
+                    continue
+                candidate[k] = target
+                leftover[w] += 1
+                leftover[target] -= 1
+            objective, candidate_solution, candidate_value = evaluate(candidate)
+            if objective is not None and objective < best - 1e-6:
+                best, solution, value, source = objective, candidate_solution, candidate_value, candidate
+                improved = True
+                break
+            count //= 2
+        if not improved:
+            break
+    return solution
+
+
+
+def heuristic_solution(supply, demand, cost, time_limit=None):
+    """
+    倍化图可行解与奇偶松弛下界，作为COPT整数规划的初始解 (不保证最优)
+
+    Args:
+        supply: 各仓库供应量
+        demand: 各港口需求量
+        cost: 每辆卡车的运输费用矩阵 (仓库 × 港口)
+        time_limit: 调整单箱车来源的时限 (秒)，None 表示不限
+
+    Returns:
+        {"objective", "lower_bound", "containers", "trucks", "time"}，containers / trucks 为
+        仓库×港口 整数矩阵；总供应不足时返回None
+    """
+    start = time.perf_counter()
+    supply = np.asarray(supply, dtype=np.int64)
+    demand = np.asarray(demand, dtype=np.int64)
+    cost = np.asarray(cost, dtype=np.float64)
+    m, n = cost.shape
+    solved = _relaxation(supply, demand, cost)
+    if solved is None:
+        return None
+    result, _, odd_warehouses, odd_ports = solved
+    # 松弛解映射回原问题 (单箱行/列的流量并入对应的仓库、港口) 即为可行解
+    flow = result["flow"]
+    containers = flow[:m, :n].copy()
+    containers[:, odd_ports] += flow[:m, n:]
+    containers[odd_warehouses] += flow[m:, :n]
+    containers[np.ix_(odd_warehouses, odd_ports)] += flow[m:, n:]
+    deadline = None if time_limit is None else start + time_limit
+    paired = _paired_solution(supply, demand, cost, containers, deadline=deadline)
+    if paired is not None and truck_cost(paired, cost) < truck_cost(containers, cost):
+        containers = paired
+    lower_bound = result["objective"]
+    if np.all(cost == np.round(cost)):
+        # 费用为整数时最优值为整数，下界可以向上取整
+        lower_bound = math.ceil(lower_bound - 1e-6)
+    return {
+        "objective": truck_cost(containers, cost),
+        "lower_bound": lower_bound,
+        "containers": containers,
+        "trucks": (containers + 1) // 2,
+        "time": time.perf_counter() - start,
+    }
+
+
+def solve_truck_copt(supply, demand, cost, warm_start=True, time_limit=None):
+    """
+    用COPT求解 solve_bomber.py 中的整数规划
+
+    Args:
+        warm_start: 是否用 heuristic_solution 的可行解作为初始解 (上界)
+        time_limit: COPT求解时限 (秒)，None 表示不限
+
+    Returns:
+        最优值，未证明最优时返回None
+    """
+    import coptpy as cp
+    from coptpy import COPT
+
+    m, n = len(supply), len(demand)
+    env = cp.Envr()
+    try:
+        model = env.createModel("container_transport_check")
+        model.setParam(COPT.Param.Logging, 0)
+        if time_limit is not None:
+            model.setParam(COPT.Param.TimeLimit, time_limit)
+        routes = [(w, p) for w in range(m) for p in range(n)]
+        x = model.addVars(routes, vtype=COPT.INTEGER, lb=0, nameprefix="containers")
+        t = model.addVars(routes, vtype=COPT.INTEGER, lb=0, nameprefix="trucks")
+        for w in range(m):
+            model.addConstr(cp.quicksum(x[w, p] for p in range(n)) <= int(supply[w]))
+        for p in range(n):
+            model.addConstr(cp.quicksum(x[w, p] for w in range(m)) == int(demand[p]))
+        for w, p in routes:
+            model.addConstr(x[w, p] <= TRUCK_CAPACITY * t[w, p])
+        model.setObjective(cp.quicksum(float(cost[w][p]) * t[w, p] for w, p in routes), sense=COPT.MINIMIZE)
+        if warm_start:
+            start = heuristic_solution(supply, demand, cost)
+            if start is not None:
+                # routes 按 仓库×港口 行优先排列，与方案矩阵展平后的顺序一致
+                model.setMipStart([x[r] for r in routes] + [t[r] for r in routes],
+                                  start["containers"].ravel().tolist() + start["trucks"].ravel().tolist())
+                model.loadMipStart()
+        model.solve()
+        return model.objval if model.status == COPT.OPTIMAL else None
+    finally:
+        env.close()
+
+
+def verify_solution(supply, demand, cost, result):
+    """检查供需约束和卡车数，并核对目标值"""
+    x = result["containers"]
+    if np.any(x < 0) or np.any(x.sum(axis=1) > supply) or np.any(x.sum(axis=0) != demand):
+        return False
+    if np.any(x > TRUCK_CAPACITY * result["trucks"]):
+        return False
+    return abs(float((cost * result["trucks"]).sum()) - result["objective"]) < 1e-6
+
+
+def random_instance(num_warehouses, num_ports, seed=2024, extent=1000.0):
+    """
+    随机实例: 仓库和港口均匀分布在 extent×extent 公里的区域内，总供应量约为总需求量的1.2倍
+
+    Returns:
+        (supply, demand, cost)，cost 为每车费用 (30欧元/公里 × 取整后的距离)
+    """
+    rng = np.random.default_rng(seed)
+    warehouses = rng.uniform(0, extent, size=(num_warehouses, 2))
+    ports = rng.uniform(0, extent, size=(num_ports, 2))
+    distance = np.rint(np.linalg.norm(warehouses[:, None, :] - ports[None, :, :], axis=2)) + 1
+    demand = rng.integers(5, 40, size=num_ports)
+    weights = rng.uniform(0.5, 1.5, size=num_warehouses)
+    supply = np.floor(weights / weights.sum() * demand.sum() * 1.2).astype(np.int64) + 1
+    return supply, demand, COST_PER_KM * distance
+
+
+def problem_instance():
+    """solve_bomber.py 中的原题数据"""
+    supply = np.array([SUPPLY[w] for w in WAREHOUSES])
+    demand = np.array([DEMAND[p] for p in PORTS])
+    cost = np.array([[COST_PER_KM * DISTANCE[w, p] for p in PORTS] for w in WAREHOUSES], dtype=float)
+    return supply, demand, cost
+
+
+def report(supply, demand, cost, time_limit=None):
+    result = heuristic_solution(supply, demand, cost)
+    if result is None:
+        print("总供应量不足，问题不可行")
+        return None
+    print(f"初始解 (倍化图可行解): {result['objective']:,.2f} 欧元，耗时 {result['time']:.3f} s，"
+          f"约束验证 {'✓' if verify_solution(supply, demand, cost, result) else '✗'}")
+    print(f"奇偶松弛下界: {result['lower_bound']:,.2f} 欧元")
+    start = time.perf_counter()
+    objective = solve_truck_copt(supply, demand, cost, time_limit=time_limit)
+    elapsed = time.perf_counter() - start
+    if objective is None:
+        print("COPT 未在时限内证明最优")
+    else:
+        gap = (result["objective"] - objective) / max(1.0, abs(objective))
+        print(f"COPT 最优值 (以初始解热启动): {objective:,.2f} 欧元，耗时 {elapsed:.3f} s，"
+              f"初始解与最优值相差 {gap:.4%}")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="集装箱调运问题的运输单纯形法热启动")
+    parser.add_argument("--random", type=int, nargs=2, metavar=("仓库数", "港口数"), default=None,
+                        help="求解随机实例而不是原题数据")
+    parser.add_argument("--seed", type=int, default=2024, help="随机实例的种子")
+    parser.add_argument("--time-limit", type=float, default=None, help="COPT求解时限 (秒)")
+    args = parser.parse_args()
+
+    if args.random is None:
+        print("=== 意大利集装箱调运问题: 运输单纯形法初始解 + COPT ===")
+        report(*problem_instance(), time_limit=args.time_limit)
+    else:
+        m, n = args.random
+        print(f"=== 随机实例: {m} 个仓库 × {n} 个港口 (种子 {args.seed}) ===")
+        report(*random_instance(m, n, args.seed), time_limit=args.time_limit)
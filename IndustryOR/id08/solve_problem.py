@@ -4,11 +4,42 @@
 目标：最小化总工时
 """
 
+import argparse
+import os
+import sys
+
 import coptpy as cp
 from coptpy import COPT
 
-def solve_assignment_problem():
-    """求解非均衡指派问题"""
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from problem_data import load_arguments, result_path  # noqa: E402
+
+# 工人集合 (I, II, III, IV, V)
+WORKERS = ['I', 'II', 'III', 'IV', 'V']
+# 任务集合 (A, B, C, D)
+TASKS = ['A', 'B', 'C', 'D']
+
+# 成本矩阵 c_ij: 工人i完成任务j所需的时间(小时)
+# 按照problem.md中的表格数据
+COST_MATRIX = {
+    ('I', 'A'): 9,   ('I', 'B'): 4,   ('I', 'C'): 3,   ('I', 'D'): 7,
+    ('II', 'A'): 4,  ('II', 'B'): 6,  ('II', 'C'): 5,  ('II', 'D'): 6,
+    ('III', 'A'): 5, ('III', 'B'): 4, ('III', 'C'): 7, ('III', 'D'): 5,
+    ('IV', 'A'): 7,  ('IV', 'B'): 5,  ('IV', 'C'): 2,  ('IV', 'D'): 3,
+    ('V', 'A'): 10,  ('V', 'B'): 6,   ('V', 'C'): 7,   ('V', 'D'): 4
+}
+
+
+def solve_assignment_problem(workers=None, tasks=None, cost_matrix=None, data_path=None):
+    """
+    求解非均衡指派问题
+
+    Args:
+        workers: 工人列表，默认为题目数据
+        tasks: 任务列表 (数量不超过工人数)
+        cost_matrix: {(工人, 任务): 工时}
+        data_path: --data 给出的数据文件，结果写入 result_<数据文件名>.txt (见 problem_data.result_path)
+    """
     try:
         # 1. 创建COPT求解环境
         env = cp.Envr()
@@ -17,20 +48,9 @@ def solve_assignment_problem():
         model = env.createModel("unbalanced_assignment_problem")
         
         # 3. 定义问题数据
-        # 工人集合 (I, II, III, IV, V)
-        workers = ['I', 'II', 'III', 'IV', 'V']
-        # 任务集合 (A, B, C, D) 
-        tasks = ['A', 'B', 'C', 'D']
-        
-        # 成本矩阵 c_ij: 工人i完成任务j所需的时间(小时)
-        # 按照problem.md中的表格数据
-        cost_matrix = {
-            ('I', 'A'): 9,   ('I', 'B'): 4,   ('I', 'C'): 3,   ('I', 'D'): 7,
-            ('II', 'A'): 4,  ('II', 'B'): 6,  ('II', 'C'): 5,  ('II', 'D'): 6,
-            ('III', 'A'): 5, ('III', 'B'): 4, ('III', 'C'): 7, ('III', 'D'): 5,
-            ('IV', 'A'): 7,  ('IV', 'B'): 5,  ('IV', 'C'): 2,  ('IV', 'D'): 3,
-            ('V', 'A'): 10,  ('V', 'B'): 6,   ('V', 'C'): 7,   ('V', 'D'): 4
-        }
+        workers = WORKERS if workers is None else workers
+        tasks = TASKS if tasks is None else tasks
+        cost_matrix = COST_MATRIX if cost_matrix is None else cost_matrix
         
         # 4. 添加决策变量
         # x_ij: 二元变量，如果指派工人i去完成任务j，则x_ij=1，否则x_ij=0
@@ -94,12 +114,13 @@ def solve_assignment_problem():
             
             # 验证结果
             print("\n=== 方案验证 ===")
-            print(f"分配的工人数量: {len(assigned_workers)}/4 (需要4名)")
-            print(f"未分配的工人数量: {len(unassigned_workers)}/1 (预期1名)")
-            print(f"所有任务是否都被分配: {'是' if len(assigned_workers) == 4 else '否'}")
+            idle = len(workers) - len(tasks)
+            print(f"分配的工人数量: {len(assigned_workers)}/{len(tasks)} (需要{len(tasks)}名)")
+            print(f"未分配的工人数量: {len(unassigned_workers)}/{idle} (预期{idle}名)")
+            print(f"所有任务是否都被分配: {'是' if len(assigned_workers) == len(tasks) else '否'}")
             
             # 保存结果到文件
-            with open('result.txt', 'w', encoding='utf-8') as f:
+            with open(result_path(data_path), 'w', encoding='utf-8') as f:
                 f.write("非均衡指派问题求解结果\n")
                 f.write("="*30 + "\n")
                 f.write(f"最优目标函数值: {model.objval:.0f} 小时\n\n")
@@ -111,7 +132,7 @@ def solve_assignment_problem():
                 f.write(f"\n未分配的工人: {', '.join(unassigned_workers)}\n")
                 f.write(f"总工时: {total_time} 小时\n")
             
-            print(f"\n结果已保存到 result.txt 文件")
+            print(f"\n结果已保存到 {result_path(data_path)} 文件")
             
             return model.objval
             
@@ -138,7 +159,14 @@ def solve_assignment_problem():
             env.close()
 
 if __name__ == "__main__":
-    result = solve_assignment_problem()
+    parser = argparse.ArgumentParser(description="非均衡指派问题")
+    parser.add_argument("--data", default=None, help="assignment 数据文件 (.json / .npz / CSV目录)，默认使用题目数据")
+    args = parser.parse_args()
+    
+    if args.data:
+        result = solve_assignment_problem(*load_arguments(args.data, "assignment"), data_path=args.data)
+    else:
+        result = solve_assignment_problem()
     if result is not None:
         print(f"\n求解完成，最优总工时为: {result:.0f} 小时")
     else:
@@ -12,6 +12,13 @@
 import coptpy as cp
 from coptpy import COPT
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solution_snapshot import save_env_snapshot, snapshot_dir  # noqa: E402
+
+# 批量运行时设置环境变量 INDUSTRYOR_SNAPSHOT=快照目录，解追加到二进制快照，不再写文本结果和模型文件
+SNAPSHOT_DIR = snapshot_dir()
 
 def solve_toy_production_planning():
     """求解玩具制造商生产规划问题"""
@@ -105,6 +112,7 @@ def solve_toy_production_planning():
         # 8. 求解模型
         print("开始求解...")
         model.solve()
+        save_env_snapshot(model)
         
         # 9. 分析求解结果
         print("=" * 60)
@@ -173,8 +181,9 @@ def solve_toy_production_planning():
             print(f"求解时间: {model.getAttr(COPT.Attr.SolvingTime):.2f} 秒")
             
             # 将结果写入文件
-            create_output_files(model, toys, toy_names, x, y, profits, wood_demand, steel_demand, 
-                              wood_available, steel_available, total_wood_used, total_steel_used)
+            if not SNAPSHOT_DIR:
+                create_output_files(model, toys, toy_names, x, y, profits, wood_demand, steel_demand, 
+                                  wood_available, steel_available, total_wood_used, total_steel_used)
             
         else:
             print("❌ 模型未找到最优解")
@@ -192,6 +201,10 @@ def solve_toy_production_planning():
             description = status_descriptions.get(model.status, "未知状态")
             print(f"状态描述: {description}")
             
+        if SNAPSHOT_DIR:
+            print(f"\n📁 解已追加到快照: {SNAPSHOT_DIR}")
+            return
+        
         # 10. 保存模型文件（可选）
         model.write("toy_production.lp")  # 保存模型为LP格式
         model.write("toy_production.mps") # 保存模型为MPS格式
@@ -1,11 +1,45 @@
+import argparse
+import os
+import sys
+
 import coptpy as cp
 from coptpy import COPT
 
-def solve_set_covering_problem():
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from problem_data import load_arguments, result_path  # noqa: E402
+
+# 所有居民区列表 (也是潜在的连锁店位置)
+AREAS = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L']
+
+# 定义覆盖关系 a_ij：如果在区域j建店能覆盖区域i，则a_ij=1
+# 基于问题描述的表格数据
+COVERAGE = {
+    'A': ['A', 'C', 'E', 'G', 'H', 'I'],
+    'B': ['B', 'H', 'I'],
+    'C': ['A', 'C', 'G', 'H', 'I'],
+    'D': ['D', 'J'],
+    'E': ['A', 'E', 'G'],
+    'F': ['F', 'J', 'K'],
+    'G': ['A', 'C', 'E', 'G'],
+    'H': ['A', 'B', 'C', 'H', 'I'],
+    'I': ['A', 'B', 'C', 'H', 'I'],
+    'J': ['D', 'F', 'J', 'K', 'L'],
+    'K': ['F', 'J', 'K', 'L'],
+    'L': ['J', 'K', 'L']
+}
+
+
+def solve_set_covering_problem(areas=None, sites=None, coverage=None, cost=None):
     """
     求解集合覆盖问题：超市连锁店最优选址问题
     
     目标：最小化建立的连锁店数量，使得每个居民区都被至少一家店覆盖
+
+    Args:
+        areas: 居民区列表，默认为题目数据
+        sites: 潜在店址列表，默认与居民区相同
+        coverage: {店址: [可覆盖的居民区]}
+        cost: {店址: 建店成本}，默认每个店址成本为1 (即最小化店数)
     """
     
     try:
@@ -16,46 +50,33 @@ def solve_set_covering_problem():
         model = env.createModel("supermarket_location_set_covering")
         
         # 3. 定义问题数据
-        # 所有居民区列表 (也是潜在的连锁店位置)
-        areas = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L']
+        areas = AREAS if areas is None else areas
+        sites = areas if sites is None else sites
+        coverage = COVERAGE if coverage is None else coverage
         
-        # 定义覆盖关系 a_ij：如果在区域j建店能覆盖区域i，则a_ij=1
-        # 基于问题描述的表格数据
-        coverage = {
-            'A': ['A', 'C', 'E', 'G', 'H', 'I'],
-            'B': ['B', 'H', 'I'],
-            'C': ['A', 'C', 'G', 'H', 'I'],
-            'D': ['D', 'J'],
-            'E': ['A', 'E', 'G'],
-            'F': ['F', 'J', 'K'],
-            'G': ['A', 'C', 'E', 'G'],
-            'H': ['A', 'B', 'C', 'H', 'I'],
-            'I': ['A', 'B', 'C', 'H', 'I'],
-            'J': ['D', 'F', 'J', 'K', 'L'],
-            'K': ['F', 'J', 'K', 'L'],
-            'L': ['J', 'K', 'L']
-        }
+        # 反向索引: 居民区 -> 能覆盖它的店址，避免对每个居民区扫描全部店址
+        covered_by = {i: [] for i in areas}
+        for j in sites:
+            for i in coverage[j]:
+                covered_by[i].append(j)
         
         # 4. 添加决策变量
         # x_j: 是否在区域j建立连锁店 (1表示建立，0表示不建立)
-        x = model.addVars(areas, vtype=COPT.BINARY, nameprefix="x")
+        x = model.addVars(sites, vtype=COPT.BINARY, nameprefix="x")
         
         # 5. 添加约束条件
         # 全覆盖约束：每个居民区都必须被至少一个连锁店覆盖
         for i in areas:
-            # 对于每个居民区i，找到所有能够覆盖它的潜在店址
-            covering_stores = []
-            for j in areas:
-                if i in coverage[j]:  # 如果在j建店能覆盖区域i
-                    covering_stores.append(x[j])
-            
             # 添加约束：至少有一个覆盖区域i的店铺被建立
-            if covering_stores:
-                model.addConstr(cp.quicksum(covering_stores) >= 1, name=f"coverage_{i}")
+            if covered_by[i]:
+                model.addConstr(cp.quicksum(x[j] for j in covered_by[i]) >= 1, name=f"coverage_{i}")
         
         # 6. 设置目标函数
-        # 最小化建立的连锁店总数
-        model.setObjective(cp.quicksum(x[j] for j in areas), sense=COPT.MINIMIZE)
+        # 最小化建立的连锁店总数 (给出建店成本时最小化总成本)
+        if cost is None:
+            model.setObjective(cp.quicksum(x[j] for j in sites), sense=COPT.MINIMIZE)
+        else:
+            model.setObjective(cp.quicksum(cost[j] * x[j] for j in sites), sense=COPT.MINIMIZE)
         
         # 7. 求解模型
         print("开始求解集合覆盖问题...")
@@ -69,7 +90,7 @@ def solve_set_covering_problem():
             
             print("\n建立连锁店的最优位置:")
             selected_locations = []
-            for j in areas:
+            for j in sites:
                 if x[j].x > 0.5:  # 二进制变量大于0.5表示选中
                     selected_locations.append(j)
                     print(f"  - 在居民区 {j} 建立连锁店")
@@ -79,15 +100,11 @@ def solve_set_covering_problem():
             # 验证覆盖情况
             print("\n=== 覆盖验证 ===")
             all_covered = True
+            selected_set = set(selected_locations)
             for i in areas:
-                covered = False
-                covering_stores = []
-                for j in selected_locations:
-                    if i in coverage[j]:
-                        covered = True
-                        covering_stores.append(j)
+                covering_stores = [j for j in covered_by[i] if j in selected_set]
                 
-                if covered:
+                if covering_stores:
                     print(f"居民区 {i}: 被覆盖 ✓ (覆盖店铺: {', '.join(covering_stores)})")
                 else:
                     print(f"居民区 {i}: 未被覆盖 ✗")
@@ -135,11 +152,19 @@ def solve_set_covering_problem():
             env.close()
 
 if __name__ == "__main__":
-    result = solve_set_covering_problem()
+    parser = argparse.ArgumentParser(description="超市连锁店选址集合覆盖问题")
+    parser.add_argument("--data", default=None, help="covering 数据文件 (.json / .npz / CSV目录)，默认使用题目数据")
+    args = parser.parse_args()
+    
+    if args.data:
+        result = solve_set_covering_problem(*load_arguments(args.data, "covering"))
+    else:
+        result = solve_set_covering_problem()
     
-    # 将结果写入result.txt文件
+    # 将结果写入result.txt文件 (--data 运行写入 result_<数据文件名>.txt)
+    result_file = result_path(args.data)
     if result:
-        with open('result.txt', 'w', encoding='utf-8') as f:
+        with open(result_file, 'w', encoding='utf-8') as f:
             f.write(f"超市连锁店最优选址问题求解结果\n")
             f.write(f"{'='*50}\n\n")
             f.write(f"最少需要建立的连锁店数量: {result['optimal_value']}\n\n")
@@ -149,8 +174,8 @@ if __name__ == "__main__":
             f.write(f"\n总共需要建立 {len(result['selected_locations'])} 家连锁店\n")
             f.write(f"\n所有居民区是否都被覆盖: {'是' if result['all_covered'] else '否'}\n")
             
-        print(f"\n结果已保存到 result.txt 文件中")
+        print(f"\n结果已保存到 {result_file} 文件中")
     else:
-        with open('result.txt', 'w', encoding='utf-8') as f:
+        with open(result_file, 'w', encoding='utf-8') as f:
             f.write("求解失败，未能找到最优解\n")
-        print(f"\n求解失败信息已保存到 result.txt 文件中")
\ No newline at end of file
+        print(f"\n求解失败信息已保存到 {result_file} 文件中")
\ No newline at end of file
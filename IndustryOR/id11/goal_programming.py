@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+摩托车生产目标规划问题 (IndustryOR id11) - 多目标求解
+
+A型摩托车全部自产，B型由进口零件组装，每周制造、装配、检验工时上限为 120/80/40 小时，不允许加班。
+每辆车的利润 = 售价 - 各工序工时 × 每小时成本:
+    A: 650 - (20×12 + 5×8 + 3×10) = 340 元      B: 725 - (7×8 + 6×10) = 609 元
+
+目标 (按题目的优先级):
+    p1  每周利润不少于3000元          -> 最小化利润不足量 d1
+    p2  每周至少生产5辆A型            -> 最小化A型产量不足量 d2
+    p3  尽量减少各工序的闲置工时，权重与每小时成本成正比 (12:8:10)
+                                      -> 最小化加权闲置 12·闲置制造 + 8·闲置装配 + 10·闲置检验
+另外把周利润本身也作为一个目标 (最大化)，以便查看利润与闲置之间的Pareto权衡。
+
+题目没有给出各目标之间的权重，本脚本给出按优先级 p1 > p2 > p3 的字典序解、Pareto前沿，
+并可按任意优先级或权重在同一个模型上求解 (见 ../pareto.py)。
+
+用法:
+    python goal_programming.py
+    python goal_programming.py --priority a_shortfall idle_cost --points 6 --workers 2
+    python goal_programming.py --weights profit=1 idle_cost=1
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import coptpy as cp
+from coptpy import COPT
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pareto import ParetoEngine, select  # noqa: E402
+
+PRODUCTS = ["A", "B"]
+PRICE = {"A": 650, "B": 725}
+# 工序: 每小时成本, 每周工时上限, 各产品每辆所需工时
+PROCESSES = {
+    "制造": {"cost": 12, "capacity": 120, "hours": {"A": 20, "B": 0}},
+    "装配": {"cost": 8, "capacity": 80, "hours": {"A": 5, "B": 7}},
+    "检验": {"cost": 10, "capacity": 40, "hours": {"A": 3, "B": 6}},
+}
+PROFIT_TARGET = 3000
+A_TARGET = 5
+
+# 目标名 -> 显示名称
+OBJECTIVES = {
+    "profit_shortfall": "p1 利润不足",
+    "a_shortfall": "p2 A型不足",
+    "idle_cost": "p3 加权闲置",
+    "profit": "周利润",
+}
+GOAL_PRIORITY = ["profit_shortfall", "a_shortfall", "idle_cost"]
+
+
+def unit_profit(product):
+    """每辆车的利润 = 售价 - 各工序工时成本"""
+    return PRICE[product] - sum(p["cost"] * p["hours"][product] for p in PROCESSES.values())
+
+
+def build_model(env):
+    """建立目标规划模型，返回 (model, {目标名: (表达式, 方向)})"""
+    model = env.createModel("motorcycle_goal_programming")
+    x = {p: model.addVar(lb=0, vtype=COPT.INTEGER, name=f"x_{p}") for p in PRODUCTS}
+    d1 = model.addVar(lb=0, name="profit_shortfall")
+    d2 = model.addVar(lb=0, name="a_shortfall")
+
+    idle = {}
+    for name, process in PROCESSES.items():
+        used = cp.quicksum(process["hours"][p] * x[p] for p in PRODUCTS)
+        # 不允许加班
+        model.addConstr(used <= process["capacity"], name=f"capacity_{name}")
+        idle[name] = process["capacity"] - used
+
+    profit = cp.quicksum(unit_profit(p) * x[p] for p in PRODUCTS)
+    model.addConstr(profit + d1 >= PROFIT_TARGET, name="goal_profit")
+    model.addConstr(x["A"] + d2 >= A_TARGET, name="goal_type_a")
+    idle_cost = cp.quicksum(PROCESSES[name]["cost"] * idle[name] for name in PROCESSES)
+
+    objectives = {
+        "profit_shortfall": (cp.LinExpr(d1), COPT.MINIMIZE),
+        "a_shortfall": (cp.LinExpr(d2), COPT.MINIMIZE),
+        "idle_cost": (idle_cost, COPT.MINIMIZE),
+        "profit": (profit, COPT.MAXIMIZE),
+    }
+    return model, objectives
+
+
+def describe(point):
+    """一个解的产量和各目标值"""
+    values = point["values"]
+    plan = ", ".join(f"{p}型 {values[f'x_{p}']:.0f} 辆" for p in PRODUCTS)
+    goals = ", ".join(f"{OBJECTIVES[n]} {point['objectives'][n]:.2f}" for n in OBJECTIVES)
+    return f"{plan} | {goals}"
+
+
+def parse_weights(items):
+    weights = {}
+    for item in items:
+        name, _, value = item.partition("=")
+        if name not in OBJECTIVES:
+            raise ValueError(f"未知的目标: {name}")
+        weights[name] = float(value)
+    return weights
+
+
+def solve_goal_programming(priority=None, weights=None, primary="profit", points=6, workers=1):
+    """求解支付表、字典序解、Pareto前沿，返回字典序解的周利润"""
+    env = None
+    try:
+        env = cp.Envr()
+        engine = ParetoEngine(build_model, env)
+
+        ideal, nadir, table = engine.payoff()
+        print("\n支付表 (行: 首先优化的目标):")
+        print(f"{'':<14}" + "".join(f"{OBJECTIVES[n]:>14}" for n in OBJECTIVES))
+        for first in OBJECTIVES:
+            print(f"{OBJECTIVES[first]:<14}" + "".join(f"{table[first][n]:>14.2f}" for n in OBJECTIVES))
+
+        priority = priority or GOAL_PRIORITY
+        point = engine.lexicographic(priority)
+        print(f"\n字典序解 ({' > '.join(OBJECTIVES[n] for n in priority)}):")
+        print(f"  {describe(point)}")
+
+        if weights:
+            weighted = engine.weighted(weights, ideal, nadir)
+            print(f"\n加权和解 (归一化权重 {weights}):")
+            print(f"  {describe(weighted)}")
+
+        begin = time.perf_counter()
+        front = engine.front(primary, points, workers, ideal, nadir)
+        elapsed = time.perf_counter() - begin
+        print(f"\nPareto前沿 (ε-约束法, 主目标 {OBJECTIVES[primary]}, 每个目标 {points} 个ε值, "
+              f"{workers} 个进程, 耗时 {elapsed:.2f} 秒, 共 {len(front)} 个非支配点):")
+        for p in front:
+            print(f"  {describe(p)}")
+
+        chosen = select(front, engine.senses, priority=priority)
+        if chosen is not None:
+            print(f"\n前沿上按同一优先级选出的点: {describe(chosen)}")
+        return point["objectives"]["profit"]
+
+    except cp.CoptError as e:
+        print(f"COPT Error: {e.retcode} - {e.message}")
+        return None
+    finally:
+        if env is not None:
+            env.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="摩托车生产目标规划 (多目标)")
+    parser.add_argument("--priority", nargs="+", choices=list(OBJECTIVES), help="字典序优先级 (默认 p1 p2 p3)")
+    parser.add_argument("--weights", nargs="+", default=[], help="加权和的权重，如 profit=1 idle_cost=1")
+    parser.add_argument("--primary", default="profit", choices=list(OBJECTIVES), help="ε-约束法的主目标")
+    parser.add_argument("--points", type=int, default=6, help="每个非主目标的ε网格点数")
+    parser.add_argument("--workers", type=int, default=1, help="并行进程数")
+    args = parser.parse_args()
+    try:
+        weights = parse_weights(args.weights)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print("摩托车生产目标规划问题 (多目标)")
+    print("=" * 60)
+    profit = solve_goal_programming(args.priority, weights, args.primary, args.points, args.workers)
+    if profit is not None:
+        print("\n" + "=" * 60)
+        print(f"字典序解的周利润: {profit:.2f} 元")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,12 +6,106 @@
 使用COPT求解器解决混合整数线性规划问题
 """
 
+import argparse
+import os
+import sys
+
 import coptpy as cp
 from coptpy import COPT
 
-def solve_production_planning():
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from problem_data import load_arguments, result_path  # noqa: E402
+
+# 容器型号（按体积升序排列）
+CONTAINERS = [1, 2, 3, 4, 5, 6]
+
+# 容器数据
+VOLUMES = {1: 1500, 2: 2500, 3: 4000, 4: 6000, 5: 9000, 6: 12000}  # 体积 (cm³)
+DEMANDS = {1: 500, 2: 550, 3: 700, 4: 900, 5: 400, 6: 300}  # 需求量 (件)
+VAR_COSTS = {1: 5, 2: 8, 3: 10, 4: 12, 5: 16, 6: 18}  # 单位可变成本 (元/件)
+FIXED_COST = 1200  # 设备启用固定成本 (元)
+
+
+def build_production_model(model, demands, var_costs, fixed_cost):
+    """
+    构建带固定费用的生产规划模型
+
+    Args:
+        model: COPT模型对象
+        demands: 各型号需求量，键的顺序即体积升序 (排在后面的型号可替代前面的型号)
+        var_costs: 各型号单位可变成本
+        fixed_cost: 设备启用固定成本，标量或 {型号: 固定成本}
+
+    Returns:
+        (x, y, demand_constrs, trigger_constrs)，供结果输出和参数原地修改使用
+    """
+    containers = list(demands)
+    rank = {c: k for k, c in enumerate(containers)}
+    if not isinstance(fixed_cost, dict):
+        fixed_cost = {i: fixed_cost for i in containers}
+
+    # Big M 常数 (用于固定成本触发约束)
+    M = sum(demands.values())
+
+    # 添加决策变量
+    # x_ij: 用生产品种i满足需求品种j的容器数量 (仅当 i >= j 时有效)
+    x = {}
+    for i in containers:
+        for j in containers:
+            if rank[i] >= rank[j]:  # 只有体积大于等于的容器才能替代
+                x[i, j] = model.addVar(vtype=COPT.INTEGER, lb=0,
+                                       name=f"x_{i}_{j}")
+
+    # y_i: 是否启用型号i的生产设备 (二进制变量)
+    y = model.addVars(containers, vtype=COPT.BINARY, nameprefix="y")
+
+    # 约束1: 需求满足约束
+    # 对于每种型号j，其需求必须被完全满足
+    # ∑(i≥j) x_ij = D_j, ∀j ∈ I
+    demand_constrs = {}
+    for j in containers:
+        constraint_expr = cp.quicksum(x[i, j] for i in containers if rank[i] >= rank[j])
+        demand_constrs[j] = model.addConstr(constraint_expr == demands[j],
+                                            name=f"demand_satisfaction_{j}")
+
+    # 约束2: 固定成本触发约束
+    # 只要生产型号i的容器，就必须启用对应设备
+    # ∑(j≤i) x_ij ≤ M * y_i, ∀i ∈ I
+    trigger_constrs = {}
+    for i in containers:
+        production_amount = cp.quicksum(x[i, j] for j in containers if rank[j] <= rank[i])
+        trigger_constrs[i] = model.addConstr(production_amount <= M * y[i],
+                                             name=f"fixed_cost_trigger_{i}")
+
+    # 目标函数
+    # 最小化总成本 = 可变成本 + 固定成本
+    # min ∑i C_i * (∑(j≤i) x_ij) + ∑i F * y_i
+
+    # 可变成本: 每种型号的总生产量 × 单位成本
+    variable_cost = cp.quicksum(
+        var_costs[i] * cp.quicksum(x[i, j] for j in containers if rank[j] <= rank[i])
+        for i in containers
+    )
+
+    # 固定成本: 启用设备的固定费用
+    fixed_cost_total = cp.quicksum(fixed_cost[i] * y[i] for i in containers)
+
+    # 设置目标函数为最小化总成本
+    model.setObjective(variable_cost + fixed_cost_total, sense=COPT.MINIMIZE)
+
+    return x, y, demand_constrs, trigger_constrs
+
+
+def solve_production_planning(containers=None, volumes=None, demands=None, var_costs=None, fixed_cost=None,
+                              data_path=None):
     """
     求解红星塑料厂的生产规划问题
+
+    Args:
+        containers: 按体积升序排列的容器型号，默认为题目数据
+        volumes / demands / var_costs: {型号: 值}
+        fixed_cost: 设备启用固定成本，标量或 {型号: 固定成本}
+        data_path: --data 给出的数据文件，结果和模型文件名后加数据文件名 (见 problem_data.result_path)
     """
     try:
         # 1. 创建COPT求解环境
@@ -21,14 +115,9 @@ def solve_production_planning():
         model = env.createModel("plastic_container_production")
         
         # 3. 定义问题数据
-        # 容器型号（按体积升序排列）
-        containers = [1, 2, 3, 4, 5, 6]
-        
-        # 容器数据
-        volumes = {1: 1500, 2: 2500, 3: 4000, 4: 6000, 5: 9000, 6: 12000}  # 体积 (cm³)
-        demands = {1: 500, 2: 550, 3: 700, 4: 900, 5: 400, 6: 300}  # 需求量 (件)
-        var_costs = {1: 5, 2: 8, 3: 10, 4: 12, 5: 16, 6: 18}  # 单位可变成本 (元/件)
-        fixed_cost = 1200  # 设备启用固定成本 (元)
+        if containers is None:
+            containers, volumes, demands, var_costs, fixed_cost = CONTAINERS, VOLUMES, DEMANDS, VAR_COSTS, FIXED_COST
+        demands = {i: demands[i] for i in containers}
         
         # Big M 常数 (用于固定成本触发约束)
         M = sum(demands.values())  # 3350
@@ -36,55 +125,16 @@ def solve_production_planning():
         print("=== 问题数据 ===")
         print("容器型号   体积(cm³)   需求(件)   单位成本(元/件)")
         for i in containers:
-            print(f"   {i}       {volumes[i]:5d}     {demands[i]:3d}        {var_costs[i]:2d}")
-        print(f"设备启用固定成本: {fixed_cost} 元")
+            print(f"   {i}       {volumes[i]:5.0f}     {demands[i]:3.0f}        {var_costs[i]:2g}")
+        if isinstance(fixed_cost, dict):
+            print("设备启用固定成本: " + ", ".join(f"型号{i} {fixed_cost[i]:g}" for i in containers) + " 元")
+        else:
+            print(f"设备启用固定成本: {fixed_cost} 元")
+        equipment_cost = fixed_cost if isinstance(fixed_cost, dict) else {i: fixed_cost for i in containers}
         print(f"Big M 参数: {M}")
         
-        # 4. 添加决策变量
-        # x_ij: 用生产品种i满足需求品种j的容器数量 (仅当 i >= j 时有效)
-        x = {}
-        for i in containers:
-            for j in containers:
-                if i >= j:  # 只有体积大于等于的容器才能替代
-                    x[i, j] = model.addVar(vtype=COPT.INTEGER, lb=0, 
-                                         name=f"x_{i}_{j}")
-        
-        # y_i: 是否启用型号i的生产设备 (二进制变量)
-        y = model.addVars(containers, vtype=COPT.BINARY, nameprefix="y")
-        
-        # 5. 添加约束条件
-        
-        # 约束1: 需求满足约束
-        # 对于每种型号j，其需求必须被完全满足
-        # ∑(i≥j) x_ij = D_j, ∀j ∈ I
-        for j in containers:
-            constraint_expr = cp.quicksum(x[i, j] for i in containers if i >= j)
-            model.addConstr(constraint_expr == demands[j], 
-                          name=f"demand_satisfaction_{j}")
-        
-        # 约束2: 固定成本触发约束  
-        # 只要生产型号i的容器，就必须启用对应设备
-        # ∑(j≤i) x_ij ≤ M * y_i, ∀i ∈ I
-        for i in containers:
-            production_amount = cp.quicksum(x[i, j] for j in containers if j <= i)
-            model.addConstr(production_amount <= M * y[i], 
-                          name=f"fixed_cost_trigger_{i}")
-        
-        # 6. 设置目标函数
-        # 最小化总成本 = 可变成本 + 固定成本
-        # min ∑i C_i * (∑(j≤i) x_ij) + ∑i F * y_i
-        
-        # 可变成本: 每种型号的总生产量 × 单位成本
-        variable_cost = cp.quicksum(
-            var_costs[i] * cp.quicksum(x[i, j] for j in containers if j <= i)
-            for i in containers
-        )
-        
-        # 固定成本: 启用设备的固定费用
-        fixed_cost_total = cp.quicksum(fixed_cost * y[i] for i in containers)
-        
-        # 设置目标函数为最小化总成本
-        model.setObjective(variable_cost + fixed_cost_total, sense=COPT.MINIMIZE)
+        # 4-6. 添加决策变量、约束条件和目标函数
+        x, y, _, _ = build_production_model(model, demands, var_costs, fixed_cost)
         
         # 7. 求解模型
         print("\n=== 开始求解 ===")
@@ -102,7 +152,7 @@ def solve_production_planning():
             for i in containers:
                 if y[i].x > 0.5:
                     activated_equipment.append(i)
-                    print(f"  型号 {i}: 启用 (固定成本: {fixed_cost} 元)")
+                    print(f"  型号 {i}: 启用 (固定成本: {equipment_cost[i]:g} 元)")
             
             if not activated_equipment:
                 print("  无设备启用")
@@ -122,7 +172,8 @@ def solve_production_planning():
             # 输出成本分解
             print(f"\n成本分解:")
             print(f"  可变成本: {total_variable_cost:.2f} 元")
-            print(f"  固定成本: {len(activated_equipment) * fixed_cost:.2f} 元")
+            total_fixed_cost = sum(equipment_cost[i] for i in activated_equipment)
+            print(f"  固定成本: {total_fixed_cost:.2f} 元")
             print(f"  总成本:   {model.objval:.2f} 元")
             
             # 验证需求满足情况
@@ -138,18 +189,18 @@ def solve_production_planning():
             print(f"  搜索节点数 (Node Count): {model.getAttr(COPT.Attr.NodeCnt)}")
             
             # 将结果写入文件
-            with open("result.txt", "w", encoding="utf-8") as f:
+            with open(result_path(data_path), "w", encoding="utf-8") as f:
                 f.write("红星塑料厂生产规划问题求解结果\n")
                 f.write("="*40 + "\n\n")
                 f.write(f"最优目标函数值: {model.objval:.2f} 元\n\n")
                 f.write("启用的生产设备:\n")
                 for i in activated_equipment:
                     f.write(f"  型号 {i}: 启用\n")
-                f.write(f"\n总固定成本: {len(activated_equipment) * fixed_cost:.2f} 元\n")
+                f.write(f"\n总固定成本: {total_fixed_cost:.2f} 元\n")
                 f.write(f"总可变成本: {total_variable_cost:.2f} 元\n")
                 f.write(f"总成本: {model.objval:.2f} 元\n")
             
-            print(f"\n结果已保存到 result.txt 文件")
+            print(f"\n结果已保存到 {result_path(data_path)} 文件")
             
         else:
             print(f"\n模型未找到最优解。状态码: {model.status}")
@@ -162,8 +213,8 @@ def solve_production_planning():
             print(f"状态描述: {status_map.get(model.status, '未知状态')}")
         
         # 可选：保存模型文件
-        model.write("toy_production.lp")
-        model.write("toy_production.sol")
+        model.write(result_path(data_path, "toy_production.lp"))
+        model.write(result_path(data_path, "toy_production.sol"))
         
         return model.objval if model.status == COPT.OPTIMAL else None
         
@@ -181,7 +232,15 @@ def solve_production_planning():
 if __name__ == "__main__":
     print("红星塑料厂生产规划问题求解")
     print("=" * 50)
-    result = solve_production_planning()
+    parser = argparse.ArgumentParser(description="红星塑料厂生产规划问题")
+    parser.add_argument("--data", default=None,
+                        help="production_planning 数据文件 (.json / .npz / CSV目录)，默认使用题目数据")
+    args = parser.parse_args()
+    
+    if args.data:
+        result = solve_production_planning(*load_arguments(args.data, "production_planning"), data_path=args.data)
+    else:
+        result = solve_production_planning()
     if result is not None:
         print(f"\n求解完成，最优总成本: {result:.2f} 元")
     else:
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+红星塑料厂生产规划问题的参数灵敏度扫描
+
+对一个或两个参数按相对变化百分比构造网格，逐点求解并汇总结果：
+- 每个工作进程只构建一次模型，网格点之间通过原地修改目标系数/右端项/约束系数切换参数
+- 同一进程内上一个网格点的最优解作为下一个网格点的MIP初始解
+- 网格按行切分成若干块，在进程池中并行求解
+- 结果写入紧凑的CSV表，包含每个网格点的修改耗时和求解耗时
+
+可扫描的参数:
+    fixed_cost        设备启用固定成本 (所有型号同时变化)
+    var_cost:i        型号i的单位可变成本
+    demand:j          型号j的需求量 (同时更新固定成本触发约束中的Big M)
+
+用法:
+    python sensitivity_sweep.py fixed_cost=-50:50:11
+    python sensitivity_sweep.py fixed_cost=-30:30:7 var_cost:6=-20:20:5 --workers 4
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import coptpy as cp
+from coptpy import COPT
+
+from production_planning import (
+    CONTAINERS, DEMANDS, VAR_COSTS, FIXED_COST, build_production_model,
+)
+
+# 工作进程内缓存的模型 (每个进程构建一次)
+_worker = None
+
+
+def parse_parameter(name):
+    """解析参数名，返回 (类型, 型号)"""
+    kind, _, index = name.partition(":")
+    if kind == "fixed_cost" and not index:
+        return kind, None
+    if kind in ("var_cost", "demand") and index:
+        i = int(index)
+        if i in CONTAINERS:
+            return kind, i
+    raise ValueError(f"无法识别的参数: {name}")
+
+
+def parameter_data(point):
+    """
+    根据网格点 {参数名: 相对变化百分比} 计算该点的问题数据
+
+    Returns:
+        (demands, var_costs, fixed_cost)
+    """
+    demands = dict(DEMANDS)
+    var_costs = dict(VAR_COSTS)
+    fixed_cost = FIXED_COST
+    for name, pct in point.items():
+        kind, i = parse_parameter(name)
+        factor = 1 + pct / 100
+        if kind == "fixed_cost":
+            fixed_cost = FIXED_COST * factor
+        elif kind == "var_cost":
+            var_costs[i] = VAR_COSTS[i] * factor
+        else:
+            demands[i] = round(DEMANDS[i] * factor)
+    return demands, var_costs, fixed_cost
+
+
+def _init_worker():
+    """工作进程初始化: 创建环境并按基准数据构建模型"""
+    global _worker
+    env = cp.Envr()
+    model = env.createModel("plastic_container_sweep")
+    model.setParam(COPT.Param.Logging, 0)
+    model.setParam(COPT.Param.Threads, 1)
+    x, y, demand_constrs, trigger_constrs = build_production_model(
+        model, DEMANDS, VAR_COSTS, FIXED_COST)
+    _worker = {
+        "env": env,
+        "model": model,
+        "x": x,
+        "y": y,
+        "demand_constrs": demand_constrs,
+        "trigger_constrs": trigger_constrs,
+        "variables": list(x.values()) + [y[i] for i in CONTAINERS],
+        "incumbent": None,
+    }
+
+
+def apply_parameters(state, demands, var_costs, fixed_cost):
+    """原地修改模型系数，使其对应给定的问题数据"""
+    model = state["model"]
+    x, y = state["x"], state["y"]
+    # 与 build_production_model 相同: 按 CONTAINERS 中的位置 (体积升序) 比较型号，排在后面的可替代前面的
+    rank = {c: k for k, c in enumerate(CONTAINERS)}
+
+    for i in CONTAINERS:
+        y[i].setInfo(COPT.Info.Obj, fixed_cost)
+        for j in CONTAINERS:
+            if rank[j] <= rank[i]:
+                x[i, j].setInfo(COPT.Info.Obj, var_costs[i])
+
+    M = sum(demands.values())
+    for j in CONTAINERS:
+        state["demand_constrs"][j].setInfo(COPT.Info.LB, demands[j])
+        state["demand_constrs"][j].setInfo(COPT.Info.UB, demands[j])
+        model.setCoeff(state["trigger_constrs"][j], y[j], -M)
+
+
+def _solve_chunk(points):
+    """在当前工作进程中依次求解一组网格点"""
+    state = _worker
+    model = state["model"]
+    rows = []
+    for point in points:
+        update_start = time.perf_counter()
+        demands, var_costs, fixed_cost = parameter_data(point)
+        apply_parameters(state, demands, var_costs, fixed_cost)
+        if state["incumbent"] is not None:
+            model.setMipStart(state["variables"], state["incumbent"])
+            model.loadMipStart()
+        update_time = time.perf_counter() - update_start
+
+        solve_start = time.perf_counter()
+        model.solve()
+        solve_time = time.perf_counter() - solve_start
+
+        row = dict(point)
+        row["status"] = model.status
+        if model.status == COPT.OPTIMAL:
+            state["incumbent"] = model.getInfo(COPT.Info.Value, state["variables"])
+            row["objective"] = round(model.objval, 4)
+            row["equipment"] = "".join(str(i) for i in CONTAINERS if state["y"][i].x > 0.5)
+            row["nodes"] = model.getAttr(COPT.Attr.NodeCnt)
+        else:
+            row["objective"] = ""
+            row["equipment"] = ""
+            row["nodes"] = ""
+        row["update_time"] = round(update_time, 6)
+        row["solve_time"] = round(solve_time, 6)
+        rows.append(row)
+    return rows
+
+
+def build_grid(axes):
+    """
+    构造网格点列表，按第一个参数分块 (块内相邻网格点参数接近，利于MIP初始解复用)
+
+    Args:
+        axes: [(参数名, [百分比, ...]), ...]，一或两个参数
+
+    Returns:
+        网格点块列表 [[{参数名: 百分比}, ...], ...]
+    """
+    if not 1 <= len(axes) <= 2:
+        raise ValueError("只支持一个或两个扫描参数")
+    for name, _ in axes:
+        parse_parameter(name)
+
+    names = [name for name, _ in axes]
+    if len(axes) == 1:
+        points = [{names[0]: v} for v in axes[0][1]]
+        return [points]
+    return [[{names[0]: v1, names[1]: v2} for v2 in axes[1][1]] for v1 in axes[0][1]]
+
+
+def run_sweep(axes, workers=None, output_file=None):
+    """
+    执行参数扫描
+
+    Args:
+        axes: [(参数名, [相对变化百分比, ...]), ...]，一或两个参数
+        workers: 进程数，默认取CPU核数
+        output_file: 结果CSV路径，为None时不写文件
+
+    Returns:
+        结果行列表，每行包含参数值、状态、目标值、启用设备、节点数和耗时
+    """
+    chunks = build_grid(axes)
+    workers = workers or os.cpu_count() or 1
+
+    # 单参数扫描时把网格切成与进程数相当的连续块
+    if len(chunks) == 1 and workers > 1:
+        points = chunks[0]
+        size = -(-len(points) // workers)
+        chunks = [points[k:k + size] for k in range(0, len(points), size)]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                             initializer=_init_worker) as pool:
+        rows = list(itertools.chain.from_iterable(pool.map(_solve_chunk, chunks)))
+
+    if output_file:
+        directory = os.path.dirname(output_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(output_file, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+    return rows
+
+
+def parse_axis(spec):
+    """解析 '参数名=起点:终点:点数' 形式的扫描轴"""
+    name, _, grid = spec.partition("=")
+    low, high, steps = grid.split(":")
+    low, high, steps = float(low), float(high), int(steps)
+    if steps == 1:
+        return name, [low]
+    return name, [low + (high - low) * k / (steps - 1) for k in range(steps)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="固定费用生产规划模型参数灵敏度扫描")
+    parser.add_argument("axes", nargs="+", help="扫描轴，格式: 参数名=起点%%:终点%%:点数")
+    parser.add_argument("--workers", type=int, default=None, help="进程数")
+    parser.add_argument("--output", default=os.path.join("output", "sensitivity_sweep.csv"),
+                        help="结果CSV路径")
+    args = parser.parse_args()
+
+    axes = [parse_axis(spec) for spec in args.axes]
+    start = time.perf_counter()
+    rows = run_sweep(axes, args.workers, args.output)
+    elapsed = time.perf_counter() - start
+
+    names = [name for name, _ in axes]
+    header = "  ".join(f"{name:>12}" for name in names)
+    print(f"{header}  {'总成本':>10}  {'启用设备':>8}  {'求解(ms)':>9}")
+    for row in rows:
+        values = "  ".join(f"{row[name]:>+11.1f}%" for name in names)
+        objective = f"{row['objective']:>10.2f}" if row["objective"] != "" else f"{'-':>10}"
+        print(f"{values}  {objective}  {row['equipment']:>8}  {row['solve_time'] * 1000:>9.2f}")
+    print(f"\n共 {len(rows)} 个网格点，总耗时 {elapsed:.2f} s")
+    print(f"结果已保存到 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
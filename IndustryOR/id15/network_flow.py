@@ -0,0 +1,574 @@
+#!/usr/bin/env python3
+"""
+工具购买与维修问题的最小费用流快速求解 (纯Python网络单纯形法)
+
+solve_corrected.py 中的整数规划可以等价地写成时间展开图上的最小费用流：
+
+节点:
+- P      : 采购源点，供应量 sum(r)
+- R_j    : 阶段j结束后待维修的旧工具，供应量 r_j
+- D_k    : 阶段k的工具需求，需求量 r_k
+- T      : 汇点，吸收未被使用的采购量、富余工具和规划期后返回的维修工具，需求量 sum(r)
+
+弧 (容量均不受限):
+- P   -> D_k      费用 a   (新购, 对应 x_k)
+- P   -> T        费用 0   (未使用的采购额度)
+- R_j -> D_{j+p}  费用 b   (慢修, 对应 y_j; j+p > n 时改接到 T)
+- R_j -> D_{j+q}  费用 c   (快修, 对应 z_j; j+q > n 时改接到 T)
+- D_k -> T        费用 0   (富余工具闲置, 对应供应充足约束中的 >=)
+
+去掉 D_k -> T 弧即得到 solve_problem.py 中的供需平衡 (=) 模型。
+
+网络矩阵全单模，整数供需下网络单纯形法得到的基本最优解天然为整数，
+节点数 2n+2、弧数约 5n，内存随阶段数线性增长。初始基取"全部慢修、缺口新购、
+富余闲置"对应的可行生成树，避免大M人工基带来的大量退化主元。
+
+network_simplex() 移植自 NetworkX 的 networkx.algorithms.flow.network_simplex
+(BSD 3-Clause 许可，许可声明见该函数前的注释)，改为按弧编号的数组接口并支持给定初始生成树。
+"""
+
+import math
+import random
+import sys
+import time
+from itertools import chain, islice
+
+
+# network_simplex() 及其内部函数移植自 NetworkX (networkx/algorithms/flow/networksimplex.py)，
+# 原许可声明如下:
+#
+# Copyright (C) 2004-2024, NetworkX Developers
+# Aric Hagberg <hagberg@lanl.gov>
+# Dan Schult <dschult@colgate.edu>
+# Pieter Swart <swart@lanl.gov>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   * Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#   * Redistributions in binary form must reproduce the above
+#     copyright notice, this list of conditions and the following
+#     disclaimer in the documentation and/or other materials provided
+#     with the distribution.
+#
+#   * Neither the name of the NetworkX Developers nor the names of its
+#     contributors may be used to endorse or promote products derived
+#     from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+def network_simplex(num_nodes, supplies, tails, heads, costs, capacities, tree_arcs=None):
+    """
+    原始网络单纯形法求解最小费用流
+
+    采用分块搜索定价规则，生成树用 parent/thread/size 数组维护。
+    未给出初始生成树时，以人工根节点和人工弧构造初始基 (大M法)。
+
+    Args:
+        num_nodes: 节点数，节点编号 0..num_nodes-1
+        supplies: 各节点净供应量 (需求为负)，总和必须为0
+        tails: 各弧起点
+        heads: 各弧终点
+        costs: 各弧单位费用
+        capacities: 各弧容量，None 表示不受限
+        tree_arcs: 可选的初始可行生成树 (num_nodes-1 条弧的编号)，
+                   非树弧流量取0，树弧流量由供需唯一确定且必须在容量范围内
+
+    Returns:
+        (最小费用, 各弧流量列表)，问题不可行时返回 (None, None)
+    """
+    n = num_nodes
+    m = len(tails)
+    if sum(supplies) != 0:
+        raise ValueError("节点供需不平衡")
+
+    # 人工弧的费用和容量取足够大的值
+    faux_inf = 3 * max(
+        1,
+        sum(abs(s) for s in supplies),
+        sum(abs(cst) for cst in costs),
+        max((u for u in capacities if u is not None), default=0),
+    )
+
+    S = list(tails)
+    T = list(heads)
+    C = list(costs)
+    U = [faux_inf if u is None else u for u in capacities]
+    x = [0] * m
+
+    # 每个节点有一条连接人工根节点 n 的人工弧
+    root = n
+    for i in range(n):
+        if supplies[i] >= 0:
+            S.append(i)
+            T.append(root)
+        else:
+            S.append(root)
+            T.append(i)
+        C.append(faux_inf)
+        U.append(faux_inf)
+        x.append(abs(supplies[i]) if tree_arcs is None else 0)
+
+    if tree_arcs is None:
+        # 初始生成树：所有人工弧构成的星形树
+        pi = [faux_inf if s >= 0 else -faux_inf for s in supplies] + [0]
+        parent = [root] * n + [None]
+        edge = list(range(m, m + n)) + [None]
+        size = [1] * n + [n + 1]
+        next_node = list(range(1, n)) + [root, 0]
+        prev_node = [root] + list(range(n - 1)) + [n - 1]
+        last = list(range(n)) + [n - 1]
+    else:
+        # 初始生成树：给定的树弧 + 节点0的人工弧 (流量为0)
+        if len(tree_arcs) != n - 1:
+            raise ValueError("初始生成树弧数必须为节点数减1")
+        adjacent = [[] for _ in range(n + 1)]
+        for e in chain(tree_arcs, [m]):
+            adjacent[S[e]].append(e)
+            adjacent[T[e]].append(e)
+
+        parent = [None] * (n + 1)
+        edge = [None] * (n + 1)
+        order = [root]
+        visited = [False] * (n + 1)
+        visited[root] = True
+        stack = [root]
+        while stack:
+            u = stack.pop()
+            if u != root:
+                order.append(u)
+            for e in adjacent[u]:
+                v = T[e] if S[e] == u else S[e]
+                if not visited[v]:
+                    visited[v] = True
+                    parent[v] = u
+                    edge[v] = e
+                    stack.append(v)
+        if len(order) != n + 1:
+            raise ValueError("初始生成树不连通")
+
+        # 由叶到根确定树弧流量
+        balance = list(supplies) + [0]
+        for v in reversed(order[1:]):
+            e = edge[v]
+            flow = balance[v] if S[e] == v else -balance[v]
+            if flow < 0 or flow > U[e]:
+                raise ValueError("初始生成树对应的流不可行")
+            x[e] = flow
+            balance[parent[v]] += balance[v]
+
+        # 由根到叶确定节点势，使树弧检验数为0
+        pi = [0] * (n + 1)
+        for v in order[1:]:
+            e = edge[v]
+            u = parent[v]
+            pi[v] = pi[u] - C[e] if S[e] == u else pi[u] + C[e]
+
+        # 线索 (先序遍历顺序) 与子树规模
+        position = [0] * (n + 1)
+        for k, v in enumerate(order):
+            position[v] = k
+        size = [1] * (n + 1)
+        for v in reversed(order[1:]):
+            size[parent[v]] += size[v]
+        last = [order[position[v] + size[v] - 1] for v in range(n + 1)]
+        next_node = [0] * (n + 1)
+        prev_node = [0] * (n + 1)
+        for k, v in enumerate(order):
+            w = order[(k + 1) % (n + 1)]
+            next_node[v] = w
+            prev_node[w] = v
+
+    num_edges = m + n
+
+    def find_entering_edges():
+        """分块搜索检验数为负的入基弧 (每块取检验数最小者)"""
+        block = int(math.ceil(math.sqrt(num_edges)))
+        num_blocks = (num_edges + block - 1) // block
+        f = 0
+        count = 0
+        while count <= num_blocks:
+            l = f + block
+            if l <= num_edges:
+                edges = range(f, l)
+            else:
+                l -= num_edges
+                edges = chain(range(f, num_edges), range(l))
+            f = l
+            best = 0
+            i = -1
+            for e in edges:
+                # 容量为0的弧流量只能为0，既不能增流也不能减流，不参与定价
+                if U[e] == 0:
+                    continue
+                c = C[e] - pi[S[e]] + pi[T[e]]
+                if x[e] != 0:
+                    c = -c
+                if c < best:
+                    best = c
+                    i = e
+            if i < 0:
+                count += 1
+            else:
+                if x[i] == 0:
+                    p, q = S[i], T[i]
+                else:
+                    p, q = T[i], S[i]
+                yield i, p, q
+                count = 0
+
+    def find_apex(p, q):
+        size_p = size[p]
+        size_q = size[q]
+        while True:
+            while size_p < size_q:
+                p = parent[p]
+                size_p = size[p]
+            while size_p > size_q:
+                q = parent[q]
+                size_q = size[q]
+            if size_p == size_q:
+                if p != q:
+                    p = parent[p]
+                    size_p = size[p]
+                    q = parent[q]
+                    size_q = size[q]
+                else:
+                    return p
+
+    def trace_path(p, w):
+        nodes = [p]
+        edges = []
+        while p != w:
+            edges.append(edge[p])
+            p = parent[p]
+            nodes.append(p)
+        return nodes, edges
+
+    def find_cycle(i, p, q):
+        w = find_apex(p, q)
+        cycle_nodes, cycle_edges = trace_path(p, w)
+        cycle_nodes.reverse()
+        cycle_edges.reverse()
+        if cycle_edges != [i]:
+            cycle_edges.append(i)
+        q_nodes, q_edges = trace_path(q, w)
+        del q_nodes[-1]
+        cycle_nodes += q_nodes
+        cycle_edges += q_edges
+        return cycle_nodes, cycle_edges
+
+    def residual_capacity(i, p):
+        return U[i] - x[i] if S[i] == p else x[i]
+
+    def find_leaving_edge(cycle_nodes, cycle_edges):
+        j, s = min(zip(reversed(cycle_edges), reversed(cycle_nodes)),
+                   key=lambda item: residual_capacity(*item))
+        t = T[j] if S[j] == s else S[j]
+        return j, s, t
+
+    def augment_flow(cycle_nodes, cycle_edges, f):
+        for i, p in zip(cycle_edges, cycle_nodes):
+            if S[i] == p:
+                x[i] += f
+            else:
+                x[i] -= f
+
+    def remove_edge(s, t):
+        size_t = size[t]
+        prev_t = prev_node[t]
+        last_t = last[t]
+        next_last_t = next_node[last_t]
+        parent[t] = None
+        edge[t] = None
+        next_node[prev_t] = next_last_t
+        prev_node[next_last_t] = prev_t
+        next_node[last_t] = t
+        prev_node[t] = last_t
+        while s is not None:
+            size[s] -= size_t
+            if last[s] == last_t:
+                last[s] = prev_t
+            s = parent[s]
+
+    def make_root(q):
+        ancestors = []
+        while q is not None:
+            ancestors.append(q)
+            q = parent[q]
+        ancestors.reverse()
+        for p, q in zip(ancestors, islice(ancestors, 1, None)):
+            size_p = size[p]
+            last_p = last[p]
+            prev_q = prev_node[q]
+            last_q = last[q]
+            next_last_q = next_node[last_q]
+            parent[p] = q
+            parent[q] = None
+            edge[p] = edge[q]
+            edge[q] = None
+            size[p] = size_p - size[q]
+            size[q] = size_p
+            next_node[prev_q] = next_last_q
+            prev_node[next_last_q] = prev_q
+            next_node[last_q] = q
+            prev_node[q] = last_q
+            if last_p == last_q:
+                last[p] = prev_q
+                last_p = prev_q
+            prev_node[p] = last_q
+            next_node[last_q] = p
+            next_node[last_p] = q
+            prev_node[q] = last_p
+            last[q] = last_p
+
+    def add_edge(i, p, q):
+        last_p = last[p]
+        next_last_p = next_node[last_p]
+        size_q = size[q]
+        last_q = last[q]
+        parent[q] = p
+        edge[q] = i
+        next_node[last_p] = q
+        prev_node[q] = last_p
+        prev_node[next_last_p] = last_q
+        next_node[last_q] = next_last_p
+        while p is not None:
+            size[p] += size_q
+            if last[p] == last_p:
+                last[p] = last_q
+            p = parent[p]
+
+    def update_potentials(i, p, q):
+        if q == T[i]:
+            d = pi[p] - C[i] - pi[q]
+        else:
+            d = pi[p] + C[i] - pi[q]
+        l = last[q]
+        pi[q] += d
+        while q != l:
+            q = next_node[q]
+            pi[q] += d
+
+    # 主迭代
+    for i, p, q in find_entering_edges():
+        cycle_nodes, cycle_edges = find_cycle(i, p, q)
+        j, s, t = find_leaving_edge(cycle_nodes, cycle_edges)
+        augment_flow(cycle_nodes, cycle_edges, residual_capacity(j, s))
+        if i != j:
+            if parent[t] != s:
+                s, t = t, s
+            if cycle_edges.index(i) > cycle_edges.index(j):
+                p, q = q, p
+            remove_edge(s, t)
+            make_root(q)
+            add_edge(i, p, q)
+            update_potentials(i, p, q)
+
+    # 人工弧仍有流量说明原问题不可行
+    if any(x[i] != 0 for i in range(m, m + n)):
+        return None, None
+
+    flows = x[:m]
+    total_cost = sum(c * f for c, f in zip(costs, flows))
+    return total_cost, flows
+
+
+def build_tool_flow_network(r, a, b, c, p, q, allow_surplus=True):
+    """
+    构建工具购买与维修问题的时间展开网络
+
+    Args:
+        r: 各阶段需求量列表 (索引0对应阶段1)
+        a, b, c: 新购、慢修、快修单位成本
+        p, q: 慢修、快修周期
+        allow_surplus: True 对应 solve_corrected.py 的供应充足约束 (>=)，
+                       False 对应 solve_problem.py 的供需平衡约束 (=)
+
+    Returns:
+        (num_nodes, supplies, tails, heads, costs, arc_index, tree_arcs)，
+        arc_index[(类型, 阶段)] 给出 x/y/z 对应的弧编号；
+        tree_arcs 为"全部慢修、缺口新购、富余闲置"方案对应的初始可行生成树，
+        allow_surplus=False 时为None
+    """
+    n = len(r)
+    total = sum(r)
+
+    # 节点编号: P=0, R_j=j (1..n), D_k=n+k (n+1..2n), T=2n+1
+    source = 0
+    sink = 2 * n + 1
+    num_nodes = 2 * n + 2
+    supplies = [0] * num_nodes
+    supplies[source] = total
+    supplies[sink] = -total
+    for j in range(1, n + 1):
+        supplies[j] = r[j - 1]
+        supplies[n + j] = -r[j - 1]
+
+    tails, heads, costs = [], [], []
+    arc_index = {}
+
+    def add_arc(key, u, v, cost):
+        if key is not None:
+            arc_index[key] = len(tails)
+        tails.append(u)
+        heads.append(v)
+        costs.append(cost)
+
+    for k in range(1, n + 1):
+        add_arc(("x", k), source, n + k, a)
+    add_arc(("unused", 0), source, sink, 0)
+
+    for j in range(1, n + 1):
+        add_arc(("y", j), j, n + j + p if j + p <= n else sink, b)
+        add_arc(("z", j), j, n + j + q if j + q <= n else sink, c)
+
+    if not allow_surplus:
+        return num_nodes, supplies, tails, heads, costs, arc_index, None
+
+    for k in range(1, n + 1):
+        add_arc(("surplus", k), n + k, sink, 0)
+
+    # 初始生成树: 所有旧工具慢修，慢修返回不足时新购补齐，富余时闲置
+    tree_arcs = [arc_index["unused", 0]]
+    for j in range(1, n + 1):
+        tree_arcs.append(arc_index["y", j])
+    for k in range(1, n + 1):
+        slow_return = r[k - p - 1] if k - p >= 1 else 0
+        if r[k - 1] >= slow_return:
+            tree_arcs.append(arc_index["x", k])
+        else:
+            tree_arcs.append(arc_index["surplus", k])
+
+    return num_nodes, supplies, tails, heads, costs, arc_index, tree_arcs
+
+
+def solve_tool_flow(r, a, b, c, p, q, allow_surplus=True):
+    """
+    用网络单纯形法求解工具购买与维修问题
+
+    Returns:
+        结果字典 {objective, x, y, z}，x/y/z 为各阶段整数决策列表；不可行时返回None
+    """
+    num_nodes, supplies, tails, heads, costs, arc_index, tree_arcs = build_tool_flow_network(
+        r, a, b, c, p, q, allow_surplus)
+    capacities = [None] * len(tails)
+    objective, flows = network_simplex(num_nodes, supplies, tails, heads, costs, capacities,
+                                       tree_arcs)
+    if objective is None:
+        return None
+
+    n = len(r)
+    return {
+        "objective": objective,
+        "x": [flows[arc_index["x", j]] for j in range(1, n + 1)],
+        "y": [flows[arc_index["y", j]] for j in range(1, n + 1)],
+        "z": [flows[arc_index["z", j]] for j in range(1, n + 1)],
+    }
+
+
+def solve_tool_copt(r, a, b, c, p, q):
+    """用COPT求解 solve_corrected.py 中的整数规划，用于校验网络流结果"""
+    import coptpy as cp
+    from coptpy import COPT
+
+    n = len(r)
+    env = cp.Envr()
+    try:
+        model = env.createModel("corrected_tool_optimization")
+        model.setParam(COPT.Param.Logging, 0)
+        stages = range(1, n + 1)
+        x = model.addVars(stages, vtype=COPT.INTEGER, lb=0, nameprefix="x")
+        y = model.addVars(stages, vtype=COPT.INTEGER, lb=0, nameprefix="y")
+        z = model.addVars(stages, vtype=COPT.INTEGER, lb=0, nameprefix="z")
+        for j in stages:
+            slow_repair_return = y[j - p] if j - p >= 1 else 0
+            fast_repair_return = z[j - q] if j - q >= 1 else 0
+            model.addConstr(x[j] + slow_repair_return + fast_repair_return >= r[j - 1])
+            model.addConstr(y[j] + z[j] == r[j - 1])
+        model.setObjective(cp.quicksum(a * x[j] + b * y[j] + c * z[j] for j in stages),
+                           sense=COPT.MINIMIZE)
+        model.solve()
+        return model.objval if model.status == COPT.OPTIMAL else None
+    finally:
+        env.close()
+
+
+def check_edge_cases():
+    """网络单纯形法的边界情形，与手算结果比较，返回不一致的情形名称列表"""
+    cases = [
+        # (名称, 节点数, 供需, 起点, 终点, 费用, 容量, 期望费用, 期望流量)
+        ("容量为0的负费用弧", 2, [0, 0], [0], [1], [-1], [0], 0, [0]),
+        ("容量为0的弧与并行弧", 2, [3, -3], [0, 0], [1, 1], [-5, 2], [0, None], 6, [0, 3]),
+        ("容量为0导致不可行", 2, [1, -1], [0], [1], [1], [0], None, None),
+        ("负费用环受容量限制", 3, [0, 0, 0], [0, 1, 2], [1, 2, 0], [-1, -1, -1], [4, 0, 4], 0, [0, 0, 0]),
+        ("负费用环", 3, [0, 0, 0], [0, 1, 2], [1, 2, 0], [-1, -1, -1], [4, 2, 4], -6, [2, 2, 2]),
+    ]
+    failed = []
+    for name, n, supplies, tails, heads, costs, capacities, cost, flows in cases:
+        if network_simplex(n, supplies, tails, heads, costs, capacities) != (cost, flows):
+            failed.append(name)
+    return failed
+
+
+def verify_solution(r, p, q, result, allow_surplus=True):
+    """检查网络流解是否满足原整数规划的全部约束"""
+    n = len(r)
+    x, y, z = result["x"], result["y"], result["z"]
+    for j in range(1, n + 1):
+        supply = x[j - 1]
+        supply += y[j - p - 1] if j - p >= 1 else 0
+        supply += z[j - q - 1] if j - q >= 1 else 0
+        if supply < r[j - 1] or (not allow_surplus and supply != r[j - 1]):
+            return False
+        if y[j - 1] + z[j - 1] != r[j - 1]:
+            return False
+    return True
+
+
+if __name__ == "__main__":
+    # 原题数据
+    n = 10
+    r = [3, 5, 2, 4, 6, 5, 4, 3, 2, 1]
+    a, b, c, p, q = 10, 1, 3, 3, 1
+
+    print("=== 网络单纯形法求解工具购买与维修问题 ===")
+    start = time.perf_counter()
+    result = solve_tool_flow(r, a, b, c, p, q)
+    elapsed = time.perf_counter() - start
+    print(f"最小总成本: {result['objective']:.2f} (耗时 {elapsed * 1000:.2f} ms)")
+    print("阶段 | 需求 | 新购 | 慢修 | 快修")
+    for j in range(n):
+        print(f" {j + 1:2d}  | {r[j]:2d}   | {result['x'][j]:2d}   | {result['y'][j]:2d}   | {result['z'][j]:2d}")
+    print(f"约束验证: {'✓' if verify_solution(r, p, q, result) else '✗'}")
+    reference = solve_tool_copt(r, a, b, c, p, q)
+    match = reference is not None and abs(reference - result["objective"]) <= 1e-6 * max(1.0, abs(reference))
+    print(f"COPT校验: {'未求得最优解' if reference is None else f'最小总成本 {reference:.2f}'} {'✓' if match else '✗'}")
+    failed = check_edge_cases()
+    print(f"边界情形: {'✓' if not failed else '✗ ' + ', '.join(failed)}")
+
+    # 规模测试
+    sizes = [int(s) for s in sys.argv[1:]] or [100, 1000, 10000]
+    rng = random.Random(2024)
+    print("\n=== 规模测试 ===")
+    for size in sizes:
+        demand = [rng.randint(1, 20) for _ in range(size)]
+        start = time.perf_counter()
+        result = solve_tool_flow(demand, a, b, c, p, q)
+        elapsed = time.perf_counter() - start
+        status = "✓" if verify_solution(demand, p, q, result) else "✗"
+        print(f"阶段数 {size:6d}: 最小总成本 {result['objective']:10.0f}, "
+              f"耗时 {elapsed:8.3f} s, 约束验证 {status}")
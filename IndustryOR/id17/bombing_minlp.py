@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+轰炸计划问题 (IndustryOR id17) - 混合整数非线性规划，外逼近求解
+
+目标有4个要害部位，摧毁其中至少2个即可。重型炸弹最多28枚、轻型炸弹最多12枚，总油耗不超过10000升。
+每架次只带一枚炸弹，油耗 = 去程 (重型每升2公里、轻型每升3公里) + 空载返程 (每升4公里) + 起降100升。
+
+决策变量: 向部位 j 投放的重型炸弹数 x_j、轻型炸弹数 y_j (整数)。
+部位 j 未被摧毁的概率 q_j = (1 - h_j)^x_j · (1 - l_j)^y_j = exp(s_j)，
+    s_j = x_j·ln(1 - h_j) + y_j·ln(1 - l_j)  (线性)
+记 S = Σ s_j，各部位相互独立时:
+    P(至少摧毁2个) = 1 - P(0个) - P(恰好1个) = 1 + (n - 1)·e^S - Σ_j e^(S - s_j)
+其中 e^(S - s_j) 是凸项 (上镜图 + 切线割平面)，(n - 1)·e^S 以正系数出现在最大化目标中，
+用分段线性插值 (对凸函数是上估计) 逼近后主问题目标是有效上界，每轮在当前解处加断点细化。
+S 的定义域很宽而 e^S 只在 0 附近变化明显，初始断点按插值误差自适应选取 (minlp_oa.adaptive_breakpoints，
+至多 PWL_POINTS 个)；等距断点时随机实例上主问题的界远大于1。
+
+用法:
+    python bombing_minlp.py                        # 求解 id17
+    python bombing_minlp.py --method ecp
+    python bombing_minlp.py --benchmark            # id17 和随机生成的 8~32 个部位实例，比较 oa / ecp
+    python bombing_minlp.py --benchmark --time-limit 30    # 每次求解限时30秒 (默认60秒)，超时时输出已有的最好解和界
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+
+import coptpy as cp
+from coptpy import COPT
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from minlp_oa import OuterApproximation, adaptive_breakpoints  # noqa: E402
+
+# 题目数据
+PARTS = [1, 2, 3, 4]
+DISTANCE = {1: 450, 2: 480, 3: 540, 4: 600}            # 距机场 (公里)
+HEAVY_PROB = {1: 0.03, 2: 0.10, 3: 0.05, 4: 0.05}      # 每枚重型炸弹的摧毁概率
+LIGHT_PROB = {1: 0.08, 2: 0.11, 3: 0.12, 4: 0.09}      # 每枚轻型炸弹的摧毁概率
+HEAVY_STOCK = 28
+LIGHT_STOCK = 12
+FUEL_LIMIT = 10000
+HEAVY_KM_PER_L = 2
+LIGHT_KM_PER_L = 3
+EMPTY_KM_PER_L = 4
+TAKEOFF_LANDING_L = 100
+# e^S 的初始断点数上限
+PWL_POINTS = 16
+
+
+def problem_instance():
+    """id17 的数据"""
+    return {
+        "parts": list(PARTS),
+        "distance": dict(DISTANCE),
+        "heavy_prob": dict(HEAVY_PROB),
+        "light_prob": dict(LIGHT_PROB),
+        "heavy_stock": HEAVY_STOCK,
+        "light_stock": LIGHT_STOCK,
+        "fuel_limit": FUEL_LIMIT,
+    }
+
+
+def random_instance(parts, seed=0):
+    """随机生成 parts 个要害部位的实例 (炸弹库存和油量与部位数成比例)"""
+    rng = random.Random(seed)
+    labels = list(range(1, parts + 1))
+    return {
+        "parts": labels,
+        "distance": {j: rng.randint(400, 700) for j in labels},
+        "heavy_prob": {j: round(rng.uniform(0.02, 0.12), 3) for j in labels},
+        "light_prob": {j: round(rng.uniform(0.05, 0.15), 3) for j in labels},
+        "heavy_stock": 7 * parts,
+        "light_stock": 3 * parts,
+        "fuel_limit": 2500 * parts,
+    }
+
+
+def fuel_per_trip(distance, km_per_liter):
+    """一架次的油耗: 去程 + 空载返程 + 起降"""
+    return distance / km_per_liter + distance / EMPTY_KM_PER_L + TAKEOFF_LANDING_L
+
+
+def success_probability(data, heavy, light):
+    """按投弹方案直接计算至少摧毁2个部位的概率"""
+    survive = [(1 - data["heavy_prob"][j]) ** heavy[j] * (1 - data["light_prob"][j]) ** light[j]
+               for j in data["parts"]]
+    none = math.prod(survive)
+    exactly_one = sum((1 - q) * none / q for q in survive)
+    return 1 - none - exactly_one
+
+
+def build_model(env, data):
+    """
+    建立主问题并加入非线性项
+
+    Returns:
+        (model, oa, heavy, light)
+    """
+    parts = data["parts"]
+    model = env.createModel("bombing_minlp")
+    model.setParam(COPT.Param.Logging, 0)
+    heavy = {j: model.addVar(lb=0, vtype=COPT.INTEGER, name=f"heavy_{j}") for j in parts}
+    light = {j: model.addVar(lb=0, vtype=COPT.INTEGER, name=f"light_{j}") for j in parts}
+
+    model.addConstr(cp.quicksum(heavy.values()) <= data["heavy_stock"], name="heavy_stock")
+    model.addConstr(cp.quicksum(light.values()) <= data["light_stock"], name="light_stock")
+    model.addConstr(
+        cp.quicksum(fuel_per_trip(data["distance"][j], HEAVY_KM_PER_L) * heavy[j]
+                    + fuel_per_trip(data["distance"][j], LIGHT_KM_PER_L) * light[j] for j in parts)
+        <= data["fuel_limit"],
+        name="fuel_limit",
+    )
+
+    # s_j = ln(部位 j 未被摧毁的概率)
+    log_survive = {j: math.log(1 - data["heavy_prob"][j]) * heavy[j]
+                   + math.log(1 - data["light_prob"][j]) * light[j] for j in parts}
+    total = cp.quicksum(log_survive.values())
+
+    oa = OuterApproximation(model)
+    # e^(S - s_j) = 除部位 j 外全部未被摧毁的概率 (凸项)
+    others = [oa.convex(total - log_survive[j], math.exp, math.exp, name=f"others_survive_{j}") for j in parts]
+    # e^S = 全部未被摧毁的概率 (分段线性)
+    none = oa.separable(total, math.exp, name="none_destroyed",
+                        grid=lambda lower, upper: adaptive_breakpoints(math.exp, lower, upper, max_points=PWL_POINTS))
+    model.setObjective(1 + (len(parts) - 1) * none - cp.quicksum(others), COPT.MAXIMIZE)
+    return model, oa, heavy, light
+
+
+def solve_bombing(data, method="oa", verbose=True, time_limit=None):
+    """求解一个实例，返回结果字典 (额外包含投弹方案和按方案直接计算的概率)，time_limit 为总时间限制 (秒)"""
+    env = None
+    try:
+        env = cp.Envr()
+        model, oa, heavy, light = build_model(env, data)
+        result = oa.solve(method=method, time_limit=time_limit)
+        if result["values"] is None:
+            if verbose:
+                print(f"求解失败: {result['status']}")
+            return result
+        plan_heavy = {j: round(result["values"][heavy[j].name]) for j in data["parts"]}
+        plan_light = {j: round(result["values"][light[j].name]) for j in data["parts"]}
+        result["heavy"], result["light"] = plan_heavy, plan_light
+        result["check"] = success_probability(data, plan_heavy, plan_light)
+        if verbose:
+            fuel = sum(fuel_per_trip(data["distance"][j], HEAVY_KM_PER_L) * plan_heavy[j]
+                       + fuel_per_trip(data["distance"][j], LIGHT_KM_PER_L) * plan_light[j] for j in data["parts"])
+            print(f"\n求解状态: {result['status']} (方法 {method}, {result['iterations']} 轮, "
+                  f"主问题求解 {result['master_solves']} 次, 切线 {result['cuts']} 条, "
+                  f"断点 {result['breakpoints']} 个, 耗时 {result['time']:.3f} 秒)")
+            print(f"最大成功概率: {result['objective']:.6f} (上界 {result['bound']:.6f}, 间隙 {result['gap']:.2e})")
+            print("\n投弹方案:")
+            for j in data["parts"]:
+                survive = ((1 - data["heavy_prob"][j]) ** plan_heavy[j]
+                           * (1 - data["light_prob"][j]) ** plan_light[j])
+                print(f"  部位{j}: 重型 {plan_heavy[j]:>2} 枚, 轻型 {plan_light[j]:>2} 枚, 摧毁概率 {1 - survive:.4f}")
+            print(f"\n重型炸弹: {sum(plan_heavy.values())}/{data['heavy_stock']}  "
+                  f"轻型炸弹: {sum(plan_light.values())}/{data['light_stock']}  "
+                  f"油耗: {fuel:.1f}/{data['fuel_limit']} 升")
+        return result
+
+    except cp.CoptError as e:
+        print(f"COPT Error: {e.retcode} - {e.message}")
+        return None
+    finally:
+        if env is not None:
+            env.close()
+
+
+def benchmark(sizes, seeds, time_limit=None):
+    """id17 和随机实例上比较单树外逼近 (oa) 与扩展割平面法 (ecp)，每次求解限时 time_limit 秒"""
+    instances = [("id17", problem_instance())]
+    instances += [(f"n={n} s={seed}", random_instance(n, seed)) for n in sizes for seed in range(seeds)]
+    print(f"\n{'实例':<12} {'方法':<5} {'状态':<16} {'成功概率':>10} {'上界':>10} {'间隙':>9} {'轮数':>5} "
+          f"{'主问题':>6} {'切线':>5} {'断点':>5} {'耗时(s)':>9}")
+    print("-" * 104)
+    for label, data in instances:
+        for method in ("oa", "ecp"):
+            result = solve_bombing(data, method, verbose=False, time_limit=time_limit)
+            if result is None or result["objective"] is None:
+                print(f"{label:<12} {method:<5} 求解失败")
+                continue
+            print(f"{label:<12} {method:<5} {result['status']:<16} {result['objective']:>10.6f} "
+                  f"{result['bound']:>10.6f} {result['gap']:>9.2e} {result['iterations']:>5} "
+                  f"{result['master_solves']:>6} {result['cuts']:>5} {result['breakpoints']:>5} {result['time']:>9.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="轰炸计划问题 (MINLP 外逼近)")
+    parser.add_argument("--method", choices=["oa", "ecp"], default="oa", help="oa: 回调中加切线; ecp: 每轮重新求解")
+    parser.add_argument("--benchmark", action="store_true", help="在 id17 和随机实例上比较 oa 与 ecp")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[8, 16, 24, 32], help="随机实例的部位数")
+    parser.add_argument("--seeds", type=int, default=2, help="每种规模的随机实例个数")
+    parser.add_argument("--time-limit", type=float, default=60.0, help="每次求解的时间限制 (秒)")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.sizes, args.seeds, args.time_limit)
+        return
+
+    print("轰炸计划问题 (混合整数非线性规划)")
+    print("=" * 60)
+    result = solve_bombing(problem_instance(), args.method, time_limit=args.time_limit)
+    if result is not None and result["objective"] is not None:
+        print("\n" + "=" * 60)
+        print(f"最大成功概率: {result['objective']:.4f} (按方案直接计算: {result['check']:.4f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+纺织厂生产目标规划问题 (IndustryOR id18) - 多目标求解
+
+纺织厂生产窗帘布和服装布，两种布的生产速度都是每小时1000米，每周正常生产时间110小时。
+每周最多可销售窗帘布70000米 (利润2.5元/米)、服装布45000米 (利润1.5元/米)。
+决策变量为两种布的每周生产小时数 (连续)，产量不超过可销售量。
+
+目标 (按题目的优先级):
+    p1  充分利用每周110小时的生产时间    -> 最小化开工不足 d1-
+    p2  每周加班不超过10小时              -> 最小化超出10小时的加班 d2+
+    p3  窗帘布销售70000米、服装布45000米  -> 最小化销售不足，按每米利润 2.5:1.5 加权
+    p4  尽量减少加班                      -> 最小化加班 d1+
+另外把周利润本身也作为一个目标 (最大化)，以便查看利润与加班之间的Pareto权衡。
+
+题目没有给出各目标之间的权重，本脚本给出按优先级 p1 > p2 > p3 > p4 的字典序解、Pareto前沿，
+并可按任意优先级或权重在同一个模型上求解 (见 ../pareto.py)。
+
+用法:
+    python goal_programming.py
+    python goal_programming.py --priority under_time excess_overtime overtime sales_shortfall
+    python goal_programming.py --points 6 --workers 2
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import coptpy as cp
+from coptpy import COPT
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pareto import ParetoEngine, select  # noqa: E402
+
+FABRICS = ["窗帘布", "服装布"]
+RATE = 1000                               # 米/小时
+MARKET = {"窗帘布": 70000, "服装布": 45000}  # 每周最大销售量 (米)
+PROFIT = {"窗帘布": 2.5, "服装布": 1.5}      # 元/米
+REGULAR_HOURS = 110
+OVERTIME_LIMIT = 10
+
+# 目标名 -> 显示名称
+OBJECTIVES = {
+    "under_time": "p1 开工不足",
+    "excess_overtime": "p2 超额加班",
+    "sales_shortfall": "p3 销售不足",
+    "overtime": "p4 加班",
+    "profit": "周利润",
+}
+GOAL_PRIORITY = ["under_time", "excess_overtime", "sales_shortfall", "overtime"]
+
+
+def build_model(env):
+    """建立目标规划模型，返回 (model, {目标名: (表达式, 方向)})"""
+    model = env.createModel("textile_goal_programming")
+    hours = {f: model.addVar(lb=0, ub=MARKET[f] / RATE, name=f"hours_{f}") for f in FABRICS}
+    under = model.addVar(lb=0, name="under_time")
+    overtime = model.addVar(lb=0, name="overtime")
+    excess = model.addVar(lb=0, name="excess_overtime")
+
+    # 总生产时间 + 开工不足 - 加班 = 110
+    model.addConstr(cp.quicksum(hours.values()) + under - overtime == REGULAR_HOURS, name="goal_time")
+    # 加班 - 超额加班 <= 10
+    model.addConstr(overtime - excess <= OVERTIME_LIMIT, name="goal_overtime")
+
+    # 销售不足按每米利润加权 (元)
+    shortfall = cp.quicksum(PROFIT[f] * (MARKET[f] - RATE * hours[f]) for f in FABRICS)
+    profit = cp.quicksum(PROFIT[f] * RATE * hours[f] for f in FABRICS)
+
+    objectives = {
+        "under_time": (cp.LinExpr(under), COPT.MINIMIZE),
+        "excess_overtime": (cp.LinExpr(excess), COPT.MINIMIZE),
+        "sales_shortfall": (shortfall, COPT.MINIMIZE),
+        "overtime": (cp.LinExpr(overtime), COPT.MINIMIZE),
+        "profit": (profit, COPT.MAXIMIZE),
+    }
+    return model, objectives
+
+
+def describe(point):
+    """一个解的产量和各目标值"""
+    values = point["values"]
+    plan = ", ".join(f"{f} {values[f'hours_{f}'] * RATE:,.0f} 米" for f in FABRICS)
+    goals = ", ".join(f"{OBJECTIVES[n]} {point['objectives'][n]:,.2f}" for n in OBJECTIVES)
+    return f"{plan} | {goals}"
+
+
+def parse_weights(items):
+    weights = {}
+    for item in items:
+        name, _, value = item.partition("=")
+        if name not in OBJECTIVES:
+            raise ValueError(f"未知的目标: {name}")
+        weights[name] = float(value)
+    return weights
+
+
+def solve_goal_programming(priority=None, weights=None, primary="profit", points=6, workers=1):
+    """求解支付表、字典序解、Pareto前沿，返回字典序解的周利润"""
+    env = None
+    try:
+        env = cp.Envr()
+        engine = ParetoEngine(build_model, env)
+
+        ideal, nadir, table = engine.payoff()
+        print("\n支付表 (行: 首先优化的目标):")
+        print(f"{'':<14}" + "".join(f"{OBJECTIVES[n]:>14}" for n in OBJECTIVES))
+        for first in OBJECTIVES:
+            print(f"{OBJECTIVES[first]:<14}" + "".join(f"{table[first][n]:>14,.2f}" for n in OBJECTIVES))
+
+        priority = priority or GOAL_PRIORITY
+        point = engine.lexicographic(priority)
+        print(f"\n字典序解 ({' > '.join(OBJECTIVES[n] for n in priority)}):")
+        print(f"  {describe(point)}")
+
+        if weights:
+            weighted = engine.weighted(weights, ideal, nadir)
+            print(f"\n加权和解 (归一化权重 {weights}):")
+            print(f"  {describe(weighted)}")
+
+        begin = time.perf_counter()
+        front = engine.front(primary, points, workers, ideal, nadir)
+        elapsed = time.perf_counter() - begin
+        print(f"\nPareto前沿 (ε-约束法, 主目标 {OBJECTIVES[primary]}, 每个目标 {points} 个ε值, "
+              f"{workers} 个进程, 耗时 {elapsed:.2f} 秒, 共 {len(front)} 个非支配点):")
+        for p in front:
+            print(f"  {describe(p)}")
+
+        chosen = select(front, engine.senses, priority=priority)
+        if chosen is not None:
+            print(f"\n前沿上按同一优先级选出的点: {describe(chosen)}")
+        return point["objectives"]["profit"]
+
+    except cp.CoptError as e:
+        print(f"COPT Error: {e.retcode} - {e.message}")
+        return None
+    finally:
+        if env is not None:
+            env.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="纺织厂生产目标规划 (多目标)")
+    parser.add_argument("--priority", nargs="+", choices=list(OBJECTIVES), help="字典序优先级 (默认 p1 p2 p3 p4)")
+    parser.add_argument("--weights", nargs="+", default=[], help="加权和的权重，如 profit=1 overtime=1")
+    parser.add_argument("--primary", default="profit", choices=list(OBJECTIVES), help="ε-约束法的主目标")
+    parser.add_argument("--points", type=int, default=6, help="每个非主目标的ε网格点数")
+    parser.add_argument("--workers", type=int, default=1, help="并行进程数")
+    args = parser.parse_args()
+    try:
+        weights = parse_weights(args.weights)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print("纺织厂生产目标规划问题 (多目标)")
+    print("=" * 60)
+    profit = solve_goal_programming(args.priority, weights, args.primary, args.points, args.workers)
+    if profit is not None:
+        print("\n" + "=" * 60)
+        print(f"字典序解的周利润: {profit:,.2f} 元")
+
+
+if __name__ == "__main__":
+    main()
@@ -30,6 +30,12 @@ try:
         ('III', 'A2', 'B2')
     ]
     
+    # 设备 -> 经过该设备的路径 索引，避免每台设备都扫描一遍完整路径列表
+    routes_by_machine = {m: [] for m in all_equipment}
+    for p, a, b in routes:
+        routes_by_machine[a].append((p, a, b))
+        routes_by_machine[b].append((p, a, b))
+    
     # 产品售价 (元/件)
     sell_price = {'I': 1.25, 'II': 2.00, 'III': 2.80}
     
@@ -77,8 +83,7 @@ try:
         # 对于每台A设备，总加工时间不超过有效工时
         a_workload = cp.quicksum(
             processing_time[(p, a)] * x[p, a, b]
-            for p, a_eq, b in routes
-            if a_eq == a and (p, a) in processing_time
+            for p, _, b in routes_by_machine[a]
         )
         model.addConstr(a_workload <= machine_hours[a], name=f"capacity_A_{a}")
     
@@ -87,8 +92,7 @@ try:
         # 对于每台B设备，总加工时间不超过有效工时
         b_workload = cp.quicksum(
             processing_time[(p, b)] * x[p, a, b]
-            for p, a, b_eq in routes
-            if b_eq == b and (p, b) in processing_time
+            for p, a, _ in routes_by_machine[b]
         )
         model.addConstr(b_workload <= machine_hours[b], name=f"capacity_B_{b}")
     
@@ -105,21 +109,13 @@ try:
     # 设备A的启用约束
     for a in equipment_A:
         if big_M[a] > 0:
-            a_production = cp.quicksum(
-                x[p, a, b]
-                for p, a_eq, b in routes
-                if a_eq == a
-            )
+            a_production = cp.quicksum(x[route] for route in routes_by_machine[a])
             model.addConstr(a_production <= big_M[a] * y[a], name=f"activation_A_{a}")
     
     # 设备B的启用约束
     for b in equipment_B:
         if big_M[b] > 0:
-            b_production = cp.quicksum(
-                x[p, a, b]
-                for p, a, b_eq in routes
-                if b_eq == b
-            )
+            b_production = cp.quicksum(x[route] for route in routes_by_machine[b])
             model.addConstr(b_production <= big_M[b] * y[b], name=f"activation_B_{b}")
     
     # 6. 设置目标函数：最大化总利润
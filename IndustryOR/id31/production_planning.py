@@ -43,6 +43,12 @@ def solve_production_planning():
             ('III', 'A2', 'B2')
         ]
         
+        # 设备 -> 经过该设备的路径 索引，避免每台设备都扫描一遍完整路径列表
+        routes_by_machine = {m: [] for m in all_equipment}
+        for p, a, b in valid_routes:
+            routes_by_machine[a].append((p, a, b))
+            routes_by_machine[b].append((p, a, b))
+        
         # 加工时间数据 T_{p,m} (小时/件)
         processing_time = {
             # 产品I的加工时间
@@ -106,8 +112,7 @@ def solve_production_planning():
             # 对于设备a，计算所有使用该设备的路径的工时消耗
             constraint_expr = cp.quicksum(
                 processing_time[p, a] * x[p, a, b] 
-                for p, a_used, b in valid_routes 
-                if a_used == a
+                for p, _, b in routes_by_machine[a]
             )
             model.addConstr(constraint_expr <= machine_hours[a], 
                           name=f"capacity_A_{a}")
@@ -116,9 +121,8 @@ def solve_production_planning():
         for b in equipment_B:
             # 对于设备b，计算所有使用该设备的路径的工时消耗
             constraint_expr = cp.quicksum(
-                processing_time[p, b] * x[p, a, b_used] 
-                for p, a, b_used in valid_routes 
-                if b_used == b
+                processing_time[p, b] * x[p, a, b] 
+                for p, a, _ in routes_by_machine[b]
             )
             model.addConstr(constraint_expr <= machine_hours[b], 
                           name=f"capacity_B_{b}")
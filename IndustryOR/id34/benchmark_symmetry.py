@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+集装箱装载模型对称性破除基准测试
+
+将原始需求按倍数放大，分别用基础模型和增强模式(FFD上界 + 载重排序约束 + MIP初始解)
+求解，对比模型规模、建模时间、求解时间、搜索节点数和目标值。
+
+用法:
+    python benchmark_symmetry.py [倍数1 倍数2 ...]
+"""
+
+import csv
+import os
+import sys
+import time
+
+import coptpy as cp
+from coptpy import COPT
+
+from production_planning import DEMANDS, build_container_model
+
+DEFAULT_SCALES = [1, 2, 4, 8]
+TIME_LIMIT = 120.0
+
+
+def run_instance(env, demands, enhanced):
+    """构建并求解一个实例，返回统计信息字典"""
+    model = env.createModel("container_packing_benchmark")
+    model.setParam(COPT.Param.Logging, 0)
+    model.setParam(COPT.Param.TimeLimit, TIME_LIMIT)
+
+    build_start = time.perf_counter()
+    containers, x, y, a, ffd_packing = build_container_model(model, demands, enhanced)
+    build_time = time.perf_counter() - build_start
+
+    solve_start = time.perf_counter()
+    model.solve()
+    solve_time = time.perf_counter() - solve_start
+
+    has_solution = model.getAttr(COPT.Attr.HasMipSol)
+    return {
+        "mode": "enhanced" if enhanced else "base",
+        "max_containers": len(containers),
+        "ffd_bound": len(ffd_packing) if ffd_packing is not None else "",
+        "rows": model.getAttr(COPT.Attr.Rows),
+        "cols": model.getAttr(COPT.Attr.Cols),
+        "status": model.status,
+        "objective": round(model.objval) if has_solution else "",
+        "best_bound": model.getAttr(COPT.Attr.BestBnd),
+        "nodes": model.getAttr(COPT.Attr.NodeCnt),
+        "build_time": round(build_time, 4),
+        "solve_time": round(solve_time, 4),
+    }
+
+
+def main():
+    scales = [int(s) for s in sys.argv[1:]] or DEFAULT_SCALES
+    results = []
+
+    env = cp.Envr()
+    try:
+        for scale in scales:
+            demands = {i: q * scale for i, q in DEMANDS.items()}
+            for enhanced in (False, True):
+                row = {"scale": scale}
+                row.update(run_instance(env, demands, enhanced))
+                results.append(row)
+                print(f"倍数={scale:<3} 模式={row['mode']:<8} "
+                      f"集装箱上限={row['max_containers']:<4} 目标值={row['objective']!s:<5} "
+                      f"节点数={row['nodes']:<8} 建模={row['build_time']:.3f}s "
+                      f"求解={row['solve_time']:.3f}s")
+    except cp.CoptError as e:
+        print(f"COPT Error: {e.retcode} - {e.message}")
+    finally:
+        env.close()
+
+    if results:
+        os.makedirs("output", exist_ok=True)
+        output_file = os.path.join("output", "benchmark_symmetry.csv")
+        with open(output_file, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0].keys()))
+            writer.writeheader()
+            writer.writerows(results)
+        print(f"\n基准测试结果已保存到 {output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+集装箱装载问题的装载模式列生成 (Gilmore-Gomory) 求解
+
+主问题按"装载模式"建模：每个模式p是一个满足全部单箱规则的装载方案 q[i,p]，
+lambda[p] 表示按模式p装载的集装箱个数。
+
+    min  sum_p lambda[p]
+    s.t. sum_p q[i,p] * lambda[p] = D_i,   对每种货物i
+         lambda[p] >= 0 且为整数
+
+主问题只有 |货物种类| 行，规模与集装箱数量无关。
+
+定价子问题在单个集装箱上求最大对偶价值的装载模式：
+
+    max  sum_i pi_i * q_i
+    s.t. 18 <= sum_i w_i * q_i <= 60
+         q_D >= 12
+         q_A <= U_A * a,  q_C >= a   (装载A则至少装载1件C)
+
+若 1 - max < 0 则该模式的检验数为负，加入主问题。列生成收敛后在已生成的模式上
+求解整数主问题 (price-and-branch)，初始列使用FFD启发式方案以保证整数主问题可行；
+若整数解高于LP下界，则固定LP解的主体部分、对残余需求用逐箱分配模型精确求解，
+把得到的模式补入主问题后重新求解。
+"""
+
+import math
+import sys
+
+import coptpy as cp
+from coptpy import COPT
+
+from production_planning import (
+    DEMANDS, GOODS, WEIGHTS, MAX_CAPACITY, MIN_CAPACITY,
+    MIN_D_QUANTITY, MIN_C_WHEN_A, build_container_model, first_fit_decreasing,
+)
+
+MAX_ITERATIONS = 200
+REDUCED_COST_TOL = 1e-6
+MASTER_TIME_LIMIT = 60.0
+RESIDUAL_TIME_LIMIT = 60.0
+
+
+def pattern_key(pattern):
+    """模式的可哈希表示"""
+    return tuple(pattern[i] for i in GOODS)
+
+
+def is_feasible_pattern(pattern):
+    """检查单个装载模式是否满足全部单箱规则"""
+    load = sum(WEIGHTS[i] * pattern[i] for i in GOODS)
+    if load < MIN_CAPACITY - 1e-9 or load > MAX_CAPACITY + 1e-9:
+        return False
+    if pattern['D'] < MIN_D_QUANTITY:
+        return False
+    if pattern['A'] > 0 and pattern['C'] < MIN_C_WHEN_A:
+        return False
+    return True
+
+
+def build_pricing_model(env, demands):
+    """构建定价子问题模型，目标函数在每次迭代时按对偶值更新"""
+    model = env.createModel("container_pattern_pricing")
+    model.setParam(COPT.Param.Logging, 0)
+
+    q = {}
+    upper = {}
+    for i in GOODS:
+        upper[i] = min(demands[i], int(MAX_CAPACITY // WEIGHTS[i]))
+        q[i] = model.addVar(vtype=COPT.INTEGER, lb=0, ub=upper[i], name=f"q_{i}")
+    a = model.addVar(vtype=COPT.BINARY, name="a")
+
+    load = cp.quicksum(WEIGHTS[i] * q[i] for i in GOODS)
+    model.addConstr(load <= MAX_CAPACITY, name="max_capacity")
+    model.addConstr(load >= MIN_CAPACITY, name="min_capacity")
+    model.addConstr(q['D'] >= MIN_D_QUANTITY, name="min_d_quantity")
+    model.addConstr(q['A'] <= upper['A'] * a, name="a_indicator_upper")
+    model.addConstr(q['C'] >= MIN_C_WHEN_A * a, name="c_when_a")
+
+    return model, q
+
+
+class PatternMaster:
+    """受限主问题：维护已生成的装载模式及其对应的列"""
+
+    def __init__(self, env, demands):
+        self.model = env.createModel("container_pattern_master")
+        self.model.setParam(COPT.Param.Logging, 0)
+        self.rows = {}
+        for i in GOODS:
+            self.rows[i] = self.model.addConstr(cp.LinExpr() == demands[i], name=f"demand_{i}")
+        self.patterns = []
+        self.columns = []
+        self.seen = set()
+
+    def add_pattern(self, pattern):
+        """加入新模式，已存在时返回False"""
+        key = pattern_key(pattern)
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        col = cp.Column()
+        for i in GOODS:
+            if pattern[i] > 0:
+                col.addTerm(self.rows[i], pattern[i])
+        self.columns.append(self.model.addVar(lb=0, obj=1.0, vtype=COPT.CONTINUOUS,
+                                              name=f"lambda_{len(self.columns)}", column=col))
+        self.patterns.append(dict(pattern))
+        return True
+
+
+def column_generation(master, pricing, q, verbose=False):
+    """
+    执行列生成直至不存在负检验数的模式
+
+    只有定价子问题求到最优且最小检验数非负 (converged 为 True) 时，受限主问题的LP值才是
+    全部模式上LP的最优值 (整数主问题的下界)；达到 MAX_ITERATIONS、定价失败或生成重复模式时
+    它只是受限主问题的LP值。
+
+    Returns:
+        (受限主问题LP值, 迭代次数, converged)，受限主问题不可行时LP值为None
+    """
+    iteration = 0
+    converged = False
+    for iteration in range(1, MAX_ITERATIONS + 1):
+        master.model.solve()
+        if master.model.status != COPT.OPTIMAL:
+            return None, iteration, False
+
+        duals = {i: master.rows[i].pi for i in GOODS}
+        pricing.setObjective(cp.quicksum(duals[i] * q[i] for i in GOODS),
+                             sense=COPT.MAXIMIZE)
+        pricing.solve()
+        if pricing.status != COPT.OPTIMAL:
+            break
+
+        reduced_cost = 1.0 - pricing.objval
+        if verbose:
+            print(f"迭代 {iteration:3d}: 主问题LP = {master.model.objval:.4f}, "
+                  f"最小检验数 = {reduced_cost:.6f}, 模式数 = {len(master.patterns)}")
+        if reduced_cost >= -REDUCED_COST_TOL:
+            converged = True
+            break
+        if not master.add_pattern({i: int(round(q[i].x)) for i in GOODS}):
+            break
+
+    return master.model.objval, iteration, converged
+
+
+def residual_repair(env, master, demands):
+    """
+    LP取整 + 残余需求精确求解的修复启发式
+
+    按LP解固定每个模式 floor(lambda)-1 个集装箱 (保留一个集装箱的调整余地)，
+    剩余需求用 production_planning 中的逐箱分配模型精确求解。残余部分的装载方案
+    作为新模式加入主问题。
+
+    Returns:
+        {模式索引: 使用次数}，残余模型无解时返回None
+    """
+    fixed_counts = [max(0, int(math.floor(var.x + 1e-6)) - 1) for var in master.columns]
+    residual = dict(demands)
+    for pattern, count in zip(master.patterns, fixed_counts):
+        for i in GOODS:
+            residual[i] -= pattern[i] * count
+
+    model = env.createModel("container_residual_repair")
+    model.setParam(COPT.Param.Logging, 0)
+    model.setParam(COPT.Param.TimeLimit, RESIDUAL_TIME_LIMIT)
+    containers, x, y, a, _ = build_container_model(model, residual, enhanced=True)
+    model.solve()
+    if not model.getAttr(COPT.Attr.HasMipSol):
+        return None
+
+    start = {k: count for k, count in enumerate(fixed_counts) if count > 0}
+    for j in containers:
+        if y[j].x < 0.5:
+            continue
+        pattern = {i: int(round(x[i, j].x)) for i in GOODS}
+        master.add_pattern(pattern)
+        k = master.patterns.index(pattern)
+        start[k] = start.get(k, 0) + 1
+    return start
+
+
+def solve_pattern_master(demands=None, verbose=True):
+    """
+    列生成求解集装箱装载问题
+
+    Args:
+        demands: 各货物需求量，默认使用原题数据
+        verbose: 是否打印迭代过程
+
+    Returns:
+        结果字典 {containers, lp_value, lp_bound, converged, patterns, iterations, num_patterns}，失败时返回None；
+        列生成未收敛时 lp_bound 为None (lp_value 只是受限主问题的LP值，不是下界)
+    """
+    demands = dict(DEMANDS if demands is None else demands)
+
+    try:
+        env = cp.Envr()
+
+        # 1. 初始列: FFD启发式方案中的各个装载模式
+        ffd_packing = first_fit_decreasing(demands)
+        if ffd_packing is None:
+            print("FFD启发式未找到可行方案，无法构造初始列")
+            return None
+
+        master = PatternMaster(env, demands)
+        for packing in ffd_packing:
+            master.add_pattern(packing)
+        pricing, q = build_pricing_model(env, demands)
+
+        # 2. 列生成求LP下界
+        lp_value, iterations, converged = column_generation(master, pricing, q, verbose)
+        if lp_value is None:
+            print(f"受限主问题未得到最优解。状态码: {master.model.status}")
+            return None
+        lp_bound = lp_value if converged else None
+        if not converged and verbose:
+            print(f"列生成在 {iterations} 轮后未收敛，受限主问题LP值 {lp_value:.4f} 不作为下界")
+
+        # 3. 整数主问题高于LP下界时，先用残余需求修复补充模式并作为MIP初始解
+        lp_columns = list(master.columns)
+        master.model.setParam(COPT.Param.TimeLimit, MASTER_TIME_LIMIT)
+        for var in lp_columns:
+            var.vtype = COPT.INTEGER
+        master.model.solve()
+        if not master.model.getAttr(COPT.Attr.HasMipSol):
+            print(f"整数主问题无可行解。状态码: {master.model.status}")
+            return None
+
+        # 未收敛时没有下界可比较，总是执行残余需求修复
+        if lp_bound is None or round(master.model.objval) > math.ceil(lp_bound - 1e-6):
+            if verbose and lp_bound is not None:
+                print(f"整数主问题目标 {round(master.model.objval)} 高于LP下界 "
+                      f"{math.ceil(lp_bound - 1e-6)}，执行残余需求修复")
+            for var in lp_columns:
+                var.vtype = COPT.CONTINUOUS
+            master.model.solve()
+            start = residual_repair(env, master, demands)
+            for var in master.columns:
+                var.vtype = COPT.INTEGER
+            if start is not None:
+                master.model.setMipStart(master.columns,
+                                         [start.get(k, 0) for k in range(len(master.columns))])
+                master.model.loadMipStart()
+            master.model.solve()
+
+        used_patterns = []
+        for pattern, var in zip(master.patterns, master.columns):
+            count = int(round(var.x))
+            if count > 0:
+                used_patterns.append((pattern, count))
+
+        return {
+            "containers": int(round(master.model.objval)),
+            "lp_value": lp_value,
+            "lp_bound": lp_bound,
+            "converged": converged,
+            "patterns": used_patterns,
+            "iterations": iterations,
+            "num_patterns": len(master.patterns),
+        }
+
+    except cp.CoptError as e:
+        print(f"COPT Error: {e.retcode} - {e.message}")
+        return None
+    finally:
+        if 'env' in locals() and env is not None:
+            env.close()
+
+
+if __name__ == "__main__":
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    demands = {i: q * scale for i, q in DEMANDS.items()}
+    result = solve_pattern_master(demands)
+    if result is None:
+        print("求解失败")
+        sys.exit(1)
+
+    print("\n" + "=" * 50)
+    print("列生成求解结果")
+    print("=" * 50)
+    if result["converged"]:
+        target = math.ceil(result["lp_bound"] - 1e-6)
+        print(f"LP下界: {result['lp_bound']:.4f} (向上取整 {target})")
+        optimal = "已证明最优" if result["containers"] == target else f"与下界相差 {result['containers'] - target}"
+        print(f"最少使用集装箱数量: {result['containers']} ({optimal})")
+    else:
+        print(f"列生成未收敛，受限主问题LP值 {result['lp_value']:.4f} 不是下界")
+        print(f"使用集装箱数量: {result['containers']} (未证明最优)")
+    print(f"列生成迭代次数: {result['iterations']}, 生成模式数: {result['num_patterns']}")
+
+    print("\n使用的装载模式:")
+    for pattern, count in result["patterns"]:
+        load = sum(WEIGHTS[i] * pattern[i] for i in GOODS)
+        content = ", ".join(f"{i}={pattern[i]}" for i in GOODS if pattern[i] > 0)
+        status = "✓" if is_feasible_pattern(pattern) else "✗"
+        print(f"  {count} 个集装箱 × [{content}] 载重 {load:.2f} 吨 {status}")
+
+    print("\n需求满足验证:")
+    for i in GOODS:
+        loaded = sum(pattern[i] * count for pattern, count in result["patterns"])
+        print(f"  {i}: 装载 {loaded} / 需求 {demands[i]} = {'✓' if loaded == demands[i] else '✗'}")
@@ -6,12 +6,303 @@
 问题描述：
 - 目标：最小化使用的集装箱数量
 - 约束：载重限制、货物依赖关系、最小装载要求等
+
+增强模式 (enhanced=True)：
+- 用首次适应递减(FFD)启发式求出可行装箱方案，以其集装箱数量作为上界收缩 max_containers
+- 在 y[j] >= y[j+1] 的基础上增加载重排序约束 load[j] >= load[j+1] 和集装箱数量下界
+- 将FFD方案作为MIP初始解传给求解器
 """
 
+import math
+import os
+import sys
+
 import coptpy as cp
 from coptpy import COPT
 
-def solve_container_packing():
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from param_tuning import apply_tuned_profile  # noqa: E402
+
+# 货物类型
+GOODS = ['A', 'B', 'C', 'D', 'E']
+
+# 需求量
+DEMANDS = {
+    'A': 120,
+    'B': 90,
+    'C': 300,
+    'D': 90,
+    'E': 120
+}
+
+# 单位重量 (吨)
+WEIGHTS = {
+    'A': 0.5,
+    'B': 1.0,
+    'C': 0.4,
+    'D': 0.6,
+    'E': 0.65
+}
+
+# 集装箱参数
+MAX_CAPACITY = 60  # 最大载重 (吨)
+MIN_CAPACITY = 18  # 最小载重 (吨)
+MIN_D_QUANTITY = 12  # 每个集装箱最少装载D的数量
+MIN_C_WHEN_A = 1   # 装载A时C的最小数量
+
+EPS = 1e-9
+
+
+def _container_load(packing):
+    """计算单个集装箱的装载重量"""
+    return sum(WEIGHTS[i] * q for i, q in packing.items())
+
+
+def _try_pack(demands, num_containers):
+    """
+    在固定数量的集装箱上执行首次适应递减装箱
+
+    每个集装箱先放入MIN_D_QUANTITY件D，再按单位重量从大到小依次首次适应放入其余货物；
+    放入A之前保证该集装箱已有MIN_C_WHEN_A件C。最后对低于最小载重的集装箱做一次
+    从其他集装箱搬移轻货的修复。
+
+    Returns:
+        装箱方案列表 [{货物: 数量}, ...]，失败时返回None
+    """
+    if demands['D'] < MIN_D_QUANTITY * num_containers:
+        return None
+
+    packing = [{i: 0 for i in GOODS} for _ in range(num_containers)]
+    loads = [0.0] * num_containers
+    remaining = dict(demands)
+
+    # 每个集装箱先满足D的最小装载量
+    for j in range(num_containers):
+        packing[j]['D'] = MIN_D_QUANTITY
+        loads[j] = MIN_D_QUANTITY * WEIGHTS['D']
+        remaining['D'] -= MIN_D_QUANTITY
+
+    # 按单位重量递减顺序首次适应
+    for i in sorted(GOODS, key=lambda g: WEIGHTS[g], reverse=True):
+        for j in range(num_containers):
+            if remaining[i] == 0:
+                break
+            if i == 'A' and packing[j]['A'] == 0:
+                # 装A前需要保证C的数量
+                need_c = max(0, MIN_C_WHEN_A - packing[j]['C'])
+                if need_c > remaining['C']:
+                    continue
+                if loads[j] + need_c * WEIGHTS['C'] + WEIGHTS['A'] > MAX_CAPACITY + EPS:
+                    continue
+                packing[j]['C'] += need_c
+                loads[j] += need_c * WEIGHTS['C']
+                remaining['C'] -= need_c
+            room = int((MAX_CAPACITY - loads[j] + EPS) // WEIGHTS[i])
+            quantity = min(room, remaining[i])
+            packing[j][i] += quantity
+            loads[j] += quantity * WEIGHTS[i]
+            remaining[i] -= quantity
+
+    if any(q > 0 for q in remaining.values()):
+        return None
+
+    # 修复低于最小载重的集装箱：从其他集装箱搬移不影响逻辑约束的货物
+    movable = sorted((i for i in GOODS if i != 'A'), key=lambda g: WEIGHTS[g])
+    for r in range(num_containers):
+        for d in range(num_containers):
+            if loads[r] >= MIN_CAPACITY - EPS:
+                break
+            if d == r:
+                continue
+            for i in movable:
+                keep = 0
+                if i == 'D':
+                    keep = MIN_D_QUANTITY
+                elif i == 'C' and packing[d]['A'] > 0:
+                    keep = MIN_C_WHEN_A
+                while (loads[r] < MIN_CAPACITY - EPS
+                       and packing[d][i] > keep
+                       and loads[d] - WEIGHTS[i] >= MIN_CAPACITY - EPS
+                       and loads[r] + WEIGHTS[i] <= MAX_CAPACITY + EPS):
+                    packing[d][i] -= 1
+                    packing[r][i] += 1
+                    loads[d] -= WEIGHTS[i]
+                    loads[r] += WEIGHTS[i]
+
+    if any(load < MIN_CAPACITY - EPS for load in loads):
+        return None
+    return packing
+
+
+def first_fit_decreasing(demands):
+    """
+    首次适应递减(FFD)启发式求可行装箱方案
+
+    从载重下界 ceil(总重量/最大载重) 开始逐个尝试集装箱数量，返回第一个可行方案。
+
+    Args:
+        demands: 各货物需求量
+
+    Returns:
+        按载重从大到小排序的装箱方案列表，找不到可行方案时返回None
+    """
+    total_weight = sum(demands[i] * WEIGHTS[i] for i in GOODS)
+    lower = max(1, math.ceil(total_weight / MAX_CAPACITY - EPS))
+    upper = demands['D'] // MIN_D_QUANTITY
+    for num_containers in range(lower, upper + 1):
+        packing = _try_pack(demands, num_containers)
+        if packing is not None:
+            return sorted(packing, key=_container_load, reverse=True)
+    return None
+
+
+def build_container_model(model, demands, enhanced=False):
+    """
+    构建集装箱装载模型
+
+    Args:
+        model: COPT模型对象
+        demands: 各货物需求量
+        enhanced: 是否启用FFD上界、载重排序约束和MIP初始解
+
+    Returns:
+        (containers, x, y, a, ffd_packing)，未启用增强模式或FFD失败时ffd_packing为None
+    """
+    goods = GOODS
+    weights = WEIGHTS
+    max_capacity = MAX_CAPACITY
+    min_capacity = MIN_CAPACITY
+    min_d_quantity = MIN_D_QUANTITY
+    min_c_when_a = MIN_C_WHEN_A
+
+    # 估算集装箱数量上限
+    total_weight = sum(demands[i] * weights[i] for i in goods)
+    max_containers = int(total_weight / min_capacity) + 5  # 安全余量
+
+    ffd_packing = None
+    if enhanced:
+        ffd_packing = first_fit_decreasing(demands)
+        if ffd_packing is not None:
+            max_containers = len(ffd_packing)
+
+    # 集装箱编号
+    containers = list(range(1, max_containers + 1))
+
+    # 添加决策变量
+    # x[i,j]: 在集装箱j中装载货物i的数量
+    x = {}
+    for i in goods:
+        for j in containers:
+            x[i, j] = model.addVar(vtype=COPT.INTEGER, lb=0, name=f"x_{i}_{j}")
+
+    # y[j]: 是否使用集装箱j
+    y = {}
+    for j in containers:
+        y[j] = model.addVar(vtype=COPT.BINARY, name=f"y_{j}")
+
+    # a[j]: 集装箱j是否装载了货物A
+    a = {}
+    for j in containers:
+        a[j] = model.addVar(vtype=COPT.BINARY, name=f"a_{j}")
+
+    # 目标函数：最小化使用的集装箱数量
+    model.setObjective(cp.quicksum(y[j] for j in containers), sense=COPT.MINIMIZE)
+
+    # 约束1: 需求满足约束
+    for i in goods:
+        model.addConstr(
+            cp.quicksum(x[i, j] for j in containers) == demands[i],
+            name=f"demand_{i}"
+        )
+
+    # 约束2: 集装箱使用关联约束
+    for i in goods:
+        for j in containers:
+            model.addConstr(
+                x[i, j] <= demands[i] * y[j],
+                name=f"usage_link_{i}_{j}"
+            )
+
+    # 约束3: 集装箱最大载重约束
+    for j in containers:
+        model.addConstr(
+            cp.quicksum(weights[i] * x[i, j] for i in goods) <= max_capacity * y[j],
+            name=f"max_capacity_{j}"
+        )
+
+    # 约束4: 集装箱最小载重约束
+    for j in containers:
+        model.addConstr(
+            cp.quicksum(weights[i] * x[i, j] for i in goods) >= min_capacity * y[j],
+            name=f"min_capacity_{j}"
+        )
+
+    # 约束5: 货物D最小装载量约束
+    for j in containers:
+        model.addConstr(
+            x['D', j] >= min_d_quantity * y[j],
+            name=f"min_d_quantity_{j}"
+        )
+
+    # 约束6: 货物A与C的装载关联逻辑
+    # 6a: 货物A装载指示
+    for j in containers:
+        model.addConstr(
+            x['A', j] <= demands['A'] * a[j],
+            name=f"a_indicator_upper_{j}"
+        )
+        model.addConstr(
+            x['A', j] >= a[j],
+            name=f"a_indicator_lower_{j}"
+        )
+
+    # 6b: 货物C关联装载
+    for j in containers:
+        model.addConstr(
+            x['C', j] >= min_c_when_a * a[j],
+            name=f"c_when_a_{j}"
+        )
+
+    # 约束7: 对称性破除约束
+    for j in range(1, max_containers):
+        model.addConstr(
+            y[j] >= y[j + 1],
+            name=f"symmetry_breaking_{j}"
+        )
+
+    if enhanced:
+        # 约束8: 载重排序约束 (已使用的集装箱按载重从大到小编号)
+        for j in range(1, max_containers):
+            model.addConstr(
+                cp.quicksum(weights[i] * x[i, j] for i in goods)
+                >= cp.quicksum(weights[i] * x[i, j + 1] for i in goods),
+                name=f"load_ordering_{j}"
+            )
+
+        # 约束9: 集装箱数量下界 (总重量 / 最大载重)
+        model.addConstr(
+            cp.quicksum(y[j] for j in containers)
+            >= math.ceil(total_weight / max_capacity - EPS),
+            name="container_lower_bound"
+        )
+
+        # FFD方案作为MIP初始解 (方案已按载重递减排序，满足排序约束)
+        if ffd_packing is not None:
+            start_vars = []
+            start_vals = []
+            for j, packing in zip(containers, ffd_packing):
+                for i in goods:
+                    start_vars.append(x[i, j])
+                    start_vals.append(packing[i])
+                start_vars.extend([y[j], a[j]])
+                start_vals.extend([1, 1 if packing['A'] > 0 else 0])
+            model.setMipStart(start_vars, start_vals)
+            model.loadMipStart()
+
+    return containers, x, y, a, ffd_packing
+
+
+def solve_container_packing(demands=None, enhanced=False):
     """求解集装箱装载优化问题"""
     
     try:
@@ -20,130 +311,27 @@ def solve_container_packing():
         model = env.createModel("container_packing_optimization")
         
         # 2. 定义问题数据
-        # 货物类型
-        goods = ['A', 'B', 'C', 'D', 'E']
-        
-        # 需求量
-        demands = {
-            'A': 120,
-            'B': 90,
-            'C': 300,
-            'D': 90,
-            'E': 120
-        }
-        
-        # 单位重量 (吨)
-        weights = {
-            'A': 0.5,
-            'B': 1.0,
-            'C': 0.4,
-            'D': 0.6,
-            'E': 0.65
-        }
-        
-        # 集装箱参数
-        max_capacity = 60  # 最大载重 (吨)
-        min_capacity = 18  # 最小载重 (吨)
-        min_d_quantity = 12  # 每个集装箱最少装载D的数量
-        min_c_when_a = 1   # 装载A时C的最小数量
-        
-        # 估算集装箱数量上限
+        goods = GOODS
+        demands = dict(DEMANDS if demands is None else demands)
+        weights = WEIGHTS
+        max_capacity = MAX_CAPACITY
+        min_capacity = MIN_CAPACITY
+        min_d_quantity = MIN_D_QUANTITY
+        min_c_when_a = MIN_C_WHEN_A
         total_weight = sum(demands[i] * weights[i] for i in goods)
-        max_containers = int(total_weight / min_capacity) + 5  # 安全余量
-        
-        print(f"货物总重量: {total_weight:.2f} 吨")
-        print(f"估算最大集装箱需求: {max_containers} 个")
-        print(f"集装箱编号: 1 到 {max_containers}")
-        
-        # 集装箱编号
-        containers = list(range(1, max_containers + 1))
-        
-        # 3. 添加决策变量
-        # x[i,j]: 在集装箱j中装载货物i的数量
-        x = {}
-        for i in goods:
-            for j in containers:
-                x[i, j] = model.addVar(vtype=COPT.INTEGER, lb=0, name=f"x_{i}_{j}")
-        
-        # y[j]: 是否使用集装箱j
-        y = {}
-        for j in containers:
-            y[j] = model.addVar(vtype=COPT.BINARY, name=f"y_{j}")
-        
-        # a[j]: 集装箱j是否装载了货物A
-        a = {}
-        for j in containers:
-            a[j] = model.addVar(vtype=COPT.BINARY, name=f"a_{j}")
-        
-        # 4. 设置目标函数：最小化使用的集装箱数量
-        model.setObjective(cp.quicksum(y[j] for j in containers), sense=COPT.MINIMIZE)
-        
-        # 5. 添加约束条件
-        
-        # 约束1: 需求满足约束
-        for i in goods:
-            model.addConstr(
-                cp.quicksum(x[i, j] for j in containers) == demands[i],
-                name=f"demand_{i}"
-            )
-        
-        # 约束2: 集装箱使用关联约束
-        for i in goods:
-            for j in containers:
-                model.addConstr(
-                    x[i, j] <= demands[i] * y[j],
-                    name=f"usage_link_{i}_{j}"
-                )
-        
-        # 约束3: 集装箱最大载重约束
-        for j in containers:
-            model.addConstr(
-                cp.quicksum(weights[i] * x[i, j] for i in goods) <= max_capacity * y[j],
-                name=f"max_capacity_{j}"
-            )
-        
-        # 约束4: 集装箱最小载重约束
-        for j in containers:
-            model.addConstr(
-                cp.quicksum(weights[i] * x[i, j] for i in goods) >= min_capacity * y[j],
-                name=f"min_capacity_{j}"
-            )
-        
-        # 约束5: 货物D最小装载量约束
-        for j in containers:
-            model.addConstr(
-                x['D', j] >= min_d_quantity * y[j],
-                name=f"min_d_quantity_{j}"
-            )
         
-        # 约束6: 货物A与C的装载关联逻辑
-        # 6a: 货物A装载指示
-        for j in containers:
-            model.addConstr(
-                x['A', j] <= demands['A'] * a[j],
-                name=f"a_indicator_upper_{j}"
-            )
-            model.addConstr(
-                x['A', j] >= a[j],
-                name=f"a_indicator_lower_{j}"
-            )
+        # 3. 构建模型
+        containers, x, y, a, ffd_packing = build_container_model(model, demands, enhanced)
         
-        # 6b: 货物C关联装载
-        for j in containers:
-            model.addConstr(
-                x['C', j] >= min_c_when_a * a[j],
-                name=f"c_when_a_{j}"
-            )
-        
-        # 约束7: 对称性破除约束
-        for j in range(1, max_containers):
-            model.addConstr(
-                y[j] >= y[j + 1],
-                name=f"symmetry_breaking_{j}"
-            )
+        print(f"货物总重量: {total_weight:.2f} 吨")
+        if ffd_packing is not None:
+            print(f"FFD启发式上界: {len(ffd_packing)} 个集装箱 (已作为MIP初始解)")
+        print(f"估算最大集装箱需求: {len(containers)} 个")
+        print(f"集装箱编号: 1 到 {len(containers)}")
         
         # 6. 求解模型
         print("\n开始求解...")
+        apply_tuned_profile(model, "knapsack")
         model.solve()
         
         # 7. 分析求解结果
@@ -239,7 +427,7 @@ def solve_container_packing():
             env.close()
 
 if __name__ == "__main__":
-    result = solve_container_packing()
+    result = solve_container_packing(enhanced="--enhanced" in sys.argv[1:])
     if result is not None:
         # 将结果写入文件
         with open("result.txt", "w", encoding="utf-8") as f:
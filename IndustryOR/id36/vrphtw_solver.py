@@ -12,15 +12,71 @@ VRPHTW (Vehicle Routing Problem with Hard Time Windows) Solver using COPT
 - 目标：最小化所有车辆的总行驶距离
 """
 
+import argparse
+import os
+import sys
+
 import coptpy as cp
 from coptpy import COPT
 import math
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from param_tuning import apply_tuned_profile  # noqa: E402
+from problem_data import load_arguments, result_path  # noqa: E402
+
+# 节点数据：仓库(0) + 20个客户(1-20)
+# 坐标数据
+COORDINATES = {
+    0: (40, 50),    # 仓库
+    1: (45, 68), 2: (45, 70), 3: (42, 66), 4: (42, 68), 5: (42, 65),
+    6: (40, 69), 7: (40, 66), 8: (38, 68), 9: (38, 70), 10: (35, 66),
+    11: (35, 69), 12: (25, 85), 13: (22, 75), 14: (22, 85), 15: (20, 80),
+    16: (20, 85), 17: (18, 75), 18: (15, 75), 19: (15, 80), 20: (30, 50)
+}
+
+# 需求数据
+DEMANDS = {
+    0: 0,   # 仓库需求为0
+    1: 10, 2: 30, 3: 10, 4: 10, 5: 10,
+    6: 20, 7: 20, 8: 20, 9: 10, 10: 10,
+    11: 10, 12: 20, 13: 30, 14: 10, 15: 40,
+    16: 40, 17: 20, 18: 20, 19: 10, 20: 10
+}
+
+# 时间窗数据 [最早时间, 最晚时间]
+TIME_WINDOWS = {
+    0: (0, 1236),       # 仓库
+    1: (912, 967), 2: (825, 870), 3: (65, 146), 4: (727, 782), 5: (15, 67),
+    6: (621, 702), 7: (170, 225), 8: (255, 324), 9: (534, 605), 10: (357, 410),
+    11: (448, 505), 12: (652, 721), 13: (30, 92), 14: (567, 620), 15: (384, 429),
+    16: (475, 528), 17: (99, 148), 18: (179, 254), 19: (278, 345), 20: (10, 73)
+}
+
+# 服务时间
+SERVICE_TIMES = {i: 90 if i > 0 else 0 for i in range(21)}  # 客户服务时间90分钟，仓库为0
+
+# 车辆数据
+NUM_VEHICLES = 5
+VEHICLE_CAPACITY = 200
+
 def calculate_distance(x1, y1, x2, y2):
     """计算两点之间的欧几里得距离"""
     return math.sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2)
 
-def solve_vrphtw():
+def solve_vrphtw(nodes=None, distances=None, demands=None, time_windows=None, service_times=None,
+                 num_vehicles=NUM_VEHICLES, vehicle_capacity=VEHICLE_CAPACITY, data_path=None):
+    """
+    求解VRPHTW问题
+
+    Args:
+        nodes: 节点列表，第一个节点为仓库，默认为题目数据
+        distances: {(i, j): 距离}，默认由坐标计算欧氏距离
+        demands / service_times: {节点: 值}
+        time_windows: {节点: (最早时间, 最晚时间)}
+        num_vehicles / vehicle_capacity: 车辆数与单车容量
+        data_path: --data 给出的数据文件，结果写入 result_<数据文件名>.txt (见 problem_data.result_path)
+    """
+    result_file = result_path(data_path, "/Users/jiale.cheng/Documents/mcp/test/result.txt")
     try:
         # 1. 创建COPT求解环境
         env = cp.Envr()
@@ -29,57 +85,26 @@ def solve_vrphtw():
         model = env.createModel("VRPHTW")
         
         # 3. 定义问题数据
-        
-        # 节点数据：仓库(0) + 20个客户(1-20)
-        # 坐标数据
-        coordinates = {
-            0: (40, 50),    # 仓库
-            1: (45, 68), 2: (45, 70), 3: (42, 66), 4: (42, 68), 5: (42, 65),
-            6: (40, 69), 7: (40, 66), 8: (38, 68), 9: (38, 70), 10: (35, 66),
-            11: (35, 69), 12: (25, 85), 13: (22, 75), 14: (22, 85), 15: (20, 80),
-            16: (20, 85), 17: (18, 75), 18: (15, 75), 19: (15, 80), 20: (30, 50)
-        }
-        
-        # 需求数据
-        demands = {
-            0: 0,   # 仓库需求为0
-            1: 10, 2: 30, 3: 10, 4: 10, 5: 10,
-            6: 20, 7: 20, 8: 20, 9: 10, 10: 10,
-            11: 10, 12: 20, 13: 30, 14: 10, 15: 40,
-            16: 40, 17: 20, 18: 20, 19: 10, 20: 10
-        }
-        
-        # 时间窗数据 [最早时间, 最晚时间]
-        time_windows = {
-            0: (0, 1236),       # 仓库
-            1: (912, 967), 2: (825, 870), 3: (65, 146), 4: (727, 782), 5: (15, 67),
-            6: (621, 702), 7: (170, 225), 8: (255, 324), 9: (534, 605), 10: (357, 410),
-            11: (448, 505), 12: (652, 721), 13: (30, 92), 14: (567, 620), 15: (384, 429),
-            16: (475, 528), 17: (99, 148), 18: (179, 254), 19: (278, 345), 20: (10, 73)
-        }
-        
-        # 服务时间
-        service_times = {i: 90 if i > 0 else 0 for i in range(21)}  # 客户服务时间90分钟，仓库为0
-        
-        # 车辆数据
-        num_vehicles = 5
-        vehicle_capacity = 200
+        if nodes is None:
+            nodes = list(COORDINATES)  # 0-20
+            demands, time_windows, service_times = DEMANDS, TIME_WINDOWS, SERVICE_TIMES
+            # 计算距离矩阵
+            distances = {}
+            for i in nodes:
+                for j in nodes:
+                    x1, y1 = COORDINATES[i]
+                    x2, y2 = COORDINATES[j]
+                    distances[i, j] = calculate_distance(x1, y1, x2, y2)
         
         # 节点集合
-        nodes = list(range(21))  # 0-20
-        customers = list(range(1, 21))  # 1-20
+        depot = nodes[0]
+        customers = nodes[1:]  # 1-20
         vehicles = list(range(num_vehicles))  # 0-4
         
-        # 计算距离矩阵
-        distances = {}
-        for i in nodes:
-            for j in nodes:
-                x1, y1 = coordinates[i]
-                x2, y2 = coordinates[j]
-                distances[i, j] = calculate_distance(x1, y1, x2, y2)
-        
         # Big M 值 - 用于线性化逻辑约束
-        M = 10000
+        # 读入较大规模数据时，M 至少覆盖 最晚服务开始时间 + 服务时间 + 最长行驶距离
+        horizon = max(l for i, (e, l) in time_windows.items() if i != depot)
+        M = max(10000, horizon + max(service_times.values()) + max(distances.values()))
         
         # 4. 添加决策变量
         
@@ -117,14 +142,14 @@ def solve_vrphtw():
         # 约束3：车辆调度 - 每辆车从仓库出发并返回仓库
         for k in vehicles:
             model.addConstr(
-                cp.quicksum(x[0, j, k] for j in customers) == 
-                cp.quicksum(x[i, 0, k] for i in customers),
+                cp.quicksum(x[depot, j, k] for j in customers) == 
+                cp.quicksum(x[i, depot, k] for i in customers),
                 name=f"depot_balance_{k}"
             )
             
             # 每辆车最多从仓库出发一次
             model.addConstr(
-                cp.quicksum(x[0, j, k] for j in customers) <= 1,
+                cp.quicksum(x[depot, j, k] for j in customers) <= 1,
                 name=f"max_one_departure_{k}"
             )
         
@@ -155,8 +180,8 @@ def solve_vrphtw():
         # 约束7：车辆返回时间约束
         for i in customers:
             model.addConstr(
-                B[i] + service_times[i] + distances[i, 0] - 
-                M * (1 - cp.quicksum(x[i, 0, k] for k in vehicles)) <= time_windows[0][1],
+                B[i] + service_times[i] + distances[i, depot] - 
+                M * (1 - cp.quicksum(x[i, depot, k] for k in vehicles)) <= time_windows[depot][1],
                 name=f"return_time_{i}"
             )
         
@@ -167,6 +192,7 @@ def solve_vrphtw():
         
         # 7. 求解模型
         print("开始求解VRPHTW问题...")
+        apply_tuned_profile(model, "routing")
         model.solve()
         
         # 8. 分析求解结果
@@ -182,10 +208,10 @@ def solve_vrphtw():
             
             for k in vehicles:
                 route = []
-                current_node = 0  # 从仓库开始
+                current_node = depot  # 从仓库开始
                 
                 # 检查是否有车辆从仓库出发
-                has_departure = any(x[0, j, k].x > 0.5 for j in customers)
+                has_departure = any(x[depot, j, k].x > 0.5 for j in customers)
                 if not has_departure:
                     continue
                     
@@ -200,9 +226,9 @@ def solve_vrphtw():
                             next_node = j
                             break
                     
-                    if next_node is None or next_node == 0:
-                        if next_node == 0:
-                            route.append(0)
+                    if next_node is None or next_node == depot:
+                        if next_node == depot:
+                            route.append(depot)
                         break
                     
                     route.append(next_node)
@@ -235,18 +261,18 @@ def solve_vrphtw():
             print(f"总距离验证: {total_distance:.2f}")
             
             # 将结果写入文件
-            with open("/Users/jiale.cheng/Documents/mcp/test/result.txt", "w") as f:
+            with open(result_file, "w") as f:
                 f.write(f"VRPHTW问题求解结果\n")
                 f.write(f"===================\n")
                 f.write(f"最优目标函数值（最小总距离）: {model.objval:.2f}\n")
                 f.write(f"活跃车辆数: {active_vehicles}/{num_vehicles}\n")
                 f.write(f"求解状态: 最优解\n")
             
-            print(f"\n结果已保存到 result.txt")
+            print(f"\n结果已保存到 {os.path.basename(result_file)}")
             
         else:
             print(f"\n模型未找到最优解，状态码: {model.status}")
-            with open("/Users/jiale.cheng/Documents/mcp/test/result.txt", "w") as f:
+            with open(result_file, "w") as f:
                 f.write(f"VRPHTW问题求解失败\n")
                 f.write(f"状态码: {model.status}\n")
         
@@ -263,4 +289,12 @@ def solve_vrphtw():
             env.close()
 
 if __name__ == "__main__":
-    solve_vrphtw()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="带硬时间窗的车辆路径问题 (VRPHTW)")
+    parser.add_argument("--data", default=None, help="routing 数据文件 (.json / .npz / CSV目录)，默认使用题目数据")
+    args = parser.parse_args()
+
+    if args.data:
+        solve_vrphtw(*load_arguments(args.data, "routing", num_vehicles=NUM_VEHICLES, vehicle_capacity=VEHICLE_CAPACITY),
+                     data_path=args.data)
+    else:
+        solve_vrphtw()
\ No newline at end of file
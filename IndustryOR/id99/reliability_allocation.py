@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+可靠性分配问题 (id99 的推广) - 乘积目标自动取对数，用 product_objective 求解
+
+系统由 n 个部件串联，部件 i 配 s_i 个备件 (并联冗余) 时的可靠度为 1 - (1 - r_i)^(s_i + 1)。
+在备件总费用和总重量限制下最大化系统可靠度 Π_i (1 - (1 - r_i)^(s_i + 1))。
+s_i 可以是连续量 (如备用容量) 或整数。ln 可靠度对 s_i 是凹函数，ProductObjective 自动选用
+切线外逼近，主问题给出系统可靠度的有效上界，每轮主问题的解都按真实可靠度记为候选解，
+相对间隙不超过 product_objective.GAP_TOL (0.01%) 时停止并证明该间隙 (状态 optimal)；
+--form pwl 强制用 SOS2 分段线性形式作对比，对数凹因子的插值不是有效上界，状态为 approximate，不给出上界。
+
+用法:
+    python reliability_allocation.py                           # 200 个部件、连续备件量
+    python reliability_allocation.py --components 500 --integer
+    python reliability_allocation.py --benchmark               # 50~400 个部件，比较 tangent / pwl 两种形式
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+
+import coptpy as cp
+from coptpy import COPT
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from product_objective import ProductObjective  # noqa: E402
+
+MAX_SPARES = 5
+
+
+def random_instance(components, seed=0):
+    """随机生成 components 个部件的实例 (费用和重量上限约为全部配满备件的30%)"""
+    rng = random.Random(seed)
+    labels = list(range(1, components + 1))
+    data = {
+        "components": labels,
+        "reliability": {i: round(rng.uniform(0.80, 0.99), 3) for i in labels},
+        "unit_price": {i: rng.randint(10, 50) for i in labels},
+        "unit_weight": {i: rng.randint(1, 8) for i in labels},
+        "max_spares": MAX_SPARES,
+    }
+    data["budget"] = round(0.3 * MAX_SPARES * sum(data["unit_price"].values()))
+    data["weight_limit"] = round(0.3 * MAX_SPARES * sum(data["unit_weight"].values()))
+    return data
+
+
+def component_reliability(r, spares):
+    """配 spares 个备件 (并联) 时部件的可靠度"""
+    return 1 - (1 - r) ** (spares + 1)
+
+
+def system_reliability(data, spares):
+    """按备件方案直接计算系统可靠度"""
+    return math.prod(component_reliability(data["reliability"][i], spares[i]) for i in data["components"])
+
+
+def build_model(env, data, integer=False, form="auto"):
+    """
+    建立模型并设置乘积目标
+
+    Returns:
+        (model, objective, spares)
+    """
+    labels = data["components"]
+    model = env.createModel("reliability_allocation")
+    model.setParam(COPT.Param.Logging, 0)
+    vtype = COPT.INTEGER if integer else COPT.CONTINUOUS
+    spares = {i: model.addVar(lb=0, ub=data["max_spares"], vtype=vtype, name=f"spares_{i}") for i in labels}
+
+    model.addConstr(cp.quicksum(data["unit_price"][i] * spares[i] for i in labels) <= data["budget"], name="budget")
+    model.addConstr(cp.quicksum(data["unit_weight"][i] * spares[i] for i in labels) <= data["weight_limit"],
+                    name="weight")
+
+    objective = ProductObjective(model, sense=COPT.MAXIMIZE)
+    for i in labels:
+        r = data["reliability"][i]
+        objective.factor(spares[i], lambda s, r=r: component_reliability(r, s),
+                         lambda s, r=r: -(1 - r) ** (s + 1) * math.log(1 - r), name=f"reliability_{i}", shape=form)
+    objective.build()
+    return model, objective, spares
+
+
+def solve_allocation(data, integer=False, form="auto", verbose=True):
+    """求解一个实例，返回结果字典 (额外包含备件方案和按方案直接计算的可靠度)"""
+    env = None
+    try:
+        env = cp.Envr()
+        model, objective, spares = build_model(env, data, integer, form)
+        result = objective.solve()
+        if result["values"] is None:
+            if verbose:
+                print(f"求解失败: {result['status']}")
+            return result
+        plan = {i: result["values"][spares[i].name] for i in data["components"]}
+        result["spares"] = plan
+        result["check"] = system_reliability(data, plan)
+        if verbose:
+            forms = sorted(set(result["forms"].values()))
+            print(f"\n求解状态: {result['status']} (形式 {', '.join(forms)}, {result['iterations']} 轮, "
+                  f"切线 {result['cuts']} 条, 断点 {result['breakpoints']} 个, 耗时 {result['time']:.3f} 秒)")
+            if result["product_bound"] is None:
+                bound = "无有效上界"
+            else:
+                bound = f"上界 {result['product_bound']:.6f}, 间隙 {result['gap']:.2e}"
+            print(f"系统可靠度: {result['product']:.6f} ({bound}, 按方案直接计算 {result['check']:.6f})")
+            cost = sum(data["unit_price"][i] * plan[i] for i in data["components"])
+            weight = sum(data["unit_weight"][i] * plan[i] for i in data["components"])
+            print(f"费用: {cost:.1f}/{data['budget']}  重量: {weight:.1f}/{data['weight_limit']}")
+            print("\n可靠度最低的10个部件:")
+            weakest = sorted(data["components"],
+                             key=lambda i: component_reliability(data["reliability"][i], plan[i]))[:10]
+            for i in weakest:
+                print(f"  部件{i:>4}: r = {data['reliability'][i]:.3f}, 备件 {plan[i]:.3f}, "
+                      f"可靠度 {component_reliability(data['reliability'][i], plan[i]):.5f}")
+        return result
+
+    except cp.CoptError as e:
+        print(f"COPT Error: {e.retcode} - {e.message}")
+        return None
+    finally:
+        if env is not None:
+            env.close()
+
+
+def benchmark(sizes, seeds, integer):
+    """随机实例上比较切线外逼近 (tangent) 与 SOS2 分段线性 (pwl) 两种形式"""
+    print(f"\n{'实例':<12} {'形式':<8} {'状态':<16} {'系统可靠度':>12} {'上界':>12} {'轮数':>5} "
+          f"{'切线':>6} {'断点':>6} {'耗时(s)':>9}")
+    print("-" * 96)
+    for n in sizes:
+        for seed in range(seeds):
+            data = random_instance(n, seed)
+            for form in ("tangent", "pwl"):
+                label = f"n={n} s={seed}"
+                result = solve_allocation(data, integer, form, verbose=False)
+                if result is None or result["product"] is None:
+                    print(f"{label:<12} {form:<8} 求解失败")
+                    continue
+                bound = "-" if result["product_bound"] is None else f"{result['product_bound']:.6f}"
+                print(f"{label:<12} {form:<8} {result['status']:<16} {result['product']:>12.6f} "
+                      f"{bound:>12} {result['iterations']:>5} {result['cuts']:>6} "
+                      f"{result['breakpoints']:>6} {result['time']:>9.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="可靠性分配问题 (乘积目标)")
+    parser.add_argument("--components", type=int, default=200, help="部件数")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--integer", action="store_true", help="备件数取整数 (默认连续)")
+    parser.add_argument("--form", choices=["auto", "tangent", "pwl"], default="auto", help="连续因子的建模形式")
+    parser.add_argument("--benchmark", action="store_true", help="在不同规模的随机实例上比较 tangent 与 pwl")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 200, 400], help="随机实例的部件数")
+    parser.add_argument("--seeds", type=int, default=2, help="每种规模的随机实例个数")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.sizes, args.seeds, args.integer)
+        return
+
+    print(f"可靠性分配问题 ({args.components} 个部件, {'整数' if args.integer else '连续'}备件量)")
+    print("=" * 60)
+    solve_allocation(random_instance(args.components, args.seed), args.integer, args.form)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,14 @@
 import math
+import os
+import sys
 from typing import Dict, List, Tuple
 
 import coptpy as cp
 from coptpy import COPT
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from product_objective import ProductObjective  # noqa: E402
+
 
 def build_and_solve_model() -> Tuple[float, float, Dict[int, int]]:
     """
@@ -44,13 +49,6 @@ def build_and_solve_model() -> Tuple[float, float, Dict[int, int]]:
     budget_max: float = 150.0
     weight_max: float = 20.0
 
-    # Validate inputs
-    for i in components:
-        for j in spares:
-            rij = reliability[i, j]
-            if rij <= 0.0:
-                raise ValueError(f"Reliability must be positive for log transform, got R[{i},{j}]={rij}")
-
     env = cp.Envr()
     try:
         model = env.createModel("reliability_maximization")
@@ -58,10 +56,6 @@ def build_and_solve_model() -> Tuple[float, float, Dict[int, int]]:
         # Decision variables: x[i,j] in {0,1}
         x = model.addVars(components, spares, vtype=COPT.BINARY, nameprefix="x")
 
-        # Objective: maximize sum_{i,j} log(R[i,j]) * x[i,j]
-        objective_expr = cp.quicksum(math.log(reliability[i, j]) * x[i, j] for i in components for j in spares)
-        model.setObjective(objective_expr, sense=COPT.MAXIMIZE)
-
         # Unique choice per component: sum_j x[i,j] == 1
         model.addConstrs((cp.quicksum(x[i, j] for j in spares) == 1 for i in components), nameprefix="unique_choice")
 
@@ -73,6 +67,12 @@ def build_and_solve_model() -> Tuple[float, float, Dict[int, int]]:
         weight_expr = cp.quicksum(unit_weight[i] * j * x[i, j] for i in components for j in spares)
         model.addConstr(weight_expr <= weight_max, name="weight")
 
+        # Objective: maximize prod_i R[i, j_i]; ProductObjective builds sum_{i,j} log(R[i,j]) * x[i,j]
+        objective = ProductObjective(model, sense=COPT.MAXIMIZE)
+        for i in components:
+            objective.choice([x[i, j] for j in spares], [reliability[i, j] for j in spares])
+        objective.build()
+
         # Optional: limit time for robustness
         model.setParam(COPT.Param.TimeLimit, 30.0)
 
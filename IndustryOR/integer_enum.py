@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IndustryOR 小规模纯整数模型的枚举求解引擎
+
+id04、id19、id20、id21、id85 等脚本只有2~8个整数变量和几行背包约束，单次求解的大部分时间花在
+创建COPT环境和建模上。对这类模型，在Python进程内直接枚举即可在微秒到毫秒级得到精确最优解:
+
+- 变量上下界: 由约束行的活动值界推出有限上下界 (如 20 xA <= 600 推出 xA <= 30)
+- 内层变量: 定义域最大的变量不参与枚举，对每个网格点由各约束行直接算出它的可行整数区间，
+  按目标系数的符号取区间端点
+- 分支变量: 其余变量中定义域最大的一个，按每个取值的单行LP松弛 (分数背包) 上界从好到差依次处理，
+  上界不优于当前最好解时停止
+- 网格: 剩余变量的全部组合按线性下标分块展开为NumPy数组，整块向量化计算约束活动值和目标值
+
+枚举规模 = 除内层变量外全部变量定义域大小的乘积。solve() 在模型为纯整数且枚举规模不超过
+ENUMERATION_LIMIT 时使用枚举，否则交给COPT求解 (含连续变量的模型如 id86 也交给COPT)。
+
+用法:
+    python integer_enum.py id04 id19 id20 id21 id85 id86 --repeat 200   # 比较枚举与COPT的单次延迟
+    python integer_enum.py --check                                      # 边界情形 (单变量等) 与COPT比较
+
+在代码中使用:
+    program = IntegerProgram(names, obj, lb, ub, matrix, row_lb, row_ub, sense=COPT.MAXIMIZE)
+    result = solve(program)    # {"status", "objective", "values", "engine", "time"}
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+import coptpy as cp
+from coptpy import COPT
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+from benchmark_suite import INSTANCES  # noqa: E402
+from solve_telemetry import script_environment  # noqa: E402
+
+# 枚举规模上限 (除内层变量外各变量定义域大小之积)
+ENUMERATION_LIMIT = 2_000_000
+# 每块展开的网格点数
+CHUNK_SIZE = 1 << 16
+TOL = 1e-9
+
+
+def _finite(value):
+    """把COPT的无穷大 (1e30) 换成 numpy 的 inf"""
+    value = np.asarray(value, dtype=float)
+    return np.where(np.abs(value) >= COPT.INFINITY, np.copysign(np.inf, value), value)
+
+
+class IntegerProgram:
+    """
+    线性整数规划 (约束行的形式与COPT相同: row_lb <= matrix @ x <= row_ub)
+
+    integer 为各变量是否为整数变量，默认全部为整数。
+    """
+
+    def __init__(self, names, obj, lb, ub, matrix, row_lb, row_ub, sense=COPT.MINIMIZE,
+                 obj_const=0.0, integer=None, row_names=None, name="integer_program"):
+        self.name = name
+        self.names = list(names)
+        self.obj = np.asarray(obj, dtype=float)
+        self.lb = _finite(lb)
+        self.ub = _finite(ub)
+        self.matrix = np.asarray(matrix, dtype=float).reshape(-1, len(self.names))
+        self.row_lb = _finite(row_lb)
+        self.row_ub = _finite(row_ub)
+        self.sense = int(sense)
+        self.obj_const = float(obj_const)
+        self.integer = np.ones(len(self.names), dtype=bool) if integer is None else np.asarray(integer, dtype=bool)
+        self.row_names = list(row_names) if row_names is not None else [f"r{i}" for i in range(len(self.row_lb))]
+
+    @classmethod
+    def from_copt_model(cls, model):
+        """读取已建好的COPT模型 (不求解)"""
+        variables = model.getVars()
+        constrs = model.getConstrs()
+        matrix = np.zeros((len(constrs), len(variables)))
+        for i, constr in enumerate(constrs):
+            row = model.getRow(constr)
+            for k in range(row.size):
+                matrix[i, row.getVar(k).index] += row.getCoeff(k)
+        return cls(
+            names=[v.name for v in variables],
+            obj=[v.obj for v in variables],
+            lb=[v.lb for v in variables],
+            ub=[v.ub for v in variables],
+            matrix=matrix,
+            row_lb=[c.lb for c in constrs],
+            row_ub=[c.ub for c in constrs],
+            sense=model.objsense,
+            obj_const=model.getAttr(COPT.Attr.ObjConst),
+            integer=[v.vtype != COPT.CONTINUOUS for v in variables],
+            row_names=[c.name for c in constrs],
+        )
+
+    @property
+    def is_pure_integer(self):
+        return bool(self.integer.all())
+
+
+def _rest_activity(terms, infinite):
+    """
+    每行中除各变量自身一项以外其余各项之和
+
+    terms 的无穷项只能是同一符号的 infinite；除自身外还有无穷项时结果为 infinite。
+    """
+    finite = np.isfinite(terms)
+    missing = (~finite).sum(axis=1, keepdims=True)
+    total = np.where(finite, terms, 0.0).sum(axis=1, keepdims=True)
+    return np.where(missing == 0, total - terms, np.where((missing == 1) & ~finite, total, infinite))
+
+
+def tighten_bounds(program, passes=10):
+    """
+    由约束行的活动值界收紧变量上下界 (整数变量取整)，每轮同时使用全部约束行
+
+    Returns:
+        (lb, ub)，模型显然不可行时某个变量的 lb > ub
+    """
+    lb, ub = program.lb.copy(), program.ub.copy()
+    integer = program.integer
+    lb[integer] = np.ceil(lb[integer] - TOL)
+    ub[integer] = np.floor(ub[integer] + TOL)
+    a = program.matrix
+    if a.size == 0:
+        return lb, ub
+    positive, negative = a > 0, a < 0
+    nonzero = positive | negative
+    hi, lo = program.row_ub[:, None], program.row_lb[:, None]
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        for _ in range(passes):
+            low_terms = np.where(positive, a * lb, np.where(negative, a * ub, 0.0))
+            high_terms = np.where(positive, a * ub, np.where(negative, a * lb, 0.0))
+            rest_low = _rest_activity(low_terms, -np.inf)
+            rest_high = _rest_activity(high_terms, np.inf)
+            upper = np.where(positive, (hi - rest_low) / a, (lo - rest_high) / a)
+            lower = np.where(positive, (lo - rest_high) / a, (hi - rest_low) / a)
+            upper = np.where(nonzero, upper, np.inf).min(axis=0)
+            lower = np.where(nonzero, lower, -np.inf).max(axis=0)
+            upper[integer] = np.floor(upper[integer] + TOL)
+            lower[integer] = np.ceil(lower[integer] - TOL)
+            tighter_ub = upper < ub - TOL
+            tighter_lb = lower > lb + TOL
+            if not (tighter_ub.any() or tighter_lb.any()):
+                break
+            ub[tighter_ub] = upper[tighter_ub]
+            lb[tighter_lb] = lower[tighter_lb]
+            if (lb > ub).any():
+                break
+    return lb, ub
+
+
+def enumeration_size(lb, ub):
+    """除定义域最大的 (内层) 变量外，其余变量定义域大小之积；有无界变量时为 inf"""
+    if not (np.isfinite(lb).all() and np.isfinite(ub).all()):
+        return math.inf
+    sizes = sorted(int(u - l) + 1 for l, u in zip(lb, ub))
+    return math.prod(sizes[:-1]) if sizes else 1
+
+
+def _relaxation_bound(program, maximize_obj, lb, ub):
+    """
+    最大化 maximize_obj @ x 的上界: 变量盒约束界与各单行LP松弛 (分数背包) 界中的最小者
+
+    只使用系数全部非负的 <= 行 (或系数全部非正的 >= 行)。
+    """
+    if (lb > ub).any():
+        return -np.inf
+    base = np.sum(np.where(maximize_obj > 0, maximize_obj * ub, maximize_obj * lb))
+    bound = base
+    gain = np.maximum(maximize_obj, 0.0)
+    width = ub - lb
+    for a, lo, hi in zip(program.matrix, program.row_lb, program.row_ub):
+        for coef, rhs in ((a, hi), (-a, -lo)):
+            if not np.isfinite(rhs) or (coef < 0).any():
+                continue
+            capacity = rhs - coef @ lb
+            if capacity < -TOL:
+                return -np.inf
+            value = maximize_obj @ lb
+            free = (coef == 0) & (gain > 0)
+            value += gain[free] @ width[free]
+            items = np.flatnonzero((coef > 0) & (gain > 0))
+            for j in items[np.argsort(-gain[items] / coef[items], kind="stable")]:
+                take = min(width[j], capacity / coef[j])
+                value += gain[j] * take
+                capacity -= coef[j] * take
+                if capacity <= TOL:
+                    break
+            bound = min(bound, value)
+    return bound
+
+
+def _improves(value, best):
+    return best is None or value > best + TOL * max(1.0, abs(best))
+
+
+def _evaluate_chunk(program, gain, lb, ub, inner, grid, grid_shape, index, fixed):
+    """
+    展开一块网格点并对每个点取内层变量的最优值
+
+    Returns:
+        (该块最好的目标值 (最大化形式), 对应的解)，该块没有可行点时为 (None, None)
+    """
+    x = np.empty((len(index), len(program.names)))
+    # 没有网格变量时 (如单变量模型) 只有一个点，直接求内层变量的区间
+    if grid:
+        for j, digits in zip(grid, np.unravel_index(index, grid_shape)):
+            x[:, j] = lb[j] + digits
+    for j, value in fixed:
+        x[:, j] = value
+    x[:, inner] = 0.0
+    activity = x @ program.matrix.T
+
+    # 内层变量的可行整数区间
+    low = np.full(len(index), lb[inner])
+    high = np.full(len(index), ub[inner])
+    feasible = np.ones(len(index), dtype=bool)
+    with np.errstate(invalid="ignore"):
+        for r, coef in enumerate(program.matrix[:, inner]):
+            lo, hi = program.row_lb[r] - activity[:, r], program.row_ub[r] - activity[:, r]
+            if coef > 0:
+                low = np.maximum(low, np.ceil(lo / coef - TOL))
+                high = np.minimum(high, np.floor(hi / coef + TOL))
+            elif coef < 0:
+                low = np.maximum(low, np.ceil(hi / coef - TOL))
+                high = np.minimum(high, np.floor(lo / coef + TOL))
+            else:
+                feasible &= (lo <= TOL * max(1.0, abs(program.row_lb[r]) if np.isfinite(program.row_lb[r]) else 1.0))
+                feasible &= (hi >= -TOL * max(1.0, abs(program.row_ub[r]) if np.isfinite(program.row_ub[r]) else 1.0))
+    feasible &= low <= high
+    if not feasible.any():
+        return None, None
+    x[:, inner] = high if gain[inner] > 0 else low
+    value = np.where(feasible, x @ gain, -np.inf)
+    k = int(np.argmax(value))
+    return float(value[k]), x[k]
+
+
+def enumerate_solve(program, bounds=None, chunk_size=CHUNK_SIZE):
+    """
+    枚举求解纯整数模型
+
+    Args:
+        bounds: tighten_bounds() 的结果 (已计算时传入避免重复计算)
+
+    Returns:
+        {"status", "objective", "values", "engine", "time", "evaluated"}，
+        status 为 COPT.OPTIMAL 或 COPT.INFEASIBLE
+    """
+    start = time.perf_counter()
+    lb, ub = bounds if bounds is not None else tighten_bounds(program)
+    infeasible = {"status": COPT.INFEASIBLE, "objective": None, "values": None, "engine": "enumeration"}
+    if (lb > ub).any():
+        return dict(infeasible, time=time.perf_counter() - start, evaluated=0)
+    if not (np.isfinite(lb).all() and np.isfinite(ub).all()):
+        raise ValueError("存在无界整数变量，不能枚举")
+
+    gain = program.obj if program.sense == COPT.MAXIMIZE else -program.obj
+    sizes = (ub - lb).astype(np.int64) + 1
+    inner = int(np.argmax(sizes))
+    outer = [int(j) for j in np.argsort(-sizes, kind="stable") if j != inner]
+    total = math.prod(int(sizes[j]) for j in outer)
+    best_value, best_x, evaluated = None, None, 0
+
+    if total <= chunk_size:
+        # 网格只有一块: 不做剪枝，整体向量化计算
+        shape = tuple(int(sizes[j]) for j in outer)
+        best_value, best_x = _evaluate_chunk(program, gain, lb, ub, inner, outer, shape, np.arange(total), ())
+        evaluated = total
+    else:
+        # 分支变量的取值按单行LP松弛界从好到差处理，界不优于当前最好解时停止
+        branch, grid = outer[0], outer[1:]
+        shape = tuple(int(sizes[j]) for j in grid)
+        grid_total = math.prod(shape)
+        candidates = []
+        for v in range(int(lb[branch]), int(ub[branch]) + 1):
+            fixed_lb, fixed_ub = lb.copy(), ub.copy()
+            fixed_lb[branch] = fixed_ub[branch] = v
+            candidates.append((_relaxation_bound(program, gain, fixed_lb, fixed_ub), v))
+        candidates.sort(key=lambda item: -item[0])
+        for bound, v in candidates:
+            if not _improves(bound, best_value):
+                break
+            for offset in range(0, grid_total, chunk_size):
+                index = np.arange(offset, min(offset + chunk_size, grid_total))
+                value, x = _evaluate_chunk(program, gain, lb, ub, inner, grid, shape, index, ((branch, v),))
+                evaluated += len(index)
+                if value is not None and _improves(value, best_value):
+                    best_value, best_x = value, x.copy()
+
+    elapsed = time.perf_counter() - start
+    if best_x is None:
+        return dict(infeasible, time=elapsed, evaluated=evaluated)
+    return {
+        "status": COPT.OPTIMAL,
+        "objective": float(program.obj @ best_x + program.obj_const),
+        "values": best_x,
+        "engine": "enumeration",
+        "time": elapsed,
+        "evaluated": evaluated,
+    }
+
+
+def solve_copt(program, env=None):
+    """用COPT求解 (env为None时新建并关闭环境，计入耗时)"""
+    start = time.perf_counter()
+    own_env = env is None
+    if own_env:
+        env = cp.Envr()
+    try:
+        model = env.createModel(program.name)
+        model.setParam(COPT.Param.Logging, 0)
+        x = [
+            model.addVar(lb=float(l) if np.isfinite(l) else -COPT.INFINITY,
+                         ub=float(u) if np.isfinite(u) else COPT.INFINITY,
+                         vtype=COPT.INTEGER if integer else COPT.CONTINUOUS, name=name)
+            for name, l, u, integer in zip(program.names, program.lb, program.ub, program.integer)
+        ]
+        for a, lo, hi, name in zip(program.matrix, program.row_lb, program.row_ub, program.row_names):
+            expr = cp.LinExpr()
+            for j in np.flatnonzero(a):
+                expr.addTerm(x[j], float(a[j]))
+            model.addBoundConstr(expr, float(lo) if np.isfinite(lo) else -COPT.INFINITY,
+                                 float(hi) if np.isfinite(hi) else COPT.INFINITY, name=name)
+        objective = cp.LinExpr(program.obj_const)
+        for j in np.flatnonzero(program.obj):
+            objective.addTerm(x[j], float(program.obj[j]))
+        model.setObjective(objective, sense=program.sense)
+        model.solve()
+        optimal = model.status == COPT.OPTIMAL
+        return {
+            "status": model.status,
+            "objective": model.objval if optimal else None,
+            "values": np.array([v.x for v in x]) if optimal else None,
+            "engine": "copt",
+            "time": time.perf_counter() - start,
+        }
+    finally:
+        if own_env:
+            env.close()
+
+
+def solve(program, limit=ENUMERATION_LIMIT, env=None):
+    """纯整数且枚举规模不超过 limit 时枚举求解，否则使用COPT"""
+    if program.is_pure_integer:
+        bounds = tighten_bounds(program)
+        if enumeration_size(*bounds) <= limit:
+            return enumerate_solve(program, bounds)
+    return solve_copt(program, env)
+
+
+def check_edge_cases():
+    """枚举引擎的边界情形，与COPT的结果比较，返回不一致的情形名称列表"""
+    inf = COPT.INFINITY
+    cases = [
+        # (名称, IntegerProgram)
+        ("单变量", IntegerProgram(["x"], [3], [0], [10], [[2]], [-inf], [9], sense=COPT.MAXIMIZE)),
+        ("单变量无约束行", IntegerProgram(["x"], [-1], [-4], [7], np.zeros((0, 1)), [], [])),
+        ("单变量不可行", IntegerProgram(["x"], [1], [0], [10], [[2]], [3], [3])),
+        ("内层变量系数为0", IntegerProgram(["x", "y"], [1, 1], [0, 0], [5, 40], [[1, 0]], [-inf], [3],
+                                      sense=COPT.MAXIMIZE)),
+        ("两变量背包", IntegerProgram(["x", "y"], [5, 4], [0, 0], [inf, inf], [[6, 4], [1, 2]], [-inf, -inf],
+                                  [24, 6], sense=COPT.MAXIMIZE)),
+    ]
+    failed = []
+    env = cp.Envr()
+    try:
+        for name, program in cases:
+            result, reference = solve(program), solve_copt(program, env)
+            if result["engine"] != "enumeration" or (result["status"] == COPT.OPTIMAL) != (
+                    reference["status"] == COPT.OPTIMAL):
+                failed.append(name)
+            elif result["status"] == COPT.OPTIMAL and abs(result["objective"] - reference["objective"]) > 1e-6:
+                failed.append(name)
+    finally:
+        env.close()
+    return failed
+
+
+def capture_programs(instance):
+    """
+    在临时目录中运行实例脚本 (输出丢弃)，读取脚本中每个模型 (照常求解，得到COPT的目标值用于核对)
+
+    Returns:
+        [(IntegerProgram, COPT目标值或None)]
+    """
+    captured = []
+    original_solve = cp.Model.solve
+
+    def capturing_solve(model, *args, **kwargs):
+        program = IntegerProgram.from_copt_model(model)
+        result = original_solve(model, *args, **kwargs)
+        captured.append((program, model.objval if model.status == COPT.OPTIMAL else None))
+        return result
+
+    with script_environment(os.path.join(ROOT, instance, INSTANCES[instance]),
+                            patches=[(cp.Model, "solve", capturing_solve)],
+                            copy_prefix="industryor_enum_", output=os.devnull) as run:
+        run.run(record_errors=True)
+    if run.error:
+        print(f"警告: {instance} 脚本出错 ({run.error})，已读取的模型仍然有效", file=sys.stderr)
+    return captured
+
+
+def benchmark(instances, repeat=200, copt_repeat=5, limit=ENUMERATION_LIMIT):
+    """
+    比较 solve() 自动选择的引擎与COPT (每次新建环境，与脚本相同) 的单次求解延迟
+
+    Returns:
+        每个模型一行的结果列表
+    """
+    rows = []
+    for instance in instances:
+        for k, (program, reference) in enumerate(capture_programs(instance)):
+            lb, ub = tighten_bounds(program)
+            size = enumeration_size(lb, ub)
+            result = solve(program, limit)
+            times = []
+            for _ in range(repeat if result["engine"] == "enumeration" else copt_repeat):
+                begin = time.perf_counter()
+                solve(program, limit)
+                times.append(time.perf_counter() - begin)
+            copt_times = []
+            for _ in range(copt_repeat):
+                copt_times.append(solve_copt(program)["time"])
+            rows.append({
+                "instance": instance + (f" #{k + 1}" if k else ""),
+                "vars": len(program.names),
+                "pure_integer": program.is_pure_integer,
+                "size": size,
+                "engine": result["engine"],
+                "objective": result["objective"],
+                "reference": reference,
+                "time": float(np.median(times)),
+                "copt_time": float(np.median(copt_times)),
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="小规模纯整数模型的枚举求解与延迟比较")
+    parser.add_argument("instances", nargs="*", help="实例编号，如 id04 id19 id20 id21 id85")
+    parser.add_argument("--repeat", type=int, default=200, help="枚举求解的重复次数 (取中位数)")
+    parser.add_argument("--copt-repeat", type=int, default=5, help="COPT求解的重复次数 (取中位数)")
+    parser.add_argument("--limit", type=int, default=ENUMERATION_LIMIT, help="自动选择枚举的规模上限")
+    parser.add_argument("--check", action="store_true", help="只检查枚举引擎的边界情形 (与COPT比较)")
+    args = parser.parse_args()
+    if args.check:
+        failed = check_edge_cases()
+        print(f"边界情形检查: {'全部通过' if not failed else '不一致: ' + ', '.join(failed)}")
+        sys.exit(1 if failed else 0)
+    if not args.instances:
+        parser.error("需要至少一个实例编号 (或使用 --check)")
+    unknown = [i for i in args.instances if i not in INSTANCES]
+    if unknown:
+        parser.error(f"未知的实例: {', '.join(unknown)}")
+
+    try:
+        rows = benchmark(args.instances, args.repeat, args.copt_repeat, args.limit)
+    except cp.CoptError as e:
+        print(f"COPT Error: {e.retcode} - {e.message}")
+        return
+
+    print("\n" + "=" * 100)
+    print(f"{'实例':<8} {'变量':>4} {'枚举规模':>12} {'引擎':<12} {'目标值':>14} {'COPT目标值':>14} "
+          f"{'单次耗时':>12} {'COPT耗时':>10} {'加速比':>8}")
+    print("-" * 100)
+    for row in rows:
+        size = "非纯整数" if not row["pure_integer"] else ("无界" if row["size"] == math.inf else f"{row['size']:,}")
+        objective = f"{row['objective']:.6g}" if row["objective"] is not None else "-"
+        reference = f"{row['reference']:.6g}" if row["reference"] is not None else "-"
+        elapsed = (f"{row['time'] * 1e6:.0f} µs" if row["time"] < 1e-3 else f"{row['time'] * 1e3:.2f} ms")
+        print(f"{row['instance']:<8} {row['vars']:>4} {size:>12} {row['engine']:<12} {objective:>14} {reference:>14} "
+              f"{elapsed:>12} {row['copt_time'] * 1e3:>7.2f} ms {row['copt_time'] / row['time']:>8.1f}")
+    mismatched = [row["instance"] for row in rows
+                  if row["objective"] is not None and row["reference"] is not None
+                  and abs(row["objective"] - row["reference"]) > 1e-6 * max(1.0, abs(row["reference"]))]
+    if mismatched:
+        print(f"\n与COPT目标值不一致: {', '.join(mismatched)}")
+
+
+if __name__ == "__main__":
+    main()
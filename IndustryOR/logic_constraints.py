@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IndustryOR 逻辑约束编译: 蕴含、互斥、至少k个，自动计算最紧的大M或改用COPT指示约束
+
+id05、id09、id14、id20 等脚本都手工推导大M链接约束 (x <= M*y)，M 取自题目数据的粗略估计
+(如 id05 的总重量6、id14 的8)。M 越大，LP松弛越弱。本模块提供两种用法:
+
+1. 建模层 LogicCompiler: 逻辑约束先登记，compile() 时由变量上下界和模型中已有的约束行
+   (活动值界传播，见 integer_enum.tighten_bounds) 推出每个表达式的取值范围，取最小的有效M；
+   mode="indicator" 时不使用大M，直接生成COPT指示约束
+2. tighten_linking_rows(): 对已建好的模型，找出只含一个二元变量、且二元变量取1时放松的约束行
+   (即手写的大M行)，按其余约束推出的活动值上界做系数收紧；取1时整行冗余的可改写为指示约束
+
+用法:
+    python logic_constraints.py id05 id09 id14 id20              # 比较原始大M、收紧大M、指示约束的节点数
+    python logic_constraints.py id05 id09 id14 id20 --presolve 0 # 关闭COPT预求解，只看建模本身的差别
+
+在代码中使用:
+    from logic_constraints import LogicCompiler
+    logic = LogicCompiler(model)                # 或 LogicCompiler(model, mode="indicator")
+    logic.link(x[i], y[i], lower=1)             # y=0 时 x=0，y=1 时 x>=1
+    logic.implies(y[2], x[2] <= x[3])           # y=1 时约束成立
+    logic.exclusive([y[0], y[3]])               # 至多选一个
+    logic.at_least([z[v] for v in veg], 3)      # 至少选3个
+    logic.compile()                             # 其余约束行全部加入后调用
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+import coptpy as cp
+from coptpy import COPT
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+from benchmark_suite import INSTANCES  # noqa: E402
+from integer_enum import IntegerProgram, solve_copt, tighten_bounds  # noqa: E402
+from solve_telemetry import script_environment  # noqa: E402
+
+TOL = 1e-9
+MODES = ("bigm", "indicator")
+
+
+def implied_bounds(model, exclude=()):
+    """
+    由变量上下界和模型约束行 (不含 exclude 中的行下标) 推出的变量上下界
+
+    Returns:
+        (lb, ub)，按变量下标排列的 numpy 数组，无法推出有限界时为 ±inf
+    """
+    program = IntegerProgram.from_copt_model(model)
+    if exclude:
+        keep = np.ones(len(program.row_lb), dtype=bool)
+        keep[list(exclude)] = False
+        program.matrix = program.matrix[keep]
+        program.row_lb = program.row_lb[keep]
+        program.row_ub = program.row_ub[keep]
+    return tighten_bounds(program)
+
+
+def _terms(expr):
+    """LinExpr 的 (变量下标, 系数) 列表 (同一变量合并) 和常数项"""
+    coeffs = {}
+    for k in range(expr.getSize()):
+        index = expr.getVar(k).index
+        coeffs[index] = coeffs.get(index, 0.0) + expr.getCoeff(k)
+    return [(j, a) for j, a in coeffs.items() if a != 0.0], expr.getConstant()
+
+
+def _activity_range(terms, lb, ub):
+    """Σ a_j x_j 在变量上下界内的最小值和最大值"""
+    low = high = 0.0
+    with np.errstate(invalid="ignore"):
+        for j, a in terms:
+            low += min(a * lb[j], a * ub[j])
+            high += max(a * lb[j], a * ub[j])
+    return low, high
+
+
+def _is_binary(var):
+    return var.vtype != COPT.CONTINUOUS and var.lb >= -TOL and var.ub <= 1 + TOL
+
+
+class LogicCompiler:
+    """
+    逻辑约束的建模层
+
+    二元变量之间的逻辑 (implies_var、exclusive、at_least) 不需要大M，调用时直接加入模型；
+    涉及一般表达式的蕴含 (implies、link) 先登记，compile() 时按当时模型中的约束行计算大M。
+    """
+
+    def __init__(self, model, mode="bigm"):
+        if mode not in MODES:
+            raise ValueError(f"未知的模式: {mode} (可选 {', '.join(MODES)})")
+        self.model = model
+        self.mode = mode
+        self.pending = []
+        self.records = []
+
+    def implies(self, y, constr, value=1, name=""):
+        """y == value 时约束 constr 成立 (constr 为 x <= e 形式的约束表达式)"""
+        if not _is_binary(y):
+            raise ValueError(f"{y.name} 不是二元变量")
+        self.pending.append((y, int(value), constr, name))
+
+    def link(self, x, y, lower=0.0, name=""):
+        """y=0 时 x=0；y=1 时 x >= lower (lower=0 时只有前一半)"""
+        name = name or f"link_{x.name}"
+        self.implies(y, x <= 0, value=0, name=f"{name}_off")
+        if lower > 0:
+            self.implies(y, x >= lower, value=1, name=f"{name}_on")
+
+    def implies_var(self, y1, y2, name=""):
+        """y1=1 时 y2=1"""
+        return self.model.addConstr(y1 <= y2, name=name)
+
+    def exclusive(self, ys, name=""):
+        """至多一个为1"""
+        return self.model.addConstr(cp.quicksum(ys) <= 1, name=name)
+
+    def at_least(self, ys, k, name=""):
+        """至少 k 个为1"""
+        return self.model.addConstr(cp.quicksum(ys) >= k, name=name)
+
+    def compile(self):
+        """
+        把登记的蕴含约束加入模型 (大M按当前模型的约束行计算)
+
+        Returns:
+            每条登记约束的记录 {name, sense, big_m, action}，big_m 为各方向实际使用的M
+        """
+        lb = ub = None
+        if self.mode == "bigm" and self.pending:
+            lb, ub = implied_bounds(self.model)
+        for y, value, constr, name in self.pending:
+            if self.mode == "indicator":
+                self.model.addGenConstrIndicator(y, bool(value), constr, name=name)
+                self.records.append({"name": name, "sense": constr.getSense(), "big_m": None,
+                                     "action": "indicator"})
+                continue
+            self.records.append(self._add_big_m(y, value, constr, name, lb, ub))
+        self.pending = []
+        return self.records
+
+    def _add_big_m(self, y, value, constr, name, lb, ub):
+        expr = constr.getExpr()
+        terms, const = _terms(expr)
+        sense = constr.getSense()
+        rhs = -const
+        low, high = _activity_range(terms, lb, ub)
+        # 指示变量取 value 时 off = 0，否则 off = 1
+        off = (1 - y) if value else y
+        lhs = cp.quicksum(a * self.model.getVar(j) for j, a in terms)
+        record = {"name": name, "sense": sense, "big_m": [], "action": "bigm"}
+        if sense in (COPT.LESS_EQUAL, COPT.EQUAL):
+            big_m = high - rhs
+            if not np.isfinite(big_m):
+                raise ValueError(f"{name}: 无法由变量上下界和约束行推出有限的大M，请使用 mode='indicator'")
+            if big_m > TOL:
+                self.model.addConstr(lhs - big_m * off <= rhs, name=name)
+                record["big_m"].append(float(big_m))
+        if sense in (COPT.GREATER_EQUAL, COPT.EQUAL):
+            big_m = rhs - low
+            if not np.isfinite(big_m):
+                raise ValueError(f"{name}: 无法由变量上下界和约束行推出有限的大M，请使用 mode='indicator'")
+            if big_m > TOL:
+                self.model.addConstr(lhs + big_m * off >= rhs, name=name)
+                record["big_m"].append(float(big_m))
+        if not record["big_m"]:
+            # 由其余约束已经保证成立，不需要加入
+            record["action"] = "redundant"
+        return record
+
+
+def tighten_linking_rows(model, mode="bigm"):
+    """
+    收紧已建好模型中的大M链接行
+
+    候选行: 单侧约束，恰含一个二元变量 y，且 y=1 时约束放松 (如 x - M*y <= 0)。
+    其余变量的上下界由全部非候选行推出，记 y 以外各项的最大活动值为 A (<= 行)，
+    y=1 时行的右端项 b - a_y 大于 A 即为冗余，把 a_y 收紧为 b - A。
+    mode="indicator" 时，y=1 冗余的行改写为指示约束 "y=0 时 其余各项 <= b"。
+
+    Returns:
+        每个候选行的记录 {row, binary, old, new, action}，action 为 tightened/indicator/kept/redundant
+    """
+    if mode not in MODES:
+        raise ValueError(f"未知的模式: {mode} (可选 {', '.join(MODES)})")
+    variables = model.getVars()
+    constrs = model.getConstrs()
+    candidates = []
+    for i, constr in enumerate(constrs):
+        row_lb, row_ub = constr.lb, constr.ub
+        upper_only = row_ub < COPT.INFINITY and row_lb <= -COPT.INFINITY
+        lower_only = row_lb > -COPT.INFINITY and row_ub >= COPT.INFINITY
+        if not (upper_only or lower_only):
+            continue
+        terms, _ = _terms(model.getRow(constr))
+        binaries = [(j, a) for j, a in terms if _is_binary(variables[j])]
+        if len(binaries) != 1:
+            continue
+        j_bin, a_bin = binaries[0]
+        # 统一成 <= 形式: sign * row <= rhs
+        sign = 1.0 if upper_only else -1.0
+        if sign * a_bin >= 0:
+            continue
+        rest = [(j, sign * a) for j, a in terms if j != j_bin]
+        rhs = sign * (row_ub if upper_only else row_lb)
+        candidates.append((i, j_bin, sign * a_bin, rest, rhs))
+    if not candidates:
+        return []
+
+    lb, ub = implied_bounds(model, exclude=[c[0] for c in candidates])
+    records, removed = [], []
+    for i, j_bin, a_bin, rest, rhs in candidates:
+        constr, y = constrs[i], variables[j_bin]
+        record = {"row": constr.name, "binary": y.name, "old": -a_bin, "new": -a_bin, "action": "kept"}
+        records.append(record)
+        _, high = _activity_range(rest, lb, ub)
+        if not np.isfinite(high):
+            continue
+        if high <= rhs + TOL:
+            # y=0 时也冗余
+            record["action"] = "redundant"
+            continue
+        if rhs - a_bin < high - TOL:
+            # y=1 时仍有约束作用，只能保留
+            continue
+        if mode == "indicator":
+            sign = 1.0 if constr.ub < COPT.INFINITY else -1.0
+            lhs = cp.quicksum(sign * a * variables[j] for j, a in rest)
+            bound = sign * rhs
+            model.addGenConstrIndicator(y, False, lhs <= bound if sign > 0 else lhs >= bound,
+                                        name=f"{constr.name}_ind")
+            removed.append(constr)
+            record.update(new=None, action="indicator")
+            continue
+        new = rhs - high
+        if new > a_bin + TOL:
+            model.setCoeff(constr, y, new if constr.ub < COPT.INFINITY else -new)
+            record.update(new=-new, action="tightened")
+    for constr in removed:
+        model.remove(constr)
+    return records
+
+
+def lp_bound(model):
+    """模型 (不含指示约束) 的LP松弛目标值"""
+    program = IntegerProgram.from_copt_model(model)
+    program.integer = np.zeros(len(program.names), dtype=bool)
+    result = solve_copt(program)
+    return result["objective"]
+
+
+def evaluate(instance, mode=None, params=None):
+    """
+    在临时目录中运行实例脚本，每次求解前按 mode 改写大M链接行 (None 为原样求解)
+
+    Returns:
+        每次求解一条记录 {objective, nodes, time, lp_bound, records}
+    """
+    solves = []
+    original_solve = cp.Model.solve
+
+    def rewriting_solve(model, *args, **kwargs):
+        records = tighten_linking_rows(model, mode) if mode else []
+        # LP松弛用原始的 solve (否则会再次进入本函数)
+        cp.Model.solve = original_solve
+        try:
+            bound = lp_bound(model) if mode != "indicator" else None
+        finally:
+            cp.Model.solve = rewriting_solve
+        for name, value in (params or {}).items():
+            model.setParam(name, value)
+        result = original_solve(model, *args, **kwargs)
+        solves.append({
+            "objective": model.objval if model.status == COPT.OPTIMAL else None,
+            "nodes": model.getAttr(COPT.Attr.NodeCnt) if model.getAttr(COPT.Attr.IsMIP) else 0,
+            "time": model.getAttr(COPT.Attr.SolvingTime),
+            "lp_bound": bound,
+            "records": records,
+        })
+        return result
+
+    with script_environment(os.path.join(ROOT, instance, INSTANCES[instance]),
+                            patches=[(cp.Model, "solve", rewriting_solve)],
+                            copy_prefix="industryor_logic_", output=os.devnull) as run:
+        run.run(record_errors=True)
+    if run.error:
+        print(f"警告: {instance} 脚本出错 ({run.error})，已记录的求解结果仍然有效", file=sys.stderr)
+    return solves
+
+
+def main():
+    parser = argparse.ArgumentParser(description="大M链接约束收紧 / 指示约束改写的节点数比较")
+    parser.add_argument("instances", nargs="+", help="实例编号，如 id05 id09 id14 id20")
+    parser.add_argument("--presolve", type=int, default=None, help="COPT Presolve 参数 (0 为关闭)")
+    args = parser.parse_args()
+    unknown = [i for i in args.instances if i not in INSTANCES]
+    if unknown:
+        parser.error(f"未知的实例: {', '.join(unknown)}")
+    params = {COPT.Param.Presolve: args.presolve} if args.presolve is not None else None
+
+    print("\n" + "=" * 100)
+    print(f"{'实例':<8} {'方式':<10} {'目标值':>12} {'LP松弛':>12} {'节点数':>8} {'耗时(s)':>9} {'候选行':>6} "
+          f"{'收紧':>5} {'指示':>5}  大M (原 -> 新)")
+    print("-" * 100)
+    for instance in args.instances:
+        for label, mode in (("原始大M", None), ("收紧大M", "bigm"), ("指示约束", "indicator")):
+            try:
+                solves = evaluate(instance, mode, params)
+            except cp.CoptError as e:
+                print(f"COPT Error: {e.retcode} - {e.message}")
+                continue
+            if not solves:
+                print(f"{instance:<8} {label:<10} 没有求解记录")
+                continue
+            for k, solve in enumerate(solves):
+                records = solve["records"]
+                tightened = [r for r in records if r["action"] == "tightened"]
+                objective = f"{solve['objective']:.6g}" if solve["objective"] is not None else "-"
+                bound = f"{solve['lp_bound']:.6g}" if solve["lp_bound"] is not None else "-"
+                changes = sorted({(round(r["old"], 6), round(r["new"], 6)) for r in tightened})
+                detail = ", ".join(f"{old:g}->{new:g}" for old, new in changes[:4])
+                if len(changes) > 4:
+                    detail += ", ..."
+                print(f"{instance + (f' #{k + 1}' if k else ''):<8} {label:<10} {objective:>12} {bound:>12} "
+                      f"{solve['nodes']:>8} {solve['time']:>9.3f} {len(records):>6} {len(tightened):>5} "
+                      f"{sum(r['action'] == 'indicator' for r in records):>5}  {detail}")
+        print("-" * 100)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IndustryOR 线性规划灵敏度分析 (对偶值、检验数与右端项/目标系数范围)
+
+id13、id16、id31 等LP脚本只输出原始解，回答"多一英亩地值多少钱"之类的问题时只能改数据重新求解。
+本模块在脚本的一次求解之后，从最终基读出全部灵敏度信息，保存为NumPy数组，之后的假设分析不再调用求解器。
+
+标准形式: 约束行 i 引入逻辑变量 s_i = a_i x，行的上下界即 s_i 的上下界，
+    [A  -I] z = 0，z = (x, s)，基矩阵 B 由基变量对应的列组成
+由最终基 (COPT的 VarBasis / ConstrBasis) 计算:
+- 对偶值: y = B^-T c_B，为目标值对约束右端项的变化率 (与COPT的 pi 一致)
+- 检验数: d = c - [A -I]^T y
+- 右端项范围: 右端项变化 δ 时基变量沿 B^-1 e_i 移动，比值检验得到基保持可行的 δ 区间；
+  非紧约束 (逻辑变量为基变量) 在松弛量用完之前目标值不变
+- 目标系数范围: 非基变量的系数变化到检验数变号为止；基变量的系数变化 Δ 时非基检验数变化 -Δ·(B^-1 N) 的对应行，
+  比值检验得到基保持最优的 Δ 区间
+- 假设分析: 同时改变多个右端项时直接用 B^-1 更新基变量并检查可行性，同时改变多个目标系数时重新计算检验数并检查最优性，
+  基保持不变时给出新的目标值和解，否则说明超出了当前基的有效范围
+
+COPT也提供 ReqSensitivity 的范围信息，但等式约束只返回退化的区间，这里统一由基矩阵计算。
+
+用法 (选项写在实例编号之后):
+    python lp_sensitivity.py id13 id16 id31                          # 运行脚本并输出灵敏度报告
+    python lp_sensitivity.py id13 --rhs total_area=110               # 多10英亩地的目标值与新种植方案
+    python lp_sensitivity.py id13 --obj corn_area=1700 --save         # 保存到 output/sensitivity/id13.npz
+    python lp_sensitivity.py --load output/sensitivity/id13.npz --rhs total_area=120   # 不调用COPT
+
+在代码中使用:
+    analysis = LPSensitivity.load("output/sensitivity/id13.npz")
+    analysis.dual[analysis.constr_index["total_area"]]
+    analysis.what_if(rhs={"total_area": 110})
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+import coptpy as cp
+from coptpy import COPT
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT_DIR = os.path.join(ROOT, "output", "sensitivity")
+
+sys.path.insert(0, ROOT)
+from benchmark_suite import INSTANCES  # noqa: E402
+from solve_telemetry import script_environment  # noqa: E402
+
+INF = COPT.INFINITY
+TOL = 1e-9
+
+
+def _bound(value):
+    """把COPT的无穷大 (1e30) 换成 numpy 的 inf"""
+    return np.where(np.abs(value) >= INF, np.copysign(np.inf, value), value)
+
+
+class LPSensitivity:
+    """
+    一个LP最优基的灵敏度信息
+
+    数组 (按 var_names / constr_names 的顺序，可用 var_index / constr_index 按名称取下标):
+        values, obj, reduced_cost, obj_low, obj_high                 变量
+        activity, rhs, slack, dual, rhs_low, rhs_high                约束 (slack 为活动值到右端项的距离，不小于0)
+    目标系数、右端项和对偶值都按原模型的优化方向给出 (最大化问题的对偶值为每单位右端项增加的利润)。
+    """
+
+    FIELDS = ("var_names", "constr_names", "sense", "objective", "obj", "var_lb", "var_ub", "values",
+              "row_lb", "row_ub", "matrix", "basis", "status")
+
+    def __init__(self, var_names, constr_names, sense, objective, obj, var_lb, var_ub, values,
+                 row_lb, row_ub, matrix, basis, status):
+        self.var_names = [str(name) for name in var_names]
+        self.constr_names = [str(name) for name in constr_names]
+        self.var_index = {name: j for j, name in enumerate(self.var_names)}
+        self.constr_index = {name: i for i, name in enumerate(self.constr_names)}
+        self.sense = int(sense)
+        self.objective = float(objective)
+        self.obj = np.asarray(obj, dtype=float)
+        self.var_lb, self.var_ub = _bound(np.asarray(var_lb, dtype=float)), _bound(np.asarray(var_ub, dtype=float))
+        self.values = np.asarray(values, dtype=float)
+        self.row_lb, self.row_ub = _bound(np.asarray(row_lb, dtype=float)), _bound(np.asarray(row_ub, dtype=float))
+        self.matrix = np.asarray(matrix, dtype=float)
+        # basis: 基变量在 z = (x, s) 中的下标；status: z 的基状态 (COPT.BASIS_*)
+        self.basis = np.asarray(basis, dtype=np.int64)
+        self.status = np.asarray(status, dtype=np.int64)
+        self._analyze()
+
+    @classmethod
+    def from_model(cls, model):
+        """从求解到最优的LP模型读取最终基 (需要 HasBasis)"""
+        variables = model.getVars()
+        constrs = model.getConstrs()
+        n, m = len(variables), len(constrs)
+        matrix = np.zeros((m, n))
+        for i, constr in enumerate(constrs):
+            row = model.getRow(constr)
+            for k in range(row.size):
+                matrix[i, row.getVar(k).index] += row.getCoeff(k)
+        status = np.concatenate([model.getVarBasis(variables), model.getConstrBasis(constrs)]).astype(np.int64)
+        return cls(
+            var_names=[v.name for v in variables],
+            constr_names=[c.name for c in constrs],
+            sense=model.objsense,
+            objective=model.objval,
+            obj=[v.obj for v in variables],
+            var_lb=[v.lb for v in variables],
+            var_ub=[v.ub for v in variables],
+            values=[v.x for v in variables],
+            row_lb=[c.lb for c in constrs],
+            row_ub=[c.ub for c in constrs],
+            matrix=matrix,
+            basis=np.flatnonzero(status == COPT.BASIS_BASIC),
+            status=status,
+        )
+
+    # ------------------------------------------------------------------ 基矩阵计算
+
+    def _analyze(self):
+        m, n = self.matrix.shape
+        self.columns = np.hstack([self.matrix, -np.eye(m)])
+        self.lower = np.concatenate([self.var_lb, self.row_lb])
+        self.upper = np.concatenate([self.var_ub, self.row_ub])
+        self.activity = self.matrix @ self.values
+        self.z = np.concatenate([self.values, self.activity])
+        if len(self.basis) != m:
+            raise ValueError(f"基变量个数 {len(self.basis)} 与约束行数 {m} 不一致")
+        self.basis_inverse = np.linalg.inv(self.columns[:, self.basis])
+
+        # 统一按最小化计算，输出时乘回 sense
+        cost = np.concatenate([self.sense * self.obj, np.zeros(m)])
+        y = self.basis_inverse.T @ cost[self.basis]
+        self._min_reduced = cost - self.columns.T @ y
+        self._min_reduced[self.basis] = 0.0
+        # 加 0.0 去掉 -0.0
+        self.dual = self.sense * y + 0.0
+        self.reduced_cost = self.sense * self._min_reduced[:n] + 0.0
+
+        self.rhs_is_upper = self._rhs_is_upper()
+        self.rhs = np.where(self.rhs_is_upper, self.row_ub, self.row_lb)
+        self.slack = np.where(self.rhs_is_upper, self.rhs - self.activity, self.activity - self.rhs)
+        self.rhs_low, self.rhs_high = self._rhs_ranges()
+        self.obj_low, self.obj_high = self._objective_ranges()
+
+    def _rhs_is_upper(self):
+        """每行的"右端项": 逻辑变量位于上界或只有有限上界时取上界，否则取下界"""
+        m = len(self.constr_names)
+        row_status = self.status[-m:]
+        upper = np.isfinite(self.row_ub) & ~np.isfinite(self.row_lb)
+        upper |= row_status == COPT.BASIS_UPPER
+        upper &= row_status != COPT.BASIS_LOWER
+        return upper & np.isfinite(self.row_ub)
+
+    def _step_interval(self, direction):
+        """基变量沿 direction 移动时保持在各自界内的步长区间 [low, high]"""
+        basic = self.basis
+        value = self.z[basic]
+        low, high = -np.inf, np.inf
+        for k in np.flatnonzero(np.abs(direction) > TOL):
+            g = direction[k]
+            bounds = ((self.lower[basic[k]] - value[k]) / g, (self.upper[basic[k]] - value[k]) / g)
+            low = max(low, min(bounds))
+            high = min(high, max(bounds))
+        return low, high
+
+    def _rhs_ranges(self):
+        m, n = self.matrix.shape
+        low, high = np.empty(m), np.empty(m)
+        for i in range(m):
+            if self.status[n + i] == COPT.BASIS_BASIC:
+                # 非紧约束: 右端项移动到当前行活动值之前基不变
+                if self.rhs_is_upper[i]:
+                    low[i], high[i] = self.activity[i], np.inf
+                else:
+                    low[i], high[i] = -np.inf, self.activity[i]
+                continue
+            step_low, step_high = self._step_interval(self.basis_inverse[:, i])
+            low[i], high[i] = self.rhs[i] + step_low, self.rhs[i] + step_high
+        return low, high
+
+    def _objective_ranges(self):
+        m, n = self.matrix.shape
+        low, high = np.empty(n), np.empty(n)
+        position = {j: r for r, j in enumerate(self.basis)}
+        nonbasic = np.setdiff1d(np.arange(n + m), self.basis)
+        for j in range(n):
+            if j in position:
+                alpha = self.basis_inverse[position[j]] @ self.columns
+                delta_low, delta_high = -np.inf, np.inf
+                for k in nonbasic:
+                    if abs(alpha[k]) <= TOL or self.status[k] == COPT.BASIS_FIXED:
+                        continue
+                    ratio = self._min_reduced[k] / alpha[k]
+                    # 位于下界的非基变量要求 d_k - Δ·alpha_k >= 0，位于上界的要求 <= 0
+                    keeps_above = (self.status[k] != COPT.BASIS_UPPER) == (alpha[k] > 0)
+                    if keeps_above:
+                        delta_high = min(delta_high, ratio)
+                    else:
+                        delta_low = max(delta_low, ratio)
+            elif self.status[j] == COPT.BASIS_FIXED:
+                delta_low, delta_high = -np.inf, np.inf
+            elif self.status[j] == COPT.BASIS_UPPER:
+                delta_low, delta_high = -np.inf, -self._min_reduced[j]
+            else:
+                delta_low, delta_high = -self._min_reduced[j], np.inf
+            # 最小化形式下的系数区间换回原优化方向
+            if self.sense == COPT.MINIMIZE:
+                low[j], high[j] = self.obj[j] + delta_low, self.obj[j] + delta_high
+            else:
+                low[j], high[j] = self.obj[j] - delta_high, self.obj[j] - delta_low
+        return low, high
+
+    # ------------------------------------------------------------------ 假设分析
+
+    def _lookup(self, index, name, kind):
+        if name not in index:
+            raise KeyError(f"未知的{kind}名称: {name}")
+        return index[name]
+
+    def what_if(self, rhs=None, obj=None):
+        """
+        同时改变若干约束右端项和变量目标系数后的最优目标值与解 (不调用求解器)
+
+        Args:
+            rhs: {约束名: 新右端项}
+            obj: {变量名: 新目标系数}
+
+        Returns:
+            {"objective", "values", "basis_valid", "violations"}；当前基不再可行或不再最优时 basis_valid 为 False，
+            violations 列出越界的基变量或检验数变号的非基变量，此时需要重新求解
+        """
+        m, n = self.matrix.shape
+        z = self.z.copy()
+        lower, upper = self.lower.copy(), self.upper.copy()
+        for name, value in (rhs or {}).items():
+            i = self._lookup(self.constr_index, name, "约束")
+            delta = value - self.rhs[i]
+            if self.rhs_is_upper[i]:
+                upper[n + i] += delta
+                if np.isfinite(lower[n + i]) and lower[n + i] == self.row_ub[i]:
+                    lower[n + i] += delta
+            else:
+                lower[n + i] += delta
+                if np.isfinite(upper[n + i]) and upper[n + i] == self.row_lb[i]:
+                    upper[n + i] += delta
+            if self.status[n + i] != COPT.BASIS_BASIC:
+                z[self.basis] += delta * self.basis_inverse[:, i]
+                z[n + i] += delta
+
+        coefficients = self.obj.copy()
+        for name, value in (obj or {}).items():
+            coefficients[self._lookup(self.var_index, name, "变量")] = value
+        cost = np.concatenate([self.sense * coefficients, np.zeros(m)])
+        reduced = cost - self.columns.T @ (self.basis_inverse.T @ cost[self.basis])
+        reduced[self.basis] = 0.0
+
+        names = self.var_names + [f"行 {name}" for name in self.constr_names]
+        violations = []
+        for k in self.basis:
+            if z[k] < lower[k] - 1e-7 * max(1.0, abs(lower[k])) or z[k] > upper[k] + 1e-7 * max(1.0, abs(upper[k])):
+                violations.append(f"{names[k]} = {z[k]:.6g} 越出 [{lower[k]:.6g}, {upper[k]:.6g}]")
+        for k in np.setdiff1d(np.arange(n + m), self.basis):
+            status = self.status[k]
+            wrong = ((status == COPT.BASIS_LOWER and reduced[k] < -1e-9)
+                     or (status == COPT.BASIS_UPPER and reduced[k] > 1e-9))
+            if wrong:
+                violations.append(f"{names[k]} 的检验数 {self.sense * reduced[k]:.6g} 变号")
+        objective = self.objective + coefficients @ z[:n] - self.obj @ self.values
+        return {
+            "objective": float(objective),
+            "values": z[:n],
+            "basis_valid": not violations,
+            "violations": violations,
+        }
+
+    def marginal_value(self, constr_name):
+        """约束右端项每增加一单位的目标值变化，以及该值成立的右端项区间"""
+        i = self._lookup(self.constr_index, constr_name, "约束")
+        return float(self.dual[i]), (float(self.rhs_low[i]), float(self.rhs_high[i]))
+
+    # ------------------------------------------------------------------ 保存与读取
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez_compressed(path, **{field: np.asarray(getattr(self, field)) for field in self.FIELDS})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(**{field: data[field] for field in cls.FIELDS})
+
+
+def capture(instance):
+    """
+    在临时目录中运行实例脚本 (输出丢弃)，对脚本中每个求解到最优的LP读取灵敏度信息
+
+    Returns:
+        [(模型类型与规模, LPSensitivity 或 None, 说明)]
+    """
+    captured = []
+    original_solve = cp.Model.solve
+
+    def analyzing_solve(model, *args, **kwargs):
+        result = original_solve(model, *args, **kwargs)
+        name = "MIP" if model.getAttr(COPT.Attr.IsMIP) else "LP"
+        name += f" {model.getAttr(COPT.Attr.Cols)}列×{model.getAttr(COPT.Attr.Rows)}行"
+        if model.getAttr(COPT.Attr.IsMIP):
+            captured.append((name, None, "MIP模型没有对偶信息"))
+        elif model.status != COPT.OPTIMAL or not model.getAttr(COPT.Attr.HasBasis):
+            captured.append((name, None, f"未得到最优基 (状态码 {model.status})"))
+        else:
+            captured.append((name, LPSensitivity.from_model(model), ""))
+        return result
+
+    with script_environment(os.path.join(ROOT, instance, INSTANCES[instance]),
+                            patches=[(cp.Model, "solve", analyzing_solve)],
+                            copy_prefix="industryor_sensitivity_", output=os.devnull) as run:
+        run.run(record_errors=True)
+    if run.error:
+        print(f"警告: {instance} 脚本出错 ({run.error})，已读取的灵敏度信息仍然有效", file=sys.stderr)
+    return captured
+
+
+def _fmt(value):
+    if value == np.inf:
+        return "+∞"
+    if value == -np.inf:
+        return "-∞"
+    return f"{_clean(value):.6g}"
+
+
+def _clean(value):
+    """舍去浮点误差产生的极小值"""
+    return 0.0 if abs(value) < 1e-9 else value
+
+
+def print_report(analysis):
+    sense = "最大化" if analysis.sense == COPT.MAXIMIZE else "最小化"
+    print(f"目标 ({sense}) 最优值: {analysis.objective:.6g}")
+    print(f"\n{'约束':<28} {'活动值':>11} {'右端项':>11} {'松弛量':>11} {'对偶值':>11} {'右端项范围':>26}")
+    for i, name in enumerate(analysis.constr_names):
+        interval = f"[{_fmt(analysis.rhs_low[i])}, {_fmt(analysis.rhs_high[i])}]"
+        print(f"{name[:28]:<28} {_clean(analysis.activity[i]):>11.6g} {analysis.rhs[i]:>11.6g} "
+              f"{_clean(analysis.slack[i]):>11.6g} {_clean(analysis.dual[i]):>11.6g} {interval:>26}")
+    print(f"\n{'变量':<28} {'取值':>11} {'目标系数':>11} {'检验数':>11} {'目标系数范围':>26}")
+    for j, name in enumerate(analysis.var_names):
+        interval = f"[{_fmt(analysis.obj_low[j])}, {_fmt(analysis.obj_high[j])}]"
+        print(f"{name[:28]:<28} {_clean(analysis.values[j]):>11.6g} {analysis.obj[j]:>11.6g} "
+              f"{_clean(analysis.reduced_cost[j]):>11.6g} {interval:>26}")
+
+
+def print_what_if(analysis, rhs, obj):
+    result = analysis.what_if(rhs, obj)
+    changes = [f"{name} 右端项 → {value:g}" for name, value in rhs.items()]
+    changes += [f"{name} 目标系数 → {value:g}" for name, value in obj.items()]
+    print(f"\n假设分析: {'，'.join(changes)}")
+    if not result["basis_valid"]:
+        print("  超出当前最优基的有效范围，需要重新求解:")
+        for violation in result["violations"]:
+            print(f"    {violation}")
+        return result
+    print(f"  目标值: {analysis.objective:.6g} → {result['objective']:.6g} "
+          f"(变化 {result['objective'] - analysis.objective:+.6g})")
+    for j, name in enumerate(analysis.var_names):
+        if abs(result["values"][j] - analysis.values[j]) > 1e-9:
+            print(f"  {name}: {analysis.values[j]:.6g} → {result['values'][j]:.6g}")
+    return result
+
+
+def parse_assignments(items):
+    changes = {}
+    for item in items or []:
+        name, sep, value = item.rpartition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"格式应为 名称=数值: {item}")
+        changes[name] = float(value)
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IndustryOR 线性规划灵敏度分析与假设分析")
+    parser.add_argument("instances", nargs="*", help="实例编号，如 id13 id16 id31")
+    parser.add_argument("--load", default=None, help="读取保存的 .npz 灵敏度文件 (不调用COPT)")
+    parser.add_argument("--rhs", nargs="+", default=None, metavar="约束=值", help="假设分析: 新的约束右端项")
+    parser.add_argument("--obj", nargs="+", default=None, metavar="变量=值", help="假设分析: 新的目标系数")
+    parser.add_argument("--save", action="store_true", help=f"把灵敏度信息保存到 {DEFAULT_OUTPUT_DIR}")
+    args = parser.parse_args()
+    rhs, obj = parse_assignments(args.rhs), parse_assignments(args.obj)
+
+    if args.load:
+        analysis = LPSensitivity.load(args.load)
+        print(f"=== {args.load} ===")
+        print_report(analysis)
+        if rhs or obj:
+            print_what_if(analysis, rhs, obj)
+        return
+
+    if not args.instances:
+        parser.error("需要指定实例或 --load")
+    unknown = [i for i in args.instances if i not in INSTANCES]
+    if unknown:
+        parser.error(f"未知的实例: {', '.join(unknown)}")
+
+    for instance in args.instances:
+        try:
+            captured = capture(instance)
+        except cp.CoptError as e:
+            print(f"COPT Error: {e.retcode} - {e.message}")
+            continue
+        if not captured:
+            print(f"\n=== {instance} ===\n脚本没有调用求解")
+            continue
+        for k, (name, analysis, note) in enumerate(captured):
+            label = instance if len(captured) == 1 else f"{instance} #{k + 1}"
+            print(f"\n=== {label} ({name}) ===")
+            if analysis is None:
+                print(note)
+                continue
+            print_report(analysis)
+            if rhs or obj:
+                try:
+                    print_what_if(analysis, rhs, obj)
+                except KeyError as e:
+                    print(f"\n假设分析跳过: {e.args[0]}")
+            if args.save:
+                path = os.path.join(DEFAULT_OUTPUT_DIR, f"{label.replace(' #', '_')}.npz")
+                analysis.save(path)
+                print(f"\n灵敏度信息已保存到 {path}")
+
+
+if __name__ == "__main__":
+    main()
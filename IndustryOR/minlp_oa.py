@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IndustryOR 混合整数非线性规划 (MINLP) 的外逼近求解引擎
+
+模型由线性部分 (直接用COPT建模) 和一元非线性项组成，每个非线性项是某个线性表达式 z 的一元函数:
+
+- 凸项 convex(expr, f, df):  引入上镜图变量 t >= f(z)，用切线 t >= f(p) + f'(p)(z - p) 逼近。
+  t 只能以"越小越好"的方向出现 (最小化目标中系数为正、最大化目标中系数为负、或 <= 约束的左端)
+- 一元项 separable(expr, f): 引入 t = PWL(z)，f 在 z 的定义域上取断点做分段线性插值 (SOS2 约束)，
+  每轮在当前解的 z 处加入断点。插值对凸函数是上估计、对凹函数是下估计，
+  t 的方向满足"插值偏保守"时 (如最小化 -e^z 项) 主问题目标仍是有效界，否则只是近似
+
+求解方法:
+- method="oa":  单树外逼近，主问题MILP只求解一次，在COPT的 MIPSOL 回调中检查每个候选整数解，
+                违反凸项时以惰性约束 (addLazyConstr) 加入该点的切线
+- method="ecp": 扩展割平面法，每轮把主问题求到最优，在最优解处加入切线后重新求解
+两种方法在分段线性误差超过容差时都会加断点重新求解主问题 (上一轮最好解作为MIP初始解)。
+
+z 的定义域由变量上下界和约束行推出 (见 logic_constraints.implied_bounds)，必须有限。
+
+在代码中使用:
+    from minlp_oa import OuterApproximation
+    oa = OuterApproximation(model)
+    w = oa.convex(expr, math.exp, math.exp, name="w")      # w >= exp(expr)
+    v = oa.separable(total, math.exp, name="v")            # v = exp(total) 的分段线性近似
+    model.setObjective(1 + 3 * v - w, COPT.MAXIMIZE)
+    result = oa.solve(method="oa")   # {status, objective, bound, gap, iterations, cuts, breakpoints, time}
+"""
+
+import heapq
+import math
+import os
+import sys
+import time
+
+import coptpy as cp
+from coptpy import COPT
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+from logic_constraints import implied_bounds  # noqa: E402
+
+# 非线性项的可行性/插值误差容差
+FEAS_TOL = 1e-7
+# 节点LP松弛解加用户割的最小违反量 (相对)
+CUT_TOL = 1e-4
+# 相对最优间隙
+GAP_TOL = 1e-6
+# 凸项的初始切线数、一元项的初始断点数
+INITIAL_POINTS = 8
+# adaptive_breakpoints 的插值误差 (绝对) 和断点数上限
+PWL_TOL = 1e-4
+MAX_BREAKPOINTS = 64
+METHODS = ("oa", "ecp")
+
+
+def adaptive_breakpoints(f, lower, upper, tol=PWL_TOL, max_points=MAX_BREAKPOINTS):
+    """
+    [lower, upper] 上的分段线性插值断点: 每次对分中点插值误差最大的区间，
+    直到所有区间的中点误差不超过 tol 或断点数达到 max_points
+    """
+    if upper <= lower:
+        return [lower]
+
+    def error(a, b):
+        return abs(f((a + b) / 2) - (f(a) + f(b)) / 2)
+
+    points = {lower, upper}
+    heap = [(-error(lower, upper), lower, upper)]
+    while heap and len(points) < max_points:
+        neg_error, a, b = heapq.heappop(heap)
+        if -neg_error <= tol:
+            break
+        middle = (a + b) / 2
+        points.add(middle)
+        heapq.heappush(heap, (-error(a, middle), a, middle))
+        heapq.heappush(heap, (-error(middle, b), middle, b))
+    return sorted(points)
+
+
+class _Term:
+    """一个非线性项: t 与 f(z) 的关系，z 是辅助变量 (z = 线性表达式)"""
+
+    def __init__(self, kind, z, t, f, df, name):
+        self.kind = kind
+        self.z, self.t = z, t
+        self.f, self.df = f, df
+        self.name = name
+        self.lower = self.upper = None
+        # 一元项: 断点、当前的 λ 变量和三行 (Σλ = 1, z = Σλp, t = Σλf(p))
+        self.points = []
+        self.weights = []
+        self.rows = None
+        self.cuts = 0
+        # 一元项: 由定义域给出初始断点的函数 grid(lower, upper)，为 None 时取等距断点
+        self.grid = None
+        # t 是否出现在用户的约束行中 (否则 t 只在目标中，任意 z 取 t = f(z) 都是可行解)
+        self.constrained = True
+        # 本次求解中回调加入的切点
+        self.lazy_points = []
+
+    def tangent(self, point):
+        """在 point 处的切线约束 t >= f(p) + f'(p)(z - p)"""
+        value, slope = self.f(point), self.df(point)
+        return self.t >= value + slope * (self.z - point)
+
+
+class _TangentCallback(cp.CallbackBase):
+    """
+    单树外逼近: 候选整数解违反凸项时加入切线 (惰性约束)；
+    节点LP松弛解明显违反凸项时加入切线作为用户割，提前收紧松弛，减少候选整数解
+
+    被拒绝的候选解只要违反的凸项的 t 都只出现在目标中，把这些 t 换成 f(z) 后仍是可行解，
+    作为启发式解交给COPT。否则树中只有恰好落在已有切点上的候选解才会被接受，
+    没有可用的当前最好解，间隙无法关闭，分支定界退化为枚举。
+    """
+
+    def __init__(self, engine):
+        super().__init__()
+        self.engine = engine
+        self.variables = engine.model.getVars()
+
+    def callback(self):
+        where = self.where()
+        terms = self.engine.convex_terms
+        variables = [term.z for term in terms] + [term.t for term in terms]
+        if where == COPT.CBCONTEXT_MIPSOL:
+            values = self.getSolution(variables)
+            add, tol = self.addLazyConstr, FEAS_TOL
+        elif where == COPT.CBCONTEXT_MIPRELAX:
+            values = self.getRelaxSol(variables)
+            add, tol = self.addUserCut, CUT_TOL
+        else:
+            return
+        violated = []
+        for term, z_value, t_value in zip(terms, values[:len(terms)], values[len(terms):]):
+            if term.f(z_value) - t_value > tol * max(1.0, abs(t_value)):
+                add(term.tangent(z_value))
+                term.cuts += 1
+                if where == COPT.CBCONTEXT_MIPSOL:
+                    term.lazy_points.append(z_value)
+                    violated.append((term, z_value))
+        if violated and not any(term.constrained for term, _ in violated):
+            solution = self.getSolution(self.variables)
+            for term, z_value in violated:
+                solution[term.t.index] = term.f(z_value)
+            self.setSolution(self.variables, solution)
+            self.loadSolution()
+
+
+class OuterApproximation:
+    """在已建好线性部分的COPT模型上加入非线性项，用外逼近 + 分段线性细化求解"""
+
+    def __init__(self, model):
+        self.model = model
+        self.terms = []
+
+    @property
+    def convex_terms(self):
+        return [term for term in self.terms if term.kind == "convex"]
+
+    @property
+    def separable_terms(self):
+        return [term for term in self.terms if term.kind == "separable"]
+
+    def _add_term(self, kind, expr, f, df, name):
+        name = name or f"nl_{len(self.terms)}"
+        z = self.model.addVar(lb=-COPT.INFINITY, ub=COPT.INFINITY, name=f"{name}_z")
+        self.model.addConstr(z == expr, name=f"{name}_def")
+        t = self.model.addVar(lb=-COPT.INFINITY, ub=COPT.INFINITY, name=name)
+        term = _Term(kind, z, t, f, df, name)
+        self.terms.append(term)
+        return term
+
+    def convex(self, expr, f, df, name="", points=INITIAL_POINTS):
+        """凸项 t >= f(expr) (初始在 points 个等距点处加切线)，返回 t"""
+        term = self._add_term("convex", expr, f, df, name)
+        term.initial_points = max(2, int(points))
+        return term.t
+
+    def separable(self, expr, f, name="", points=INITIAL_POINTS, grid=None):
+        """
+        一元项 t = f(expr) 的分段线性近似，返回 t
+
+        初始断点为 points 个等距点；给定 grid 时改用 grid(lower, upper) 返回的断点 (须含两个端点)，
+        如 grid=lambda a, b: adaptive_breakpoints(f, a, b) 按插值误差自适应选取
+        """
+        term = self._add_term("separable", expr, f, None, name)
+        term.initial_points = max(2, int(points))
+        term.grid = grid
+        return term.t
+
+    def _domains(self):
+        """由变量上下界和约束行推出各 z 的定义域"""
+        lb, ub = implied_bounds(self.model)
+        for term in self.terms:
+            lower, upper = lb[term.z.index], ub[term.z.index]
+            if not (math.isfinite(lower) and math.isfinite(upper)):
+                raise ValueError(f"{term.name}: 无法由变量上下界和约束行推出有限的定义域")
+            term.lower, term.upper = float(lower), float(upper)
+            self.model.setInfo(COPT.Info.LB, [term.z], [term.lower])
+            self.model.setInfo(COPT.Info.UB, [term.z], [term.upper])
+
+    def _build_pwl(self, term, points):
+        """
+        按断点 points 重建一元项的SOS2插值
+
+        COPT不支持删除SOS约束，旧的 λ 变量固定为0 (全为0的SOS2约束自然满足)，
+        新的 λ 变量以列的形式加入同样的三行。
+        """
+        values = [term.f(p) for p in points]
+        if term.rows is None:
+            weights = [self.model.addVar(lb=0.0, ub=1.0, name=f"{term.name}_lambda_{k}") for k in range(len(points))]
+            term.rows = (
+                self.model.addConstr(cp.quicksum(weights) == 1, name=f"{term.name}_convexity"),
+                self.model.addConstr(term.z == cp.LinExpr(weights, points), name=f"{term.name}_z_pwl"),
+                self.model.addConstr(term.t == cp.LinExpr(weights, values), name=f"{term.name}_t_pwl"),
+            )
+        else:
+            self.model.setInfo(COPT.Info.UB, term.weights, [0.0] * len(term.weights))
+            convexity, z_row, t_row = term.rows
+            weights = []
+            for k, (p, value) in enumerate(zip(points, values)):
+                # 行的形式为 z - Σλp = 0、t - Σλf(p) = 0
+                column = cp.Column([convexity, z_row, t_row], [1.0, -p, -value])
+                weights.append(self.model.addVar(lb=0.0, ub=1.0, name=f"{term.name}_lambda_{len(points)}_{k}",
+                                                 column=column))
+        self.model.addSOS(COPT.SOS_TYPE2, weights, list(range(len(points))))
+        term.points, term.weights = list(points), weights
+
+    def _setup(self):
+        self._domains()
+        for term in self.terms:
+            term.constrained = self.model.getCol(term.t).size > 0
+        for term in self.terms:
+            if term.kind == "convex":
+                # 定义域上等距点的切线，使主问题有界
+                count = term.initial_points
+                for p in sorted({term.lower + (term.upper - term.lower) * k / (count - 1) for k in range(count)}):
+                    self.model.addConstr(term.tangent(p), name=f"{term.name}_cut")
+                    term.cuts += 1
+            elif term.grid is not None:
+                self._build_pwl(term, sorted(set(term.grid(term.lower, term.upper))))
+            else:
+                count = term.initial_points
+                points = [term.lower + (term.upper - term.lower) * k / (count - 1) for k in range(count)]
+                self._build_pwl(term, sorted(set(points)))
+
+    def _true_objective(self, objective, z_values, t_values):
+        """主问题目标值 objective 中把 t 换成 f(z) 后的真实目标值 (只修正目标函数中的 t)"""
+        for term, z, t in zip(self.terms, z_values, t_values):
+            objective += term.t.obj * (term.f(z) - t)
+        return objective
+
+    def solve(self, method="oa", max_iterations=50, gap_tol=GAP_TOL, time_limit=None):
+        """
+        外逼近主循环
+
+        Returns:
+            {status, objective, bound, gap, iterations, master_solves, cuts, breakpoints, time, values}
+            objective 为最好可行解的真实目标值，bound 为最后一次主问题的界 (MIP主问题取 BestBnd)；
+            达到时间限制时 status 为 "time_limit"，保留已有的最好解和界
+        """
+        if method not in METHODS:
+            raise ValueError(f"未知的方法: {method} (可选 {', '.join(METHODS)})")
+        begin = time.perf_counter()
+        self._setup()
+        model = self.model
+        sign = 1.0 if model.objsense == COPT.MINIMIZE else -1.0
+        integers = [v for v in model.getVars() if v.vtype != COPT.CONTINUOUS]
+        # 主问题按同样的相对间隙求解，否则界 (BestBnd) 与最好解之差可能超过 gap_tol
+        model.setParam(COPT.Param.RelGap, gap_tol)
+
+        best, best_values, bound, status = None, None, None, "not_solved"
+        iterations = master_solves = 0
+        while iterations < max_iterations:
+            iterations += 1
+            if time_limit is not None:
+                model.setParam(COPT.Param.TimeLimit, max(0.0, time_limit - (time.perf_counter() - begin)))
+            # 单树外逼近不用MIP初始解: COPT检查初始解时回调中不能加惰性约束 (INVALID)，
+            # 回调交回的启发式解已经提供当前最好解
+            single_tree = method == "oa" and self.convex_terms
+            if best_values is not None and integers and not single_tree:
+                model.setMipStart(integers, [best_values[v.name] for v in integers])
+                model.loadMipStart()
+            if single_tree:
+                # 加入断点后模型多了新列，每次求解重新注册回调
+                model.setCallback(_TangentCallback(self), COPT.CBCONTEXT_MIPSOL | COPT.CBCONTEXT_MIPRELAX)
+            model.solve()
+            master_solves += 1
+            # 回调中的惰性约束不保留到下一次求解，作为普通约束加入模型
+            for term in self.convex_terms:
+                for point in term.lazy_points:
+                    model.addConstr(term.tangent(point), name=f"{term.name}_cut")
+                term.lazy_points = []
+            stopped = model.status == COPT.TIMEOUT
+            if model.status != COPT.OPTIMAL and not (stopped and model.getAttr(COPT.Attr.HasMipSol)):
+                if stopped:
+                    status = "time_limit"
+                else:
+                    status = "infeasible" if model.status == COPT.INFEASIBLE else "master_failed"
+                break
+            # 之后加入切线和断点会使解信息失效，先读出目标值和全部变量值。
+            # MIP主问题按相对间隙停止 (或达到时间限制)，界取 BestBnd 而不是当前解的目标值
+            master_bound = model.getAttr(COPT.Attr.BestBnd) if model.ismip else model.objval
+            if stopped and bound is not None:
+                # 未求完的主问题的界可能比上一轮的界松
+                master_bound = max(master_bound, bound, key=lambda value: sign * value)
+            bound, master_objective = master_bound, model.objval
+            variables = model.getVars()
+            values = dict(zip((v.name for v in variables), model.getInfo(COPT.Info.Value, variables)))
+            z_values = [values[term.z.name] for term in self.terms]
+            t_values = [values[term.t.name] for term in self.terms]
+
+            refined = False
+            feasible = True
+            for term, z, t in zip(self.terms, z_values, t_values):
+                error = term.f(z) - t
+                scale = FEAS_TOL * max(1.0, abs(t))
+                if term.kind == "convex" and error > scale:
+                    # 只在目标中出现的 t 取 f(z) 后主问题的解仍可行，按真实目标值记为候选解
+                    feasible = feasible and not term.constrained
+                    values[term.t.name] = term.f(z)
+                    model.addConstr(term.tangent(z), name=f"{term.name}_cut")
+                    term.cuts += 1
+                    refined = True
+                elif term.kind == "separable" and abs(error) > scale:
+                    if all(abs(z - p) > FEAS_TOL * max(1.0, abs(p)) for p in term.points):
+                        self._build_pwl(term, sorted(term.points + [z]))
+                        refined = True
+            if feasible:
+                objective = self._true_objective(master_objective, z_values, t_values)
+                if best is None or sign * objective < sign * best:
+                    best, best_values = objective, values
+            if stopped:
+                status = "time_limit"
+                break
+            status = "optimal"
+            if not refined or (best is not None and sign * (best - bound) <= gap_tol * max(1.0, abs(best))):
+                break
+            if time_limit is not None and time.perf_counter() - begin >= time_limit:
+                status = "time_limit"
+                break
+        else:
+            status = "iteration_limit"
+
+        gap = None
+        if best is not None and bound is not None:
+            gap = max(0.0, sign * (best - bound)) / max(1.0, abs(best))
+        return {
+            "status": status,
+            "objective": best,
+            "bound": bound,
+            "gap": gap,
+            "iterations": iterations,
+            "master_solves": master_solves,
+            "cuts": sum(term.cuts for term in self.convex_terms),
+            "breakpoints": sum(len(term.points) for term in self.separable_terms),
+            "time": time.perf_counter() - begin,
+            "values": best_values,
+        }
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IndustryOR MIP求解进度记录
+
+通过COPT回调在求解过程中采样 (时间, 当前最优解, 最优界, 相对间隙, 节点数)，
+以追加方式写入CSV轨迹文件，并提供根据轨迹计算原始积分 (primal integral) 和
+达到目标间隙所需时间的工具，用于比较不同建模方式的求解过程。
+
+- 只在当前最优解或最优界发生变化时采样，轨迹长度与求解进展相关而不是与节点数相关
+- 采样先写入内存缓冲区，缓冲区满或距上次写盘超过 flush_interval 秒时批量追加到文件
+- COPT回调中没有节点数信息，nodes 列为 MIPNODE 回调的累计次数 (近似已处理节点数)，
+  求解结束后追加一条 event=final 的记录，其中 nodes 为 NodeCnt 属性的准确值
+
+CSV列: run, label, time, incumbent, best_bound, gap, nodes, event
+
+用法一 (在脚本中调用):
+    from mip_progress import solve_with_progress
+    solve_with_progress(model, "output/progress.csv", label="enhanced")
+
+用法二 (不修改脚本，记录脚本中的全部MIP求解):
+    python mip_progress.py record [--trace 文件] [--label 标签] id34/production_planning.py --enhanced
+
+用法三 (汇总轨迹指标):
+    python mip_progress.py summary output/mip_progress.csv [--optimum 7] [--target-gap 0.01 0.001]
+"""
+
+import argparse
+import csv
+import os
+import time
+import uuid
+
+import coptpy as cp
+from coptpy import COPT
+
+from solve_telemetry import script_environment
+
+DEFAULT_TRACE = os.path.join("output", "mip_progress.csv")
+
+FIELDS = ["run", "label", "time", "incumbent", "best_bound", "gap", "nodes", "event"]
+
+# 回调中 BestObj / BestBnd 超过该值视为不存在
+_INFINITY = 1e29
+
+# 新最优解回调 (较早的版本没有 INCUMBENT 回调，退回到 MIPSOL)
+_INCUMBENT_CONTEXT = getattr(COPT, "CBCONTEXT_INCUMBENT", COPT.CBCONTEXT_MIPSOL)
+CONTEXTS = _INCUMBENT_CONTEXT | COPT.CBCONTEXT_MIPNODE | COPT.CBCONTEXT_MIPRELAX
+
+
+def relative_gap(incumbent, bound):
+    """相对间隙 |incumbent - bound| / |incumbent|，没有可行解时返回None"""
+    if incumbent is None or bound is None:
+        return None
+    if incumbent == bound:
+        return 0.0
+    return abs(incumbent - bound) / max(abs(incumbent), 1e-10)
+
+
+class ProgressRecorder(cp.CallbackBase):
+    """
+    MIP进度记录回调
+
+    Args:
+        path: CSV轨迹文件路径 (追加写入，不存在时自动创建并写表头)
+        label: 轨迹标签，如建模方式名称
+        buffer_size: 缓冲区最多保留的采样数
+        flush_interval: 两次写盘的最长间隔 (秒)
+    """
+
+    def __init__(self, path=DEFAULT_TRACE, label="", buffer_size=256, flush_interval=1.0):
+        super().__init__()
+        self.path = path
+        self.label = label
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.run = uuid.uuid4().hex[:12]
+        self.buffer = []
+        self.samples = 0
+        self.nodes = 0
+        self.start_time = None
+        self.last_flush = None
+        self.last_state = None
+
+    def start(self):
+        """开始计时 (在 model.solve() 之前调用)"""
+        self.start_time = time.perf_counter()
+        self.last_flush = self.start_time
+        self.nodes = 0
+        self.last_state = None
+
+    def callback(self):
+        where = self.where()
+        if where == COPT.CBCONTEXT_MIPNODE:
+            self.nodes += 1
+        if self.start_time is None:
+            self.start()
+
+        incumbent = None
+        if self.getInfo(COPT.CBInfo.HasIncumbent):
+            incumbent = self.getInfo(COPT.CBInfo.BestObj)
+        bound = self.getInfo(COPT.CBInfo.BestBnd)
+        if bound is not None and abs(bound) >= _INFINITY:
+            bound = None
+
+        state = (incumbent, bound)
+        if state == self.last_state:
+            return
+        self.last_state = state
+        event = "incumbent" if where == _INCUMBENT_CONTEXT else "bound"
+        self.record(incumbent, bound, self.nodes, event)
+
+    def record(self, incumbent, bound, nodes, event):
+        """追加一条采样，必要时写盘"""
+        now = time.perf_counter()
+        self.buffer.append({
+            "run": self.run,
+            "label": self.label,
+            "time": round(now - self.start_time, 6),
+            "incumbent": incumbent,
+            "best_bound": bound,
+            "gap": relative_gap(incumbent, bound),
+            "nodes": nodes,
+            "event": event,
+        })
+        self.samples += 1
+        if len(self.buffer) >= self.buffer_size or now - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """把缓冲区中的采样追加到CSV文件"""
+        self.last_flush = time.perf_counter()
+        if not self.buffer:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        with open(self.path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            if new_file:
+                writer.writeheader()
+            writer.writerows(self.buffer)
+        self.buffer.clear()
+
+    def finish(self, model):
+        """求解结束后写入最终状态 (准确节点数) 并清空缓冲区"""
+        has_solution = model.getAttr(COPT.Attr.HasMipSol)
+        incumbent = model.objval if has_solution else None
+        bound = model.getAttr(COPT.Attr.BestBnd)
+        if abs(bound) >= _INFINITY:
+            bound = None
+        self.record(incumbent, bound, model.getAttr(COPT.Attr.NodeCnt), "final")
+        self.flush()
+
+
+def solve_with_progress(model, path=DEFAULT_TRACE, label="", buffer_size=256, flush_interval=1.0):
+    """
+    挂上进度记录回调后求解模型
+
+    Returns:
+        ProgressRecorder 对象 (run 属性为本次轨迹的编号)
+    """
+    recorder = ProgressRecorder(path, label, buffer_size, flush_interval)
+    model.setCallback(recorder, CONTEXTS)
+    recorder.start()
+    try:
+        model.solve()
+    except cp.CoptError:
+        recorder.flush()
+        raise
+    recorder.finish(model)
+    return recorder
+
+
+def _optional_float(value):
+    return float(value) if value not in ("", None) else None
+
+
+def read_trace(path):
+    """
+    读取CSV轨迹文件
+
+    Returns:
+        {run: {"label": 标签, "samples": [{time, incumbent, best_bound, gap, nodes, event}, ...]}}，
+        按文件中出现的顺序
+    """
+    runs = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            run = runs.setdefault(row["run"], {"label": row["label"], "samples": []})
+            run["samples"].append({
+                "time": float(row["time"]),
+                "incumbent": _optional_float(row["incumbent"]),
+                "best_bound": _optional_float(row["best_bound"]),
+                "gap": _optional_float(row["gap"]),
+                "nodes": int(row["nodes"]),
+                "event": row["event"],
+            })
+    return runs
+
+
+def primal_gap(incumbent, optimum):
+    """Berthold 原始间隙: 没有可行解时为1，否则为 |z - z*| / max(|z|, |z*|)"""
+    if incumbent is None:
+        return 1.0
+    if incumbent == optimum:
+        return 0.0
+    if incumbent * optimum < 0:
+        return 1.0
+    return abs(incumbent - optimum) / max(abs(incumbent), abs(optimum))
+
+
+def primal_integral(samples, optimum=None, horizon=None):
+    """
+    原始积分: 原始间隙阶梯函数在 [0, horizon] 上的积分，越小表示越早找到好的可行解
+
+    Args:
+        samples: read_trace 返回的某条轨迹的采样列表
+        optimum: 最优目标值，默认取轨迹中最后的最优解
+        horizon: 积分区间右端 (秒)，默认取轨迹的结束时间；比较多条轨迹时应使用相同的值
+
+    Returns:
+        原始积分 (秒)，轨迹中没有任何可行解且未给出 optimum 时返回None
+    """
+    if optimum is None:
+        incumbents = [s["incumbent"] for s in samples if s["incumbent"] is not None]
+        if not incumbents:
+            return None
+        optimum = incumbents[-1]
+    if horizon is None:
+        horizon = samples[-1]["time"] if samples else 0.0
+
+    integral = 0.0
+    previous_time = 0.0
+    current_gap = 1.0
+    for sample in samples:
+        t = min(sample["time"], horizon)
+        integral += current_gap * (t - previous_time)
+        previous_time = t
+        current_gap = primal_gap(sample["incumbent"], optimum)
+    integral += current_gap * max(horizon - previous_time, 0.0)
+    return integral
+
+
+def time_to_gap(samples, target_gap):
+    """返回相对间隙首次不超过 target_gap 的时间 (秒)，未达到时返回None"""
+    for sample in samples:
+        if sample["gap"] is not None and sample["gap"] <= target_gap:
+            return sample["time"]
+    return None
+
+
+def summarize(path, optimum=None, target_gaps=(0.01,), horizon=None):
+    """
+    汇总轨迹文件中每条轨迹的指标
+
+    未给出 optimum 时使用所有轨迹中最好的最终解；
+    未给出 horizon 时使用所有轨迹中最长的求解时间，使不同轨迹的原始积分可比。
+
+    Returns:
+        结果行列表
+    """
+    runs = read_trace(path)
+    if horizon is None:
+        horizon = max((run["samples"][-1]["time"] for run in runs.values() if run["samples"]), default=0.0)
+    if optimum is None:
+        finals = [run["samples"][-1] for run in runs.values() if run["samples"]]
+        finals = [s for s in finals if s["incumbent"] is not None]
+        if finals:
+            # 由未证明最优的轨迹判断优化方向: 界低于最优解为最小化问题
+            open_finals = [s for s in finals if s["best_bound"] is not None and s["best_bound"] != s["incumbent"]]
+            minimize = not open_finals or open_finals[0]["best_bound"] < open_finals[0]["incumbent"]
+            values = [s["incumbent"] for s in finals]
+            optimum = min(values) if minimize else max(values)
+
+    rows = []
+    for run_id, run in runs.items():
+        samples = run["samples"]
+        final = samples[-1]
+        row = {
+            "run": run_id,
+            "label": run["label"],
+            "solve_time": final["time"],
+            "incumbent": final["incumbent"],
+            "best_bound": final["best_bound"],
+            "gap": final["gap"],
+            "nodes": final["nodes"],
+            "samples": len(samples),
+            "primal_integral": primal_integral(samples, optimum, horizon) if optimum is not None else None,
+        }
+        for target in target_gaps:
+            row[f"time_to_gap_{target:g}"] = time_to_gap(samples, target)
+        rows.append(row)
+    return rows
+
+
+def record_script(script, script_args=(), path=DEFAULT_TRACE, label=""):
+    """
+    在脚本所在目录下运行脚本，期间对全部MIP求解挂上进度记录回调
+
+    Args:
+        script: 脚本路径
+        script_args: 传给脚本的命令行参数
+        path: CSV轨迹文件路径 (相对路径按当前目录解析)
+        label: 轨迹标签
+    """
+    path = os.path.abspath(path)
+    original_solve = cp.Model.solve
+
+    def recording_solve(model, *args, **kwargs):
+        if not model.getAttr(COPT.Attr.IsMIP):
+            return original_solve(model, *args, **kwargs)
+        recorder = ProgressRecorder(path, label)
+        model.setCallback(recorder, CONTEXTS)
+        recorder.start()
+        try:
+            result = original_solve(model, *args, **kwargs)
+        except cp.CoptError:
+            recorder.flush()
+            raise
+        recorder.finish(model)
+        return result
+
+    with script_environment(script, script_args, patches=[(cp.Model, "solve", recording_solve)]) as run:
+        run.run()
+
+
+def _format(value, spec):
+    return format(value, spec) if value is not None else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MIP求解进度轨迹记录与汇总")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record = subparsers.add_parser("record", help="运行脚本并记录全部MIP求解的进度轨迹")
+    record.add_argument("script", help="要运行的脚本，如 id36/vrphtw_solver.py")
+    record.add_argument("script_args", nargs=argparse.REMAINDER, help="传给脚本的参数")
+    record.add_argument("--trace", default=DEFAULT_TRACE, help="CSV轨迹文件路径")
+    record.add_argument("--label", default="", help="轨迹标签")
+
+    summary = subparsers.add_parser("summary", help="汇总轨迹文件中每条轨迹的指标")
+    summary.add_argument("trace", nargs="?", default=DEFAULT_TRACE, help="CSV轨迹文件路径")
+    summary.add_argument("--optimum", type=float, default=None, help="最优目标值")
+    summary.add_argument("--horizon", type=float, default=None, help="原始积分的时间区间 (秒)")
+    summary.add_argument("--target-gap", type=float, nargs="+", default=[0.01], help="目标相对间隙")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record_script(args.script, args.script_args, args.trace, args.label)
+        print(f"\n进度轨迹已追加到 {os.path.abspath(args.trace)}")
+        return
+
+    rows = summarize(args.trace, args.optimum, args.target_gap, args.horizon)
+    gap_columns = [f"time_to_gap_{target:g}" for target in args.target_gap]
+    header = "  ".join(f"{'达到' + format(target, 'g') + '(s)':>12}" for target in args.target_gap)
+    print(f"{'轨迹':<12} {'标签':<10} {'求解(s)':>9} {'最优解':>12} {'最优界':>12} {'间隙':>9} "
+          f"{'节点数':>8} {'原始积分':>10}  {header}")
+    for row in rows:
+        times = "  ".join(f"{_format(row[column], '.4f'):>12}" for column in gap_columns)
+        print(f"{row['run']:<12} {row['label']:<10} {row['solve_time']:>9.4f} "
+              f"{_format(row['incumbent'], '.4f'):>12} {_format(row['best_bound'], '.4f'):>12} "
+              f"{_format(row['gap'], '.2e'):>9} {row['nodes']:>8} "
+              f"{_format(row['primal_integral'], '.4f'):>10}  {times}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IndustryOR 模型导出缓存
+
+求解脚本每次运行都在Python中重新构造模型 (并在脚本旁写出 .lp/.mps/.sol)。对于数据不变的脚本，
+可以只运行一次构造过程，把模型以压缩MPS格式存入缓存目录，之后直接用COPT的读取器加载模型求解，
+完全跳过Python端的建模。
+
+- 缓存键为脚本目录下除输出文件外的全部文件 (源码和脚本读取的 csv/xlsx/json 等数据文件)、
+  .py 文件 (直接或间接) 导入的 IndustryOR 根目录模块 (如 problem_data.py)、命令行参数、
+  参数中指向的已存在文件或目录 (如 --data 数据文件) 的内容和COPT版本的哈希，任一改变即视为缓存失效。
+  输出文件指 OUTPUT_PATTERNS 匹配的结果/模型/解文件以及 output、__pycache__ 和隐藏目录，脚本运行时会改写它们
+- 缓存未命中时照常运行脚本 (输出文件与直接运行相同)，并在每次求解前把模型导出到缓存
+- 缓存命中时不运行脚本，依次读取缓存中的模型并求解，输出目标值和非零变量取值
+- 脚本中按变量对象设置的MIP初始解、回调和求解参数不会保存到MPS文件中，回放时使用COPT默认参数
+
+缓存目录结构:
+    output/model_cache/<实例>_<缓存键>/
+        manifest.json       脚本路径、参数、每个模型的规模和Python建模耗时
+        model_0.mps.gz      第1次求解的模型
+        model_1.mps.gz      ...
+
+用法 (选项写在脚本路径之前):
+    python model_cache.py run id09/production_planning.py          # 未命中则构造并缓存，命中则直接读取求解
+    python model_cache.py run --refresh id60/tsp_mtz.py            # 忽略已有缓存重新构造
+    python model_cache.py compare id09/production_planning.py id14/meal_planning.py id36/vrphtw_solver.py
+    python model_cache.py clear
+"""
+
+import argparse
+import ast
+import fnmatch
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import coptpy as cp
+from coptpy import COPT
+
+from solve_telemetry import script_environment
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(ROOT, "output", "model_cache")
+MANIFEST_FILE = "manifest.json"
+# 脚本目录中不计入缓存键的输出文件 (脚本每次运行都会改写) 和目录
+OUTPUT_PATTERNS = ("result*.txt", "*_result*.txt", "detailed_results*", "final_summary*",
+                   "*.lp", "*.mps", "*.sol", "*.bas", "*.mst", "*.log", ".*")
+OUTPUT_DIRS = ("output", "__pycache__")
+
+
+def _imported_names(path):
+    """Python文件中 import / from ... import 的顶层模块名 (不含相对导入)"""
+    with open(path, "rb") as f:
+        try:
+            tree = ast.parse(f.read(), filename=path)
+        except SyntaxError:
+            return set()
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.add(node.module.split(".")[0])
+    return names
+
+
+def root_modules(sources):
+    """sources 中的文件直接或间接导入的 IndustryOR 根目录模块文件 (按路径排序)"""
+    found = set()
+    pending = list(sources)
+    while pending:
+        for name in _imported_names(pending.pop()):
+            path = os.path.join(ROOT, f"{name}.py")
+            if path not in found and os.path.isfile(path):
+                found.add(path)
+                pending.append(path)
+    return sorted(found)
+
+
+def argument_paths(script_dir, script_args):
+    """
+    参数中指向已存在文件或目录的路径 (含 --选项=路径 的形式)
+
+    脚本在其目录下运行，相对路径按脚本目录解析；同时检查按当前目录解析的路径
+    """
+    paths = []
+    for arg in script_args:
+        value = arg.split("=", 1)[1] if arg.startswith("-") and "=" in arg else arg
+        if not value or value.startswith("-"):
+            continue
+        candidates = [value] if os.path.isabs(value) else [os.path.join(script_dir, value), os.path.abspath(value)]
+        for path in candidates:
+            path = os.path.normpath(path)
+            if os.path.exists(path) and path not in paths:
+                paths.append(path)
+    return paths
+
+
+def _hash_path(digest, path):
+    """把文件内容 (目录则为其中全部文件的相对路径和内容) 加入哈希"""
+    digest.update(path.encode())
+    if os.path.isfile(path):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+        return
+    for base, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            file_path = os.path.join(base, name)
+            digest.update(os.path.relpath(file_path, path).encode())
+            with open(file_path, "rb") as f:
+                digest.update(f.read())
+
+
+def input_files(script_dir):
+    """脚本目录 (含子目录) 下除输出文件和输出目录外的全部文件，按相对路径排序"""
+    paths = []
+    for base, dirs, files in os.walk(script_dir):
+        dirs[:] = sorted(d for d in dirs if d not in OUTPUT_DIRS and not d.startswith("."))
+        for name in sorted(files):
+            if not any(fnmatch.fnmatch(name, pattern) for pattern in OUTPUT_PATTERNS):
+                paths.append(os.path.join(base, name))
+    return paths
+
+
+def cache_key(script, script_args=()):
+    """
+    缓存键: 脚本目录下的全部输入文件 (源码和数据文件，见 input_files)、.py 文件导入的根目录模块、
+    参数、参数中指向的数据文件内容和COPT版本的哈希
+    """
+    script = os.path.abspath(script)
+    script_dir = os.path.dirname(script)
+    digest = hashlib.sha256()
+    digest.update(os.path.basename(script).encode())
+    files = input_files(script_dir)
+    for path in files:
+        digest.update(os.path.relpath(path, script_dir).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    sources = [path for path in files if path.endswith(".py")]
+    for path in root_modules(sources):
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    digest.update("\0".join(script_args).encode())
+    for path in argument_paths(script_dir, script_args):
+        _hash_path(digest, path)
+    digest.update(f"{COPT.VERSION_MAJOR}.{COPT.VERSION_MINOR}.{COPT.VERSION_TECHNICAL}".encode())
+    return digest.hexdigest()[:16]
+
+
+def cache_path(script, script_args=(), cache_dir=DEFAULT_CACHE_DIR):
+    """脚本对应的缓存目录"""
+    instance = os.path.basename(os.path.dirname(os.path.abspath(script)))
+    return os.path.join(cache_dir, f"{instance}_{cache_key(script, script_args)}")
+
+
+def load_manifest(directory):
+    """读取缓存清单，缓存不存在或不完整时返回None"""
+    path = os.path.join(directory, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if not all(os.path.exists(os.path.join(directory, m["file"])) for m in manifest["models"]):
+        return None
+    return manifest
+
+
+def export_model(model, path):
+    """把模型写为gzip压缩的MPS文件 (COPT能直接读取 .mps.gz 但不能直接写出，先写临时文件再压缩)"""
+    with tempfile.TemporaryDirectory(prefix="industryor_mps_") as tmp:
+        plain = os.path.join(tmp, "model.mps")
+        model.write(plain)
+        with open(plain, "rb") as source, gzip.open(path, "wb", compresslevel=6) as target:
+            shutil.copyfileobj(source, target)
+
+
+def build(script, script_args=(), cache_dir=DEFAULT_CACHE_DIR):
+    """
+    照常运行脚本，并在每次求解前把模型导出到缓存
+
+    Returns:
+        缓存清单
+    """
+    script = os.path.abspath(script)
+    directory = cache_path(script, script_args, cache_dir)
+    if os.path.exists(directory):
+        shutil.rmtree(directory)
+    os.makedirs(directory)
+
+    models = []
+    created = {}
+    original_solve = cp.Model.solve
+    original_create = cp.Envr.createModel
+
+    def create_model(env, *args, **kwargs):
+        model = original_create(env, *args, **kwargs)
+        created[id(model)] = time.perf_counter()
+        return model
+
+    def caching_solve(model, *args, **kwargs):
+        build_time = time.perf_counter() - created.get(id(model), time.perf_counter())
+        file_name = f"model_{len(models)}.mps.gz"
+        export_start = time.perf_counter()
+        export_model(model, os.path.join(directory, file_name))
+        models.append({
+            "file": file_name,
+            "build_time": build_time,
+            "export_time": time.perf_counter() - export_start,
+            "vars": model.getAttr(COPT.Attr.Cols),
+            "constrs": model.getAttr(COPT.Attr.Rows),
+        })
+        return original_solve(model, *args, **kwargs)
+
+    patches = [(cp.Model, "solve", caching_solve), (cp.Envr, "createModel", create_model)]
+    try:
+        with script_environment(script, script_args, patches=patches) as run:
+            run.run()
+    finally:
+        # 脚本在求解之后出错 (如写结果文件失败) 时，已导出的模型仍然可用
+        manifest = {"script": os.path.relpath(script, ROOT), "args": list(script_args), "models": models}
+        if models:
+            with open(os.path.join(directory, MANIFEST_FILE), "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def read_models(env, directory, manifest):
+    """
+    读取缓存中的全部模型
+
+    Returns:
+        [(模型, 读取耗时秒)]
+    """
+    loaded = []
+    for entry in manifest["models"]:
+        model = env.createModel(f"cached_{os.path.splitext(entry['file'])[0]}")
+        start = time.perf_counter()
+        model.read(os.path.join(directory, entry["file"]))
+        loaded.append((model, time.perf_counter() - start))
+    return loaded
+
+
+def replay(directory, manifest, show=20):
+    """读取缓存中的模型并求解，输出目标值和非零变量取值"""
+    env = cp.Envr()
+    try:
+        for k, (model, read_time) in enumerate(read_models(env, directory, manifest)):
+            entry = manifest["models"][k]
+            model.solve()
+            print(f"\n=== 缓存模型 {k + 1}/{len(manifest['models'])} ({entry['file']}) ===")
+            print(f"读取耗时: {read_time * 1000:.2f} ms (Python建模耗时 {entry['build_time'] * 1000:.2f} ms)")
+            if model.status != COPT.OPTIMAL:
+                print(f"模型未找到最优解，状态码: {model.status}")
+                continue
+            print(f"最优目标函数值: {model.objval:.6g}")
+            nonzero = [(v.name, v.x) for v in model.getVars() if abs(v.x) > 1e-9]
+            print(f"非零变量 ({len(nonzero)} 个):")
+            for name, value in nonzero[:show]:
+                print(f"  {name} = {value:g}")
+            if len(nonzero) > show:
+                print(f"  ... 其余 {len(nonzero) - show} 个")
+    finally:
+        env.close()
+
+
+def compare(scripts, cache_dir=DEFAULT_CACHE_DIR, repeats=3):
+    """
+    比较Python建模与读取缓存模型的耗时 (缺少缓存的脚本先构造一次)
+
+    Returns:
+        每个模型一行的结果列表
+    """
+    rows = []
+    env = cp.Envr()
+    try:
+        for script in scripts:
+            directory = cache_path(script, (), cache_dir)
+            manifest = load_manifest(directory)
+            if manifest is None:
+                try:
+                    manifest = build(script, (), cache_dir)
+                except (cp.CoptError, OSError) as e:
+                    # 求解失败 (如许可限制) 不影响已导出的模型
+                    print(f"{script}: 运行脚本出错 ({e})")
+                    manifest = load_manifest(directory)
+                if manifest is None:
+                    continue
+            read_times = [[] for _ in manifest["models"]]
+            for _ in range(repeats):
+                for k, (model, read_time) in enumerate(read_models(env, directory, manifest)):
+                    read_times[k].append(read_time)
+            for k, entry in enumerate(manifest["models"]):
+                read_time = min(read_times[k])
+                rows.append({
+                    "script": manifest["script"] + (f" #{k + 1}" if len(manifest["models"]) > 1 else ""),
+                    "size": f"{entry['vars']}×{entry['constrs']}",
+                    "build_time": entry["build_time"],
+                    "read_time": read_time,
+                    "file_size": os.path.getsize(os.path.join(directory, entry["file"])),
+                })
+    finally:
+        env.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="求解脚本的压缩MPS模型缓存")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="缓存目录")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="有缓存时读取缓存模型求解，否则运行脚本并写入缓存")
+    run.add_argument("--refresh", action="store_true", help="忽略已有缓存，重新运行脚本构造模型")
+    run.add_argument("--show", type=int, default=20, help="回放时显示的非零变量个数")
+    run.add_argument("script", help="求解脚本")
+    run.add_argument("script_args", nargs=argparse.REMAINDER, help="传给脚本的参数")
+
+    cmp_parser = subparsers.add_parser("compare", help="比较Python建模与读取缓存的耗时")
+    cmp_parser.add_argument("--repeats", type=int, default=3, help="读取重复次数 (取最小值)")
+    cmp_parser.add_argument("scripts", nargs="+", help="求解脚本")
+
+    subparsers.add_parser("clear", help="删除全部缓存")
+    args = parser.parse_args()
+
+    if args.command == "clear":
+        if os.path.exists(args.cache_dir):
+            shutil.rmtree(args.cache_dir)
+        print(f"已清空 {args.cache_dir}")
+        return
+
+    if args.command == "run":
+        directory = cache_path(args.script, args.script_args, args.cache_dir)
+        manifest = None if args.refresh else load_manifest(directory)
+        if manifest is None:
+            print(f"缓存未命中，运行脚本构造模型: {args.script}")
+            try:
+                manifest = build(args.script, args.script_args, args.cache_dir)
+            except Exception as e:
+                # 脚本在求解之后出错时，已导出的模型仍然写入了缓存
+                print(f"\n脚本运行出错: {type(e).__name__}: {e}")
+                manifest = load_manifest(directory) or {"models": []}
+            print(f"\n已缓存 {len(manifest['models'])} 个模型到 {directory}")
+        else:
+            print(f"缓存命中: {directory}")
+            replay(directory, manifest, args.show)
+        return
+
+    rows = compare(args.scripts, args.cache_dir, args.repeats)
+    print("\n" + "=" * 92)
+    print(f"{'脚本':<36} {'规模(列×行)':>12} {'Python建模(ms)':>15} {'读取缓存(ms)':>13} {'加速比':>7} {'文件(KB)':>9}")
+    print("-" * 92)
+    for row in rows:
+        speedup = row["build_time"] / row["read_time"] if row["read_time"] > 0 else float("inf")
+        print(f"{row['script'][:36]:<36} {row['size']:>12} {row['build_time'] * 1000:>15.2f} "
+              f"{row['read_time'] * 1000:>13.2f} {speedup:>7.1f} {row['file_size'] / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
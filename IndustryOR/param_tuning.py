@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IndustryOR COPT参数自动调优
+
+在选定的一组实例上搜索COPT参数 (线程数、预求解、割平面、启发式、强分支)，
+按问题族保存最优配置，求解脚本可通过 apply_tuned_profile() 选择使用调优结果。
+
+搜索方法为逐次减半 (successive halving):
+- 从默认配置加若干随机配置开始，第1轮只在少量实例上评估，保留得分最好的 1/eta 的配置
+- 之后每轮加入更多实例，直到只剩一个配置或用完全部实例
+- 每个 (配置, 实例) 只运行一次，结果在各轮之间复用
+- 竞速截断: 某实例已有配置的求解时间 t 时，其余配置在该实例上的时限为 cap * t，超时即判负
+
+得分为各实例求解时间的平移几何平均 (shift 秒)；求解失败或超时记为 penalty * 时限。
+每次评估在临时目录中的实例副本里以独立进程运行 (进程池)，不会改写仓库中的输出文件。
+
+调优结果保存在 tuned_profiles.json:
+    {问题族: {"params": {参数: 值}, "score": 得分, "default_score": 默认配置得分, "instances": [...], ...}}
+
+用法:
+    python param_tuning.py --family production_planning --configs 16 --workers 4
+    python param_tuning.py --instances id34 id36 --family packing_routing --time-limit 60
+    python param_tuning.py --show
+
+在求解脚本中使用:
+    from param_tuning import apply_tuned_profile
+    apply_tuned_profile(model, "routing")   # 没有该问题族的调优结果时不做任何事
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import coptpy as cp
+from coptpy import COPT
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PROFILES = os.path.join(ROOT, "tuned_profiles.json")
+
+sys.path.insert(0, ROOT)
+from benchmark_suite import INSTANCES  # noqa: E402
+from solve_telemetry import script_environment  # noqa: E402
+
+# 问题族 -> 实例 (与 problem_data.py 的问题族对应，另加网络流)
+FAMILIES = {
+    "production_planning": ["id01", "id03", "id06", "id09", "id12", "id13", "id16", "id20",
+                            "id27", "id31", "id47", "id85", "id86"],
+    "routing": ["id36", "id60"],
+    "network_flow": ["id07", "id15", "id100"],
+    "covering": ["id10", "id26", "id55", "id83"],
+    "assignment": ["id08", "id81"],
+    "knapsack": ["id04", "id05", "id14", "id19", "id21", "id34", "id99"],
+}
+
+# 搜索空间，-1 表示由COPT自动选择 (即默认值)
+PARAM_SPACE = {
+    "Threads": [-1, 1, 2, 4],
+    "Presolve": [-1, 0, 1, 3],
+    "CutLevel": [-1, 0, 1, 3],
+    "HeurLevel": [-1, 0, 1, 3],
+    "StrongBranching": [-1, 0, 1, 3],
+}
+DEFAULT_CONFIG = {name: -1 for name in PARAM_SPACE}
+
+_profiles_cache = {}
+
+
+def config_key(config):
+    """配置的规范化字符串，用作字典键和显示"""
+    return ",".join(f"{name}={config[name]}" for name in sorted(config))
+
+
+def sample_configs(count, seed=0):
+    """默认配置加 count-1 个不重复的随机配置"""
+    rng = random.Random(seed)
+    configs = [dict(DEFAULT_CONFIG)]
+    seen = {config_key(DEFAULT_CONFIG)}
+    total = math.prod(len(values) for values in PARAM_SPACE.values())
+    while len(configs) < min(count, total):
+        config = {name: rng.choice(values) for name, values in PARAM_SPACE.items()}
+        key = config_key(config)
+        if key not in seen:
+            seen.add(key)
+            configs.append(config)
+    return configs
+
+
+def evaluate(instance, config, time_limit):
+    """
+    在临时目录中运行一次实例脚本，脚本中的每次求解都使用给定参数和时限 (在进程池工作进程中执行)
+
+    Returns:
+        {instance, config, time, status, objective, nodes, error}，time 为各次求解的 SolvingTime 之和，
+        nodes 为各次MIP求解的分支节点数之和
+    """
+    solves = []
+    original_solve = cp.Model.solve
+
+    def tuned_solve(model, *args, **kwargs):
+        for name, value in config.items():
+            model.setParam(name, value)
+        model.setParam(COPT.Param.TimeLimit, time_limit)
+        result = original_solve(model, *args, **kwargs)
+        objective = None
+        if model.status == COPT.OPTIMAL:
+            objective = model.objval
+        nodes = model.getAttr(COPT.Attr.NodeCnt) if model.getAttr(COPT.Attr.IsMIP) else 0
+        solves.append((model.getAttr(COPT.Attr.SolvingTime), model.status, objective, nodes))
+        return result
+
+    # 脚本和COPT日志全部丢弃
+    with script_environment(os.path.join(ROOT, instance, INSTANCES[instance]),
+                            patches=[(cp.Model, "solve", tuned_solve)],
+                            copy_prefix="industryor_tune_", output=os.devnull) as run:
+        error = run.run(record_errors=True)
+
+    # 部分脚本求解后写结果文件失败 (作者机器上的绝对路径)，此时求解结果仍然有效
+    if not solves:
+        return {"instance": instance, "config": config, "time": None, "status": None,
+                "objective": None, "nodes": None, "error": error or "没有求解记录"}
+    return {
+        "instance": instance,
+        "config": config,
+        "time": sum(s[0] for s in solves),
+        "status": solves[-1][1],
+        "objective": solves[-1][2],
+        "nodes": sum(s[3] for s in solves),
+        "error": None,
+    }
+
+
+def _evaluate_task(task):
+    return evaluate(*task)
+
+
+def run_cost(result, time_limit, penalty):
+    """单次运行的代价: 求解时间，失败或超时记为 penalty * 时限"""
+    if result["error"] or result["status"] != COPT.OPTIMAL:
+        return penalty * time_limit
+    return result["time"]
+
+
+def shifted_geomean(values, shift):
+    """平移几何平均，避免毫秒级的小实例主导得分"""
+    return math.exp(sum(math.log(v + shift) for v in values) / len(values)) - shift
+
+
+class Tuner:
+    """
+    逐次减半调参器
+
+    Args:
+        instances: 参与调参的实例编号列表
+        time_limit: 单次求解时限 (秒)
+        eta: 每轮保留 1/eta 的配置
+        cap: 竞速截断倍数
+        penalty: 失败运行的代价倍数 (相对时限)
+        shift: 平移几何平均的平移量 (秒)
+        workers: 进程数
+    """
+
+    def __init__(self, instances, time_limit=60.0, eta=2, cap=3.0, penalty=10.0, shift=0.01, workers=None):
+        unknown = [i for i in instances if i not in INSTANCES]
+        if unknown:
+            raise ValueError(f"未知的实例: {', '.join(unknown)}")
+        self.instances = list(instances)
+        self.time_limit = time_limit
+        self.eta = eta
+        self.cap = cap
+        self.penalty = penalty
+        self.shift = shift
+        self.workers = workers or os.cpu_count() or 1
+        # {(配置键, 实例): 运行结果}
+        self.results = {}
+        self.best_time = {}
+
+    def _limit(self, instance):
+        best = self.best_time.get(instance)
+        if best is None:
+            return self.time_limit
+        return min(self.time_limit, max(self.cap * best, 1.0))
+
+    def run_round(self, configs, instances, pool):
+        """在指定实例上评估尚未评估过的 (配置, 实例) 组合"""
+        tasks = []
+        for instance in instances:
+            limit = self._limit(instance)
+            for config in configs:
+                if (config_key(config), instance) not in self.results:
+                    tasks.append((instance, config, limit))
+        for task, result in zip(tasks, pool.map(_evaluate_task, tasks)):
+            result["time_limit"] = task[2]
+            self.results[config_key(task[1]), task[0]] = result
+            if result["error"] is None and result["status"] == COPT.OPTIMAL:
+                best = self.best_time.get(task[0])
+                if best is None or result["time"] < best:
+                    self.best_time[task[0]] = result["time"]
+
+    def score(self, config, instances):
+        key = config_key(config)
+        costs = [run_cost(self.results[key, i], self.time_limit, self.penalty) for i in instances]
+        return shifted_geomean(costs, self.shift)
+
+    def tune(self, configs, verbose=True):
+        """
+        执行逐次减半
+
+        Returns:
+            (最优配置, 最优得分, 默认配置得分)；默认配置在第1轮后被淘汰时其得分只基于第1轮实例
+        """
+        survivors = list(configs)
+        rounds = max(1, math.ceil(math.log(len(survivors), self.eta))) if len(survivors) > 1 else 1
+        default_key = config_key(DEFAULT_CONFIG)
+        default_score = None
+        used = []
+        with ProcessPoolExecutor(max_workers=self.workers, max_tasks_per_child=1) as pool:
+            for r in range(rounds):
+                count = max(1, math.ceil(len(self.instances) * (r + 1) / rounds))
+                used = self.instances[:count]
+                start = time.perf_counter()
+                self.run_round(survivors, used, pool)
+                ranked = sorted(survivors, key=lambda c: self.score(c, used))
+                for config in ranked:
+                    if config_key(config) == default_key:
+                        default_score = self.score(config, used)
+                if verbose:
+                    print(f"第 {r + 1}/{rounds} 轮: {len(survivors)} 个配置 × {len(used)} 个实例，"
+                          f"用时 {time.perf_counter() - start:.1f} s，"
+                          f"当前最优 {self.score(ranked[0], used):.4f} ({config_key(ranked[0])})")
+                if r < rounds - 1:
+                    survivors = ranked[:max(1, math.ceil(len(ranked) / self.eta))]
+                else:
+                    survivors = ranked[:1]
+        best = survivors[0]
+        return best, self.score(best, used), default_score
+
+
+def load_profiles(path=DEFAULT_PROFILES):
+    """读取调优结果文件，文件不存在时返回空字典"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_profile(family, params, score, default_score, instances, path=DEFAULT_PROFILES):
+    """把一个问题族的调优结果合并写入结果文件"""
+    profiles = load_profiles(path)
+    profiles[family] = {
+        "params": params,
+        "score": round(score, 6),
+        "default_score": round(default_score, 6) if default_score is not None else None,
+        "instances": list(instances),
+        "tuned_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(profiles, f, ensure_ascii=False, indent=2, sort_keys=True)
+    _profiles_cache.pop(path, None)
+
+
+def apply_tuned_profile(model, family, path=DEFAULT_PROFILES):
+    """
+    把问题族的调优参数设置到模型上
+
+    Returns:
+        实际设置的 {参数: 值}，没有调优结果时为空字典
+    """
+    if path not in _profiles_cache:
+        _profiles_cache[path] = load_profiles(path)
+    params = _profiles_cache[path].get(family, {}).get("params", {})
+    for name, value in params.items():
+        # -1 即COPT默认值，不必设置
+        if value != -1:
+            model.setParam(name, value)
+    return params
+
+
+def main():
+    parser = argparse.ArgumentParser(description="在IndustryOR实例上自动调优COPT参数")
+    parser.add_argument("--family", default=None, help=f"问题族，可选: {', '.join(FAMILIES)}")
+    parser.add_argument("--instances", nargs="+", default=None, help="参与调参的实例 (默认为问题族的全部实例)")
+    parser.add_argument("--configs", type=int, default=16, help="初始配置数 (含默认配置)")
+    parser.add_argument("--seed", type=int, default=0, help="随机配置的种子")
+    parser.add_argument("--time-limit", type=float, default=60.0, help="单次求解时限 (秒)")
+    parser.add_argument("--eta", type=int, default=2, help="每轮保留 1/eta 的配置")
+    parser.add_argument("--cap", type=float, default=3.0, help="竞速截断倍数")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="进程数 (默认 CPU核数 / 搜索空间中的最大线程数)")
+    parser.add_argument("--profiles", default=DEFAULT_PROFILES, help="调优结果文件")
+    parser.add_argument("--show", action="store_true", help="只显示已保存的调优结果")
+    args = parser.parse_args()
+
+    if args.show:
+        profiles = load_profiles(args.profiles)
+        if not profiles:
+            print("还没有调优结果")
+        for family, profile in sorted(profiles.items()):
+            params = ", ".join(f"{k}={v}" for k, v in sorted(profile["params"].items()) if v != -1) or "默认参数"
+            print(f"{family:<20} {params}")
+            default_score = profile["default_score"] if profile["default_score"] is not None else "-"
+            score = f"{profile['score']:.4f}" if profile["score"] is not None else "-"
+            print(f"{'':<20} 得分 {score} (默认 {default_score})，"
+                  f"实例 {', '.join(profile['instances'])}，{profile['tuned_at'] or '-'}")
+        return
+
+    if args.family is None:
+        parser.error("需要指定 --family")
+    instances = args.instances or FAMILIES.get(args.family)
+    if not instances:
+        parser.error(f"未知的问题族 '{args.family}'，请用 --instances 指定实例")
+    # 并行评估时避免多线程配置互相抢占CPU
+    max_threads = max(max(PARAM_SPACE["Threads"]), 1)
+    workers = args.workers or max(1, (os.cpu_count() or 1) // max_threads)
+
+    tuner = Tuner(instances, args.time_limit, args.eta, args.cap, workers=workers)
+    configs = sample_configs(args.configs, args.seed)
+    print(f"问题族 {args.family}: {len(instances)} 个实例，{len(configs)} 个初始配置，{workers} 个进程")
+    best, score, default_score = tuner.tune(configs)
+
+    print(f"\n最优配置: {config_key(best)}")
+    print(f"得分: {score:.4f} s" + (f" (默认配置 {default_score:.4f} s)" if default_score is not None else ""))
+    failed = [r for r in tuner.results.values() if r["error"]]
+    if failed:
+        print(f"注意: {len(failed)} 次运行失败，例如 {failed[0]['instance']}: {failed[0]['error']}")
+    save_profile(args.family, best, score, default_score, instances, args.profiles)
+    print(f"已保存到 {args.profiles}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IndustryOR 多目标规划引擎: 支付表、字典序、加权和、ε-约束法Pareto前沿
+
+id11、id18 是带优先级的目标规划题，题目没有给出各目标之间的权重，README 记为"缺乏必要信息"。
+本模块把模型只建一次，目标函数和ε约束行在同一个模型上切换，任意权重或优先级都不需要重新建模:
+
+- 建模函数 build(env) 返回 (model, objectives)，objectives 为 {名称: (线性表达式, COPT.MINIMIZE/MAXIMIZE)}
+- payoff():          依次以每个目标为首做字典序优化，得到支付表、理想点和最低点 (nadir)
+- lexicographic():   按给定优先级依次优化，前面的目标固定在最优值 (允许 tol 的相对误差)
+- weighted():        加权和 (按理想点/最低点归一化)
+- front():           ε-约束法: 主目标之外的每个目标在 [理想值, 最低值] 上取等距网格作为约束界，
+                     每个网格点先优化主目标，再固定主目标优化其余目标的归一化和 (排除弱Pareto点)
+- select():          在已算出的前沿上按权重或优先级直接选点，不再求解
+
+热启动: 同一网格切片内相邻的ε值在同一个模型上依次求解，MIP用上一个解作为初始解 (setMipStart)，
+LP由COPT沿用上一次的基。
+并行: workers > 1 时把网格按顺序切成 workers 段，每个工作进程建一次模型，在自己的一段上依次求解。
+build 必须是模块级函数 (进程池需要序列化)。
+
+在代码中使用:
+    from pareto import ParetoEngine, select
+    engine = ParetoEngine(build_model)
+    ideal, nadir, table = engine.payoff()
+    point = engine.lexicographic(["p1", "p2", "p3"])
+    front = engine.front("利润", points=11, workers=4)
+    best = select(front, engine.senses, weights={"利润": 1, "闲置": 2}, ideal=ideal, nadir=nadir)
+"""
+
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import coptpy as cp
+from coptpy import COPT
+
+# 字典序优化中前序目标允许的相对误差
+LEX_TOL = 1e-6
+# 判断支配关系和去重的容差
+DOMINANCE_TOL = 1e-7
+
+
+def _linear_part(expr):
+    """表达式的变量部分 (新的 LinExpr) 和常数项"""
+    terms = cp.LinExpr()
+    for k in range(expr.getSize()):
+        terms.addTerm(expr.getVar(k), expr.getCoeff(k))
+    return terms, expr.getConstant()
+
+
+def _sign(sense):
+    """把目标统一成最小化时的系数"""
+    return 1.0 if sense == COPT.MINIMIZE else -1.0
+
+
+def _cap(bound, tol):
+    """在界上留出 tol 的相对余量 (最小化目标的上界)"""
+    return bound + tol * max(1.0, abs(bound))
+
+
+class ParetoEngine:
+    """
+    在一个COPT模型上切换目标函数和ε约束界的多目标求解器
+
+    每个目标对应一行 lb <= f(x) - 常数项 <= ub 的约束，默认为自由行，求解时按需设置上下界。
+    """
+
+    def __init__(self, build, env=None):
+        self.build = build
+        self.env = env or cp.Envr()
+        self.model, objectives = build(self.env)
+        self.model.setParam(COPT.Param.Logging, 0)
+        self.names = list(objectives)
+        self.senses = {name: objectives[name][1] for name in self.names}
+        self.exprs, self.consts, self.rows = {}, {}, {}
+        for name in self.names:
+            terms, const = _linear_part(objectives[name][0])
+            self.exprs[name], self.consts[name] = terms, const
+            self.rows[name] = self.model.addBoundConstr(terms, -COPT.INFINITY, COPT.INFINITY,
+                                                        name=f"epsilon_{name}")
+        self.is_mip = bool(self.model.getAttr(COPT.Attr.IsMIP))
+        self.variables = self.model.getVars()
+        self.last_solution = None
+        self.solves = 0
+
+    def _set_bounds(self, bounds):
+        """bounds: {目标名: 最小化意义下的上界}，未给出的目标行恢复为自由行"""
+        rows, lbs, ubs = [], [], []
+        for name in self.names:
+            lb, ub = -COPT.INFINITY, COPT.INFINITY
+            if name in bounds:
+                # 最小化目标 f <= 界；最大化目标 f >= -界 (界按最小化意义给出)
+                if self.senses[name] == COPT.MINIMIZE:
+                    ub = bounds[name] - self.consts[name]
+                else:
+                    lb = -bounds[name] - self.consts[name]
+            rows.append(self.rows[name])
+            lbs.append(lb)
+            ubs.append(ub)
+        self.model.setInfo(COPT.Info.LB, rows, lbs)
+        self.model.setInfo(COPT.Info.UB, rows, ubs)
+
+    def _solve(self, objective, sense, bounds):
+        """在给定的ε界下求解，返回各目标值 (原始意义) 和变量值，不可行时返回 None"""
+        self._set_bounds(bounds)
+        self.model.setObjective(objective, sense)
+        if self.is_mip and self.last_solution is not None:
+            # 热启动: 上一个解 (满足新的界时COPT直接采用)
+            self.model.setMipStart(self.variables, self.last_solution)
+            self.model.loadMipStart()
+        self.model.solve()
+        self.solves += 1
+        if self.model.status != COPT.OPTIMAL:
+            return None
+        solution = self.model.getInfo(COPT.Info.Value, self.variables)
+        self.last_solution = solution
+        objectives = {name: self.exprs[name].getValue() + self.consts[name] for name in self.names}
+        return {"objectives": objectives, "values": dict(zip((v.name for v in self.variables), solution))}
+
+    def _minimized(self, point, name):
+        return _sign(self.senses[name]) * point["objectives"][name]
+
+    def lexicographic(self, priority, bounds=None, tol=LEX_TOL):
+        """
+        按优先级依次优化，前面的目标固定在最优值附近 (相对误差 tol)
+
+        bounds 为额外的ε界 ({目标名: 最小化意义下的上界})。不可行时返回 None。
+        """
+        bounds = dict(bounds or {})
+        point = None
+        for name in priority:
+            point = self._solve(self.exprs[name], self.senses[name], bounds)
+            if point is None:
+                return None
+            bounds[name] = min(bounds.get(name, math.inf), _cap(self._minimized(point, name), tol))
+        return point
+
+    def payoff(self):
+        """
+        支付表: 以每个目标为首做字典序优化 (其余目标按原顺序)
+
+        Returns:
+            (ideal, nadir, table)，ideal/nadir 为 {目标名: 值} (原始意义)，table 为 {首目标: 该点的各目标值}
+        """
+        table = {}
+        for name in self.names:
+            point = self.lexicographic([name] + [n for n in self.names if n != name])
+            if point is None:
+                raise ValueError("模型不可行")
+            table[name] = point["objectives"]
+        ideal, nadir = {}, {}
+        for name in self.names:
+            values = [_sign(self.senses[name]) * table[first][name] for first in self.names]
+            ideal[name] = _sign(self.senses[name]) * min(values)
+            nadir[name] = _sign(self.senses[name]) * max(values)
+        return ideal, nadir, table
+
+    def weighted(self, weights, ideal=None, nadir=None):
+        """
+        加权和: Σ w_k (f_k - 理想值) / (最低值 - 理想值)，各项按最小化意义；不给 ideal/nadir 时不归一化
+        """
+        objective = cp.LinExpr()
+        for name, weight in weights.items():
+            scale = 1.0
+            if ideal is not None and nadir is not None:
+                span = abs(nadir[name] - ideal[name])
+                scale = 1.0 / span if span > DOMINANCE_TOL else 1.0
+            objective += weight * scale * _sign(self.senses[name]) * self.exprs[name]
+        return self._solve(objective, COPT.MINIMIZE, {})
+
+    def epsilon_point(self, primary, bounds, ideal, nadir, tol=LEX_TOL):
+        """
+        ε-约束法的一个网格点: 其余目标按 bounds 约束，先优化主目标，再固定主目标优化其余目标的归一化和
+        """
+        point = self._solve(self.exprs[primary], self.senses[primary], bounds)
+        if point is None:
+            return None
+        secondary = [name for name in self.names if name != primary]
+        if not secondary:
+            return point
+        bounds = dict(bounds)
+        bounds[primary] = _cap(self._minimized(point, primary), tol)
+        objective = cp.LinExpr()
+        for name in secondary:
+            span = abs(nadir[name] - ideal[name])
+            objective += (_sign(self.senses[name]) / (span if span > DOMINANCE_TOL else 1.0)) * self.exprs[name]
+        return self._solve(objective, COPT.MINIMIZE, bounds) or point
+
+    def front(self, primary, points=11, workers=1, ideal=None, nadir=None):
+        """
+        ε-约束法Pareto前沿
+
+        Returns:
+            非支配点列表 (按主目标排序)，每个点为 {objectives, values}
+        """
+        if ideal is None or nadir is None:
+            ideal, nadir, _ = self.payoff()
+        grid = epsilon_grid(self, primary, points, ideal, nadir)
+        if workers <= 1 or len(grid) < 2:
+            found = [self.epsilon_point(primary, bounds, ideal, nadir) for bounds in grid]
+        else:
+            slices = [list(s) for s in np.array_split(np.arange(len(grid)), workers) if len(s)]
+            tasks = [(self.build, primary, [grid[i] for i in s], ideal, nadir) for s in slices]
+            found = []
+            with ProcessPoolExecutor(max_workers=len(tasks)) as pool:
+                for part in pool.map(_solve_slice, tasks):
+                    found.extend(part)
+        return nondominated([p for p in found if p is not None], self.senses, primary)
+
+
+def epsilon_grid(engine, primary, points, ideal, nadir):
+    """主目标以外各目标在 [理想值, 最低值] 上的等距网格 (最小化意义下的上界) 的全部组合"""
+    axes = []
+    for name in engine.names:
+        if name == primary:
+            continue
+        low = _sign(engine.senses[name]) * ideal[name]
+        high = _sign(engine.senses[name]) * nadir[name]
+        count = points if high - low > DOMINANCE_TOL * max(1.0, abs(high)) else 1
+        axes.append([(name, _cap(value, DOMINANCE_TOL)) for value in np.linspace(high, low, count)])
+    return [dict(combo) for combo in itertools.product(*axes)]
+
+
+def _solve_slice(task):
+    """工作进程: 建一次模型，在网格的一段上依次求解 (相邻ε值互为热启动)"""
+    build, primary, grid, ideal, nadir = task
+    engine = ParetoEngine(build)
+    return [engine.epsilon_point(primary, bounds, ideal, nadir) for bounds in grid]
+
+
+def nondominated(found, senses, primary=None):
+    """去掉被支配的点和重复点"""
+    names = list(senses)
+    vectors = [np.array([_sign(senses[n]) * p["objectives"][n] for n in names]) for p in found]
+    keep = []
+    for i, v in enumerate(vectors):
+        tol = DOMINANCE_TOL * np.maximum(1.0, np.abs(v))
+        dominated = False
+        for j, w in enumerate(vectors):
+            if j == i:
+                continue
+            if (w <= v + tol).all() and ((w < v - tol).any() or j < i and (np.abs(w - v) <= tol).all()):
+                dominated = True
+                break
+        if not dominated:
+            keep.append(found[i])
+    if primary is not None:
+        keep.sort(key=lambda p: _sign(senses[primary]) * p["objectives"][primary])
+    return keep
+
+
+def select(front, senses, weights=None, priority=None, ideal=None, nadir=None, tol=LEX_TOL):
+    """
+    在已算出的前沿上选点: 给 weights 时取归一化加权和最小的点，给 priority 时按字典序选点
+
+    前沿是网格近似，选出的点是网格上的最优点；需要精确解时在 ParetoEngine 上调用
+    weighted() / lexicographic()。
+    """
+    if not front:
+        return None
+    if priority is not None:
+        candidates = list(front)
+        for name in priority:
+            best = min(_sign(senses[name]) * p["objectives"][name] for p in candidates)
+            limit = _cap(best, tol)
+            candidates = [p for p in candidates if _sign(senses[name]) * p["objectives"][name] <= limit]
+        return candidates[0]
+
+    def score(point):
+        total = 0.0
+        for name, weight in (weights or {}).items():
+            value = _sign(senses[name]) * point["objectives"][name]
+            if ideal is not None and nadir is not None:
+                low = _sign(senses[name]) * ideal[name]
+                span = abs(_sign(senses[name]) * nadir[name] - low)
+                value = (value - low) / (span if span > DOMINANCE_TOL else 1.0)
+            total += weight * value
+        return total
+
+    return min(front, key=score)
+
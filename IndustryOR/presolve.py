@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IndustryOR Python端预处理: 活动值界传播、大M系数收紧、删除冗余约束行
+
+很多脚本的变量只声明 lb=0 而不给上界，实际上约束行已经推出很紧的上界 (如 id04 的动物数量、
+id47 的作物面积受 total_land 限制)。presolve() 在模型建好、求解之前对约束行做一遍处理:
+
+1. 大M系数收紧: 只含一个二元变量、且二元变量取1时放松的约束行，按其余约束推出的活动值上界
+   收紧二元变量的系数 (见 logic_constraints.tighten_linking_rows)
+2. 变量上下界收紧: 由全部约束行的活动值界传播推出变量上下界 (整数变量取整，
+   见 integer_enum.tighten_bounds)，写回模型
+3. 删除冗余约束行: 在收紧后的变量上下界内，活动值范围已落在 [行下界, 行上界] 内的约束行
+   (包括已变成变量上下界的单变量行)
+
+推出的界对全部可行解 (整数变量取整数值) 成立，因此最优值不变；但被删除的约束行之后不能再访问
+(对偶值、松弛量等)，脚本求解后需要读取这些约束时应传入 remove_rows=False。
+
+用法:
+    python presolve.py id04 id47                  # 比较预处理前后的改动数量和求解耗时
+    python presolve.py id04 id47 --repeat 10
+
+在代码中使用:
+    from presolve import presolve
+    report = presolve(model)     # {"bounds", "finite", "coefs", "rows", "infeasible", "time"}
+    model.solve()
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+import coptpy as cp
+from coptpy import COPT
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+from benchmark_suite import INSTANCES  # noqa: E402
+from integer_enum import IntegerProgram, tighten_bounds  # noqa: E402
+from logic_constraints import tighten_linking_rows  # noqa: E402
+from solve_telemetry import script_environment  # noqa: E402
+
+# 变量上下界的改进小于该相对量时不写回
+BOUND_TOL = 1e-6
+# 判断约束行冗余的容差
+ROW_TOL = 1e-9
+
+
+def _improved(new, old, upper):
+    """new 是否比 old 明显更紧 (upper 为 True 时比较上界)"""
+    if not np.isfinite(new):
+        return False
+    if not np.isfinite(old):
+        return True
+    gap = old - new if upper else new - old
+    return gap > BOUND_TOL * max(1.0, abs(old))
+
+
+def presolve(model, big_m=True, remove_rows=True, passes=10):
+    """
+    对已建好的模型做界传播预处理 (直接修改模型)
+
+    Returns:
+        {bounds: 收紧的变量上下界个数, finite: 其中由无界变为有界的个数,
+         coefs: 收紧的大M系数个数, rows: 删除的约束行数, infeasible: 是否推出不可行, time: 耗时}
+    """
+    begin = time.perf_counter()
+    report = {"bounds": 0, "finite": 0, "coefs": 0, "rows": 0, "infeasible": False}
+    if big_m:
+        records = tighten_linking_rows(model, "bigm")
+        report["coefs"] = sum(r["action"] == "tightened" for r in records)
+
+    program = IntegerProgram.from_copt_model(model)
+    lb, ub = tighten_bounds(program, passes)
+    if (lb > ub + BOUND_TOL * np.maximum(1.0, np.abs(ub))).any():
+        # 约束行互相矛盾，保持模型不变交给COPT报告不可行
+        report["infeasible"] = True
+        report["time"] = time.perf_counter() - begin
+        return report
+
+    variables = model.getVars()
+    changed_vars, new_lb, new_ub = [], [], []
+    for j, var in enumerate(variables):
+        lower, upper = program.lb[j], program.ub[j]
+        tighter_lb = _improved(lb[j], lower, upper=False)
+        tighter_ub = _improved(ub[j], upper, upper=True)
+        if not (tighter_lb or tighter_ub):
+            continue
+        report["bounds"] += int(tighter_lb) + int(tighter_ub)
+        report["finite"] += int(tighter_lb and not np.isfinite(lower)) + int(tighter_ub and not np.isfinite(upper))
+        lower = lb[j] if tighter_lb else lower
+        upper = ub[j] if tighter_ub else upper
+        changed_vars.append(var)
+        new_lb.append(lower if np.isfinite(lower) else -COPT.INFINITY)
+        new_ub.append(upper if np.isfinite(upper) else COPT.INFINITY)
+        program.lb[j], program.ub[j] = lower, upper
+    if changed_vars:
+        model.setInfo(COPT.Info.LB, changed_vars, new_lb)
+        model.setInfo(COPT.Info.UB, changed_vars, new_ub)
+
+    if remove_rows and len(program.row_lb):
+        a = program.matrix
+        with np.errstate(invalid="ignore"):
+            low = np.where(a > 0, a * program.lb, np.where(a < 0, a * program.ub, 0.0)).sum(axis=1)
+            high = np.where(a > 0, a * program.ub, np.where(a < 0, a * program.lb, 0.0)).sum(axis=1)
+        scale = np.maximum(1.0, np.abs(a).max(axis=1, initial=0.0))
+        redundant = ((program.row_lb == -np.inf) | (low >= program.row_lb - ROW_TOL * scale)) & \
+                    ((program.row_ub == np.inf) | (high <= program.row_ub + ROW_TOL * scale))
+        redundant &= ~np.isnan(low) & ~np.isnan(high)
+        if redundant.any():
+            constrs = model.getConstrs()
+            model.remove([constrs[i] for i in np.flatnonzero(redundant)])
+            report["rows"] = int(redundant.sum())
+
+    report["time"] = time.perf_counter() - begin
+    return report
+
+
+def evaluate(instance, enabled):
+    """
+    在临时目录中运行实例脚本，enabled 为 True 时每次求解前先做 presolve()
+
+    Returns:
+        每次求解一条记录 {objective, time, presolve_time, report}
+    """
+    solves = []
+    original_solve = cp.Model.solve
+
+    def presolving_solve(model, *args, **kwargs):
+        report = presolve(model) if enabled else None
+        result = original_solve(model, *args, **kwargs)
+        solves.append({
+            "objective": model.objval if model.status == COPT.OPTIMAL else None,
+            "time": model.getAttr(COPT.Attr.SolvingTime),
+            "presolve_time": report["time"] if report else 0.0,
+            "report": report,
+        })
+        return result
+
+    with script_environment(os.path.join(ROOT, instance, INSTANCES[instance]),
+                            patches=[(cp.Model, "solve", presolving_solve)],
+                            copy_prefix="industryor_presolve_", output=os.devnull) as run:
+        run.run(record_errors=True)
+    if run.error:
+        print(f"警告: {instance} 脚本出错 ({run.error})，已记录的求解结果仍然有效", file=sys.stderr)
+    return solves
+
+
+def main():
+    parser = argparse.ArgumentParser(description="界传播预处理前后的改动数量和求解耗时比较")
+    parser.add_argument("instances", nargs="+", help="实例编号，如 id04 id47")
+    parser.add_argument("--repeat", type=int, default=5, help="每种方式运行的次数 (耗时取中位数)")
+    args = parser.parse_args()
+    unknown = [i for i in args.instances if i not in INSTANCES]
+    if unknown:
+        parser.error(f"未知的实例: {', '.join(unknown)}")
+
+    print("\n" + "=" * 104)
+    print(f"{'实例':<8} {'目标值(原)':>12} {'目标值(预处理)':>14} {'收紧界':>6} {'变有界':>6} {'大M系数':>7} "
+          f"{'删除行':>6} {'预处理(ms)':>10} {'求解(ms) 原':>12} {'求解(ms) 预处理':>15}")
+    print("-" * 104)
+    for instance in args.instances:
+        try:
+            runs = {enabled: [evaluate(instance, enabled) for _ in range(args.repeat)] for enabled in (False, True)}
+        except cp.CoptError as e:
+            print(f"COPT Error: {e.retcode} - {e.message}")
+            continue
+        if not runs[False][0] or not runs[True][0]:
+            print(f"{instance:<8} 没有求解记录")
+            continue
+        for k, (before, after) in enumerate(zip(runs[False][0], runs[True][0])):
+            report = after["report"]
+            base_time = np.median([run[k]["time"] for run in runs[False]]) * 1e3
+            solve_time = np.median([run[k]["time"] for run in runs[True]]) * 1e3
+            presolve_time = np.median([run[k]["presolve_time"] for run in runs[True]]) * 1e3
+            objectives = [f"{s['objective']:.6g}" if s["objective"] is not None else "-" for s in (before, after)]
+            label = instance + (f" #{k + 1}" if k else "")
+            print(f"{label:<8} {objectives[0]:>12} {objectives[1]:>14} {report['bounds']:>6} {report['finite']:>6} "
+                  f"{report['coefs']:>7} {report['rows']:>6} {presolve_time:>10.2f} {base_time:>12.2f} "
+                  f"{solve_time:>15.2f}" + ("  (推出不可行)" if report["infeasible"] else ""))
+
+
+if __name__ == "__main__":
+    main()
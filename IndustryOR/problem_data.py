@@ -0,0 +1,609 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IndustryOR 统一问题数据格式
+
+各求解脚本原先把数据写成Python字典字面量，扩大规模就得改代码。本模块按问题族定义统一的数据
+结构 (集合 + 按集合索引的NumPy数组 + 标量)，提供 JSON / CSV / NPZ 三种文件格式的读写、
+按问题族校验、以及生成大规模随机实例的工具。求解脚本通过 --data 参数读取数据文件。
+
+问题族与字段 (括号内为数组维度，"2" 表示固定长度2):
+    production_planning  集合 products
+        demand(products), unit_cost(products)；可选 fixed_cost(标量或products), volume(products)
+    routing              集合 nodes (第一个节点为仓库)
+        demand(nodes)；coordinates(nodes, 2) 与 distance(nodes, nodes) 至少其一；
+        可选 time_window(nodes, 2), service_time(nodes)；标量 num_vehicles, vehicle_capacity
+    covering             集合 elements, sites
+        coverage(elements, sites) 0/1矩阵；可选 cost(sites)
+    assignment           集合 agents, tasks
+        cost(agents, tasks)
+    knapsack             集合 items, resources
+        value(items), weight(resources, items), capacity(resources)；可选 lower(items), upper(items)
+
+文件格式:
+    .json   {"family", "name", "sets": {集合: [标签]}, "scalars": {...}, "arrays": {字段: 嵌套列表}}
+    .npz    数组按字段名存放，集合存为 "set:集合名"，标量存为 "scalar:名称"，问题族存为 "meta:family"
+    目录    problem.json (family/name/sets/scalars) + 每个数组字段一个 CSV，
+            表头为各维度的集合名加 value 列，每行一个非零元素 (长格式)
+
+用法:
+    python problem_data.py generate knapsack --size 1000 --output output/knapsack_1000.npz
+    python problem_data.py info output/knapsack_1000.npz
+    python problem_data.py convert output/knapsack_1000.npz output/knapsack_1000.json
+
+求解脚本读取 --data 文件时使用 load_arguments()，按问题族转换为脚本求解函数的参数元组:
+    from problem_data import load_arguments
+    solve_farm_optimization(*load_arguments(args.data, "knapsack"))
+"""
+
+import argparse
+import csv
+import json
+import os
+
+import numpy as np
+
+# 问题族定义: sets 为必需集合；arrays 中每个字段给出允许的维度组合；
+# required 为必需字段，any_of 为至少需要其一的字段组
+SCHEMAS = {
+    "production_planning": {
+        "sets": ["products"],
+        "arrays": {
+            "demand": [("products",)],
+            "unit_cost": [("products",)],
+            "fixed_cost": [(), ("products",)],
+            "volume": [("products",)],
+        },
+        "required": ["demand", "unit_cost"],
+        "scalars": [],
+    },
+    "routing": {
+        "sets": ["nodes"],
+        "arrays": {
+            "demand": [("nodes",)],
+            "coordinates": [("nodes", 2)],
+            "distance": [("nodes", "nodes")],
+            "time_window": [("nodes", 2)],
+            "service_time": [("nodes",)],
+        },
+        "required": ["demand"],
+        "any_of": [["coordinates", "distance"]],
+        "scalars": ["num_vehicles", "vehicle_capacity"],
+    },
+    "covering": {
+        "sets": ["elements", "sites"],
+        "arrays": {
+            "coverage": [("elements", "sites")],
+            "cost": [("sites",)],
+        },
+        "required": ["coverage"],
+        "scalars": [],
+    },
+    "assignment": {
+        "sets": ["agents", "tasks"],
+        "arrays": {
+            "cost": [("agents", "tasks")],
+        },
+        "required": ["cost"],
+        "scalars": [],
+    },
+    "knapsack": {
+        "sets": ["items", "resources"],
+        "arrays": {
+            "value": [("items",)],
+            "weight": [("resources", "items")],
+            "capacity": [("resources",)],
+            "lower": [("items",)],
+            "upper": [("items",)],
+        },
+        "required": ["value", "weight", "capacity"],
+        "scalars": [],
+    },
+}
+
+
+class ProblemData:
+    """
+    一个问题实例的数据
+
+    Attributes:
+        family: 问题族名称
+        name: 实例名称
+        sets: {集合名: 标签列表}
+        arrays: {字段名: numpy数组}
+        scalars: {名称: 数值}
+    """
+
+    def __init__(self, family, sets, arrays=None, scalars=None, name=""):
+        if family not in SCHEMAS:
+            raise ValueError(f"未知的问题族: {family}")
+        self.family = family
+        self.name = name
+        self.sets = {key: list(labels) for key, labels in sets.items()}
+        self.arrays = {key: np.asarray(value, dtype=np.float64) for key, value in (arrays or {}).items()}
+        self.scalars = dict(scalars or {})
+        self._indices = {}
+        self.validate()
+
+    def __getitem__(self, key):
+        if key in self.arrays:
+            return self.arrays[key]
+        return self.scalars[key]
+
+    def __contains__(self, key):
+        return key in self.arrays or key in self.scalars
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def index(self, set_name):
+        """{标签: 位置}"""
+        if set_name not in self._indices:
+            self._indices[set_name] = {label: k for k, label in enumerate(self.sets[set_name])}
+        return self._indices[set_name]
+
+    def dims(self, field):
+        """数组字段各维度对应的集合名 (固定长度维度为整数)"""
+        shape = self.arrays[field].shape
+        for dims in SCHEMAS[self.family]["arrays"].get(field, []):
+            if self._shape_of(dims) == shape:
+                return dims
+        raise KeyError(f"字段 {field} 没有匹配的维度定义")
+
+    def as_dict(self, field):
+        """
+        把数组字段转换为以集合标签为键的字典，便于原有基于字典的建模代码直接使用
+
+        一维数组返回 {标签: 值}；二维数组返回 {(标签1, 标签2): 值}；
+        固定长度的维度 (如坐标、时间窗) 转为元组值，如 {节点: (x, y)}
+        """
+        array = self.arrays[field]
+        dims = self.dims(field)
+        if len(dims) == 0:
+            return array.item()
+        if len(dims) == 1:
+            return dict(zip(self.sets[dims[0]], array.tolist()))
+        if isinstance(dims[1], int):
+            return {label: tuple(row) for label, row in zip(self.sets[dims[0]], array.tolist())}
+        rows, cols = self.sets[dims[0]], self.sets[dims[1]]
+        return {(r, c): value for r, row in zip(rows, array.tolist()) for c, value in zip(cols, row)}
+
+    def _shape_of(self, dims):
+        return tuple(d if isinstance(d, int) else len(self.sets.get(d, ())) for d in dims)
+
+    def validate(self):
+        """按问题族定义检查集合、字段和维度，不符合时抛出 ValueError"""
+        schema = SCHEMAS[self.family]
+        for set_name in schema["sets"]:
+            if set_name not in self.sets:
+                raise ValueError(f"{self.family} 缺少集合 {set_name}")
+            if len(set(self.sets[set_name])) != len(self.sets[set_name]):
+                raise ValueError(f"集合 {set_name} 中有重复标签")
+        for field in schema["required"]:
+            if field not in self.arrays:
+                raise ValueError(f"{self.family} 缺少字段 {field}")
+        for group in schema.get("any_of", []):
+            if not any(field in self.arrays for field in group):
+                raise ValueError(f"{self.family} 需要字段 {' 或 '.join(group)} 之一")
+        for field in schema["scalars"]:
+            if field not in self.scalars:
+                raise ValueError(f"{self.family} 缺少标量 {field}")
+        for field, array in self.arrays.items():
+            allowed = schema["arrays"].get(field)
+            if allowed is None:
+                raise ValueError(f"{self.family} 没有字段 {field}")
+            if array.shape not in [self._shape_of(dims) for dims in allowed]:
+                raise ValueError(f"字段 {field} 的形状 {array.shape} 与定义 {allowed} 不符")
+
+    def distance_matrix(self):
+        """routing 问题的距离矩阵: 优先使用 distance，否则由坐标计算欧氏距离"""
+        if "distance" in self.arrays:
+            return self.arrays["distance"]
+        xy = self.arrays["coordinates"]
+        diff = xy[:, None, :] - xy[None, :, :]
+        return np.sqrt((diff ** 2).sum(axis=2))
+
+
+def _label(value):
+    # JSON/CSV 中的数字标签还原为 int，与原脚本的键类型一致
+    if isinstance(value, str) and value.lstrip("-").isdigit():
+        return int(value)
+    return value
+
+
+def _array_from_json(value, sets, dims):
+    """JSON中的数组可以是嵌套列表，也可以是以标签为键的 (嵌套) 字典"""
+    if not isinstance(value, dict):
+        return np.asarray(value, dtype=np.float64)
+    index = {label: k for k, label in enumerate(sets[dims[0]])}
+    if len(dims) == 1:
+        array = np.zeros(len(index))
+        for label, v in value.items():
+            array[index[_label(label)]] = v
+        return array
+    if isinstance(dims[1], int):
+        array = np.zeros((len(index), dims[1]))
+        for label, row in value.items():
+            array[index[_label(label)]] = row
+        return array
+    col_index = {label: k for k, label in enumerate(sets[dims[1]])}
+    array = np.zeros((len(index), len(col_index)))
+    for label, row in value.items():
+        if isinstance(row, dict):
+            for col, v in row.items():
+                array[index[_label(label)], col_index[_label(col)]] = v
+        else:
+            # {行标签: [列标签, ...]} 形式的0/1关系，如覆盖关系
+            for col in row:
+                array[index[_label(label)], col_index[_label(col)]] = 1.0
+    return array
+
+
+def _dims_for(family, field, value, sets):
+    """根据JSON中字段的结构在允许的维度组合中选出匹配的一个"""
+    allowed = SCHEMAS[family]["arrays"].get(field)
+    if allowed is None:
+        raise ValueError(f"{family} 没有字段 {field}")
+    if len(allowed) == 1:
+        return allowed[0]
+    depth = 0
+    probe = value
+    while isinstance(probe, (list, dict)) and probe:
+        depth += 1
+        probe = next(iter(probe.values())) if isinstance(probe, dict) else probe[0]
+    for dims in allowed:
+        if len(dims) == depth:
+            return dims
+    raise ValueError(f"字段 {field} 的结构与定义 {allowed} 不符")
+
+
+def load_json(path):
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    family = raw["family"]
+    sets = {key: [_label(v) for v in labels] for key, labels in raw["sets"].items()}
+    arrays = {}
+    scalars = dict(raw.get("scalars", {}))
+    for field, value in raw.get("arrays", {}).items():
+        dims = _dims_for(family, field, value, sets)
+        if dims == ():
+            arrays[field] = np.asarray(float(value))
+        else:
+            arrays[field] = _array_from_json(value, sets, dims)
+    return ProblemData(family, sets, arrays, scalars, raw.get("name", ""))
+
+
+def save_json(data, path):
+    raw = {
+        "family": data.family,
+        "name": data.name,
+        "sets": data.sets,
+        "scalars": data.scalars,
+        "arrays": {field: array.tolist() for field, array in data.arrays.items()},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(raw, f, ensure_ascii=False)
+
+
+def load_npz(path):
+    with np.load(path, allow_pickle=False) as archive:
+        family = str(archive["meta:family"])
+        name = str(archive["meta:name"]) if "meta:name" in archive else ""
+        sets, arrays, scalars = {}, {}, {}
+        for key in archive.files:
+            if key.startswith("set:"):
+                sets[key[4:]] = [_label(v) for v in archive[key].tolist()]
+            elif key.startswith("scalar:"):
+                scalars[key[7:]] = archive[key].item()
+            elif not key.startswith("meta:"):
+                arrays[key] = archive[key]
+    return ProblemData(family, sets, arrays, scalars, name)
+
+
+def save_npz(data, path):
+    payload = {"meta:family": np.array(data.family), "meta:name": np.array(data.name)}
+    for set_name, labels in data.sets.items():
+        payload[f"set:{set_name}"] = np.array([str(label) for label in labels])
+    for key, value in data.scalars.items():
+        payload[f"scalar:{key}"] = np.array(value)
+    payload.update(data.arrays)
+    np.savez_compressed(path, **payload)
+
+
+def load_csv_dir(directory):
+    with open(os.path.join(directory, "problem.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    family = meta["family"]
+    sets = {key: [_label(v) for v in labels] for key, labels in meta["sets"].items()}
+    arrays = {}
+    for file_name in sorted(os.listdir(directory)):
+        if not file_name.endswith(".csv"):
+            continue
+        field = file_name[:-4]
+        with open(os.path.join(directory, file_name), newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            rows = list(reader)
+        dims = tuple(int(d) if d.isdigit() else d for d in header[:-1])
+        shape = tuple(d if isinstance(d, int) else len(sets[d]) for d in dims)
+        indices = [None if isinstance(d, int) else {str(label): k for k, label in enumerate(sets[d])}
+                   for d in dims]
+        array = np.zeros(shape)
+        if not dims:
+            array = np.asarray(float(rows[0][0]))
+        elif rows:
+            table = np.array(rows, dtype=object)
+            positions = tuple(
+                table[:, k].astype(np.int64) if index is None
+                else np.fromiter((index[v] for v in table[:, k]), dtype=np.int64, count=len(rows))
+                for k, index in enumerate(indices)
+            )
+            array[positions] = table[:, -1].astype(np.float64)
+        arrays[field] = array
+    return ProblemData(family, sets, arrays, meta.get("scalars", {}), meta.get("name", ""))
+
+
+def save_csv_dir(data, directory):
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "problem.json"), "w", encoding="utf-8") as f:
+        json.dump({"family": data.family, "name": data.name, "sets": data.sets,
+                   "scalars": data.scalars}, f, ensure_ascii=False, indent=2)
+    for field, array in data.arrays.items():
+        dims = data.dims(field)
+        header = [str(d) for d in dims] + ["value"]
+        labels = [list(range(d)) if isinstance(d, int) else data.sets[d] for d in dims]
+        with open(os.path.join(directory, f"{field}.csv"), "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            if not dims:
+                writer.writerow([array.item()])
+                continue
+            for position in zip(*np.nonzero(array)):
+                writer.writerow([labels[k][p] for k, p in enumerate(position)] + [array[position]])
+
+
+def load_problem(path, family=None):
+    """
+    读取问题数据文件 (.json / .npz / CSV目录)
+
+    Args:
+        path: 文件或目录路径
+        family: 期望的问题族，给出时检查是否一致
+
+    Returns:
+        ProblemData
+    """
+    if os.path.isdir(path):
+        data = load_csv_dir(path)
+    elif path.endswith(".npz"):
+        data = load_npz(path)
+    elif path.endswith(".json"):
+        data = load_json(path)
+    else:
+        raise ValueError(f"无法识别的数据文件格式: {path}")
+    if family is not None and data.family != family:
+        raise ValueError(f"数据文件 {path} 的问题族为 {data.family}，需要 {family}")
+    return data
+
+
+def save_problem(data, path):
+    """按扩展名保存问题数据 (.json / .npz，其他路径保存为CSV目录)"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if path.endswith(".npz"):
+        save_npz(data, path)
+    elif path.endswith(".json"):
+        save_json(data, path)
+    else:
+        save_csv_dir(data, path)
+
+
+def knapsack_arguments(data):
+    """
+    knapsack 数据 -> (items, profits, resources, weights, capacities, lower, upper)
+
+    weights 为按资源排列的二维列表；没有 lower / upper 字段时对应项为None
+    """
+    lower = data["lower"].tolist() if "lower" in data else None
+    upper = data["upper"].tolist() if "upper" in data else None
+    return (data.sets["items"], data["value"].tolist(), data.sets["resources"], data["weight"].tolist(),
+            data["capacity"].tolist(), lower, upper)
+
+
+def assignment_arguments(data):
+    """assignment 数据 -> (agents, tasks, cost)，cost 为 {(agent, task): 成本}"""
+    return data.sets["agents"], data.sets["tasks"], data.as_dict("cost")
+
+
+def covering_arguments(data):
+    """
+    covering 数据 -> (elements, sites, coverage, cost)
+
+    coverage 为 {site: [可覆盖的元素]}，cost 为 {site: 成本}，没有 cost 字段时为None
+    """
+    elements, sites = data.sets["elements"], data.sets["sites"]
+    matrix = data["coverage"]
+    coverage = {j: [elements[i] for i in matrix[:, k].nonzero()[0]] for k, j in enumerate(sites)}
+    cost = data.as_dict("cost") if "cost" in data else None
+    return elements, sites, coverage, cost
+
+
+def production_planning_arguments(data):
+    """
+    production_planning 数据 -> (products, volumes, demand, unit_cost, fixed_cost)
+
+    有 volume 字段时产品按体积升序排列，否则按文件中的顺序且体积记为0；
+    fixed_cost 为标量或 {产品: 固定成本}，没有该字段时为0
+    """
+    products = data.sets["products"]
+    volumes = data.as_dict("volume") if "volume" in data else {i: 0 for i in products}
+    ordered = sorted(products, key=lambda i: volumes[i]) if "volume" in data else list(products)
+    fixed_cost = data.as_dict("fixed_cost") if "fixed_cost" in data else 0
+    return ordered, volumes, data.as_dict("demand"), data.as_dict("unit_cost"), fixed_cost
+
+
+def routing_arguments(data, num_vehicles=None, vehicle_capacity=None):
+    """
+    routing 数据 -> (nodes, distances, demand, time_windows, service_times, num_vehicles, vehicle_capacity)
+
+    distances 为 {(i, j): 距离}；缺少时间窗时用足够宽的时间窗，缺少服务时间时记为0；
+    文件中没有车辆数、车辆容量标量时使用参数给出的默认值
+    """
+    nodes = data.sets["nodes"]
+    matrix = data.distance_matrix().tolist()
+    distances = {(i, j): matrix[a][b] for a, i in enumerate(nodes) for b, j in enumerate(nodes)}
+    if "time_window" in data:
+        time_windows = data.as_dict("time_window")
+    else:
+        horizon = sum(max(row) for row in matrix) * 2
+        time_windows = {i: (0, horizon) for i in nodes}
+    service_times = data.as_dict("service_time") if "service_time" in data else {i: 0 for i in nodes}
+    num_vehicles = data.scalars.get("num_vehicles", num_vehicles)
+    return (nodes, distances, data.as_dict("demand"), time_windows, service_times,
+            int(num_vehicles) if num_vehicles is not None else None,
+            data.scalars.get("vehicle_capacity", vehicle_capacity))
+
+
+ARGUMENTS = {
+    "knapsack": knapsack_arguments,
+    "assignment": assignment_arguments,
+    "covering": covering_arguments,
+    "production_planning": production_planning_arguments,
+    "routing": routing_arguments,
+}
+
+
+def result_path(data_path, default="result.txt"):
+    """
+    结果文件名: data_path 为None (题目数据) 时为 default，否则在文件名后加数据文件名
+    (如 result_knapsack_1000.txt)，--data 运行不覆盖题目数据的参考结果
+    """
+    if data_path is None:
+        return default
+    stem = os.path.splitext(os.path.basename(os.path.normpath(data_path)))[0]
+    root, ext = os.path.splitext(default)
+    return f"{root}_{stem}{ext}"
+
+
+def load_arguments(path, family, **defaults):
+    """
+    读取数据文件并转换为求解脚本的参数元组 (见各 *_arguments 函数)
+
+    Args:
+        path: 数据文件路径
+        family: 问题族，文件中的问题族必须一致
+        defaults: 传给转换函数的默认值 (如 routing 的 num_vehicles、vehicle_capacity)
+    """
+    return ARGUMENTS[family](load_problem(path, family=family), **defaults)
+
+
+def generate(family, size, seed=0):
+    """
+    生成指定问题族的随机实例
+
+    Args:
+        family: 问题族
+        size: 规模 (产品数 / 客户数 / 元素数 / 代理数 / 物品数)
+        seed: 随机种子
+    """
+    rng = np.random.default_rng(seed)
+    if family == "production_planning":
+        products = list(range(1, size + 1))
+        volume = np.sort(rng.integers(1000, 20000, size)).astype(float)
+        unit_cost = np.round(volume / 1000 + rng.uniform(0, 4, size), 2)
+        return ProblemData(family, {"products": products}, {
+            "demand": rng.integers(100, 1000, size),
+            "unit_cost": unit_cost,
+            "fixed_cost": np.asarray(float(rng.integers(500, 2000))),
+            "volume": volume,
+        }, name=f"production_{size}")
+    if family == "routing":
+        nodes = list(range(size + 1))
+        coordinates = rng.uniform(0, 100, (size + 1, 2))
+        demand = rng.integers(5, 40, size + 1).astype(float)
+        demand[0] = 0
+        horizon = 1000.0
+        start = rng.uniform(0, horizon * 0.8, size + 1)
+        time_window = np.column_stack([start, start + rng.uniform(60, 200, size + 1)])
+        time_window[0] = (0, horizon + 300)
+        service_time = np.full(size + 1, 10.0)
+        service_time[0] = 0
+        vehicle_capacity = 200
+        return ProblemData(family, {"nodes": nodes}, {
+            "demand": demand,
+            "coordinates": coordinates,
+            "time_window": time_window,
+            "service_time": service_time,
+        }, {"num_vehicles": int(np.ceil(demand.sum() / vehicle_capacity)) + 2,
+            "vehicle_capacity": vehicle_capacity}, name=f"routing_{size}")
+    if family == "covering":
+        elements = [f"E{k}" for k in range(size)]
+        coverage = (rng.random((size, size)) < min(1.0, 5.0 / size)).astype(float)
+        np.fill_diagonal(coverage, 1.0)
+        return ProblemData(family, {"elements": elements, "sites": list(elements)},
+                           {"coverage": coverage, "cost": np.ones(size)}, name=f"covering_{size}")
+    if family == "assignment":
+        agents = [f"W{k}" for k in range(size + max(1, size // 5))]
+        tasks = [f"T{k}" for k in range(size)]
+        return ProblemData(family, {"agents": agents, "tasks": tasks},
+                           {"cost": rng.integers(1, 100, (len(agents), size))}, name=f"assignment_{size}")
+    if family == "knapsack":
+        items = [f"I{k}" for k in range(size)]
+        resources = ["R0", "R1"]
+        weight = rng.integers(1, 50, (2, size)).astype(float)
+        return ProblemData(family, {"items": items, "resources": resources}, {
+            "value": rng.integers(1, 100, size),
+            "weight": weight,
+            "capacity": np.round(weight.sum(axis=1) / 4),
+            "lower": np.zeros(size),
+            "upper": rng.integers(1, 5, size),
+        }, name=f"knapsack_{size}")
+    raise ValueError(f"未知的问题族: {family}")
+
+
+def describe(data):
+    """打印实例概况"""
+    print(f"问题族: {data.family}")
+    print(f"实例名: {data.name or '-'}")
+    for set_name, labels in data.sets.items():
+        preview = ", ".join(str(label) for label in labels[:5])
+        print(f"集合 {set_name}: {len(labels)} 个 ({preview}{', ...' if len(labels) > 5 else ''})")
+    for field, array in data.arrays.items():
+        print(f"字段 {field}: 形状 {array.shape}, 范围 [{array.min():g}, {array.max():g}]" if array.size
+              else f"字段 {field}: 空")
+    for key, value in data.scalars.items():
+        print(f"标量 {key} = {value}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IndustryOR 问题数据文件工具")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    info = subparsers.add_parser("info", help="显示数据文件概况")
+    info.add_argument("path", help="数据文件或CSV目录")
+
+    gen = subparsers.add_parser("generate", help="生成随机实例")
+    gen.add_argument("family", choices=sorted(SCHEMAS), help="问题族")
+    gen.add_argument("--size", type=int, default=100, help="实例规模")
+    gen.add_argument("--seed", type=int, default=0, help="随机种子")
+    gen.add_argument("--output", required=True, help="输出路径 (.json / .npz / 目录)")
+
+    convert = subparsers.add_parser("convert", help="转换数据文件格式")
+    convert.add_argument("source", help="源文件")
+    convert.add_argument("target", help="目标文件 (.json / .npz / 目录)")
+    args = parser.parse_args()
+
+    if args.command == "info":
+        describe(load_problem(args.path))
+    elif args.command == "generate":
+        data = generate(args.family, args.size, args.seed)
+        save_problem(data, args.output)
+        print(f"已生成 {data.name} -> {args.output}")
+    else:
+        save_problem(load_problem(args.source), args.target)
+        print(f"已转换 {args.source} -> {args.target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IndustryOR 乘积型目标: 自动取对数，按因子的形状生成对数线性、切线外逼近或SOS2分段线性形式
+
+id99 (可靠性分配) 的目标是各部件可靠度的乘积，脚本手工对每个可靠度取 math.log 后线性化；
+id17 的未摧毁概率也是同样的推导。本模块把乘积目标 Π_k g_k 换成 Σ_k ln g_k，按因子类型自动处理:
+
+- choice(variables, values): 因子为 values[k]^x_k (x_k 为0-1选择变量，至多一个取1)，
+  ln 因子 = Σ x_k·ln(values[k]) 是线性的，直接并入目标；values[k] = 0 的选项把 x_k 固定为0
+- power(base, expr):         因子为 base^expr (expr 为线性表达式)，ln 因子 = expr·ln(base) 同样是线性的
+- factor(expr, g, dg):       连续因子 g(expr) > 0。先由变量上下界和约束行推出 expr 的定义域
+  (logic_constraints.implied_bounds)，在定义域上采样判断 ln g 的凹凸性:
+    * 最大化乘积且 ln g 为凹 (可靠度 1-(1-r)^(s+1) 等对数凹函数)，或最小化乘积且 ln g 为凸时，
+      用切线外逼近 (minlp_oa 的凸项)，切线割平面使主问题目标是有效界，结果是全局最优
+    * 其他情况用 SOS2 分段线性插值 (minlp_oa 的一元项)。初始断点按插值误差自适应二分
+      (minlp_oa.adaptive_breakpoints，误差超过 PWL_TOL 的区间对分，最多 MAX_BREAKPOINTS 个)，
+      求解中再在当前解处加断点细化。插值对凹的 ln g 是下估计、对凸的是上估计，只有偏保守时
+      (最大化且 ln g 为凸，或最小化且 ln g 为凹) 主问题目标才是有效界，否则结果的状态为 "approximate"，
+      不给出乘积的界
+  shape="tangent" / "pwl" 可强制指定形式
+
+在代码中使用:
+    from product_objective import ProductObjective
+    objective = ProductObjective(model)                           # 默认最大化乘积
+    for i in components:
+        objective.choice([x[i, j] for j in spares], [reliability[i, j] for j in spares])
+    for i in parts:
+        objective.factor(s[i], lambda v, r=r[i]: 1 - (1 - r) ** (v + 1), name=f"r_{i}")
+    objective.build()                  # 设置目标 (只有 choice/power 时模型是普通MILP，可直接 model.solve())
+    result = objective.solve()         # minlp_oa 的结果字典，另含 product 和 product_bound
+"""
+
+import math
+import os
+import sys
+
+import coptpy as cp
+from coptpy import COPT
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+from logic_constraints import implied_bounds  # noqa: E402
+from minlp_oa import OuterApproximation, adaptive_breakpoints  # noqa: E402
+
+# 判断凹凸性的采样点数
+SHAPE_SAMPLES = 33
+# 凹凸性判断时二阶差分的容差 (相对)
+SHAPE_TOL = 1e-9
+# ln 乘积的间隙容差，即乘积的相对间隙 (切线外逼近每轮只加切线，1e-6 需要很多轮)
+GAP_TOL = 1e-4
+SHAPES = ("auto", "tangent", "pwl")
+
+
+def _expr_range(expr, lb, ub):
+    """线性表达式在变量上下界内的取值范围"""
+    low = high = expr.getConstant()
+    for k in range(expr.getSize()):
+        index, coeff = expr.getVar(k).index, expr.getCoeff(k)
+        low += min(coeff * lb[index], coeff * ub[index])
+        high += max(coeff * lb[index], coeff * ub[index])
+    return low, high
+
+
+def _samples(lower, upper, count=SHAPE_SAMPLES):
+    if upper <= lower:
+        return [lower]
+    return [lower + (upper - lower) * k / (count - 1) for k in range(count)]
+
+
+def curvature(f, lower, upper):
+    """
+    f 在 [lower, upper] 上的形状 (按等距采样点的二阶差分判断)
+
+    Returns:
+        "linear"、"concave"、"convex" 或 "general"
+    """
+    values = [f(p) for p in _samples(lower, upper)]
+    second = [values[k - 1] - 2 * values[k] + values[k + 1] for k in range(1, len(values) - 1)]
+    tol = SHAPE_TOL * max([1.0] + [abs(v) for v in values])
+    concave = all(d <= tol for d in second)
+    convex = all(d >= -tol for d in second)
+    if concave and convex:
+        return "linear"
+    if concave:
+        return "concave"
+    if convex:
+        return "convex"
+    return "general"
+
+
+class _Factor:
+    """一个连续因子 g(expr)，build() 时按定义域和形状决定建模形式"""
+
+    def __init__(self, expr, g, dg, name, shape):
+        self.expr, self.g, self.dg = expr, g, dg
+        self.name, self.shape = name, shape
+        self.lower = self.upper = None
+        self.form = None
+        self.curvature = None
+
+    def log(self, z):
+        value = self.g(z)
+        if value <= 0:
+            raise ValueError(f"{self.name}: 因子在 {z} 处的值 {value} 不为正，无法取对数")
+        return math.log(value)
+
+    def log_slope(self, z):
+        """ln g 的导数: 给定 dg 时为 dg/g，否则用定义域内的差分"""
+        if self.dg is not None:
+            return self.dg(z) / self.g(z)
+        step = 1e-6 * max(1.0, abs(z))
+        a, b = max(self.lower, z - step), min(self.upper, z + step)
+        if b <= a:
+            return 0.0
+        return (self.log(b) - self.log(a)) / (b - a)
+
+
+class ProductObjective:
+    """在已建好约束的COPT模型上设置乘积型目标 Π 因子 (取对数后求解)"""
+
+    def __init__(self, model, sense=COPT.MAXIMIZE):
+        self.model = model
+        self.sense = sense
+        self.log_constant = 0.0
+        self.log_linear = []
+        self.factors = []
+        self.oa = None
+
+    def constant(self, value):
+        """常数因子 value > 0"""
+        if value <= 0:
+            raise ValueError(f"常数因子必须为正，得到 {value}")
+        self.log_constant += math.log(value)
+
+    def choice(self, variables, values):
+        """因子 Π_k values[k]^x_k，variables 为0-1选择变量 (至多一个取1，都不取时因子为1)"""
+        for var, value in zip(variables, values):
+            if value < 0:
+                raise ValueError(f"{var.name}: 因子的取值必须非负，得到 {value}")
+            if value == 0:
+                if self.sense != COPT.MAXIMIZE:
+                    raise ValueError(f"{var.name}: 最小化乘积时因子不能取0")
+                # 选中即乘积为0，不可能是最大化的最优解
+                self.model.setInfo(COPT.Info.UB, [var], [0.0])
+            elif value != 1:
+                self.log_linear.append((math.log(value), var))
+
+    def power(self, base, expr):
+        """因子 base^expr，base > 0，expr 为变量或线性表达式"""
+        if base <= 0:
+            raise ValueError(f"底数必须为正，得到 {base}")
+        if base != 1:
+            self.log_linear.append((math.log(base), expr))
+
+    def factor(self, expr, g, dg=None, name="", shape="auto"):
+        """连续因子 g(expr) > 0，dg 为 g 的导数 (省略时用差分)，shape 见模块说明"""
+        if shape not in SHAPES:
+            raise ValueError(f"未知的形式: {shape} (可选 {', '.join(SHAPES)})")
+        self.factors.append(_Factor(expr, g, dg, name or f"factor_{len(self.factors)}", shape))
+
+    def _tangent_fits(self, shape):
+        """该形状的 ln g 能否用切线外逼近得到有效界"""
+        wanted = "concave" if self.sense == COPT.MAXIMIZE else "convex"
+        return shape in ("linear", wanted)
+
+    def _pwl_fits(self, shape):
+        """该形状的 ln g 的分段线性插值是否偏保守 (主问题目标是有效界)"""
+        wanted = "convex" if self.sense == COPT.MAXIMIZE else "concave"
+        return shape in ("linear", wanted)
+
+    def build(self):
+        """决定各连续因子的形式并设置目标 Σ ln 因子"""
+        self.oa = OuterApproximation(self.model)
+        if self.factors:
+            lb, ub = implied_bounds(self.model)
+        sign = 1.0 if self.sense == COPT.MAXIMIZE else -1.0
+        nonlinear = []
+        for factor in self.factors:
+            # 变量对象可能不是表达式，统一乘1转成 LinExpr
+            lower, upper = _expr_range(1.0 * factor.expr, lb, ub)
+            if not (math.isfinite(lower) and math.isfinite(upper)):
+                raise ValueError(f"{factor.name}: 无法由变量上下界和约束行推出有限的定义域")
+            factor.lower, factor.upper = float(lower), float(upper)
+            shape = curvature(factor.log, factor.lower, factor.upper)
+            factor.curvature = shape
+            if factor.shape == "tangent" and not self._tangent_fits(shape):
+                raise ValueError(f"{factor.name}: ln 因子为 {shape}，切线外逼近不是有效界")
+            if factor.shape == "pwl" or (factor.shape == "auto" and not self._tangent_fits(shape)):
+                factor.form = "pwl"
+                t = self.oa.separable(factor.expr, factor.log, name=factor.name,
+                                      grid=lambda a, b, f=factor.log: adaptive_breakpoints(f, a, b))
+                nonlinear.append((1.0, t))
+            else:
+                # 凸项形式 u >= sign·(-ln g)，目标中以 -sign·u 出现 (越小越好)
+                factor.form = "tangent"
+                u = self.oa.convex(factor.expr, lambda z, f=factor: -sign * f.log(z),
+                                   lambda z, f=factor: -sign * f.log_slope(z), name=factor.name)
+                nonlinear.append((-sign, u))
+
+        objective = cp.LinExpr(self.log_constant)
+        for coeff, term in self.log_linear + nonlinear:
+            objective += coeff * term
+        self.model.setObjective(objective, self.sense)
+
+    def solve(self, method="oa", gap_tol=GAP_TOL, **kwargs):
+        """
+        求解 (参数同 OuterApproximation.solve，gap_tol 默认为 GAP_TOL)
+
+        Returns:
+            OuterApproximation.solve 的结果字典，objective/bound 为 ln 乘积，
+            另含 product、product_bound (乘积本身) 和 forms (各连续因子的建模形式)；
+            有因子的分段线性插值不偏保守时 bound、gap、product_bound 为 None，
+            status 由 "optimal" 改为 "approximate"
+        """
+        if self.oa is None:
+            self.build()
+        result = self.oa.solve(method=method, gap_tol=gap_tol, **kwargs)
+        if any(factor.form == "pwl" and not self._pwl_fits(factor.curvature) for factor in self.factors):
+            result["bound"] = result["gap"] = None
+            if result["status"] == "optimal":
+                result["status"] = "approximate"
+        result["product"] = math.exp(result["objective"]) if result["objective"] is not None else None
+        result["product_bound"] = math.exp(result["bound"]) if result["bound"] is not None else None
+        result["forms"] = {factor.name: factor.form for factor in self.factors}
+        return result
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IndustryOR 多模型竞速求解
+
+同一个问题常有多种建模方式 (如 id15 的 solve_problem.py 与 solve_corrected.py)，
+或者同一模型在不同参数下求解时间差异很大。竞速模式把这些"变体"同时放在独立进程中运行，
+第一个证明最优 (或达到目标间隙) 的变体胜出，其余进程立即终止，从而降低难实例的尾部延迟。
+
+变体写法: 脚本路径[@参数=值,参数=值]，例如
+    id15/solve_problem.py
+    id34/production_planning.py@Presolve=0,CutLevel=3
+
+- 每个变体在临时目录中的脚本目录副本里运行，互不覆盖输出文件；
+  指定 --adopt 时把胜出变体生成或修改的文件复制回原目录
+- 变体以脚本中第一次达到最优 (或间隙不超过 --gap) 的求解为准，适用于只求解一次的脚本
+- 未在变体中指定 Threads 时，每个变体分得 CPU核数 / 变体数 个线程，避免互相抢占
+- 各变体的求解日志保存在 --log-dir 下
+
+用法:
+    python race_solver.py id15/solve_problem.py id15/solve_corrected.py
+    python race_solver.py --gap 0.01 --timeout 300 id34/production_planning.py \\
+        id34/production_planning.py@Presolve=0 "id34/production_planning.py@MipStartMode=2"
+"""
+
+import argparse
+import filecmp
+import multiprocessing
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import time
+
+import coptpy as cp
+from coptpy import COPT
+
+from solve_telemetry import script_environment
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_LOG_DIR = os.path.join("output", "race")
+
+STATUS_NAMES = {
+    COPT.OPTIMAL: "最优",
+    COPT.INFEASIBLE: "无可行解",
+    COPT.UNBOUNDED: "无界",
+    COPT.TIMEOUT: "超时",
+    COPT.INTERRUPTED: "中断",
+}
+
+
+def parse_variant(spec):
+    """
+    解析变体写法
+
+    Returns:
+        (脚本路径, {参数名: 值})
+    """
+    script, _, param_text = spec.partition("@")
+    params = {}
+    for item in filter(None, param_text.split(",")):
+        name, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"变体 '{spec}' 的参数 '{item}' 缺少 '='")
+        try:
+            params[name.strip()] = int(value)
+        except ValueError:
+            params[name.strip()] = float(value)
+    return script, params
+
+
+def _solve_gap(model):
+    """MIP求解后的相对间隙，LP或没有可行解时为None"""
+    if not model.getAttr(COPT.Attr.IsMIP):
+        return 0.0 if model.status == COPT.OPTIMAL else None
+    if not model.getAttr(COPT.Attr.HasMipSol):
+        return None
+    return model.getAttr(COPT.Attr.BestGap)
+
+
+def _run_variant(index, script, params, workdir, log_path, target_gap, messages):
+    """子进程入口: 在副本目录中运行脚本，每次求解结束后把结果发给主进程"""
+    script_path = os.path.join(workdir, os.path.basename(script))
+    original_solve = cp.Model.solve
+    start = time.perf_counter()
+
+    def racing_solve(model, *args, **kwargs):
+        for name, value in params.items():
+            model.setParam(name, value)
+        if target_gap is not None:
+            model.setParam(COPT.Param.RelGap, target_gap)
+        result = original_solve(model, *args, **kwargs)
+        gap = _solve_gap(model)
+        has_objective = gap is not None
+        messages.put({
+            "index": index,
+            "event": "solve",
+            "time": time.perf_counter() - start,
+            "status": model.status,
+            "objective": model.objval if has_objective else None,
+            "gap": gap,
+        })
+        return result
+
+    error = None
+    try:
+        # 重定向文件描述符，COPT在C层输出的求解日志也写入日志文件
+        with script_environment(script_path, patches=[(cp.Model, "solve", racing_solve)],
+                                output=log_path) as run:
+            error = run.run(record_errors=True)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        messages.put({"index": index, "event": "exit", "time": time.perf_counter() - start, "error": error})
+
+
+def _proved(message, target_gap):
+    """该次求解是否证明了最优 (或达到目标间隙)"""
+    if message["status"] == COPT.OPTIMAL:
+        return True
+    return target_gap is not None and message["gap"] is not None and message["gap"] <= target_gap
+
+
+def _adopt_outputs(workdir, script_dir):
+    """把胜出变体新建或修改的文件复制回原脚本目录，返回复制的文件列表"""
+    copied = []
+    for root, dirs, files in os.walk(workdir):
+        dirs[:] = [d for d in dirs if d != "__pycache__"]
+        for name in files:
+            source = os.path.join(root, name)
+            relative = os.path.relpath(source, workdir)
+            target = os.path.join(script_dir, relative)
+            if os.path.exists(target) and filecmp.cmp(source, target, shallow=False):
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copy2(source, target)
+            copied.append(relative)
+    return copied
+
+
+def race(variants, target_gap=None, timeout=None, log_dir=DEFAULT_LOG_DIR, adopt=False):
+    """
+    并行运行各变体，第一个证明最优的变体胜出，其余变体立即终止
+
+    Args:
+        variants: 变体写法列表
+        target_gap: 目标相对间隙，None 表示要求证明最优
+        timeout: 整体时限 (秒)，超时后终止全部变体
+        log_dir: 各变体求解日志的保存目录
+        adopt: 是否把胜出变体的输出文件复制回原目录
+
+    Returns:
+        {"winner": 变体序号或None, "time": 胜出用时, "variants": 每个变体的结果字典列表}
+    """
+    parsed = [parse_variant(spec) for spec in variants]
+    threads = max(1, (os.cpu_count() or 1) // len(parsed))
+    os.makedirs(log_dir, exist_ok=True)
+
+    context = multiprocessing.get_context("spawn")
+    messages = context.Queue()
+    results = []
+    processes = []
+    with tempfile.TemporaryDirectory(prefix="industryor_race_") as tmp:
+        for index, (script, params) in enumerate(parsed):
+            script_dir = os.path.dirname(os.path.abspath(script))
+            workdir = os.path.join(tmp, f"variant_{index}")
+            shutil.copytree(script_dir, workdir, ignore=shutil.ignore_patterns("__pycache__"))
+            params = dict(params)
+            params.setdefault("Threads", threads)
+            log_path = os.path.abspath(os.path.join(log_dir, f"variant_{index}.log"))
+            results.append({"spec": variants[index], "status": None, "objective": None, "gap": None,
+                            "time": None, "outcome": "运行中", "log": log_path, "workdir": workdir,
+                            "script_dir": script_dir})
+            processes.append(context.Process(
+                target=_run_variant,
+                args=(index, script, params, workdir, log_path, target_gap, messages),
+                daemon=True,
+            ))
+
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+
+        winner = None
+        running = set(range(len(processes)))
+        while running:
+            remaining = None if timeout is None else timeout - (time.perf_counter() - start)
+            if remaining is not None and remaining <= 0:
+                break
+            try:
+                message = messages.get(timeout=1.0 if remaining is None else min(remaining, 1.0))
+            except queue.Empty:
+                # 子进程异常崩溃 (如段错误) 时不会发出退出消息
+                for index in [i for i in running if not processes[i].is_alive() and messages.empty()]:
+                    running.discard(index)
+                    if results[index]["outcome"] == "运行中":
+                        results[index]["outcome"] = f"失败 (进程退出码 {processes[index].exitcode})"
+                continue
+            result = results[message["index"]]
+            if message["event"] == "solve":
+                if result["status"] is not None and _proved(result, target_gap):
+                    continue  # 已以前一次求解为准
+                result.update(status=message["status"], objective=message["objective"],
+                              gap=message["gap"], time=message["time"])
+                if winner is None and _proved(message, target_gap):
+                    winner = message["index"]
+                    result["outcome"] = "胜出"
+                    # 终止其余变体，胜出者继续运行以写完输出文件
+                    for index in running - {winner}:
+                        processes[index].terminate()
+                        results[index]["outcome"] = "已取消"
+                    running = {winner}
+            else:
+                running.discard(message["index"])
+                if result["outcome"] == "运行中":
+                    result["outcome"] = f"失败 ({message['error']})" if message["error"] else "完成"
+
+        for index, process in enumerate(processes):
+            if process.is_alive():
+                process.terminate()
+                if results[index]["outcome"] == "运行中":
+                    results[index]["outcome"] = "超时终止"
+            process.join()
+
+        if winner is not None and adopt:
+            results[winner]["adopted"] = _adopt_outputs(results[winner]["workdir"],
+                                                        results[winner]["script_dir"])
+
+    return {"winner": winner, "time": results[winner]["time"] if winner is not None else None,
+            "variants": results}
+
+
+def print_report(summary):
+    """打印竞速结果"""
+    print("\n" + "=" * 100)
+    print("竞速求解结果")
+    print("=" * 100)
+    print(f"{'#':>2} {'变体':<48} {'状态':<8} {'目标值':>14} {'间隙':>9} {'用时(s)':>9}  结果")
+    print("-" * 100)
+    for index, result in enumerate(summary["variants"]):
+        status = STATUS_NAMES.get(result["status"], "-" if result["status"] is None else str(result["status"]))
+        objective = f"{result['objective']:.6g}" if result["objective"] is not None else "-"
+        gap = f"{result['gap']:.4%}" if result["gap"] is not None else "-"
+        elapsed = f"{result['time']:.2f}" if result["time"] is not None else "-"
+        print(f"{index:>2} {result['spec'][:48]:<48} {status:<8} {objective:>14} {gap:>9} {elapsed:>9}  "
+              f"{result['outcome']}")
+    print("-" * 100)
+
+    winner = summary["winner"]
+    if winner is None:
+        print("没有变体在时限内证明最优")
+        return
+    best = summary["variants"][winner]
+    print(f"胜出变体: #{winner} {best['spec']}，用时 {summary['time']:.2f} s")
+    print(f"求解日志: {best['log']}")
+    # 多个变体都给出最优解时，检查不同建模方式的目标值是否一致
+    optimal = [r for r in summary["variants"] if r["status"] == COPT.OPTIMAL and r["objective"] is not None]
+    if any(abs(r["objective"] - best["objective"]) > 1e-6 * max(1.0, abs(best["objective"])) for r in optimal):
+        print("警告: 各变体的最优目标值不一致，请检查建模是否等价")
+    if "adopted" in best:
+        print(f"已复制回原目录的文件: {', '.join(best['adopted']) or '无'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多个建模方式/参数设置并行竞速求解")
+    parser.add_argument("variants", nargs="+", help="变体，写法为 脚本路径[@参数=值,...]")
+    parser.add_argument("--gap", type=float, default=None, help="目标相对间隙，达到即视为胜出 (默认要求证明最优)")
+    parser.add_argument("--timeout", type=float, default=None, help="整体时限 (秒)")
+    parser.add_argument("--log-dir", default=DEFAULT_LOG_DIR, help="各变体求解日志的保存目录")
+    parser.add_argument("--adopt", action="store_true", help="把胜出变体的输出文件复制回原目录")
+    args = parser.parse_args()
+
+    if len(args.variants) < 2:
+        parser.error("至少需要两个变体")
+    summary = race(args.variants, args.gap, args.timeout, args.log_dir, args.adopt)
+    print_report(summary)
+    sys.exit(0 if summary["winner"] is not None else 1)
+
+
+if __name__ == "__main__":
+    main()
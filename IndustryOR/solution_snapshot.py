@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IndustryOR 二进制解快照
+
+批量求解 (参数扫描、多实例重复运行) 时，每次都写 detailed_results.txt / final_summary.txt /
+缩进JSON会产生成千上万个小文本文件。解快照把同一模型的多次求解结果按列式二进制格式
+存放在一个目录中：
+
+    快照目录/
+        names.npy     变量名 (只写一次)
+        values.f64    解值矩阵，每次求解一行，float64 按行追加
+        info.f64      每次求解的 (目标值, 状态码)，float64 按行追加
+        labels.txt    每次求解的标签，一行一个
+
+追加写入的代价与已有解的数量无关；读取时 values.f64 通过 numpy.memmap 映射，
+按变量名取一列 (如某个变量在全部解中的取值) 不需要把整个文件读入内存。
+
+用法一 (在脚本中调用):
+    from solution_snapshot import append_model_snapshot
+    append_model_snapshot("output/snapshots", model, label="fixed_cost=+10%")
+
+实例脚本统一通过环境变量启用 (见 save_env_snapshot):
+    INDUSTRYOR_SNAPSHOT=output/snapshots INDUSTRYOR_SNAPSHOT_LABEL=run1 python id03/solve_production_planning.py
+
+用法二 (读取):
+    from solution_snapshot import SolutionSnapshot
+    snapshot = SolutionSnapshot("output/snapshots")
+    snapshot.column("x[1]")          # 变量 x[1] 在所有解中的取值
+    snapshot.solution(-1)            # 最后一个解 {变量名: 值}
+
+用法三 (命令行查看):
+    python solution_snapshot.py info output/snapshots
+    python solution_snapshot.py show output/snapshots --index -1 [--vars x[1] y[1]]
+    python solution_snapshot.py export output/snapshots snapshots.npz
+"""
+
+import argparse
+import os
+
+import numpy as np
+from coptpy import COPT
+
+NAMES_FILE = "names.npy"
+VALUES_FILE = "values.f64"
+INFO_FILE = "info.f64"
+LABELS_FILE = "labels.txt"
+# 实例脚本的快照目录和标签环境变量
+SNAPSHOT_ENV = "INDUSTRYOR_SNAPSHOT"
+LABEL_ENV = "INDUSTRYOR_SNAPSHOT_LABEL"
+
+
+def has_solution(model):
+    """模型是否有可读取的解 (MIP看 HasMipSol，LP看 HasLpSol)"""
+    return bool(model.getAttr(COPT.Attr.HasMipSol if model.getAttr(COPT.Attr.IsMIP) else COPT.Attr.HasLpSol))
+
+
+def model_solution(model):
+    """
+    读取已求解模型的全部变量名和取值
+
+    Returns:
+        (变量名列表, float64数组)，没有解 (不可行、超时无可行解等) 时取值全为NaN
+    """
+    variables = model.getVars()
+    names = [v.name for v in variables]
+    if has_solution(model):
+        values = np.asarray(model.getInfo(COPT.Info.Value, variables), dtype=np.float64)
+    else:
+        values = np.full(len(names), np.nan)
+    return names, values
+
+
+class SnapshotWriter:
+    """
+    解快照写入器
+
+    Args:
+        directory: 快照目录，已存在时在其后追加 (变量名必须一致)
+        names: 变量名列表
+        buffer_rows: 内存中缓冲的解数量，达到后批量追加到文件
+    """
+
+    def __init__(self, directory, names, buffer_rows=1024):
+        self.directory = directory
+        self.names = list(names)
+        self.buffer_rows = buffer_rows
+        self.values = []
+        self.info = []
+        self.labels = []
+
+        os.makedirs(directory, exist_ok=True)
+        names_path = os.path.join(directory, NAMES_FILE)
+        if os.path.exists(names_path):
+            existing = np.load(names_path).tolist()
+            if existing != self.names:
+                raise ValueError(f"快照 '{directory}' 的变量名与当前模型不一致")
+        else:
+            np.save(names_path, np.array(self.names, dtype=str))
+
+    def add(self, values, objective=np.nan, status=-1, label=""):
+        """
+        添加一个解
+
+        Args:
+            values: 与 names 顺序一致的取值序列，或 {变量名: 值} 字典 (缺失的变量记为NaN)
+            objective: 目标值，没有可行解时为NaN
+            status: 求解状态码
+            label: 标签，不能包含换行符
+        """
+        if isinstance(values, dict):
+            row = np.array([values.get(name, np.nan) for name in self.names], dtype=np.float64)
+        else:
+            row = np.asarray(values, dtype=np.float64)
+            if row.shape != (len(self.names),):
+                raise ValueError(f"解的长度 {row.shape} 与变量数 {len(self.names)} 不一致")
+        if "\n" in label:
+            raise ValueError("标签不能包含换行符")
+
+        self.values.append(row)
+        self.info.append((objective, status))
+        self.labels.append(label)
+        if len(self.values) >= self.buffer_rows:
+            self.flush()
+
+    def add_model(self, model, label=""):
+        """添加已求解模型的当前解"""
+        names, values = model_solution(model)
+        if names != self.names:
+            raise ValueError("模型的变量名与快照不一致")
+        objective = model.objval if has_solution(model) else np.nan
+        self.add(values, objective, model.status, label)
+
+    def flush(self):
+        """把缓冲的解追加到快照文件"""
+        if not self.values:
+            return
+        with open(os.path.join(self.directory, VALUES_FILE), "ab") as f:
+            np.vstack(self.values).tofile(f)
+        with open(os.path.join(self.directory, INFO_FILE), "ab") as f:
+            np.asarray(self.info, dtype=np.float64).tofile(f)
+        with open(os.path.join(self.directory, LABELS_FILE), "a", encoding="utf-8") as f:
+            f.writelines(label + "\n" for label in self.labels)
+        self.values.clear()
+        self.info.clear()
+        self.labels.clear()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def append_model_snapshot(directory, model, label=""):
+    """把已求解模型的当前解追加到快照目录 (单次调用，适合每次运行只求解一次的脚本)"""
+    names, _ = model_solution(model)
+    with SnapshotWriter(directory, names) as writer:
+        writer.add_model(model, label)
+
+
+def snapshot_dir():
+    """环境变量 INDUSTRYOR_SNAPSHOT 指定的快照目录，未设置时为None"""
+    return os.environ.get(SNAPSHOT_ENV) or None
+
+
+def save_env_snapshot(model):
+    """
+    实例脚本使用: 设置了 INDUSTRYOR_SNAPSHOT 时把当前解追加到该快照，标签取 INDUSTRYOR_SNAPSHOT_LABEL
+
+    Returns:
+        快照目录，未设置环境变量时返回None (不写入)
+    """
+    directory = snapshot_dir()
+    if directory is not None:
+        append_model_snapshot(directory, model, os.environ.get(LABEL_ENV, ""))
+    return directory
+
+
+class SolutionSnapshot:
+    """
+    解快照读取器，values 为只读内存映射
+
+    Attributes:
+        names: 变量名数组
+        index: {变量名: 列号}
+        values: (解数量, 变量数) float64 内存映射数组
+        objective: 每个解的目标值
+        status: 每个解的状态码
+        labels: 每个解的标签
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.names = np.load(os.path.join(directory, NAMES_FILE))
+        self.index = {name: k for k, name in enumerate(self.names.tolist())}
+
+        values_path = os.path.join(directory, VALUES_FILE)
+        num_vars = len(self.names)
+        if os.path.exists(values_path) and os.path.getsize(values_path) > 0 and num_vars > 0:
+            self.values = np.memmap(values_path, dtype=np.float64, mode="r").reshape(-1, num_vars)
+        else:
+            self.values = np.empty((0, num_vars), dtype=np.float64)
+
+        info_path = os.path.join(directory, INFO_FILE)
+        info = np.fromfile(info_path, dtype=np.float64).reshape(-1, 2) if os.path.exists(info_path) \
+            else np.empty((0, 2))
+        self.objective = info[:, 0]
+        self.status = info[:, 1].astype(np.int64)
+
+        labels_path = os.path.join(directory, LABELS_FILE)
+        if os.path.exists(labels_path):
+            with open(labels_path, encoding="utf-8") as f:
+                self.labels = [line.rstrip("\n") for line in f]
+        else:
+            self.labels = []
+
+        if not len(self.values) == len(self.objective) == len(self.labels):
+            raise ValueError(f"快照 '{directory}' 文件不完整: "
+                             f"{len(self.values)} 个解, {len(self.objective)} 条状态, {len(self.labels)} 个标签")
+
+    def __len__(self):
+        return len(self.objective)
+
+    def column(self, name):
+        """变量 name 在全部解中的取值"""
+        return self.values[:, self.index[name]]
+
+    def columns(self, names):
+        """多个变量在全部解中的取值，形状为 (解数量, len(names))"""
+        return self.values[:, [self.index[name] for name in names]]
+
+    def solution(self, k):
+        """第k个解，返回 {变量名: 值}"""
+        return dict(zip(self.names.tolist(), self.values[k].tolist()))
+
+    def find(self, label):
+        """返回标签为 label 的解的序号列表"""
+        return [k for k, value in enumerate(self.labels) if value == label]
+
+    def to_npz(self, path):
+        """导出为单个压缩 .npz 文件 (便于传输，读取时不再支持内存映射)"""
+        np.savez_compressed(path, names=self.names, values=np.asarray(self.values),
+                            objective=self.objective, status=self.status,
+                            labels=np.array(self.labels, dtype=str))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="查看或导出二进制解快照")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    info = subparsers.add_parser("info", help="显示快照概况")
+    info.add_argument("directory", help="快照目录")
+
+    show = subparsers.add_parser("show", help="显示某个解")
+    show.add_argument("directory", help="快照目录")
+    show.add_argument("--index", type=int, default=-1, help="解的序号，负数表示从末尾计数")
+    show.add_argument("--vars", nargs="+", default=None, help="只显示这些变量")
+
+    export = subparsers.add_parser("export", help="导出为 .npz 文件")
+    export.add_argument("directory", help="快照目录")
+    export.add_argument("output", help="输出 .npz 路径")
+    args = parser.parse_args()
+
+    snapshot = SolutionSnapshot(args.directory)
+    if args.command == "info":
+        print(f"快照目录: {args.directory}")
+        print(f"变量数: {len(snapshot.names)}")
+        print(f"解数量: {len(snapshot)}")
+        if len(snapshot):
+            feasible = snapshot.objective[~np.isnan(snapshot.objective)]
+            if len(feasible):
+                print(f"目标值范围: {feasible.min():.4f} ~ {feasible.max():.4f}")
+            codes, counts = np.unique(snapshot.status, return_counts=True)
+            print("状态码分布: " + ", ".join(f"{c}: {n}" for c, n in zip(codes, counts)))
+    elif args.command == "show":
+        k = args.index
+        print(f"解 {k % len(snapshot)}  标签: {snapshot.labels[k] or '-'}  "
+              f"目标值: {snapshot.objective[k]:.4f}  状态码: {snapshot.status[k]}")
+        names = args.vars or snapshot.names.tolist()
+        for name in names:
+            print(f"  {name} = {snapshot.values[k, snapshot.index[name]]:g}")
+    else:
+        snapshot.to_npz(args.output)
+        print(f"已导出到 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IndustryOR 求解遥测
+
+把每次 model.solve() 的建模耗时、求解器属性、峰值内存和模型规模写成一条JSON记录，
+追加到JSONL文件中，便于跨实例、跨版本追踪性能回退。
+
+记录字段:
+    timestamp, run_id, instance, script, model, solve_index,
+    status, objective, is_mip,
+    build_time       建模耗时 (创建模型或上一次求解结束 -> 本次求解开始)
+    solve_wall_time  model.solve() 的墙钟时间
+    solving_time     COPT SolvingTime 属性
+    rows, cols, elems, ints, bins,
+    best_bnd, best_gap, node_cnt, simplex_iter, barrier_iter,
+    peak_rss_mb      进程峰值常驻内存
+    copt_version, python_version, host
+
+用法一 (在脚本中显式调用):
+    from solve_telemetry import build_timer, instrumented_solve
+
+    with build_timer() as timer:
+        ...  # 建模
+    instrumented_solve(model, instance="id34", build_time=timer.elapsed)
+
+用法二 (不修改脚本，记录脚本中的全部求解):
+    python solve_telemetry.py [--log 文件] id34/production_planning.py [脚本参数 ...]
+
+--log 须写在脚本路径之前，脚本路径之后的全部参数原样传给脚本。
+
+默认日志文件为 IndustryOR/output/solve_telemetry.jsonl，可用环境变量
+INDUSTRYOR_TELEMETRY_LOG 或 --log 参数覆盖。
+"""
+
+import argparse
+import json
+import os
+import platform
+import runpy
+import shutil
+import socket
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+
+import coptpy as cp
+from coptpy import COPT
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_LOG = os.path.join(ROOT, "output", "solve_telemetry.jsonl")
+
+# 本进程的运行编号，同一次运行中的多次求解共享
+RUN_ID = uuid.uuid4().hex[:12]
+
+# 求解器属性 -> 记录字段
+_SIZE_ATTRS = {
+    "rows": COPT.Attr.Rows,
+    "cols": COPT.Attr.Cols,
+    "elems": COPT.Attr.Elems,
+    "ints": COPT.Attr.Ints,
+    "bins": COPT.Attr.Bins,
+}
+_MIP_ATTRS = {
+    "best_bnd": COPT.Attr.BestBnd,
+    "best_gap": COPT.Attr.BestGap,
+    "node_cnt": COPT.Attr.NodeCnt,
+}
+_LP_ATTRS = {
+    "simplex_iter": COPT.Attr.SimplexIter,
+    "barrier_iter": COPT.Attr.BarrierIter,
+}
+
+# 由 install() 挂钩的模型信息: id(model) -> {name, instance, last_mark, solve_index}
+_tracked_models = {}
+_original_solve = None
+_original_create_model = None
+
+
+def log_path():
+    """当前生效的JSONL日志路径"""
+    return os.environ.get("INDUSTRYOR_TELEMETRY_LOG", DEFAULT_LOG)
+
+
+def peak_rss_mb():
+    """进程峰值常驻内存 (MB)，平台不支持时返回None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 上单位为KB，macOS 上单位为字节
+    if sys.platform == "darwin":
+        return round(peak / (1024 * 1024), 2)
+    return round(peak / 1024, 2)
+
+
+def copt_version():
+    """COPT版本号字符串"""
+    parts = [getattr(COPT, name, None) for name in ("VERSION_MAJOR", "VERSION_MINOR", "VERSION_TECHNICAL")]
+    return ".".join(str(p) for p in parts if p is not None) or None
+
+
+def current_instance():
+    """根据当前工作目录推断实例编号 (如 id34)"""
+    name = os.path.basename(os.getcwd())
+    return name if name.startswith("id") else None
+
+
+class BuildTimer:
+    """建模计时器，elapsed 为秒"""
+
+    def __init__(self):
+        self.start = None
+        self.elapsed = None
+
+
+@contextmanager
+def build_timer():
+    """统计代码块 (通常是建模部分) 的墙钟耗时"""
+    timer = BuildTimer()
+    timer.start = time.perf_counter()
+    try:
+        yield timer
+    finally:
+        timer.elapsed = time.perf_counter() - timer.start
+
+
+def _safe_attr(model, attr):
+    try:
+        return model.getAttr(attr)
+    except cp.CoptError:
+        return None
+
+
+def collect_record(model, build_time=None, solve_wall_time=None, instance=None,
+                   model_name=None, solve_index=0, extra=None):
+    """
+    读取求解后模型的属性，组装一条遥测记录
+
+    Args:
+        model: 已求解的COPT模型
+        build_time: 建模耗时 (秒)
+        solve_wall_time: 求解墙钟耗时 (秒)
+        instance: 实例编号，默认按当前工作目录推断
+        model_name: 模型名
+        solve_index: 同一模型的第几次求解 (从0开始)
+        extra: 附加字段字典
+
+    Returns:
+        记录字典
+    """
+    is_mip = bool(_safe_attr(model, COPT.Attr.IsMIP))
+    has_solution = _safe_attr(model, COPT.Attr.HasMipSol if is_mip else COPT.Attr.HasLpSol)
+
+    record = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "run_id": RUN_ID,
+        "instance": instance or current_instance(),
+        "script": os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else None,
+        "model": model_name,
+        "solve_index": solve_index,
+        "status": model.status,
+        "objective": model.objval if has_solution else None,
+        "is_mip": is_mip,
+        "build_time": round(build_time, 6) if build_time is not None else None,
+        "solve_wall_time": round(solve_wall_time, 6) if solve_wall_time is not None else None,
+        "solving_time": _safe_attr(model, COPT.Attr.SolvingTime),
+    }
+    for key, attr in _SIZE_ATTRS.items():
+        record[key] = _safe_attr(model, attr)
+    for key, attr in (_MIP_ATTRS if is_mip else _LP_ATTRS).items():
+        record[key] = _safe_attr(model, attr)
+    record["peak_rss_mb"] = peak_rss_mb()
+    record["copt_version"] = copt_version()
+    record["python_version"] = platform.python_version()
+    record["host"] = socket.gethostname()
+    if extra:
+        record.update(extra)
+    return record
+
+
+def write_record(record, path=None):
+    """以追加方式写入一条JSONL记录"""
+    path = path or log_path()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def instrumented_solve(model, instance=None, build_time=None, model_name=None,
+                       extra=None, path=None):
+    """
+    求解模型并写入遥测记录
+
+    Args:
+        model: COPT模型
+        instance: 实例编号，默认按当前工作目录推断
+        build_time: 建模耗时 (秒)，通常来自 build_timer()
+        model_name: 模型名
+        extra: 附加字段字典
+        path: JSONL日志路径，默认 log_path()
+
+    Returns:
+        遥测记录字典
+    """
+    solve = _original_solve or cp.Model.solve
+    start = time.perf_counter()
+    solve(model)
+    solve_wall_time = time.perf_counter() - start
+    record = collect_record(model, build_time, solve_wall_time, instance, model_name, extra=extra)
+    write_record(record, path)
+    return record
+
+
+def _tracking_create_model(env, name=""):
+    model = _original_create_model(env, name)
+    _tracked_models[id(model)] = {"name": name, "last_mark": time.perf_counter(), "solve_index": 0}
+    return model
+
+
+def _tracking_solve(model, *args, **kwargs):
+    info = _tracked_models.setdefault(
+        id(model), {"name": None, "last_mark": None, "solve_index": 0})
+    start = time.perf_counter()
+    build_time = start - info["last_mark"] if info["last_mark"] is not None else None
+    try:
+        return _original_solve(model, *args, **kwargs)
+    finally:
+        end = time.perf_counter()
+        try:
+            record = collect_record(model, build_time, end - start, model_name=info["name"],
+                                    solve_index=info["solve_index"])
+            write_record(record)
+        except Exception as e:
+            print(f"遥测记录失败: {e}", file=sys.stderr)
+        info["solve_index"] += 1
+        info["last_mark"] = time.perf_counter()
+
+
+def install():
+    """挂钩 Envr.createModel 和 Model.solve，使本进程内的所有求解自动写入遥测记录"""
+    global _original_solve, _original_create_model
+    if _original_solve is not None:
+        return
+    _original_solve = cp.Model.solve
+    _original_create_model = cp.Envr.createModel
+    cp.Model.solve = _tracking_solve
+    cp.Envr.createModel = _tracking_create_model
+
+
+def uninstall():
+    """撤销 install() 的挂钩"""
+    global _original_solve, _original_create_model
+    if _original_solve is None:
+        return
+    cp.Model.solve = _original_solve
+    cp.Envr.createModel = _original_create_model
+    _original_solve = None
+    _original_create_model = None
+    _tracked_models.clear()
+
+
+class ScriptRun:
+    """script_environment() 中待运行的脚本，error 记录脚本的异常或非零退出码"""
+
+    def __init__(self, path):
+        self.path = path
+        self.error = None
+
+    def run(self, record_errors=False):
+        """
+        以 __main__ 运行脚本
+
+        Args:
+            record_errors: 为 True 时脚本的异常和非零退出码记录在 error 中而不抛出
+                (部分脚本求解后写结果文件失败，已经完成的求解仍然有效)
+
+        Returns:
+            error
+        """
+        try:
+            runpy.run_path(self.path, run_name="__main__")
+        except SystemExit as e:
+            if not record_errors:
+                raise
+            if e.code not in (None, 0):
+                self.error = f"脚本退出码 {e.code}"
+        except Exception as e:
+            if not record_errors:
+                raise
+            self.error = f"{type(e).__name__}: {e}"
+        return self.error
+
+
+def _restore_output(saved):
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.dup2(saved[0], 1)
+    os.dup2(saved[1], 2)
+    os.close(saved[0])
+    os.close(saved[1])
+
+
+@contextmanager
+def script_environment(script, script_args=(), patches=(), copy_prefix=None, output=None):
+    """
+    在脚本所在目录下运行脚本的环境 (与手动 cd 后运行一致)，退出时恢复工作目录、sys.argv、sys.path、
+    被替换的方法和标准输出
+
+    Args:
+        script: 脚本路径
+        script_args: 传给脚本的命令行参数
+        patches: [(类, 方法名, 替换函数)]，如 [(cp.Model, "solve", tuned_solve)]
+        copy_prefix: 给出时把脚本所在目录复制到以此为前缀的临时目录中运行，仓库中的结果文件不被覆盖
+        output: 给出时把文件描述符1、2重定向到该文件 (os.devnull 即丢弃)，COPT在C层输出的日志一并重定向
+
+    Yields:
+        ScriptRun
+    """
+    script = os.path.abspath(script)
+    saved_cwd, saved_argv, saved_path = os.getcwd(), sys.argv, list(sys.path)
+    originals = [(owner, name, getattr(owner, name)) for owner, name, _ in patches]
+    with ExitStack() as stack:
+        if copy_prefix is not None:
+            workdir = stack.enter_context(tempfile.TemporaryDirectory(prefix=copy_prefix))
+            copy_dir = os.path.join(workdir, os.path.basename(os.path.dirname(script)))
+            shutil.copytree(os.path.dirname(script), copy_dir, ignore=shutil.ignore_patterns("__pycache__"))
+            script = os.path.join(copy_dir, os.path.basename(script))
+        script_dir = os.path.dirname(script)
+        if output is not None:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            saved = os.dup(1), os.dup(2)
+            target = os.open(output, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            os.dup2(target, 1)
+            os.dup2(target, 2)
+            os.close(target)
+            stack.callback(_restore_output, saved)
+        os.chdir(script_dir)
+        sys.argv = [script] + list(script_args)
+        # 临时目录的上级没有公共模块 (problem_data 等)，从仓库目录导入
+        sys.path[:0] = [script_dir, ROOT]
+        for owner, name, replacement in patches:
+            setattr(owner, name, replacement)
+        try:
+            yield ScriptRun(script)
+        finally:
+            for owner, name, original in originals:
+                setattr(owner, name, original)
+            os.chdir(saved_cwd)
+            sys.argv = saved_argv
+            sys.path[:] = saved_path
+
+
+def run_script(script, script_args=()):
+    """
+    在脚本所在目录下运行脚本 (与手动 cd 后运行一致)，期间记录全部求解
+
+    Args:
+        script: 脚本路径
+        script_args: 传给脚本的命令行参数
+    """
+    install()
+    try:
+        with script_environment(script, script_args) as run:
+            run.run()
+    finally:
+        uninstall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="运行IndustryOR脚本并记录每次求解的遥测信息")
+    parser.add_argument("script", help="要运行的脚本，如 id34/production_planning.py")
+    parser.add_argument("script_args", nargs=argparse.REMAINDER, help="传给脚本的参数")
+    parser.add_argument("--log", default=None, help="JSONL日志路径 (须写在脚本路径之前)")
+    args = parser.parse_args()
+
+    if args.log:
+        os.environ["INDUSTRYOR_TELEMETRY_LOG"] = os.path.abspath(args.log)
+    else:
+        os.environ.setdefault("INDUSTRYOR_TELEMETRY_LOG", DEFAULT_LOG)
+    run_script(args.script, args.script_args)
+    print(f"\n遥测记录已追加到 {log_path()}")
+
+
+if __name__ == "__main__":
+    main()
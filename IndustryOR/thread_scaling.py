@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IndustryOR 多线程扩展性测试
+
+各求解脚本都不设置线程数，COPT默认按机器核数取线程，在多核机器上运行结果难以复现，
+多个实例共享一台机器时也不清楚每个求解该分几个线程。本模块对每个实例分别以
+1/2/4/8/16 个线程重复求解，统计加速比和并行效率，并按问题族给出默认线程数。
+
+确定性设置: Threads、SimplexThreads、BarThreads、CrossoverThreads、MipTasks 全部固定为同一个值，
+不再依赖机器核数。COPT在固定线程数下是确定性的，同一线程数的重复运行应得到相同的目标值和节点数，
+报告中的"可复现"列对此进行核对。
+
+- 加速比 = 1线程耗时中位数 / k线程耗时中位数，效率 = 加速比 / k
+- 吞吐量最优线程数: 许多实例共享机器时，k线程的单个求解占用 k * 耗时 的核秒数，
+  取问题族内总核秒数最少的 k (同样的核数在单位时间内可完成最多的求解)
+- 延迟最优线程数: 问题族内总耗时最少的 k (机器上只运行一个求解时)
+
+每次求解在独立进程中、临时目录的实例副本里依次运行 (不并行，避免互相干扰计时)。
+
+用法:
+    python thread_scaling.py id34 id36 --runs 3
+    python thread_scaling.py --family production_planning --threads 1 2 4 8
+    python thread_scaling.py --family routing --save-defaults   # 把吞吐量最优线程数写入 tuned_profiles.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from coptpy import COPT
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+from benchmark_suite import INSTANCES  # noqa: E402
+from param_tuning import DEFAULT_PROFILES, FAMILIES, evaluate, load_profiles  # noqa: E402
+
+THREAD_COUNTS = [1, 2, 4, 8, 16]
+DEFAULT_OUTPUT = os.path.join("output", "thread_scaling.json")
+
+
+def deterministic_config(threads):
+    """固定全部与线程数相关的参数"""
+    return {
+        "Threads": threads,
+        "SimplexThreads": threads,
+        "BarThreads": threads,
+        "CrossoverThreads": threads,
+        "MipTasks": threads,
+    }
+
+
+def family_of(instance):
+    for family, instances in FAMILIES.items():
+        if instance in instances:
+            return family
+    return "other"
+
+
+def measure_instance(instance, thread_counts, runs, time_limit):
+    """
+    以各线程数重复求解一个实例
+
+    Returns:
+        {线程数: {median, times, objective, nodes, reproducible, error}}
+    """
+    measurements = {}
+    for threads in thread_counts:
+        results = []
+        for _ in range(runs):
+            # 每次求解使用新进程，避免前一次运行的状态影响计时
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                results.append(pool.submit(evaluate, instance, deterministic_config(threads), time_limit).result())
+        failed = [r for r in results if r["error"] or r["status"] != COPT.OPTIMAL]
+        if failed:
+            reason = failed[0]["error"] or f"状态码 {failed[0]['status']}"
+            measurements[threads] = {"median": None, "times": [], "objective": None, "nodes": None,
+                                     "reproducible": None, "error": reason}
+            continue
+        times = [r["time"] for r in results]
+        outcomes = {(round(r["objective"], 9), r["nodes"]) for r in results}
+        measurements[threads] = {
+            "median": statistics.median(times),
+            "times": times,
+            "objective": results[0]["objective"],
+            "nodes": results[0]["nodes"],
+            "reproducible": len(outcomes) == 1,
+            "error": None,
+        }
+    return measurements
+
+
+def scaling_rows(measurements):
+    """加速比与效率，以1线程 (或测得的最少线程数) 为基准"""
+    measured = sorted(k for k, m in measurements.items() if m["median"] is not None)
+    if not measured:
+        return []
+    base_threads = measured[0]
+    base = measurements[base_threads]["median"]
+    rows = []
+    for threads in sorted(measurements):
+        m = measurements[threads]
+        row = {"threads": threads, "median": m["median"], "reproducible": m["reproducible"], "error": m["error"]}
+        if m["median"] is not None and m["median"] > 0:
+            row["speedup"] = base / m["median"] * base_threads
+            row["efficiency"] = row["speedup"] / threads
+            row["core_seconds"] = threads * m["median"]
+        else:
+            row["speedup"] = row["efficiency"] = row["core_seconds"] = None
+        rows.append(row)
+    return rows
+
+
+def recommend(report):
+    """
+    按问题族给出吞吐量最优和延迟最优的线程数 (只考虑在族内全部实例上都求解成功的线程数)
+
+    Returns:
+        {问题族: {"throughput": k, "latency": k, "core_seconds": {k: 总核秒}, "instances": [...]}}
+    """
+    families = {}
+    for instance, entry in report.items():
+        families.setdefault(entry["family"], []).append(instance)
+
+    recommendations = {}
+    for family, instances in families.items():
+        candidates = None
+        for instance in instances:
+            ok = {row["threads"] for row in report[instance]["rows"] if row["median"] is not None}
+            candidates = ok if candidates is None else candidates & ok
+        if not candidates:
+            continue
+        core_seconds, wall = {}, {}
+        for threads in sorted(candidates):
+            rows = [next(r for r in report[i]["rows"] if r["threads"] == threads) for i in instances]
+            core_seconds[threads] = sum(r["core_seconds"] or 0.0 for r in rows)
+            wall[threads] = sum(r["median"] for r in rows)
+        recommendations[family] = {
+            "throughput": min(core_seconds, key=lambda k: (core_seconds[k], k)),
+            "latency": min(wall, key=lambda k: (wall[k], k)),
+            "core_seconds": core_seconds,
+            "instances": instances,
+        }
+    return recommendations
+
+
+def save_thread_defaults(recommendations, path=DEFAULT_PROFILES):
+    """把吞吐量最优线程数写入调优结果文件中对应问题族的 Threads 参数，其余参数保持不变"""
+    profiles = load_profiles(path)
+    for family, rec in recommendations.items():
+        profile = profiles.setdefault(family, {"params": {}, "score": None, "default_score": None,
+                                               "instances": rec["instances"], "tuned_at": None})
+        profile["params"]["Threads"] = rec["throughput"]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(profiles, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def print_report(report, recommendations):
+    for instance, entry in report.items():
+        print(f"\n{instance} ({entry['family']})")
+        print(f"  {'线程':>4} {'耗时中位数(s)':>14} {'加速比':>8} {'效率':>8} {'核秒':>10}  可复现")
+        for row in entry["rows"]:
+            if row["median"] is None:
+                print(f"  {row['threads']:>4} {'失败: ' + row['error']}")
+                continue
+            speedup = f"{row['speedup']:.2f}" if row["speedup"] is not None else "-"
+            efficiency = f"{row['efficiency']:.0%}" if row["efficiency"] is not None else "-"
+            core_seconds = f"{row['core_seconds']:.3f}" if row["core_seconds"] is not None else "-"
+            print(f"  {row['threads']:>4} {row['median']:>14.4f} {speedup:>8} {efficiency:>8} {core_seconds:>10}  "
+                  f"{'是' if row['reproducible'] else '否'}")
+
+    if recommendations:
+        print("\n按问题族推荐的线程数:")
+        for family, rec in sorted(recommendations.items()):
+            print(f"  {family:<20} 吞吐量最优 {rec['throughput']:>2} 线程，延迟最优 {rec['latency']:>2} 线程 "
+                  f"({len(rec['instances'])} 个实例)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测试IndustryOR实例的多线程扩展性")
+    parser.add_argument("instances", nargs="*", help="实例编号 (默认为 --family 的全部实例)")
+    parser.add_argument("--family", default=None, help=f"问题族，可选: {', '.join(FAMILIES)}")
+    parser.add_argument("--threads", type=int, nargs="+", default=THREAD_COUNTS, help="测试的线程数")
+    parser.add_argument("--runs", type=int, default=3, help="每个线程数的重复次数")
+    parser.add_argument("--time-limit", type=float, default=600.0, help="单次求解时限 (秒)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="结果JSON路径")
+    parser.add_argument("--save-defaults", action="store_true",
+                        help="把吞吐量最优线程数写入 tuned_profiles.json (求解脚本通过 apply_tuned_profile 使用)")
+    args = parser.parse_args()
+
+    instances = args.instances or FAMILIES.get(args.family, [])
+    if not instances:
+        parser.error("需要指定实例或 --family")
+    unknown = [i for i in instances if i not in INSTANCES]
+    if unknown:
+        parser.error(f"未知的实例: {', '.join(unknown)}")
+    cores = os.cpu_count() or 1
+    thread_counts = sorted(set(args.threads))
+    if any(k > cores for k in thread_counts):
+        print(f"注意: 本机只有 {cores} 个核，超过核数的线程数测得的是超额订阅下的表现")
+
+    report = {}
+    for instance in instances:
+        print(f"测试 {instance} ...", flush=True)
+        measurements = measure_instance(instance, thread_counts, args.runs, args.time_limit)
+        report[instance] = {
+            "family": args.family or family_of(instance),
+            "measurements": {str(k): m for k, m in measurements.items()},
+            "rows": scaling_rows(measurements),
+        }
+
+    recommendations = recommend(report)
+    print_report(report, recommendations)
+
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"cores": cores, "runs": args.runs, "instances": report,
+                   "recommendations": recommendations}, f, ensure_ascii=False, indent=2)
+    print(f"\n结果已保存到 {args.output}")
+
+    if args.save_defaults and recommendations:
+        save_thread_defaults(recommendations)
+        print(f"推荐线程数已写入 {DEFAULT_PROFILES}")
+
+
+if __name__ == "__main__":
+    main()